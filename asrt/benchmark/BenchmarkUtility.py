@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import sys
+import time
+import queue
+import resource
+import multiprocessing
+
+
+def getPeakRSS():
+    """Peak resident set size of the current process
+       in bytes.
+    """
+    peakRSS = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    #Bytes on macOS, kilobytes elsewhere
+    if sys.platform != "darwin":
+        peakRSS *= 1024
+    return peakRSS
+
+
+def getMemory():
+    """Current memory of the process in bytes, from
+       /proc/self/smaps_rollup on Linux:
+          - rss         : resident pages
+          - pss         : resident pages, shared ones divided
+                          by the number of processes mapping them
+          - privateDirty: pages only this process wrote to
+
+       return an empty dictionary elsewhere
+    """
+    keysDict = {'Rss:': 'rss', 'Pss:': 'pss', 'Private_Dirty:': 'privateDirty'}
+    memoryDict = {}
+    try:
+        with open("/proc/self/smaps_rollup") as inputFile:
+            for strLine in inputFile:
+                fieldsList = strLine.split()
+                if len(fieldsList) >= 2 and fieldsList[0] in keysDict:
+                    memoryDict[keysDict[fieldsList[0]]] = int(fieldsList[1]) * 1024
+    except (IOError, OSError):
+        pass
+    return memoryDict
+
+
+def _measure(function, args, queue):
+    try:
+        startTime = time.time()
+        result = function(*args)
+        queue.put({'result': result, 'seconds': time.time() - startTime,
+                   'peakRSS': getPeakRSS()})
+    except Exception as e:
+        queue.put({'error': str(e)})
+
+
+def _idle():
+    return None
+
+
+def measureInChild(function, *args):
+    """Run 'function(*args)' in a fresh process.
+
+       return a dictionary with the result, the duration
+       in seconds and the peak RSS in bytes of the child
+    """
+    context = multiprocessing.get_context("spawn")
+    resultQueue = context.Queue()
+    process = context.Process(target=_measure, args=(function, args, resultQueue))
+    process.start()
+
+    #The child may be killed, i.e. out of memory
+    measure = None
+    while measure is None:
+        try:
+            measure = resultQueue.get(timeout=1)
+        except queue.Empty:
+            if not process.is_alive() and resultQueue.empty():
+                measure = {}
+    process.join()
+
+    if process.exitcode != 0 and 'error' not in measure:
+        measure['error'] = "Exit code %d" % process.exitcode
+    return measure
+
+
+def getBaselineRSS():
+    """Peak RSS of a child doing nothing, the interpreter
+       and imports overhead.
+    """
+    return measureInChild(_idle)['peakRSS']
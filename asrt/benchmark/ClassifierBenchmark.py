@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import time
+import logging
+
+from asrt.common.ioread import Ioread
+from asrt.common.TextDocument import TextDocument
+from asrt.common.TextCluster import TextCluster
+from asrt.common.ClassifierWord import WordClassifier
+
+
+class ClassifierBenchmark(object):
+    """Sentences per second of the language classifier
+       and agreement with the full classification.
+
+       Configurations are:
+          - full          : all words of a sentence
+          - earlyStopping : until the result is settled
+          - budget        : at most 'maxWords' words
+          - earlyBudget   : both
+          - hierarchical  : input files as one document,
+                            see 'TextDocument.setClassificationMode'
+    """
+    logger = logging.getLogger("Asrt.ClassifierBenchmark")
+
+    FULL            = 'full'
+    EARLYSTOPPING   = 'earlyStopping'
+    BUDGET          = 'budget'
+    EARLYBUDGET     = 'earlyBudget'
+    HIERARCHICAL    = 'hierarchical'
+    CONFIGURATIONS  = [FULL, EARLYSTOPPING, BUDGET, EARLYBUDGET, HIERARCHICAL]
+
+    def __init__(self, filePathsList, classifier=None, maxWords=10):
+        """Default constructor.
+
+           param filePathsList: sentences files, one per line
+           param classifier   : a trained classifier, default to
+                                a newly trained 'WordClassifier'
+           param maxWords     : words budget per sentence
+        """
+        self.filePathsList = filePathsList
+        self.classifier = classifier
+        self.maxWords = maxWords
+
+    #####################
+    #Public interface
+    #
+    def classify(self, sentencesList, earlyStopping, maxWords):
+        """Classify all sentences.
+
+           return the list of labels
+        """
+        self.classifier.setEarlyStopping(earlyStopping)
+        self.classifier.setMaxWords(maxWords)
+        return [self.classifier.classify(s)[0] for s in sentencesList]
+
+    def classifyDocument(self, sentencesList):
+        """Classify all sentences as one document in
+           hierarchical mode.
+
+           return the list of labels and the statistics
+        """
+        self.classifier.setEarlyStopping(False)
+        self.classifier.setMaxWords(None)
+
+        textDocument = TextDocument(None, 0, None, [], None, False, False)
+        textDocument._addSentences(sentencesList, bSplit=False)
+        textDocument.setClassifier(self.classifier)
+        textDocument.setClassificationMode(TextDocument.CLASSIFYHIERARCHICAL)
+        textDocument.classifySentences()
+
+        return [c.getAttribute(TextCluster.LANGUAGE_ATTRIBUTE) for c in
+                textDocument.listContent], textDocument.getClassificationStatistics()
+
+    def run(self, configurationsList=None):
+        """Measure 'configurationsList', default to all.
+
+           return a dictionary of measures per configuration
+        """
+        configurationsList = configurationsList or ClassifierBenchmark.CONFIGURATIONS
+
+        if self.classifier is None:
+            self.classifier = WordClassifier()
+            self.classifier.train()
+
+        io = Ioread()
+        sentencesList = []
+        for filePath in self.filePathsList:
+            for strLine in io.iterLines(filePath):
+                if len(strLine.strip()) > 0:
+                    sentencesList.append(strLine)
+
+        settingsDict = {ClassifierBenchmark.FULL: (False, None),
+                        ClassifierBenchmark.EARLYSTOPPING: (True, None),
+                        ClassifierBenchmark.BUDGET: (False, self.maxWords),
+                        ClassifierBenchmark.EARLYBUDGET: (True, self.maxWords)}
+
+        resultsDict = {'files': self.filePathsList,
+                       'sentences': len(sentencesList),
+                       'maxWords': self.maxWords,
+                       'configurations': {}}
+
+        #Reference labels and duration
+        self.logger.info("Measuring %s" % ClassifierBenchmark.FULL)
+        startTime = time.perf_counter()
+        fullList = self.classify(sentencesList, False, None)
+        fullSeconds = time.perf_counter() - startTime
+
+        for configuration in configurationsList:
+            labelsList, seconds, statisticsDict = fullList, fullSeconds, None
+            if configuration == ClassifierBenchmark.HIERARCHICAL:
+                self.logger.info("Measuring %s" % configuration)
+                startTime = time.perf_counter()
+                labelsList, statisticsDict = self.classifyDocument(sentencesList)
+                seconds = time.perf_counter() - startTime
+            elif configuration != ClassifierBenchmark.FULL:
+                self.logger.info("Measuring %s" % configuration)
+                earlyStopping, maxWords = settingsDict[configuration]
+                startTime = time.perf_counter()
+                labelsList = self.classify(sentencesList, earlyStopping, maxWords)
+                seconds = time.perf_counter() - startTime
+
+            agreed = sum([1 for l, f in zip(labelsList, fullList) if l == f])
+            measureDict = {'seconds': seconds,
+                           'sentencesPerSecond': len(sentencesList) / max(seconds, 1e-9),
+                           'speedup': fullSeconds / max(seconds, 1e-9),
+                           'agreement': agreed / float(max(len(sentencesList), 1))}
+            if statisticsDict is not None:
+                measureDict['classification'] = statisticsDict
+            resultsDict['configurations'][configuration] = measureDict
+            self.logger.info("%s: %.1f sentences/s, speedup %.2f, agreement %.4f" %
+                             (configuration, measureDict['sentencesPerSecond'],
+                              measureDict['speedup'], measureDict['agreement']))
+
+        return resultsDict
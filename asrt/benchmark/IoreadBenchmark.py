@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import os
+import random
+import logging
+
+from asrt.common.ioread import Ioread
+from asrt.benchmark.BenchmarkUtility import measureInChild, getBaselineRSS
+
+
+SENTENCES = ["Le conseil d'administration a approuvé les comptes de l'exercice.",
+             "Die Sitzung wurde um 10 Uhr eröffnet.",
+             "Les données sont disponibles à l'adresse suivante.",
+             "The meeting was adjourned at 5 p.m.",
+             "L'année 2014 a été marquée par une forte croissance (+3,5 %)."]
+
+
+###############
+# Readers, run in a child process
+#
+def _readFileContent(filePath):
+    return len(Ioread().readFileContent(filePath))
+
+
+def _readFileContentList(filePath):
+    return len(Ioread().readFileContentList(filePath))
+
+
+def _nltkRead(filePath):
+    return len(Ioread().nltkRead(filePath))
+
+
+def _iterLines(filePath):
+    return sum(1 for line in Ioread().iterLines(filePath))
+
+
+def _iterParagraphs(filePath):
+    return sum(1 for paragraph in Ioread().iterParagraphs(filePath))
+
+
+def _readLegacy(filePath):
+    """Former 'readFileContent' implementation.
+    """
+    with open(filePath, encoding="utf-8", errors="surrogateescape") as f:
+        return len(f.read())
+
+
+class IoreadBenchmark(object):
+    """Peak RSS and duration of the 'Ioread' readers.
+
+       Every reader runs in its own process so that peak
+       RSS values are independent.
+    """
+    logger = logging.getLogger("Asrt.IoreadBenchmark")
+
+    READERS = {'legacy': _readLegacy,
+               'readFileContent': _readFileContent,
+               'readFileContentList': _readFileContentList,
+               'nltkRead': _nltkRead,
+               'iterLines': _iterLines,
+               'iterParagraphs': _iterParagraphs}
+
+    STREAMINGREADERS = ['iterLines', 'iterParagraphs']
+
+    def __init__(self, filePath):
+        self.filePath = filePath
+
+    def generate(self, size, seed=1):
+        """Write a text file of about 'size' bytes, with
+           paragraphs and non ascii characters.
+        """
+        self.logger.info("Generating %d bytes into %s" % (size, self.filePath))
+
+        rand = random.Random(seed)
+        blocksList = []
+        for i in range(1000):
+            linesList = [rand.choice(SENTENCES) for j in range(rand.randint(1, 8))]
+            blocksList.append("\n".join(linesList) + "\n\n")
+        block = "".join(blocksList).encode('utf-8')
+
+        with open(self.filePath, 'wb') as f:
+            written = 0
+            while written < size:
+                f.write(block)
+                written += len(block)
+
+    def run(self, readersList=None):
+        """Measure 'readersList', default to all readers.
+
+           return a dictionary of measures per reader
+        """
+        readersList = readersList or sorted(IoreadBenchmark.READERS.keys())
+
+        resultsDict = {'file': self.filePath,
+                       'size': os.path.getsize(self.filePath),
+                       'baselineRSS': getBaselineRSS(),
+                       'readers': {}}
+
+        for reader in readersList:
+            self.logger.info("Measuring %s" % reader)
+            measure = measureInChild(IoreadBenchmark.READERS[reader], self.filePath)
+            resultsDict['readers'][reader] = measure
+            if 'error' in measure:
+                self.logger.critical("%s failed: %s" % (reader, measure['error']))
+            else:
+                self.logger.info("%s: %.2f s, peak RSS %.1f MB" %
+                                 (reader, measure['seconds'],
+                                  measure['peakRSS'] / 1048576.0))
+
+        return resultsDict
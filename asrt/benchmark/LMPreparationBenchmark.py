@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import time
+import logging
+
+from asrt.common.ioread import Ioread
+from asrt.common.WordCache import WordCache
+from asrt.common.formula.FormulaLMPreparation import LMPreparationFormula
+
+
+class LMPreparationBenchmark(object):
+    """Sentences per second of 'LMPreparationFormula'.
+
+       Input files hold one sentence per line. The word
+       cache is measured disabled and enabled, a fresh
+       cache being used for each run.
+    """
+    logger = logging.getLogger("Asrt.LMPreparationBenchmark")
+
+    NOCACHE         = 'noCache'
+    WORDCACHE       = 'wordCache'
+    CONFIGURATIONS  = [NOCACHE, WORDCACHE]
+
+    def __init__(self, filePathsList, languageId=0, expandNumberInWords=True):
+        """Default constructor.
+
+           param filePathsList      : sentences files
+           param languageId         : language of the sentences
+           param expandNumberInWords: formula setting
+        """
+        self.filePathsList = filePathsList
+        self.languageId = languageId
+        self.expandNumberInWords = expandNumberInWords
+
+    #####################
+    #Public interface
+    #
+    def prepare(self, sentencesList, wordCache=None):
+        """Prepare all sentences with a new formula.
+
+           param wordCache: the 'WordCache' of the formula,
+                            None to disable
+
+           return the list of prepared sentences
+        """
+        formula = LMPreparationFormula()
+        formula.setWordCache(wordCache)
+        formula.setExpandNumberInWords(self.expandNumberInWords)
+        formula.setLanguageId(self.languageId)
+
+        resultsList = []
+        for strSentence in sentencesList:
+            formula.setText(strSentence)
+            resultsList.append(formula.prepareText())
+        return resultsList
+
+    def run(self, configurationsList=None):
+        """Measure 'configurationsList', default to all.
+
+           return a dictionary of measures per configuration
+        """
+        configurationsList = configurationsList or LMPreparationBenchmark.CONFIGURATIONS
+
+        io = Ioread()
+        sentencesList = []
+        for filePath in self.filePathsList:
+            for strLine in io.iterLines(filePath):
+                if len(strLine.strip()) > 0:
+                    sentencesList.append(strLine)
+
+        resultsDict = {'files': self.filePathsList,
+                       'languageId': self.languageId,
+                       'sentences': len(sentencesList),
+                       'configurations': {}}
+
+        for configuration in configurationsList:
+            wordCache = None
+            if configuration == LMPreparationBenchmark.WORDCACHE:
+                wordCache = WordCache()
+
+            self.logger.info("Measuring %s" % configuration)
+            startTime = time.perf_counter()
+            self.prepare(sentencesList, wordCache)
+            seconds = time.perf_counter() - startTime
+
+            measureDict = {'seconds': seconds,
+                           'sentencesPerSecond': len(sentencesList) / max(seconds, 1e-9)}
+            if wordCache is not None:
+                measureDict['wordCache'] = wordCache.getStageStatistics()
+            resultsDict['configurations'][configuration] = measureDict
+            self.logger.info("%s: %.1f sentences/s" %
+                             (configuration, measureDict['sentencesPerSecond']))
+
+        return resultsDict
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import os
+import sys
+import time
+import logging
+import platform
+import tempfile
+
+from asrt.common.Classifier import LanguageClassifier, _iterSentences
+from asrt.common.ClassifierWord import WordClassifier
+from asrt.common.ClassifierCharNgram import CharNgramClassifier
+from asrt.common.ClassifierModelStore import ClassifierModelStore
+from asrt.config.AsrtConfig import UNKNOWN_LABEL
+
+
+class LanguageIdBenchmark(object):
+    """Accuracy and throughput of language classifiers
+       on held out labelled sentences.
+
+       The test set is made of the europarl_raw files held
+       out from training, see 'LanguageClassifier.getEuroparlSplit',
+       and of the user labelled sentences files. Classifiers
+       are trained on the other europarl_raw files, on user
+       training files or loaded from model files.
+
+       Configurations are:
+          - words          : 'WordClassifier', words naive Bayes
+          - wordsEarlyStop : with early stopping
+          - wordsBudget    : at most 'maxWords' words per sentence
+          - wordsMapped    : the words model mapped in memory,
+                             see 'MappedNaiveBayes'
+          - ngrams         : 'CharNgramClassifier', character n-grams
+
+       Other 'LanguageClassifier' implementations or settings
+       are measured once added, see 'addConfiguration'.
+    """
+    logger = logging.getLogger("Asrt.LanguageIdBenchmark")
+
+    WORDS           = 'words'
+    WORDSEARLYSTOP  = 'wordsEarlyStop'
+    WORDSBUDGET     = 'wordsBudget'
+    WORDSMAPPED     = 'wordsMapped'
+    NGRAMS          = 'ngrams'
+    CONFIGURATIONS  = [WORDS, WORDSEARLYSTOP, WORDSBUDGET, WORDSMAPPED, NGRAMS]
+
+    EUROPARL        = 'europarl'
+
+    def __init__(self, filePathsList=[], europarl=True, trainFilePathsList=None,
+                 heldOutEvery=10, maxSentences=None, maxWords=10,
+                 wordModelFile=None, ngramModelFile=None, workers=1):
+        """Default constructor.
+
+           param filePathsList     : labelled test sentences files, see
+                                     'LanguageClassifier.readLabelledFiles'
+           param europarl          : test on the held out europarl_raw files
+           param trainFilePathsList: labelled training sentences files,
+                                     default to the other europarl_raw files
+           param heldOutEvery      : one europarl_raw file in 'heldOutEvery'
+                                     is held out
+           param maxSentences      : test sentences per label and source,
+                                     default to all
+           param maxWords          : words budget of 'wordsBudget'
+           param wordModelFile     : words model file or model store,
+                                     trained otherwise
+           param ngramModelFile    : character n-grams model file,
+                                     trained otherwise
+           param workers           : words training processes
+        """
+        self.filePathsList = filePathsList
+        self.europarl = europarl
+        self.trainFilePathsList = trainFilePathsList
+        self.heldOutEvery = heldOutEvery
+        self.maxSentences = maxSentences
+        self.maxWords = maxWords
+        self.wordModelFile = wordModelFile
+        self.ngramModelFile = ngramModelFile
+        self.workers = workers
+
+        self.factoriesDict = {
+            LanguageIdBenchmark.WORDS: lambda: self.getWordClassifier(),
+            LanguageIdBenchmark.WORDSEARLYSTOP: lambda: self.getWordClassifier(earlyStopping=True),
+            LanguageIdBenchmark.WORDSBUDGET: lambda: self.getWordClassifier(maxWords=self.maxWords),
+            LanguageIdBenchmark.WORDSMAPPED: lambda: self.getWordClassifier(mapped=True),
+            LanguageIdBenchmark.NGRAMS: self.getNgramClassifier}
+
+        self.wordModel = None
+        self.trainSecondsDict = {}
+        self.labelledList = None
+
+    #####################
+    #Public interface
+    #
+    def addConfiguration(self, configuration, factory):
+        """Measure the classifier returned by 'factory',
+           timed as its load time.
+
+           param factory: a function without arguments
+                          returning a ready classifier
+        """
+        self.factoriesDict[configuration] = factory
+
+    def getConfigurations(self):
+        return LanguageIdBenchmark.CONFIGURATIONS + \
+            sorted(set(self.factoriesDict.keys()) - set(LanguageIdBenchmark.CONFIGURATIONS))
+
+    def getWordClassifier(self, earlyStopping=False, maxWords=None, mapped=False):
+        """A 'WordClassifier' with the given settings, on
+           the model file or on the trained model.
+        """
+        classifier = WordClassifier()
+        if self.wordModelFile is not None and os.path.isdir(self.wordModelFile):
+            classifier = ClassifierModelStore(self.wordModelFile).getClassifier()
+        elif self.wordModelFile is not None:
+            classifier.loadModel(self.wordModelFile)
+        elif mapped:
+            classifier.loadModel(self._getMappedModelFile())
+        else:
+            classifier.classifier = self._getWordModel()
+
+        classifier.setEarlyStopping(earlyStopping)
+        classifier.setMaxWords(maxWords)
+        return classifier
+
+    def getNgramClassifier(self):
+        """A 'CharNgramClassifier' of the model file or
+           trained.
+        """
+        if self.ngramModelFile is not None:
+            return CharNgramClassifier.load(self.ngramModelFile)
+
+        classifier = CharNgramClassifier()
+        startTime = time.perf_counter()
+        classifier.trainFromSources(self.getTrainSources())
+        self.trainSecondsDict[LanguageIdBenchmark.NGRAMS] = time.perf_counter() - startTime
+        return classifier
+
+    def getTrainSources(self):
+        """Training sources, the user training files or the
+           europarl_raw files not held out.
+
+           return a list of (label, source), see
+                  'LanguageClassifier.trainFromSources'
+        """
+        if self.trainFilePathsList:
+            return LanguageClassifier.readLabelledSources(self.trainFilePathsList)
+        return LanguageClassifier.getEuroparlSplit(self.heldOutEvery)[0]
+
+    def getTestSentences(self):
+        """Held out europarl_raw sentences and user
+           labelled sentences, read once.
+
+           return a list of (label, sentence, source name)
+        """
+        if self.labelledList is not None:
+            return self.labelledList
+
+        self.labelledList = []
+        if self.europarl:
+            for label, source in LanguageClassifier.getEuroparlSplit(self.heldOutEvery)[1]:
+                self.labelledList.extend([(label, " ".join(w), LanguageIdBenchmark.EUROPARL)
+                                          for w in self._limit(_iterSentences(source))])
+
+        for filePath in self.filePathsList:
+            sentencesDict = {}
+            for label, strSentence in LanguageClassifier.readLabelledFiles([filePath]):
+                sentencesDict.setdefault(label, []).append(strSentence)
+            for label, sentencesList in sorted(sentencesDict.items()):
+                self.labelledList.extend([(label, s, filePath)
+                                          for s in self._limit(sentencesList)])
+
+        return self.labelledList
+
+    def run(self, configurationsList=None):
+        """Measure 'configurationsList', default to all.
+
+           return a dictionary of measures per configuration
+        """
+        configurationsList = configurationsList or self.getConfigurations()
+
+        labelledList = self.getTestSentences()
+        if len(labelledList) == 0:
+            raise Exception("No test sentences")
+
+        resultsDict = {'date': time.strftime("%Y-%m-%d %H:%M:%S"),
+                       'python': sys.version.split()[0],
+                       'platform': platform.platform(),
+                       'files': self.filePathsList,
+                       'europarl': self.europarl,
+                       'trainFiles': self.trainFilePathsList,
+                       'heldOutEvery': self.heldOutEvery,
+                       'sentences': len(labelledList),
+                       'sources': self._getCounts([t for l, s, t in labelledList]),
+                       'configurations': {}}
+
+        with tempfile.TemporaryDirectory() as self.tempDir:
+            for configuration in configurationsList:
+                self.logger.info("Preparing %s" % configuration)
+                trainSeconds = sum(self.trainSecondsDict.values())
+                startTime = time.perf_counter()
+                classifier = self.factoriesDict[configuration]()
+                #Training is reported apart
+                loadSeconds = time.perf_counter() - startTime - \
+                    (sum(self.trainSecondsDict.values()) - trainSeconds)
+
+                self.logger.info("Measuring %s" % configuration)
+                startTime = time.perf_counter()
+                predictedList = [classifier.classify(s)[0] for l, s, t in labelledList]
+                seconds = time.perf_counter() - startTime
+
+                measureDict = {'loadSeconds': loadSeconds, 'seconds': seconds,
+                               'sentencesPerSecond': len(labelledList) / max(seconds, 1e-9)}
+                measureDict.update(LanguageIdBenchmark.getMetrics(
+                    [l for l, s, t in labelledList], predictedList))
+                resultsDict['configurations'][configuration] = measureDict
+                self.logger.info("%s: %.1f sentences/s, accuracy %.4f, unknown %.4f, load %.3f s" %
+                                 (configuration, measureDict['sentencesPerSecond'],
+                                  measureDict['accuracy'], measureDict['unknown'], loadSeconds))
+
+        wordsDict = resultsDict['configurations'].get(LanguageIdBenchmark.WORDS)
+        for configuration, measureDict in resultsDict['configurations'].items():
+            if wordsDict is not None:
+                measureDict['speedup'] = wordsDict['seconds'] / max(measureDict['seconds'], 1e-9)
+
+        resultsDict['trainSeconds'] = dict(self.trainSecondsDict)
+        return resultsDict
+
+    #####################
+    #Static methods
+    #
+    @staticmethod
+    def getMetrics(labelsList, predictedList):
+        """Accuracy, unknown rate and per label precision,
+           recall and F1, unknown results are counted as
+           errors.
+
+           return a dictionary of metrics, the ones of a
+                  label are None without sentences
+        """
+        total = float(max(len(labelsList), 1))
+        correct = sum([l == p for l, p in zip(labelsList, predictedList)])
+
+        perLabelDict, confusionDict = {}, {}
+        for label, predicted in zip(labelsList, predictedList):
+            countsDict = confusionDict.setdefault(label, {})
+            countsDict[predicted] = countsDict.get(predicted, 0) + 1
+
+        for label in sorted((set(labelsList) | set(predictedList)) - set([UNKNOWN_LABEL])):
+            truePositives = confusionDict.get(label, {}).get(label, 0)
+            support = sum(confusionDict.get(label, {}).values())
+            predictedCount = predictedList.count(label)
+
+            precision = truePositives / float(predictedCount) if predictedCount > 0 else None
+            recall = truePositives / float(support) if support > 0 else None
+            f1 = None
+            if precision is not None and recall is not None:
+                f1 = 2 * precision * recall / (precision + recall) if truePositives > 0 else 0.0
+            unknown = confusionDict.get(label, {}).get(UNKNOWN_LABEL, 0) / float(support) \
+                if support > 0 else None
+
+            perLabelDict[label] = {'precision': precision, 'recall': recall, 'f1': f1,
+                                   'unknown': unknown, 'sentences': support}
+
+        return {'accuracy': correct / total,
+                'unknown': predictedList.count(UNKNOWN_LABEL) / total,
+                'labels': perLabelDict,
+                'confusion': confusionDict}
+
+    #####################
+    #Implementation
+    #
+    def _getWordModel(self):
+        """Words model trained once on the training
+           sources.
+        """
+        if self.wordModel is None:
+            classifier = WordClassifier()
+            startTime = time.perf_counter()
+            classifier.trainFromSources(self.getTrainSources(), self.workers)
+            classifier.setUniformPriors()
+            self.trainSecondsDict[LanguageIdBenchmark.WORDS] = time.perf_counter() - startTime
+            self.wordModel = classifier.classifier
+        return self.wordModel
+
+    def _getMappedModelFile(self):
+        """Trained words model exported once, the export
+           is reported as training.
+        """
+        modelFile = self.tempDir + os.sep + "words.map"
+        if not os.path.exists(modelFile):
+            classifier = WordClassifier()
+            classifier.classifier = self._getWordModel()
+            startTime = time.perf_counter()
+            classifier.exportModel(modelFile)
+            self.trainSecondsDict[LanguageIdBenchmark.WORDSMAPPED] = time.perf_counter() - startTime
+        return modelFile
+
+    def _limit(self, iterable):
+        """At most 'maxSentences' items of 'iterable'.
+        """
+        itemsList = []
+        for item in iterable:
+            if self.maxSentences is not None and len(itemsList) >= self.maxSentences:
+                break
+            itemsList.append(item)
+        return itemsList
+
+    def _getCounts(self, itemsList):
+        countsDict = {}
+        for item in itemsList:
+            countsDict[item] = countsDict.get(item, 0) + 1
+        return countsDict
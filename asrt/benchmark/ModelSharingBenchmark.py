@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import os
+import time
+import pickle
+import logging
+import tempfile
+import multiprocessing
+
+from asrt.common.ClassifierWord import WordClassifier
+from asrt.benchmark.BenchmarkUtility import measureInChild, getMemory
+
+
+###############
+# Workers, forked from a child process
+#
+def _classifyInWorker(classifier, sentencesList, barrier, resultQueue):
+    """Classify 'sentencesList', memory is measured
+       while all workers are alive.
+    """
+    barrier.wait()
+    beforeDict = getMemory()
+    startTime = time.time()
+    for strSentence in sentencesList:
+        classifier.classify(strSentence)
+    seconds = time.time() - startTime
+    barrier.wait()
+    afterDict = getMemory()
+    resultQueue.put({'before': beforeDict, 'after': afterDict, 'seconds': seconds})
+    barrier.wait()
+
+
+def _share(modelFile, mapped, workers, sentencesList):
+    """Load the model and fork 'workers' classifying
+       processes.
+
+       return the memory of the parent and of the workers
+    """
+    classifier = WordClassifier()
+    if mapped:
+        classifier.loadModel(modelFile)
+    else:
+        with open(modelFile, 'rb') as inputFile:
+            classifier.classifier = pickle.load(inputFile)
+    parentDict = getMemory()
+
+    context = multiprocessing.get_context("fork")
+    barrier, resultQueue = context.Barrier(workers), context.Queue()
+    processesList = [context.Process(target=_classifyInWorker,
+                                     args=(classifier, sentencesList, barrier, resultQueue))
+                     for i in range(workers)]
+    for process in processesList:
+        process.start()
+    workersList = [resultQueue.get() for process in processesList]
+    for process in processesList:
+        process.join()
+
+    return {'parent': parentDict, 'workers': workersList}
+
+
+class ModelSharingBenchmark(object):
+    """Memory of worker processes sharing the words
+       classifier model.
+
+       The model is loaded in a parent process which forks
+       the workers. Memory is reported before and after the
+       workers classify the sentences. Configurations are:
+          - nltk   : the 'nltk.NaiveBayesClassifier' objects,
+                     shared copy on write until touched
+          - mapped : the flat model file mapped in memory,
+                     see 'MappedNaiveBayes'
+    """
+    logger = logging.getLogger("Asrt.ModelSharingBenchmark")
+
+    NLTK            = 'nltk'
+    MAPPED          = 'mapped'
+    CONFIGURATIONS  = [NLTK, MAPPED]
+
+    def __init__(self, filePathsList, classifier=None):
+        """Default constructor.
+
+           param filePathsList: labelled sentences files, see
+                                'LanguageClassifier.readLabelledFiles',
+                                classified by the workers
+           param classifier   : a trained 'LanguageClassifier',
+                                default to a 'WordClassifier'
+                                trained on the sentences
+        """
+        self.filePathsList = filePathsList
+        self.classifier = classifier
+
+    #####################
+    #Public interface
+    #
+    def run(self, workers=4, configurationsList=None):
+        """Measure 'configurationsList', default to all.
+
+           return a dictionary of measures per configuration
+        """
+        configurationsList = configurationsList or ModelSharingBenchmark.CONFIGURATIONS
+
+        sentencesList = [s for l, s in WordClassifier.readLabelledFiles(self.filePathsList)]
+
+        if self.classifier is None:
+            self.classifier = WordClassifier()
+            self.classifier.trainFromSources(
+                WordClassifier.readLabelledSources(self.filePathsList))
+            self.classifier.setUniformPriors()
+
+        resultsDict = {'files': self.filePathsList, 'sentences': len(sentencesList),
+                       'workers': workers, 'configurations': {}}
+
+        with tempfile.TemporaryDirectory() as tempDir:
+            modelsDict = {ModelSharingBenchmark.NLTK: tempDir + os.sep + "model.pickle",
+                          ModelSharingBenchmark.MAPPED: tempDir + os.sep + "model.map"}
+            with open(modelsDict[ModelSharingBenchmark.NLTK], 'wb') as outputFile:
+                pickle.dump(self.classifier.classifier, outputFile)
+            self.classifier.exportModel(modelsDict[ModelSharingBenchmark.MAPPED])
+
+            for configuration in configurationsList:
+                self.logger.info("Measuring %s" % configuration)
+                measure = measureInChild(_share, modelsDict[configuration],
+                                         configuration == ModelSharingBenchmark.MAPPED,
+                                         workers, sentencesList)
+                measure['modelFileSize'] = os.path.getsize(modelsDict[configuration])
+                resultsDict['configurations'][configuration] = measure
+
+                if 'error' in measure:
+                    self.logger.critical("%s failed: %s" % (configuration, measure['error']))
+                    continue
+
+                shareDict = measure.pop('result')
+                measure['parent'] = shareDict['parent']
+                measure['workers'] = shareDict['workers']
+                for key in ['rss', 'pss', 'privateDirty']:
+                    for moment in ['before', 'after']:
+                        valuesList = [w[moment].get(key, 0) for w in shareDict['workers']]
+                        measure['%s%s' % (key, moment.capitalize())] = \
+                            sum(valuesList) / float(max(len(valuesList), 1))
+                self.logger.info("%s: per worker pss %.1f -> %.1f MB, private dirty %.1f -> %.1f MB" %
+                                 (configuration, measure['pssBefore'] / 1048576.0,
+                                  measure['pssAfter'] / 1048576.0,
+                                  measure['privateDirtyBefore'] / 1048576.0,
+                                  measure['privateDirtyAfter'] / 1048576.0))
+
+        return resultsDict
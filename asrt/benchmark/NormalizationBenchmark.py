@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import os
+import time
+import logging
+
+from asrt.common.ioread import Ioread
+from asrt.common.TextDocument import TextDocument
+from asrt.common.RegularExpressionList import RegexList
+from asrt.common.formula.FormulaRegularExpression import RegularExpressionFormula
+from asrt.benchmark.BenchmarkUtility import measureInChild, getBaselineRSS, getPeakRSS
+
+
+###############
+# Normalization, run in a child process
+#
+def _normalize(filePathsList, languagesList, regexFile, workers, batchSize):
+    """Load the sentences, assign languages in turn and
+       apply the user regular expressions.
+
+       return a dictionary with the number of sentences, the
+              duration of the stage and the peak RSS before it
+    """
+    formula = RegularExpressionFormula(None, RegexList.loadFromFile(regexFile))
+
+    io = Ioread()
+    textDocument = TextDocument(None, languagesList[0], formula, [], None, False, False)
+    for filePath in filePathsList:
+        for strLine in io.iterLines(filePath):
+            textDocument._addClusterText(strLine, 0)
+
+    for i, textCluster in enumerate(textDocument.listContent):
+        textCluster.setLanguage(languagesList[i % len(languagesList)])
+
+    loadPeakRSS = getPeakRSS()
+    startTime = time.time()
+    textDocument.setParallelNormalization(workers, batchSize)
+    textDocument.normalizeTextSentences()
+
+    return {'sentences': len(textDocument.listContent),
+            'seconds': time.time() - startTime,
+            'loadPeakRSS': loadPeakRSS}
+
+
+class NormalizationBenchmark(object):
+    """Peak memory and throughput of the user regular
+       expressions stage, 'TextDocument.normalizeTextSentences'.
+
+       The stage duration and its peak memory above the
+       loaded document are reported. Configurations are:
+          - joined  : all sentences of a language at once,
+                      the former implementation
+          - batched : bounded batches in one process
+          - parallel: bounded batches in a pool of workers
+    """
+    logger = logging.getLogger("Asrt.NormalizationBenchmark")
+
+    JOINED          = 'joined'
+    BATCHED         = 'batched'
+    PARALLEL        = 'parallel'
+    CONFIGURATIONS  = [JOINED, BATCHED, PARALLEL]
+
+    def __init__(self, filePathsList, regexFile, languagesList=[1, 2, 3]):
+        """Default constructor.
+
+           param filePathsList: sentences files, one per line
+           param regexFile    : user regular expressions file
+           param languagesList: languages given in turn to
+                                the sentences
+        """
+        self.filePathsList = filePathsList
+        self.regexFile = regexFile
+        self.languagesList = languagesList
+
+    #####################
+    #Public interface
+    #
+    def run(self, workers=2, batchSize=None, configurationsList=None):
+        """Measure 'configurationsList', default to all.
+
+           return a dictionary of measures per configuration
+        """
+        configurationsList = configurationsList or NormalizationBenchmark.CONFIGURATIONS
+        batchSize = batchSize or TextDocument.NORMALIZATIONBATCHSIZE
+
+        settingsDict = {NormalizationBenchmark.JOINED: (1, 0),
+                        NormalizationBenchmark.BATCHED: (1, batchSize),
+                        NormalizationBenchmark.PARALLEL: (workers, batchSize)}
+
+        resultsDict = {'files': self.filePathsList,
+                       'size': sum([os.path.getsize(f) for f in self.filePathsList]),
+                       'regexFile': self.regexFile,
+                       'languages': self.languagesList,
+                       'baselineRSS': getBaselineRSS(),
+                       'configurations': {}}
+
+        for configuration in configurationsList:
+            configurationWorkers, configurationBatchSize = settingsDict[configuration]
+            self.logger.info("Measuring %s" % configuration)
+            measure = measureInChild(_normalize, self.filePathsList, self.languagesList,
+                                     self.regexFile, configurationWorkers,
+                                     configurationBatchSize)
+            measure['workers'] = configurationWorkers
+            measure['batchSize'] = configurationBatchSize
+            resultsDict['configurations'][configuration] = measure
+
+            if 'error' in measure:
+                self.logger.critical("%s failed: %s" % (configuration, measure['error']))
+            else:
+                stageDict = measure.pop('result')
+                measure['sentences'] = stageDict['sentences']
+                measure['stageSeconds'] = stageDict['seconds']
+                measure['stagePeakRSS'] = measure['peakRSS'] - stageDict['loadPeakRSS']
+                measure['sentencesPerSecond'] = stageDict['sentences'] / \
+                    max(stageDict['seconds'], 1e-9)
+                self.logger.info("%s: %.1f sentences/s, stage peak RSS %.1f MB" %
+                                 (configuration, measure['sentencesPerSecond'],
+                                  measure['stagePeakRSS'] / 1048576.0))
+
+        return resultsDict
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import time
+import hashlib
+import logging
+
+from asrt.common.ioread import Ioread
+from asrt.common.RegularExpressionList import RegexList
+from asrt.common.RegularExpressionBundle import RegexBundle
+from asrt.common.RegularExpressionBackend import RegexEngine
+from asrt.common.formula.FormulaRegularExpression import RegularExpressionFormula, RegexRule
+from asrt.common.formula.FormulaLMPreparation import LMPreparationFormula
+from asrt.benchmark.BenchmarkUtility import measureInChild
+
+#Quadratic with backtracking: each start position
+#scans the rest of a line without spaces
+ADVERSARIALPATTERN = "[a-z]*QQQ"
+
+
+###############
+# Matching, run in a child process
+#
+def _match(backendName, regexFile, sentencesList, languageId, adversarialLength):
+    """Apply the user rules and the lm preparation to
+       'sentencesList' with 'backendName'.
+
+       return a dictionary of durations and output digests
+    """
+    regexEngine = RegexEngine(backendName)
+    if regexEngine.getBackendName() != backendName:
+        return {'available': False}
+
+    resultDict = {'available': True}
+    if regexFile is not None:
+        regexBundle = RegexBundle.load(regexFile)
+        formula = RegularExpressionFormula(None, [r for r in regexBundle.getRegexList()
+                                                  if int(r[RegexList.TYPEINDICE]) != -1])
+        formula.setRules(regexBundle.getRules())
+        formula.setRegexEngine(regexEngine)
+
+        startTime = time.time()
+        for rule in formula.getLanguageRules(languageId):
+            rule.compile(regexEngine)
+        resultDict['compileSeconds'] = time.time() - startTime
+
+        startTime = time.time()
+        outputList = [formula.apply(s, languageId) for s in sentencesList]
+        resultDict['rulesSeconds'] = time.time() - startTime
+        resultDict['rulesDigest'] = _getDigest(outputList)
+
+    #Sentences the lm preparation fails on are counted
+    lmFormula, outputList, resultDict['lmErrors'] = LMPreparationFormula(), [], 0
+    lmFormula.setRegexEngine(regexEngine)
+    startTime = time.time()
+    for strSentence in sentencesList:
+        try:
+            outputList.append(lmFormula.prepare(strSentence, languageId))
+        except Exception as e:
+            outputList.append("%s: %s" % (type(e).__name__, e))
+            resultDict['lmErrors'] += 1
+    resultDict['lmSeconds'] = time.time() - startTime
+    resultDict['lmDigest'] = _getDigest(outputList)
+
+    if adversarialLength > 0:
+        rule = RegexRule(ADVERSARIALPATTERN, "", 0)
+        startTime = time.time()
+        rule.sub("a" * adversarialLength, regexEngine)
+        resultDict['adversarialSeconds'] = time.time() - startTime
+
+    resultDict.update(regexEngine.getStatistics())
+    return resultDict
+
+
+def _getDigest(outputList):
+    return hashlib.sha256("\n".join(outputList).encode('utf-8')).hexdigest()
+
+
+class RegexBackendBenchmark(object):
+    """Throughput of the regular expressions backends,
+       see 'RegexEngine', in a new process per backend.
+
+       For each backend are measured the user rules, the
+       lm preparation and one line of 'adversarialLength'
+       characters without spaces matched by a pattern that
+       backtracks. Outputs are compared to the ones of 're'.
+       Backends that are not installed are reported as not
+       available.
+    """
+    logger = logging.getLogger("Asrt.RegexBackendBenchmark")
+
+    CONFIGURATIONS  = RegexEngine.getBackendNames()
+
+    def __init__(self, filePathsList, regexFile=None, languageId=1, adversarialLength=20000):
+        """Default constructor.
+
+           param filePathsList    : sentences files, one per line
+           param regexFile        : user regular expressions file
+           param languageId       : language of the sentences
+           param adversarialLength: characters of the adversarial
+                                    line, 0 to disable
+        """
+        self.filePathsList = filePathsList
+        self.regexFile = regexFile
+        self.languageId = languageId
+        self.adversarialLength = adversarialLength
+
+    #####################
+    #Public interface
+    #
+    def run(self, configurationsList=None):
+        """Measure 'configurationsList', default to all
+           backends, 're' is always measured first.
+
+           return a dictionary of measures per backend
+        """
+        configurationsList = [RegexEngine.DEFAULT] + \
+            [c for c in configurationsList or RegexBackendBenchmark.CONFIGURATIONS
+             if c != RegexEngine.DEFAULT]
+
+        io = Ioread()
+        sentencesList = []
+        for filePath in self.filePathsList:
+            sentencesList.extend([l.strip() for l in io.iterLines(filePath)])
+
+        resultsDict = {'files': self.filePathsList, 'sentences': len(sentencesList),
+                       'regexFile': self.regexFile, 'languageId': self.languageId,
+                       'adversarialLength': self.adversarialLength,
+                       'configurations': {}}
+
+        referenceDict = None
+        for configuration in configurationsList:
+            self.logger.info("Measuring %s" % configuration)
+            measure = measureInChild(_match, configuration, self.regexFile, sentencesList,
+                                     self.languageId, self.adversarialLength)
+            resultsDict['configurations'][configuration] = measure
+
+            if 'error' in measure:
+                self.logger.critical("%s failed: %s" % (configuration, measure['error']))
+                continue
+
+            measure.update(measure.pop('result'))
+            if not measure['available']:
+                self.logger.info("%s: not installed" % configuration)
+                continue
+
+            referenceDict = referenceDict or measure
+            for stage in ['rules', 'lm']:
+                if stage + 'Seconds' not in measure:
+                    continue
+                measure[stage + 'SentencesPerSecond'] = len(sentencesList) / \
+                    max(measure[stage + 'Seconds'], 1e-9)
+                measure[stage + 'EqualToRe'] = \
+                    measure[stage + 'Digest'] == referenceDict[stage + 'Digest']
+
+            self.logger.info("%s: rules %.1f, lm %.1f sentences/s, adversarial %.3f s, " \
+                             "%d of %d patterns with re" %
+                             (configuration, measure.get('rulesSentencesPerSecond', 0),
+                              measure['lmSentencesPerSecond'],
+                              measure.get('adversarialSeconds', 0),
+                              measure['fallbacks'], measure['patterns']))
+
+        return resultsDict
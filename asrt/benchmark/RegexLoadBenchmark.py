@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import os
+import time
+import random
+import shutil
+import logging
+import tempfile
+
+from asrt.common.ioread import Ioread
+from asrt.common.RegularExpressionList import RegexList
+from asrt.common.RegularExpressionBundle import RegexBundle
+from asrt.common.formula.FormulaRegularExpression import RegularExpressionFormula
+from asrt.benchmark.BenchmarkUtility import measureInChild
+
+WORDS = ["maison", "Haus", "house", "casa", "voiture", "Wagen", "car", "macchina",
+         "rouge", "rot", "red", "rosso", "grand", "gross", "big", "grande",
+         "Strasse", "rue", "street", "via", "Herr", "monsieur", "mister", "signore"]
+
+
+###############
+# Loading, run in a child process
+#
+def _load(configuration, regexFile, sentencesList, languageId):
+    """Load the rules and normalize 'sentencesList'.
+
+       return a dictionary with the load duration, the
+              duration of the first sentence and of all
+    """
+    startTime = time.time()
+    if configuration == RegexLoadBenchmark.FORMER:
+        substitutionList = [r for r in RegexList.loadFromFile(regexFile)
+                            if int(r[RegexList.TYPEINDICE]) != -1]
+        applyFunction = lambda s: RegularExpressionFormula.applyRegularExpressions(
+            s, substitutionList, languageId)
+    else:
+        regexBundle = RegexBundle.load(regexFile)
+        formula = RegularExpressionFormula(None, [r for r in regexBundle.getRegexList()
+                                                  if int(r[RegexList.TYPEINDICE]) != -1])
+        formula.setRules(regexBundle.getRules())
+        applyFunction = lambda s: formula.apply(s, languageId)
+    loadSeconds = time.time() - startTime
+
+    applyStartTime = time.time()
+    firstSeconds = None
+    for strSentence in sentencesList:
+        applyFunction(strSentence)
+        if firstSeconds is None:
+            firstSeconds = time.time() - applyStartTime
+
+    return {'loadSeconds': loadSeconds, 'firstSentenceSeconds': firstSeconds,
+            'applySeconds': time.time() - applyStartTime}
+
+
+class RegexLoadBenchmark(object):
+    """Load time of the user regular expressions and
+       normalization throughput, in a new process.
+
+       Configurations are:
+          - former : csv rows expanded on each application,
+                     the former implementation
+          - csv    : csv rows expanded once into rules
+          - bundle : rules of the compiled bundle, see
+                     'RegexBundle'
+    """
+    logger = logging.getLogger("Asrt.RegexLoadBenchmark")
+
+    FORMER          = 'former'
+    CSV             = 'csv'
+    BUNDLE          = 'bundle'
+    CONFIGURATIONS  = [FORMER, CSV, BUNDLE]
+
+    def __init__(self, filePathsList, regexFile, languageId=1):
+        """Default constructor.
+
+           param filePathsList: sentences files, one per line
+           param regexFile    : user regular expressions file
+           param languageId   : language of the sentences
+        """
+        self.filePathsList = filePathsList
+        self.regexFile = regexFile
+        self.languageId = languageId
+
+    #####################
+    #Public interface
+    #
+    def generate(self, rulesCount, seed=1):
+        """Write a regular expressions file of 'rulesCount'
+           rules of all types and languages.
+        """
+        self.logger.info("Generating %d rules into %s" % (rulesCount, self.regexFile))
+
+        rand = random.Random(seed)
+        linesList = ["regexPatternString\tregexPatternAlternate\tregexPatternType_id\t" +
+                     "Language\tregexPatternComment"]
+        for i in range(rulesCount):
+            word, other = rand.choice(WORDS), rand.choice(WORDS)
+            languageId = rand.choice([0, 1, 2, 3, 4])
+            kind = i % 10
+            if kind == 0:
+                linesList.append("%s%d[0-9]+\t\t-1\t%d\t" % (word, i, languageId))
+            elif kind == 1:
+                linesList.append("([0-9]+)%s%d\t\\g<1> %s\t1\t%d\t" % (word, i, other, languageId))
+            elif kind == 2:
+                linesList.append("%s%d\tlambda m: m.group(0).upper()\t1\t%d\t" %
+                                 (word, i, languageId))
+            else:
+                linesList.append("%s%d\t%s\t%d\t%d\t" %
+                                 (word, i, other, rand.randint(2, 6), languageId))
+
+        with open(self.regexFile, 'w', encoding='utf-8') as outputFile:
+            outputFile.write("\n".join(linesList) + "\n")
+
+    def run(self, configurationsList=None):
+        """Measure 'configurationsList', default to all.
+
+           return a dictionary of measures per configuration
+        """
+        configurationsList = configurationsList or RegexLoadBenchmark.CONFIGURATIONS
+
+        io = Ioread()
+        sentencesList = []
+        for filePath in self.filePathsList:
+            sentencesList.extend([l.strip() for l in io.iterLines(filePath)])
+
+        resultsDict = {'files': self.filePathsList, 'sentences': len(sentencesList),
+                       'regexFile': self.regexFile, 'languageId': self.languageId,
+                       'configurations': {}}
+
+        with tempfile.TemporaryDirectory() as tempDir:
+            #A copy without bundle for the csv configurations
+            regexFile = tempDir + os.sep + "regex.csv"
+            shutil.copyfile(self.regexFile, regexFile)
+
+            bundleFile = tempDir + os.sep + "rules" + RegexBundle.EXTENSION
+            startTime = time.time()
+            regexBundle = RegexBundle.compile(regexFile, bundleFile)
+            resultsDict['compileSeconds'] = time.time() - startTime
+            resultsDict['rows'] = len(regexBundle.getRegexList())
+            resultsDict['rules'] = len(regexBundle.getRules())
+
+            filesDict = {RegexLoadBenchmark.FORMER: regexFile,
+                         RegexLoadBenchmark.CSV: regexFile,
+                         RegexLoadBenchmark.BUNDLE: bundleFile}
+
+            for configuration in configurationsList:
+                self.logger.info("Measuring %s" % configuration)
+                measure = measureInChild(_load, configuration, filesDict[configuration],
+                                         sentencesList, self.languageId)
+                resultsDict['configurations'][configuration] = measure
+
+                if 'error' in measure:
+                    self.logger.critical("%s failed: %s" % (configuration, measure['error']))
+                    continue
+
+                measure.update(measure.pop('result'))
+                measure['sentencesPerSecond'] = len(sentencesList) / \
+                    max(measure['applySeconds'], 1e-9)
+                self.logger.info("%s: load %.3f s, first sentence %.3f s, %.1f sentences/s" %
+                                 (configuration, measure['loadSeconds'],
+                                  measure['firstSentenceSeconds'] or 0,
+                                  measure['sentencesPerSecond']))
+
+        return resultsDict
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import os
+import time
+import logging
+
+from asrt.common.ioread import Ioread
+from asrt.common.TextDocument import TextDocument
+from asrt.common.AsrtUtility import getErrorMessage
+
+
+class SegmenterBenchmark(object):
+    """Throughput of the sentence segmentation engines
+       and agreement of the 'rules' engine with punkt.
+
+       Each engine runs the full 'TextDocument' loading,
+       i.e. including the split on tabs, ';', ':', '!'
+       and '?'. Sentence boundaries are compared as offsets
+       in the text without white spaces.
+    """
+    logger = logging.getLogger("Asrt.SegmenterBenchmark")
+
+    REFERENCE = TextDocument.SEGMENTERPUNKT
+
+    def __init__(self, filePathsList, languageId=0):
+        """Default constructor.
+
+           param filePathsList: text files of the corpus
+           param languageId   : language of the corpus
+        """
+        self.filePathsList = filePathsList
+        self.languageId = languageId
+
+    #####################
+    #Public interface
+    #
+    def segment(self, segmenter, strText):
+        """Sentences of 'strText' as loaded by a
+           'TextDocument' using 'segmenter'.
+        """
+        textDocument = TextDocument(None, self.languageId, None, [], None,
+                                    True, False)
+        textDocument.setSegmenter(segmenter)
+        textDocument.loadAsSentences(strText)
+        return [c.getTextSentence() for c in textDocument.listContent]
+
+    def run(self, segmentersList=None):
+        """Measure 'segmentersList', default to all engines.
+
+           return a dictionary of measures per engine
+        """
+        segmentersList = segmentersList or TextDocument.SEGMENTERS
+
+        io = Ioread()
+        textsList = [io.nltkRead(filePath) for filePath in self.filePathsList]
+
+        resultsDict = {'files': self.filePathsList,
+                       'languageId': self.languageId,
+                       'size': sum([os.path.getsize(f) for f in self.filePathsList]),
+                       'segmenters': {}}
+
+        sentencesDict = {}
+        for segmenter in segmentersList:
+            self.logger.info("Measuring %s" % segmenter)
+            try:
+                startTime = time.perf_counter()
+                sentencesDict[segmenter] = [self.segment(segmenter, strText)
+                                            for strText in textsList]
+                seconds = time.perf_counter() - startTime
+            except Exception as e:
+                self.logger.critical(getErrorMessage(e, "%s failed" % segmenter))
+                resultsDict['segmenters'][segmenter] = {'error': str(e)}
+                continue
+
+            sentencesCount = sum([len(s) for s in sentencesDict[segmenter]])
+            resultsDict['segmenters'][segmenter] = {
+                'seconds': seconds,
+                'sentences': sentencesCount,
+                'megabytesPerSecond': resultsDict['size'] / 1048576.0 / max(seconds, 1e-9),
+                'sentencesPerSecond': sentencesCount / max(seconds, 1e-9)}
+            self.logger.info("%s: %d sentences in %.2f s" %
+                             (segmenter, sentencesCount, seconds))
+
+        #Agreement with the reference
+        reference = SegmenterBenchmark.REFERENCE
+        for segmenter in sentencesDict:
+            if segmenter == reference or reference not in sentencesDict:
+                continue
+            agreement = SegmenterBenchmark.getAgreement(
+                sentencesDict[reference], sentencesDict[segmenter])
+            resultsDict['segmenters'][segmenter]['agreement'] = agreement
+            self.logger.info("%s agreement with %s: boundaries F1 %.3f, sentences %.3f" %
+                             (segmenter, reference, agreement['boundaryF1'],
+                              agreement['sentences']))
+
+        return resultsDict
+
+    #####################
+    #Static methods
+    #
+    @staticmethod
+    def getAgreement(referenceDocumentsList, documentsList):
+        """Boundary precision, recall and f1 and the rate
+           of identical sentences.
+
+           param referenceDocumentsList: a list of sentences
+                                         lists, one per document
+           param documentsList         : idem, to be compared
+        """
+        truePositives, referenceCount, hypothesisCount = 0, 0, 0
+        sameSentences = 0
+        for referenceList, sentencesList in zip(referenceDocumentsList, documentsList):
+            referenceSpans = SegmenterBenchmark.getSpans(referenceList)
+            spans = SegmenterBenchmark.getSpans(sentencesList)
+
+            referenceBoundaries = set([end for start, end in referenceSpans])
+            boundaries = set([end for start, end in spans])
+
+            truePositives += len(referenceBoundaries & boundaries)
+            referenceCount += len(referenceBoundaries)
+            hypothesisCount += len(boundaries)
+            sameSentences += len(set(referenceSpans) & set(spans))
+
+        precision = truePositives / float(max(hypothesisCount, 1))
+        recall = truePositives / float(max(referenceCount, 1))
+        f1 = 0.0
+        if precision + recall > 0:
+            f1 = 2 * precision * recall / (precision + recall)
+
+        return {'boundaryPrecision': precision, 'boundaryRecall': recall,
+                'boundaryF1': f1,
+                'sentences': sameSentences / float(max(referenceCount, 1))}
+
+    @staticmethod
+    def getSpans(sentencesList):
+        """Start and end offsets of the sentences in the
+           text without white spaces.
+        """
+        spansList, offset = [], 0
+        for strSentence in sentencesList:
+            length = len("".join(strSentence.split()))
+            spansList.append((offset, offset + length))
+            offset += length
+        return spansList
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import time
+import hashlib
+import logging
+import resource
+
+import nltk
+
+from asrt.common.Classifier import LanguageClassifier
+from asrt.common.ClassifierWord import WordClassifier
+from asrt.benchmark.BenchmarkUtility import measureInChild, getBaselineRSS
+
+
+###############
+# Training, run in a child process
+#
+def _getSources(filePathsList):
+    """Labelled sentences files as training sources,
+       europarl_raw without files.
+    """
+    if not filePathsList:
+        return LanguageClassifier.EUROPARL_SOURCES
+
+    return LanguageClassifier.readLabelledSources(filePathsList)
+
+
+def _getFingerprint(classifier):
+    """Digest of the frequencies of a naive Bayes model.
+    """
+    digest = hashlib.sha1()
+    for key, probDist in sorted(classifier._feature_probdist.items(), key=repr):
+        digest.update(repr((key, probDist._bins,
+                            sorted(probDist.freqdist().items(), key=repr))).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _train(filePathsList, streaming, workers):
+    """Train a 'WordClassifier' from its labelled
+       features set or from streamed counts.
+
+       return a dictionary with the duration, the model
+              fingerprint and the peak RSS of the workers
+    """
+    sourcesList = _getSources(filePathsList)
+
+    classifier = WordClassifier()
+    startTime = time.time()
+    if streaming:
+        classifier.trainFromSources(sourcesList, workers)
+    else:
+        classifier.classifier = nltk.NaiveBayesClassifier.train(
+            classifier.getLabelledFeaturesSet(sourcesList))
+    seconds = time.time() - startTime
+
+    return {'seconds': seconds, 'fingerprint': _getFingerprint(classifier.classifier),
+            'workersPeakRSS': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024}
+
+
+class TrainingBenchmark(object):
+    """Duration and peak memory of the words classifier
+       training.
+
+       Configurations are:
+          - featuresSet : 'nltk.NaiveBayesClassifier.train' on
+                          the features of all words, the former
+                          implementation
+          - streaming   : counts of streamed sentences, see
+                          'LanguageClassifier.trainFromSources'
+          - parallel    : counts of each language in a worker
+                          process
+    """
+    logger = logging.getLogger("Asrt.TrainingBenchmark")
+
+    FEATURESSET     = 'featuresSet'
+    STREAMING       = 'streaming'
+    PARALLEL        = 'parallel'
+    CONFIGURATIONS  = [FEATURESSET, STREAMING, PARALLEL]
+
+    def __init__(self, filePathsList=None):
+        """Default constructor.
+
+           param filePathsList: labelled sentences files, see
+                                'LanguageClassifier.readLabelledFiles',
+                                default to europarl_raw
+        """
+        self.filePathsList = filePathsList
+
+    #####################
+    #Public interface
+    #
+    def run(self, workers=4, configurationsList=None):
+        """Measure 'configurationsList', default to all.
+
+           return a dictionary of measures per configuration
+        """
+        configurationsList = configurationsList or TrainingBenchmark.CONFIGURATIONS
+
+        settingsDict = {TrainingBenchmark.FEATURESSET: (False, 1),
+                        TrainingBenchmark.STREAMING: (True, 1),
+                        TrainingBenchmark.PARALLEL: (True, workers)}
+
+        resultsDict = {'files': self.filePathsList,
+                       'baselineRSS': getBaselineRSS(),
+                       'configurations': {}}
+
+        for configuration in configurationsList:
+            streaming, configurationWorkers = settingsDict[configuration]
+            self.logger.info("Measuring %s" % configuration)
+            measure = measureInChild(_train, self.filePathsList, streaming,
+                                     configurationWorkers)
+            measure['workers'] = configurationWorkers
+            resultsDict['configurations'][configuration] = measure
+
+            if 'error' in measure:
+                self.logger.critical("%s failed: %s" % (configuration, measure['error']))
+                continue
+
+            trainDict = measure.pop('result')
+            measure['trainSeconds'] = trainDict['seconds']
+            measure['fingerprint'] = trainDict['fingerprint']
+            measure['workersPeakRSS'] = trainDict['workersPeakRSS']
+            self.logger.info("%s: %.2f s, peak RSS %.1f MB, workers peak RSS %.1f MB" %
+                             (configuration, measure['trainSeconds'],
+                              measure['peakRSS'] / 1048576.0,
+                              measure['workersPeakRSS'] / 1048576.0))
+
+        fingerprintsSet = set([m['fingerprint'] for m in
+                               resultsDict['configurations'].values() if 'fingerprint' in m])
+        resultsDict['sameModel'] = len(fingerprintsSet) <= 1
+
+        return resultsDict
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import re
+import logging
+
+from asrt.common.ioread import Ioread
+
+
+class AbbreviationTrie(object):
+    """Abbreviations of one language as a trie of words.
+
+       Sentences are expanded in one left to right scan,
+       the longest abbreviation starting at a word wins.
+
+       Abbreviations made of several dotted parts, i.e.
+       'z.B.', also match their spaced form 'z. B.'.
+       Opening punctuation glued before the first word and
+       closing punctuation glued after the last word are
+       kept around the expansion, i.e. '(etc.),' gives
+       '(et cetera),'.
+    """
+    logger = logging.getLogger("Asrt.AbbreviationTrie")
+
+    #Expansion key in a node, never a word
+    EXPANSION       = None
+
+    OPENINGCHARS    = "\"'«“‘(["
+    CLOSINGCHARS    = "\"'»”’)],;:!?"
+    PUNCTUATIONCHARS = OPENINGCHARS + CLOSINGCHARS
+    DOTTEDREGEX     = re.compile(r"^(\w+[.]){2,}$", flags=re.UNICODE)
+    DOTTEDPARTREGEX = re.compile(r"\w+[.]", flags=re.UNICODE)
+
+    #Abbreviation files columns
+    ABBREVIATIONINDICE  = 0
+    EXPANSIONINDICE     = 1
+    LANGUAGEINDICE      = 2
+
+    def __init__(self, abbreviationsDict=None):
+        """Default constructor.
+
+           param abbreviationsDict: abbreviations to expansions
+        """
+        self.rootDict = {}
+        #First words without glued punctuation
+        self.firstWordsSet = set()
+        self.count = 0
+        if abbreviationsDict is not None:
+            self.addAll(abbreviationsDict)
+
+    #####################
+    #Public interface
+    #
+    def add(self, strAbbreviation, strExpansion):
+        """Add 'strAbbreviation' and its spaced form, an
+           existing abbreviation is replaced.
+        """
+        wordsList = strAbbreviation.split()
+        if len(wordsList) == 0:
+            return
+
+        self._addWords(wordsList, strExpansion)
+        if len(wordsList) == 1 and \
+                AbbreviationTrie.DOTTEDREGEX.match(strAbbreviation):
+            self._addWords(AbbreviationTrie.DOTTEDPARTREGEX.findall(strAbbreviation),
+                           strExpansion)
+        self.count += 1
+
+    def addAll(self, abbreviationsDict):
+        for strAbbreviation, strExpansion in abbreviationsDict.items():
+            self.add(strAbbreviation, strExpansion)
+
+    def expand(self, wordsList):
+        """Replace abbreviations in 'wordsList'.
+
+           return the new words list and True if some
+                  expansions are empty or contain spaces
+        """
+        firstWordsSet = self.firstWordsSet
+        punctuationChars = AbbreviationTrie.PUNCTUATIONCHARS
+
+        newWordsList, bSplit, nextIndex = [], False, 0
+        for i, w in enumerate(wordsList):
+            if i < nextIndex:
+                continue
+
+            #Most words are not abbreviations, with or
+            #without glued punctuation
+            if w.strip(punctuationChars) not in firstWordsSet:
+                newWordsList.append(w)
+                continue
+
+            match = self._matchAt(wordsList, i)
+            if match is None:
+                newWordsList.append(w)
+                continue
+
+            strExpansion, nextIndex = match
+            bSplit = bSplit or " " in strExpansion or strExpansion == ""
+            newWordsList.append(strExpansion)
+
+        return newWordsList, bSplit
+
+    def __len__(self):
+        return self.count
+
+    #####################
+    #Static methods
+    #
+    @staticmethod
+    def readFile(abbreviationFile):
+        """Read a user abbreviations file.
+
+           The file is in CSV format with tabs as fields
+           separators and a header line, like regular
+           expressions files:
+                abbreviation, expansion, language id, comments
+
+           return a dictionary of abbreviations per language id
+        """
+        AbbreviationTrie.logger.info("Load abbreviations from %s" % abbreviationFile)
+
+        abbreviationsDict = {}
+        for row in Ioread().readCSV(abbreviationFile, '\t')[1:]:
+            if len(row) <= AbbreviationTrie.LANGUAGEINDICE:
+                continue
+            languageId = int(row[AbbreviationTrie.LANGUAGEINDICE])
+            abbreviationsDict.setdefault(languageId, {})[
+                row[AbbreviationTrie.ABBREVIATIONINDICE]] = \
+                row[AbbreviationTrie.EXPANSIONINDICE]
+
+        return abbreviationsDict
+
+    #####################
+    #Implementation
+    #
+    def _addWords(self, wordsList, strExpansion):
+        self.firstWordsSet.add(wordsList[0].strip(AbbreviationTrie.PUNCTUATIONCHARS))
+        nodeDict = self.rootDict
+        for w in wordsList:
+            nodeDict = nodeDict.setdefault(w, {})
+        nodeDict[AbbreviationTrie.EXPANSION] = strExpansion
+
+    def _matchAt(self, wordsList, i):
+        """Longest abbreviation starting at word 'i'.
+
+           return the expansion with its glued punctuation
+                  and the index of the next word, or None
+        """
+        w, strPrefix = wordsList[i], ""
+        if w not in self.rootDict:
+            strWord = w.lstrip(AbbreviationTrie.OPENINGCHARS)
+            strPrefix, w = w[:len(w) - len(strWord)], strWord
+
+        match, nodeDict = None, self.rootDict
+        for j in range(i, len(wordsList)):
+            if j > i:
+                w = wordsList[j]
+
+            childDict = nodeDict.get(w)
+            if childDict is None:
+                #Closing punctuation ends the abbreviation
+                strWord = w.rstrip(AbbreviationTrie.CLOSINGCHARS)
+                if len(strWord) < len(w):
+                    childDict = nodeDict.get(strWord)
+                    if childDict is not None and AbbreviationTrie.EXPANSION in childDict:
+                        match = (strPrefix + childDict[AbbreviationTrie.EXPANSION] +
+                                 w[len(strWord):], j + 1)
+                break
+
+            nodeDict = childDict
+            if AbbreviationTrie.EXPANSION in nodeDict:
+                match = (strPrefix + nodeDict[AbbreviationTrie.EXPANSION], j + 1)
+
+        return match
@@ -51,10 +51,10 @@ def getErrorMessage(e, prefix):
     exc_type, exc_obj, exc_tb = sys.exc_info()
     fname = os.path.split(exc_tb.tb_frame.f_code.co_filename)[1]
     stackMessage = "\n------------ Begin stack ------------\n" + \
-                   getByteString(traceback.format_exc().rstrip()) + "\n" + \
+                   traceback.format_exc().rstrip() + "\n" + \
                    "------------ End stack --------------"
     strError = "%s: %s (line: %d), %s\n%s" % \
-        (prefix, fname, exc_tb.tb_lineno, getByteString(e.message), stackMessage)
+        (prefix, fname, exc_tb.tb_lineno, str(e), stackMessage)
 
     return strError
 
@@ -89,9 +89,12 @@ def getTestSuite(pGetSuite, unitTestList):
 #
 
 
-def convertNumber(cls, strText):
+def convertNumber(cls, strText, cache=None):
     """Multilingual algorithm to convert a number
        into a written form.
+
+       Ordinal numbers depend on their neighbours and
+       are never taken from 'cache'.
     """
     wordsList = re.split(SPACEPATTERN, strText, flags=re.UNICODE)
 
@@ -100,6 +103,14 @@ def convertNumber(cls, strText):
         if not hasNumber(cls, w):
             newWordsList.append(w)
             continue
+
+        if cache is not None:
+            wNorm = cache.get(w)
+            if wNorm is not None and wNorm is not cache.BYPASS:
+                newWordsList.append(wNorm)
+                continue
+
+        bContext = False
         try:
             # Now check number type
             if cls._isTransitionNumber(w):
@@ -111,6 +122,7 @@ def convertNumber(cls, strText):
                 if cls._isCardinalNumber(wNorm):
                     wNorm = cls._cardinal2word(wNorm)
                 elif cls._isOrdinalNumber(wNorm):
+                    bContext = True
                     wNorm = cls._ordinal2word(wordsList, i)
                 elif cls._isDecimalNumber(wNorm):
                     wNorm = cls._decimal2word(wNorm)
@@ -118,7 +130,6 @@ def convertNumber(cls, strText):
                     wNorm = cls._roman2word(wNorm)
                 else:
                     wNorm = w
-            newWordsList.append(wNorm)
 
         except Exception as e:
             prefix = "Error formatting number (%s): %s" % \
@@ -127,8 +138,11 @@ def convertNumber(cls, strText):
             logger.warning(prefix)
 
             # Split into digits
-            for n in list(w):
-                newWordsList.append(cls._cardinal2word(n))
+            wNorm = " ".join([cls._cardinal2word(n) for n in list(w)])
+
+        newWordsList.append(wNorm)
+        if cache is not None:
+            cache.put(w, cache.BYPASS if bContext else wNorm)
 
     return " ".join(newWordsList)
 
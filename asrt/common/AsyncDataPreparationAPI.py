@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import os
+import asyncio
+import logging
+import tempfile
+import concurrent.futures
+import multiprocessing
+
+from asrt.common.MyFile import MyFile
+from asrt.common.ioread import Ioread
+from asrt.common.TextDocument import TextDocument
+from asrt.common.TextRepresentation import TextRepresentation
+from asrt.common.DataPreparationAPI import DataPreparationAPI
+from asrt.config.AsrtConfig import FRENCH_LABEL, GERMAN_LABEL, ENGLISH_LABEL
+from asrt.config.AsrtConfig import ITALIAN_LABEL, UNKNOWN_LABEL
+
+###############
+# Worker process
+#
+# One configured 'DataPreparationAPI' per worker process,
+# set once by the pool initializer so that regexes and
+# the classifier trained by the parent are shared between
+# documents.
+_workerAPI = None
+
+
+def _initWorker(api):
+    """Pool initializer.
+    """
+    global _workerAPI
+    _workerAPI = api
+
+    #Duplicates are removed in the parent process,
+    #across all workers
+    _workerAPI.setDeduplicator(None)
+
+
+def _prepareInWorker(textFile, language):
+    """CPU bound stages of 'DataPreparationAPI.prepareDocument'
+       for an already converted text file.
+
+       return a dictionary of sentences per language label
+    """
+    api = _workerAPI
+    api.setInputFile(None)
+    api.setFormattedText(Ioread().nltkRead(textFile))
+    api.prepareDocument(language)
+
+    sentencesDict = {FRENCH_LABEL: [], GERMAN_LABEL: [],
+                     ITALIAN_LABEL: [], ENGLISH_LABEL: [],
+                     UNKNOWN_LABEL: []}
+    DataPreparationAPI.appendDocumentSentences(api.getDocument(), sentencesDict)
+
+    return sentencesDict
+
+
+###############
+# Helpers
+#
+class AsyncPreparationResult(object):
+    """Outcome of the preparation of one document.
+    """
+
+    def __init__(self, inputFile, sentencesDict, error=None):
+        self.inputFile = inputFile
+        self.sentencesDict = sentencesDict
+        self.error = error
+
+    def getInputFile(self):
+        return self.inputFile
+
+    def getSentencesDict(self):
+        """Sentences per language label, None on error.
+        """
+        return self.sentencesDict
+
+    def getError(self):
+        return self.error
+
+    def isError(self):
+        return self.error is not None
+
+
+###############
+# Main class
+#
+class AsyncDataPreparationAPI():
+    """Asyncio version of 'DataPreparationAPI'.
+
+       Pdf documents are converted with an asyncio subprocess,
+       the segmentation, classification and normalization
+       stages run in a process pool. The number of documents
+       in flight is bounded.
+
+       Preparation options are set on the underlying
+       'DataPreparationAPI' returned by 'getAPI'.
+    """
+    logger = logging.getLogger("Asrt.AsyncDataPreparationAPI")
+
+    def __init__(self, outputDir, maxWorkers=None, maxConcurrency=None):
+        """Default constructor.
+
+           param maxWorkers    : size of the process pool, default
+                                 to the number of cpus
+           param maxConcurrency: maximum number of documents in
+                                 flight, default to twice 'maxWorkers'
+        """
+        self.outputDir = outputDir
+        self.tempDir = outputDir
+        self.maxWorkers = maxWorkers or os.cpu_count() or 1
+        self.maxConcurrency = maxConcurrency or 2 * self.maxWorkers
+        self.mpContext = None
+        self.api = DataPreparationAPI(None, outputDir)
+        self.executor = None
+        self.retiredExecutors = []
+        self.semaphore = None
+        self.classifierLock = None
+
+    #####################
+    #Getters and setters
+    #
+    def getAPI(self):
+        """The 'DataPreparationAPI' holding the preparation
+           options. Changes are taken into account when the
+           process pool is (re)started.
+        """
+        return self.api
+
+    def setTempDir(self, tempDir):
+        self.tempDir = tempDir
+
+    def setMaxWorkers(self, maxWorkers):
+        self.maxWorkers = maxWorkers
+
+    def setMaxConcurrency(self, maxConcurrency):
+        self.maxConcurrency = maxConcurrency
+        self.semaphore = None
+
+    def setMultiprocessingContext(self, mpContext):
+        """Start method of the worker processes, i.e.
+           'fork', 'spawn' or 'forkserver'.
+        """
+        self.mpContext = mpContext
+
+    #####################
+    #Public interface
+    #
+    async def prepare(self, inputFile, language=0):
+        """Prepare one document.
+
+           param language: an int between 0-4, see
+                           'DataPreparationAPI.prepareDocument'
+           return a dictionary of sentences per language label
+        """
+        if language > 4 or language < 0:
+            raise Exception("Unknown language")
+
+        if language == 0:
+            await self._trainClassifier()
+
+        async with self._getSemaphore():
+            textFile = await self._convertToText(inputFile)
+            try:
+                future = self._getExecutor().submit(_prepareInWorker,
+                                                    textFile, language)
+                try:
+                    sentencesDict = await asyncio.wrap_future(future)
+                except asyncio.CancelledError:
+                    await self._waitRunning(future)
+                    raise
+            finally:
+                if textFile != inputFile:
+                    MyFile.removeFile(textFile)
+
+        deduplicator = self.api.getDeduplicator()
+        if deduplicator is not None:
+            for languageLabel, sentencesList in list(sentencesDict.items()):
+                sentencesDict[languageLabel] = \
+                    deduplicator.filterSentences(sentencesList)
+
+        return sentencesDict
+
+    async def prepareBatch(self, inputFiles, language=0):
+        """Prepare 'inputFiles' concurrently, yielding an
+           'AsyncPreparationResult' as soon as a document
+           is done.
+
+           Usage: async for result in api.prepareBatch(files)
+
+           Leaving the loop early cancels pending documents.
+        """
+        tasks = [asyncio.ensure_future(self._prepareResult(f, language))
+                 for f in inputFiles]
+        try:
+            for nextDone in asyncio.as_completed(tasks):
+                yield await nextDone
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def close(self):
+        """Shutdown the process pool.
+        """
+        executorsList, self.retiredExecutors = self.retiredExecutors, []
+        if self.executor is not None:
+            executorsList.append(self.executor)
+            self.executor = None
+        for executor in executorsList:
+            await asyncio.get_running_loop().run_in_executor(
+                None, executor.shutdown, True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, excType, excValue, traceback):
+        await self.close()
+
+    #####################
+    #Implementation
+    #
+    async def _prepareResult(self, inputFile, language):
+        """Wrap 'prepare' so that one failing document does
+           not stop a batch.
+        """
+        try:
+            sentencesDict = await self.prepare(inputFile, language)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.critical("Error preparing %s: %s" % (inputFile, str(e)))
+            return AsyncPreparationResult(inputFile, None, e)
+
+        return AsyncPreparationResult(inputFile, sentencesDict)
+
+    async def _trainClassifier(self):
+        """Train the classifier once in this process, before
+           the workers are started, so that they receive it
+           with the 'DataPreparationAPI'.
+        """
+        if self.classifierLock is None:
+            self.classifierLock = asyncio.Lock()
+
+        async with self.classifierLock:
+            if self.api.getClassifier() is not None:
+                return
+
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.api.trainClassifier)
+
+            #Workers started without classifier are replaced,
+            #their documents in progress still complete
+            if self.executor is not None:
+                self.executor.shutdown(wait=False)
+                self.retiredExecutors.append(self.executor)
+                self.executor = None
+
+    @staticmethod
+    async def _waitRunning(future):
+        """Cancel 'future' or, when a worker is already
+           preparing the document, wait for it so that its
+           text file is not removed while being read.
+        """
+        if future.cancel():
+            return
+        try:
+            await asyncio.shield(asyncio.wrap_future(future))
+        except Exception:
+            pass
+
+    async def _convertToText(self, inputFile):
+        """Text files are read as is, pdf files are
+           converted with an asyncio subprocess.
+
+           return the text file path
+        """
+        tr = TextRepresentation(inputFile, self.tempDir, self.outputDir)
+        documentType = tr.getDocumentType()
+
+        if documentType == TextRepresentation.TEXTTYPE:
+            return inputFile
+
+        #Unique per document, documents of a batch may
+        #share their file name
+        MyFile.checkDirExists(self.tempDir)
+        fileDescriptor, destinationPath = tempfile.mkstemp(
+            prefix=MyFile(inputFile).getCurrentFileName() + ".", suffix=".tmp",
+            dir=self.tempDir)
+        os.close(fileDescriptor)
+        try:
+            await self._pdf2text(inputFile, destinationPath)
+        except BaseException:
+            MyFile.removeFile(destinationPath)
+            raise
+        return destinationPath
+
+    async def _pdf2text(self, sourcePath, destinationPath):
+        """Non blocking version of 'TextRepresentation.pdf2text'.
+        """
+        self.logger.info("Converting pdf document %s" % sourcePath)
+
+        process = await asyncio.create_subprocess_exec(
+            *(TextDocument.CONVERT_COMMAND + [sourcePath, destinationPath]),
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT)
+        try:
+            stdout, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            MyFile.removeFile(destinationPath)
+            raise
+
+        if process.returncode != 0:
+            self.logger.critical("Failure: converting pdf: %s\n%s" %
+                                 (sourcePath, stdout.decode('utf-8', 'replace')))
+            raise Exception("Error converting pdf: " + sourcePath)
+
+    def _getSemaphore(self):
+        """Bound the number of documents in flight.
+        """
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.maxConcurrency)
+        return self.semaphore
+
+    def _getExecutor(self):
+        """Lazy creation of the process pool.
+        """
+        if self.executor is None:
+            mpContext = None
+            if self.mpContext is not None:
+                mpContext = multiprocessing.get_context(self.mpContext)
+            self.executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.maxWorkers, mp_context=mpContext,
+                initializer=_initWorker, initargs=(self.api,))
+        return self.executor
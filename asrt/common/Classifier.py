@@ -24,10 +24,14 @@ __license__ = "BSD 3-Clause"
 import string
 import logging
 import os
+import collections
+import concurrent.futures
 import nltk
 
 from nltk.corpus import europarl_raw
-from nltk.probability import DictionaryProbDist
+from nltk.probability import DictionaryProbDist, ELEProbDist, FreqDist
+from asrt.common.ioread import Ioread
+from asrt.common.ClassifierMappedModel import MappedNaiveBayes
 from asrt.config.AsrtConfig import FRENCH_LABEL, GERMAN_LABEL, ENGLISH_LABEL
 from asrt.config.AsrtConfig import ITALIAN_LABEL, UNKNOWN_LABEL
 from asrt.config.AsrtConfig import NLTK_DATA
@@ -35,6 +39,46 @@ from asrt.config.AsrtConfig import NLTK_DATA
 nltk.data.path.append(NLTK_DATA)
 
 
+###############
+# Streaming training, run in worker processes
+#
+def _iterSentences(source):
+    if isinstance(source, str):
+        return getattr(europarl_raw, source).sents()
+    if isinstance(source, tuple):
+        languageName, fileIdsList = source
+        return getattr(europarl_raw, languageName).sents(fileIdsList)
+    return source
+
+
+def _countFeatures(classifier, label, source):
+    """Count the features values of the words of the
+       'source' sentences, streamed once.
+
+       Features only depend on the word, they are
+       extracted once per distinct word.
+
+       param source: a europarl_raw language name, a
+                     (name, files list) tuple or an
+                     iterable of words lists
+       return the number of samples and a dictionary of
+              values counts per feature name
+    """
+    wordsCounter = collections.Counter()
+    for wordsList in _iterSentences(source):
+        wordsCounter.update(wordsList)
+
+    samplesCount = 0
+    featuresCountDict = collections.defaultdict(collections.Counter)
+    for strWord, count in wordsCounter.items():
+        for featuresDict, noLabel in classifier.getFeatures([strWord], label):
+            samplesCount += count
+            for featureName, featureValue in featuresDict.items():
+                featuresCountDict[featureName][featureValue] += count
+
+    return samplesCount, dict(featuresCountDict)
+
+
 class LanguageClassifier():
     """An English/French/German/Italian classifier.
     """
@@ -42,63 +86,239 @@ class LanguageClassifier():
 
     SCORE_THRESHOLD = 0.03
 
+    #europarl_raw languages
+    EUROPARL_SOURCES = [(FRENCH_LABEL, 'french'), (GERMAN_LABEL, 'german'),
+                        (ITALIAN_LABEL, 'italian'), (ENGLISH_LABEL, 'english')]
+
     def __init__(self):
         self.classifier = None
         self.scoreDetail = ""
+        self.earlyStopping = False
+        self.maxWords = None
+
+    def isTrained(self):
+        """True once trained, loaded or mapped.
+        """
+        return self.classifier is not None
 
     def classify(self, textUtterance, context="", removePunctuation=True):
         """Return the class of 'textUtterance'.
 
+           With early stopping, words are classified until
+           the remaining ones can not change the result.
+           Scores are then computed over all words, the
+           unclassified ones being counted for no label.
+
            Parameters:
                - textUtterance : utf8 string
                - context       : string to display on error
         """
-        if self.classifier == None:
+        if not self.isTrained():
             raise Exception("Classifier not trained.")
 
         # Prepare the given text
-        wordsList = self._prepareText(
-            textUtterance, context, removePunctuation)
+        wordsList = self._sampleWords(self._prepareText(
+            textUtterance, context, removePunctuation))
 
-        # Store processing information for debugging
-        self.scoreDetail = ""
+        # Store processing information for debugging,
+        # built locally as the classifier may be shared
+        scoreDetail = ""
 
         # Hold count results
         labelCountDict = {FRENCH_LABEL: 0, GERMAN_LABEL: 0, ITALIAN_LABEL: 0,
                           ENGLISH_LABEL: 0}
 
         # Label unknown
-        for (featuresDict, noLabel) in self.getFeatures(wordsList, None, context):
+        featuresList = self.getFeatures(wordsList, None, context)
+        remainingCount = len(featuresList)
+        for (featuresDict, noLabel) in featuresList:
             # Classify word features
             label = self.classifier.classify(featuresDict)
-            self.scoreDetail += "%s:  %s\n" % (
+            scoreDetail += "%s:  %s\n" % (
                 self.getFeaturesStringRepresentation(featuresDict), label)
             labelCountDict[label] += 1
+            remainingCount -= 1
+
+            if self.earlyStopping and remainingCount > 0 and \
+                    self._isSettled(labelCountDict, len(featuresList), remainingCount):
+                break
 
-        return self._getResult(labelCountDict)
+        self.scoreDetail = scoreDetail
+        return self._getResult(labelCountDict, len(featuresList))
 
-    def train(self):
-        """Train using europarl_raw corpus.
+    def agrees(self, textUtterance, label, maxWords):
+        """Cheap check that 'textUtterance' is of language
+           'label': at most 'maxWords' words, evenly spread,
+           are classified and all need to be of 'label'.
+        """
+        if not self.isTrained():
+            raise Exception("Classifier not trained.")
+
+        wordsList = self._sampleWords(self._prepareText(textUtterance), maxWords)
+        for (featuresDict, noLabel) in self.getFeatures(wordsList, None):
+            if self.classifier.classify(featuresDict) != label:
+                return False
+
+        return True
+
+    def train(self, workers=len(EUROPARL_SOURCES)):
+        """Train using europarl_raw corpus, languages are
+           counted by 'workers' processes, see 'trainFromSources'.
         """
         nltkDataPath = os.path.dirname(
             europarl_raw.french.abspath('ep-00-02-16.fr'))
-        LanguageClassifier.logger.info("Getting features from %s ..." %
+        LanguageClassifier.logger.info("Counting features from %s ..." %
                                        os.path.dirname(nltkDataPath))
-        train_set = self.getLabelledFeaturesSet()
-
-        LanguageClassifier.logger.info("Starting training...")
-        self.classifier = nltk.NaiveBayesClassifier.train(train_set)
+        self.trainFromSources(LanguageClassifier.EUROPARL_SOURCES, workers)
 
         # Override trained probabilities
-        dist = DictionaryProbDist({FRENCH_LABEL: 0.25, GERMAN_LABEL: 0.25, ITALIAN_LABEL: 0.25,
-                                   ENGLISH_LABEL: 0.25})
-
-        self.classifier._label_probdist = dist
+        self.setUniformPriors()
         LanguageClassifier.logger.info("Training done...")
 
+    def trainFromSources(self, sourcesList, workers=1):
+        """Train a naive Bayes classifier from features
+           counts, without building features sets.
+
+           The model is the one 'nltk.NaiveBayesClassifier.train'
+           gives for the labelled features set of all words.
+
+           param sourcesList: a list of (label, source), a source
+                              is a europarl_raw language name, a
+                              (name, files list) tuple or an
+                              iterable of words lists
+           param workers    : sources counted in parallel, they
+                              need to be pickled when not names
+        """
+        countsList = self._countSources(sourcesList, workers)
+
+        LanguageClassifier.logger.info("Merging counts...")
+        labelFreqDist = FreqDist()
+        featureFreqDistDict = {}
+        featureValuesDict = collections.defaultdict(set)
+        for (label, source), (samplesCount, featuresCountDict) in \
+                zip(sourcesList, countsList):
+            LanguageClassifier.logger.info(
+                "Number of words: %d for label %s" % (samplesCount, label))
+            labelFreqDist[label] += samplesCount
+            for featureName, valuesCounter in featuresCountDict.items():
+                featureFreqDistDict.setdefault((label, featureName),
+                                               FreqDist()).update(valuesCounter)
+                featureValuesDict[featureName].update(valuesCounter)
+
+        # Missing features get the value None, as in nltk
+        for label in labelFreqDist:
+            for featureName in list(featureValuesDict.keys()):
+                freqDist = featureFreqDistDict.setdefault((label, featureName), FreqDist())
+                missingCount = labelFreqDist[label] - freqDist.N()
+                if missingCount > 0:
+                    freqDist[None] += missingCount
+                    featureValuesDict[featureName].add(None)
+
+        featureProbDistDict = {}
+        for (label, featureName), freqDist in featureFreqDistDict.items():
+            featureProbDistDict[label, featureName] = ELEProbDist(
+                freqDist, bins=len(featureValuesDict[featureName]))
+
+        self.classifier = nltk.NaiveBayesClassifier(ELEProbDist(labelFreqDist),
+                                                    featureProbDistDict)
+
+    def updateFromSources(self, sourcesList, workers=1):
+        """Add the counts of 'sourcesList' to the trained
+           model, only the new sentences are counted.
+
+           The model is the one 'trainFromSources' gives for
+           the former and the new sources together, uniform
+           label probabilities are kept.
+
+           param sourcesList: see 'trainFromSources', labels
+                              need to be known
+        """
+        if not isinstance(self.classifier, nltk.NaiveBayesClassifier):
+            raise Exception("Classifier not trained or not updatable.")
+
+        featureProbDistDict = self.classifier._feature_probdist
+        labelsList = self.classifier.labels()
+        namesSet = set([n for l, n in featureProbDistDict.keys()])
+        for label, source in sourcesList:
+            if label not in labelsList:
+                raise Exception("Unknown label: %s" % label)
+
+        countsList = self._countSources(sourcesList, workers)
+
+        # Values not seen for any label add bins
+        binsDict = dict([(n, featureProbDistDict[l, n]._bins)
+                         for l, n in featureProbDistDict.keys()])
+        samplesDict = collections.Counter()
+        for (label, source), (samplesCount, featuresCountDict) in \
+                zip(sourcesList, countsList):
+            LanguageClassifier.logger.info(
+                "Number of new words: %d for label %s" % (samplesCount, label))
+            if not namesSet.issuperset(featuresCountDict.keys()):
+                raise Exception("Unknown features: %s" %
+                                sorted(set(featuresCountDict.keys()) - namesSet))
+
+            samplesDict[label] += samplesCount
+            for featureName in namesSet:
+                valuesCounter = featuresCountDict.get(featureName, collections.Counter())
+                missingCount = samplesCount - sum(valuesCounter.values())
+                if missingCount > 0:
+                    valuesCounter[None] += missingCount
+
+                freqDistsList = [featureProbDistDict[l, featureName].freqdist()
+                                 for l in labelsList]
+                for featureValue in valuesCounter:
+                    if not any([featureValue in f for f in freqDistsList]):
+                        binsDict[featureName] += 1
+                featureProbDistDict[label, featureName].freqdist().update(valuesCounter)
+
+        for (label, featureName), probDist in list(featureProbDistDict.items()):
+            featureProbDistDict[label, featureName] = ELEProbDist(
+                probDist.freqdist(), bins=binsDict[featureName])
+
+        labelProbDist = self.classifier._label_probdist
+        if isinstance(labelProbDist, ELEProbDist):
+            labelProbDist.freqdist().update(samplesDict)
+            self.classifier._label_probdist = ELEProbDist(labelProbDist.freqdist())
+
+    def setUniformPriors(self):
+        """Same probability for all labels of the trained
+           model, whatever their number of words.
+        """
+        labelsList = self.classifier.labels()
+        self.classifier._label_probdist = DictionaryProbDist(
+            dict([(l, 1.0 / len(labelsList)) for l in labelsList]))
+
+    def exportModel(self, modelFile):
+        """Write the trained model as a flat file to be
+           mapped in memory, see 'MappedNaiveBayes'.
+        """
+        if not self.isTrained():
+            raise Exception("Classifier not trained.")
+        MappedNaiveBayes.export(self.classifier, modelFile)
+
+    def loadModel(self, modelFile):
+        """Map a model written by 'exportModel' instead of
+           training, processes mapping the same file share
+           its memory.
+        """
+        self.classifier = MappedNaiveBayes(modelFile)
+
     ########################
     # Getters and setters
     #
+    def setEarlyStopping(self, earlyStopping):
+        """Stop classifying the words of a sentence once
+           its result is settled, the result is the same.
+        """
+        self.earlyStopping = earlyStopping
+
+    def setMaxWords(self, maxWords):
+        """Classify at most 'maxWords' words per sentence,
+           evenly spread over the sentence. None or 0 to
+           classify all words.
+        """
+        self.maxWords = maxWords
+
     def getFeatures(self, wordsList, label, context=""):
         """Abstract method to be implemented"""
         pass
@@ -107,7 +327,7 @@ class LanguageClassifier():
         """String representation for features."""
         pass
 
-    def getLabelledFeaturesSet(self):
+    def getLabelledFeaturesSet(self, sourcesList=EUROPARL_SOURCES):
         """A labelled features set is a set of tuples
            of the following form:
 
@@ -115,11 +335,14 @@ class LanguageClassifier():
            ({'feature_name': 'feature 1', 'feature_name': 'feature 2', ...}, label 2),
            ({'feature_name': 'feature 1', 'feature_name': 'feature 2', ...}, label 1),
            ...
+
+           param sourcesList: see 'trainFromSources'
         """
-        return self._getLabelRawTextFeatures(europarl_raw.french, FRENCH_LABEL) +\
-            self._getLabelRawTextFeatures(europarl_raw.german, GERMAN_LABEL) +\
-            self._getLabelRawTextFeatures(europarl_raw.italian, ITALIAN_LABEL) +\
-            self._getLabelRawTextFeatures(europarl_raw.english, ENGLISH_LABEL)
+        allFeatures = []
+        for label, source in sourcesList:
+            allFeatures.extend(self._getLabelRawTextFeatures(
+                _iterSentences(source), label))
+        return allFeatures
 
     def getScoreDetails(self):
         """Detailed information about the score.
@@ -129,19 +352,33 @@ class LanguageClassifier():
     ########################
     # Implementation
     #
-    def _getLabelRawTextFeatures(self, language, label):
-        """Raw text with sentences separated by
-           spaces.
+    def _countSources(self, sourcesList, workers):
+        """Features counts of each source, see '_countFeatures'.
+        """
+        if workers > 1 and len(sourcesList) > 1:
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=min(workers, len(sourcesList))) as executor:
+                futuresList = [executor.submit(_countFeatures, self, label, source)
+                               for label, source in sourcesList]
+                return [f.result() for f in futuresList]
+
+        return [_countFeatures(self, label, source) for label, source in sourcesList]
+
+    def _getLabelRawTextFeatures(self, sentencesList, label):
+        """Features of all words of 'sentencesList', an
+           iterable of words lists.
         """
-        LanguageClassifier.logger.info(
-            "Number of sentences: %d for label %s" % (len(language.sents()), label))
-
         allFeatures = []
 
-        for wordsList in language.sents():
+        sentencesCount = 0
+        for wordsList in sentencesList:
             # Get all features for the sentence
             features = self.getFeatures(wordsList, label)
             allFeatures.extend(features)
+            sentencesCount += 1
+
+        LanguageClassifier.logger.info(
+            "Number of sentences: %d for label %s" % (sentencesCount, label))
 
         return allFeatures
 
@@ -157,8 +394,43 @@ class LanguageClassifier():
             textUtterance, context, removePunctuation)
         return textUtterance.split(' ')
 
-    def _getResult(self, labelCountDict):
+    def _sampleWords(self, wordsList, maxWords=None):
+        """At most 'maxWords' words, default to the words
+           budget, taken with an even stride so that a
+           sentence is always sampled the same way.
+        """
+        maxWords = maxWords or self.maxWords
+        if not maxWords or len(wordsList) <= maxWords:
+            return wordsList
+
+        return [wordsList[i * len(wordsList) // maxWords]
+                for i in range(maxWords)]
+
+    def _isSettled(self, labelCountDict, totalCount, remainingCount):
+        """Check if the remaining words can still change
+           the result of '_getResult'.
+
+           Scores are compared as in '_getResult', the
+           leader is settled if it wins when all remaining
+           words go to the runner-up, unknown is settled if
+           the leader can not win with all remaining words.
+        """
+        countsList = sorted(list(labelCountDict.values()), reverse=True)
+        leaderCount, runnerUpCount = countsList[0], countsList[1]
+
+        if leaderCount / float(totalCount) - \
+                (runnerUpCount + remainingCount) / float(totalCount) > \
+                LanguageClassifier.SCORE_THRESHOLD:
+            return True
+
+        return (leaderCount + remainingCount) / float(totalCount) - \
+            runnerUpCount / float(totalCount) <= LanguageClassifier.SCORE_THRESHOLD
+
+    def _getResult(self, labelCountDict, totalCount=None):
         """Return label or unknown.
+
+           param totalCount: number of words, default to the
+                             number of classified words
         """
         # Get counts
         fCount = labelCountDict[FRENCH_LABEL]
@@ -166,7 +438,8 @@ class LanguageClassifier():
         iCount = labelCountDict[ITALIAN_LABEL]
         eCount = labelCountDict[ENGLISH_LABEL]
 
-        totalCount = fCount + gCount + iCount + eCount
+        if totalCount is None:
+            totalCount = fCount + gCount + iCount + eCount
 
         if totalCount == 0:
             return (UNKNOWN_LABEL, -1)
@@ -207,6 +480,54 @@ class LanguageClassifier():
     ########################
     # Statics
     #
+    @staticmethod
+    def readLabelledFiles(filePathsList):
+        """Read sentences files with one label, a tab and
+           a sentence per line, i.e. 'french\tBonjour.'.
+
+           return a list of (label, sentence)
+        """
+        io = Ioread()
+        labelledList = []
+        for filePath in filePathsList:
+            for strLine in io.iterLines(filePath):
+                fieldsList = strLine.rstrip("\n").split("\t", 1)
+                if len(fieldsList) == 2 and len(fieldsList[1].strip()) > 0:
+                    labelledList.append((fieldsList[0], fieldsList[1]))
+        return labelledList
+
+    @staticmethod
+    def readLabelledSources(filePathsList):
+        """Labelled sentences files as sources of words
+           lists, see 'trainFromSources'.
+
+           return a list of (label, list of words lists)
+        """
+        sourcesDict = {}
+        for label, strSentence in LanguageClassifier.readLabelledFiles(filePathsList):
+            sourcesDict.setdefault(label, []).append(strSentence.split())
+        return sorted(sourcesDict.items())
+
+    @staticmethod
+    def getEuroparlSplit(heldOutEvery=10):
+        """Split the europarl_raw files of each language,
+           one file in 'heldOutEvery' is held out from
+           training.
+
+           return the training sources and the held out
+                  sources, see 'trainFromSources'
+        """
+        if heldOutEvery < 2:
+            raise Exception("At least one file in two is used for training")
+
+        trainSourcesList, heldOutSourcesList = [], []
+        for label, languageName in LanguageClassifier.EUROPARL_SOURCES:
+            fileIdsList = sorted(getattr(europarl_raw, languageName).fileids())
+            heldOutSourcesList.append((label, (languageName, fileIdsList[::heldOutEvery])))
+            trainSourcesList.append((label, (languageName,
+                [f for i, f in enumerate(fileIdsList) if i % heldOutEvery != 0])))
+        return trainSourcesList, heldOutSourcesList
+
     @staticmethod
     def normalizeText(textUtterance, context="", removePunctuation=True):
         """Normalize text:
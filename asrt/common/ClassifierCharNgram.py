@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import sys
+import json
+import math
+import zlib
+import logging
+import itertools
+import collections
+from array import array
+
+from asrt.common.Classifier import LanguageClassifier, _iterSentences
+from asrt.config.AsrtConfig import FRENCH_LABEL, GERMAN_LABEL, ENGLISH_LABEL
+from asrt.config.AsrtConfig import ITALIAN_LABEL, UNKNOWN_LABEL
+
+
+class CharNgramClassifier(LanguageClassifier):
+    """A text classifier using character n-grams.
+
+       N-grams of 1 to 5 characters of the sentence are
+       hashed into a fixed number of buckets, each n-gram
+       encoded in utf-8.
+       The model holds one array of log probabilities per
+       language, a multinomial naive Bayes over buckets, and
+       a sentence is scored in one pass.
+    """
+    logger = logging.getLogger("Asrt.CharNgramClassifier")
+
+    MINORDER        = 1
+    MAXORDER        = 5
+    BUCKETSBITS     = 18
+    SMOOTHING       = 0.1
+
+    LABELS          = [FRENCH_LABEL, GERMAN_LABEL, ITALIAN_LABEL, ENGLISH_LABEL]
+
+    #Model file: magic line, json header line and one
+    #little endian float array per label. Version 1 models
+    #hashed byte n-grams.
+    MAGIC           = b"ASRT-CHARNGRAM-2\n"
+
+    def __init__(self, bucketsBits=BUCKETSBITS):
+        LanguageClassifier.__init__(self)
+        self.bucketsBits = bucketsBits
+        self.mask = (1 << bucketsBits) - 1
+        self.labelsList = list(CharNgramClassifier.LABELS)
+        self.logProbsList = None
+
+    ########################
+    # Public interface
+    #
+    def classify(self, textUtterance, context="", removePunctuation=True):
+        """Return the class of 'textUtterance' and the
+           posterior probability of the class.
+
+           Unknown is returned when the two best classes
+           are within 'SCORE_THRESHOLD'.
+        """
+        if not self.isTrained():
+            raise Exception("Classifier not trained.")
+
+        bucketsList = self.getBuckets(LanguageClassifier.normalizeText(
+            textUtterance, context, removePunctuation))
+        if len(bucketsList) == 0:
+            return (UNKNOWN_LABEL, -1)
+
+        scoresList = [sum(map(logProbs.__getitem__, bucketsList))
+                      for logProbs in self.logProbsList]
+
+        #Posterior probabilities
+        maxScore = max(scoresList)
+        probsList = [math.exp(s - maxScore) for s in scoresList]
+        total = sum(probsList)
+        rankedList = sorted(zip([p / total for p in probsList], self.labelsList),
+                            reverse=True)
+
+        self.scoreDetail = "/".join(["%s:%f" % (l, p) for p, l in rankedList])
+        if rankedList[0][0] - rankedList[1][0] <= LanguageClassifier.SCORE_THRESHOLD:
+            return (UNKNOWN_LABEL, self.scoreDetail)
+
+        return (rankedList[0][1], rankedList[0][0])
+
+    def isTrained(self):
+        return self.logProbsList is not None
+
+    def agrees(self, textUtterance, label, maxWords):
+        """A sentence is classified in one pass, the words
+           budget is not used.
+        """
+        return self.classify(textUtterance)[0] == label
+
+    def train(self):
+        """Train using europarl_raw corpus.
+        """
+        CharNgramClassifier.logger.info("Training character n-grams on europarl_raw ...")
+        self.trainFromSources(LanguageClassifier.EUROPARL_SOURCES)
+
+    def trainFromSources(self, sourcesList, workers=1):
+        """Train from labelled sources of words lists, see
+           'LanguageClassifier.trainFromSources'. Sentences
+           are counted in this process, the sources of a
+           label are merged.
+        """
+        sourcesDict = collections.defaultdict(list)
+        for label, source in sourcesList:
+            sourcesDict[label].append(source)
+
+        self.trainFromTexts(dict([(label, (" ".join(wordsList) for wordsList in
+                                           itertools.chain.from_iterable(
+                                               [_iterSentences(s) for s in labelSources])))
+                                  for label, labelSources in sourcesDict.items()]))
+
+    def trainFromTexts(self, textsDict):
+        """Train from sentences per label.
+
+           param textsDict: a dictionary of iterables of
+                            sentences per label
+        """
+        bucketsCount = self.mask + 1
+        self.labelsList = sorted(textsDict.keys())
+        self.logProbsList = []
+        for label in self.labelsList:
+            counter = collections.Counter()
+            for strText in textsDict[label]:
+                counter.update(self.getBuckets(LanguageClassifier.normalizeText(strText)))
+
+            total = sum(counter.values()) + CharNgramClassifier.SMOOTHING * bucketsCount
+            unseen = math.log(CharNgramClassifier.SMOOTHING / total)
+            logProbs = array('f', [unseen]) * bucketsCount
+            for bucket, count in counter.items():
+                logProbs[bucket] = math.log((count + CharNgramClassifier.SMOOTHING) / total)
+
+            self.logProbsList.append(logProbs)
+            CharNgramClassifier.logger.info("Label %s: %d n-grams, %d buckets used" %
+                                            (label, sum(counter.values()), len(counter)))
+
+    def getBuckets(self, strText):
+        """Buckets of the character n-grams of 'strText',
+           padded with spaces. N-grams are encoded in utf-8
+           for hashing only.
+
+           return a list of bucket indices
+        """
+        if len(strText) == 0:
+            return []
+
+        strPadded = " " + strText + " "
+        mask, crc32 = self.mask, zlib.crc32
+
+        bucketsList = []
+        for n in range(CharNgramClassifier.MINORDER, CharNgramClassifier.MAXORDER + 1):
+            bucketsList.extend([crc32(strPadded[i:i + n].encode('utf-8')) & mask
+                                for i in range(len(strPadded) - n + 1)])
+        return bucketsList
+
+    def save(self, modelFile):
+        """Write the model to 'modelFile'.
+        """
+        headerDict = {'labels': self.labelsList, 'bucketsBits': self.bucketsBits,
+                      'minOrder': CharNgramClassifier.MINORDER,
+                      'maxOrder': CharNgramClassifier.MAXORDER}
+
+        with open(modelFile, 'wb') as outputFile:
+            outputFile.write(CharNgramClassifier.MAGIC)
+            outputFile.write((json.dumps(headerDict) + "\n").encode('utf-8'))
+            for logProbs in self.logProbsList:
+                if sys.byteorder != 'little':
+                    logProbs = array('f', logProbs)
+                    logProbs.byteswap()
+                logProbs.tofile(outputFile)
+
+    #####################
+    #Static methods
+    #
+    @staticmethod
+    def load(modelFile):
+        """Read a model written by 'save'.
+
+           return a trained 'CharNgramClassifier'
+        """
+        CharNgramClassifier.logger.info("Load character n-grams model %s" % modelFile)
+
+        with open(modelFile, 'rb') as inputFile:
+            if inputFile.readline() != CharNgramClassifier.MAGIC:
+                raise Exception("Not a character n-grams model: %s" % modelFile)
+
+            headerDict = json.loads(inputFile.readline().decode('utf-8'))
+            if headerDict['minOrder'] != CharNgramClassifier.MINORDER or \
+                    headerDict['maxOrder'] != CharNgramClassifier.MAXORDER:
+                raise Exception("Unsupported n-grams orders: %s" % modelFile)
+
+            classifier = CharNgramClassifier(headerDict['bucketsBits'])
+            classifier.labelsList = headerDict['labels']
+            classifier.logProbsList = []
+            for label in classifier.labelsList:
+                logProbs = array('f')
+                logProbs.fromfile(inputFile, classifier.mask + 1)
+                if sys.byteorder != 'little':
+                    logProbs.byteswap()
+                classifier.logProbsList.append(logProbs)
+
+        return classifier
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import sys
+import mmap
+import json
+import zlib
+import logging
+from array import array
+
+from nltk.probability import sum_logs
+
+
+class MappedNaiveBayes(object):
+    """A trained 'nltk.NaiveBayesClassifier' as a flat,
+       read-only file mapped in memory.
+
+       Processes mapping the same file share its pages
+       through the page cache. Pickling only keeps the
+       file path, workers map the file again.
+
+       Features values are interned as 'name\\0repr(value)'
+       keys, found through an open addressing table hashed
+       with crc32. Each key has the log probabilities of all
+       labels, values not seen in training get the unseen
+       log probability of their feature name. Results are
+       the ones of 'NaiveBayesClassifier.classify'.
+
+       File layout, little endian, sections aligned on 8 bytes:
+          - magic line and json header line
+          - priors   : double per label
+          - unseen   : double per label and feature name
+          - slots    : uint32 per slot, key index + 1 or 0
+          - offsets  : uint32 per key + 1, into the keys blob
+          - logProbs : double per key and label
+          - keys     : utf-8 keys blob
+    """
+    logger = logging.getLogger("Asrt.MappedNaiveBayes")
+
+    MAGIC           = b"ASRT-NBMAP-1\n"
+    SEPARATOR       = "\x00"
+
+    def __init__(self, modelFile):
+        """Map 'modelFile', see 'export'.
+        """
+        self.modelFile = modelFile
+        self._map()
+
+    #####################
+    #Public interface
+    #
+    def classify(self, featuresDict):
+        """Most probable label of 'featuresDict', as
+           'NaiveBayesClassifier.classify' gives it.
+        """
+        labelsList, labelsCount = self.labelsList, self.labelsCount
+        scoresList = list(self.priors)
+
+        for featureName, featureValue in featuresDict.items():
+            nameIndex = self.namesDict.get(featureName)
+            if nameIndex is None:
+                continue
+
+            keyIndex = self._find(featureName, featureValue)
+            if keyIndex is None:
+                logProbs = self.unseen[nameIndex * labelsCount:(nameIndex + 1) * labelsCount]
+            else:
+                logProbs = self.logProbs[keyIndex * labelsCount:(keyIndex + 1) * labelsCount]
+
+            for i in range(labelsCount):
+                scoresList[i] += logProbs[i]
+
+        # Normalized as in 'DictionaryProbDist', ties go
+        # to the greatest label
+        total = sum_logs(scoresList)
+        return max([(s - total, l) for s, l in zip(scoresList, labelsList)])[1]
+
+    def labels(self):
+        return list(self.labelsList)
+
+    def close(self):
+        for view in [self.priors, self.unseen, self.slots, self.offsets,
+                     self.logProbs, self.keys]:
+            view.release()
+        self.mappedFile.close()
+
+    #####################
+    #Static methods
+    #
+    @staticmethod
+    def export(classifier, modelFile):
+        """Write the model of 'classifier', a trained
+           'nltk.NaiveBayesClassifier', to 'modelFile'.
+        """
+        labelsList = sorted(classifier.labels())
+        namesList = sorted(set([n for l, n in classifier._feature_probdist.keys()]))
+
+        #All features values seen for any label
+        keysDict = {}
+        for (label, featureName), probDist in classifier._feature_probdist.items():
+            for featureValue in probDist.samples():
+                keysDict.setdefault(MappedNaiveBayes._getKey(featureName, featureValue),
+                                    (featureName, featureValue))
+        keysList = sorted(keysDict.keys())
+
+        unknownValue = object()
+        priors = array('d', [classifier._label_probdist.logprob(l) for l in labelsList])
+        unseen, logProbs = array('d'), array('d')
+        for featureName in namesList:
+            for label in labelsList:
+                unseen.append(MappedNaiveBayes._getLogProb(
+                    classifier, label, featureName, unknownValue))
+        for key in keysList:
+            featureName, featureValue = keysDict[key]
+            for label in labelsList:
+                logProbs.append(MappedNaiveBayes._getLogProb(
+                    classifier, label, featureName, featureValue))
+
+        keysBlob, offsets = bytearray(), array('I', [0])
+        for key in keysList:
+            keysBlob.extend(key)
+            offsets.append(len(keysBlob))
+
+        slotsCount = 1
+        while slotsCount < 2 * max(len(keysList), 1):
+            slotsCount *= 2
+        slots = array('I', [0]) * slotsCount
+        for i, key in enumerate(keysList):
+            slot = zlib.crc32(key) & (slotsCount - 1)
+            while slots[slot] != 0:
+                slot = (slot + 1) & (slotsCount - 1)
+            slots[slot] = i + 1
+
+        sectionsList = [('priors', priors), ('unseen', unseen), ('slots', slots),
+                        ('offsets', offsets), ('logProbs', logProbs),
+                        ('keys', array('B', keysBlob))]
+
+        headerDict = {'labels': labelsList, 'names': namesList,
+                      'keys': len(keysList), 'slots': slotsCount, 'sections': {}}
+        offset = 0
+        for name, values in sectionsList:
+            headerDict['sections'][name] = offset
+            offset += MappedNaiveBayes._align(len(values) * values.itemsize)
+
+        with open(modelFile, 'wb') as outputFile:
+            outputFile.write(MappedNaiveBayes.MAGIC)
+            strHeader = json.dumps(headerDict, sort_keys=True)
+            #Sections start aligned
+            startSize = len(MappedNaiveBayes.MAGIC) + len(strHeader.encode('utf-8')) + 1
+            strHeader += " " * (MappedNaiveBayes._align(startSize) - startSize)
+            outputFile.write((strHeader + "\n").encode('utf-8'))
+
+            for name, values in sectionsList:
+                if sys.byteorder != 'little':
+                    values = array(values.typecode, values)
+                    values.byteswap()
+                data = values.tobytes()
+                outputFile.write(data + b"\x00" * (MappedNaiveBayes._align(len(data)) - len(data)))
+
+        MappedNaiveBayes.logger.info("Exported %d labels, %d features values to %s" %
+                                     (len(labelsList), len(keysList), modelFile))
+
+    #####################
+    #Pickling, only the path
+    #
+    def __getstate__(self):
+        return {'modelFile': self.modelFile}
+
+    def __setstate__(self, stateDict):
+        self.modelFile = stateDict['modelFile']
+        self._map()
+
+    #####################
+    #Implementation
+    #
+    def _map(self):
+        with open(self.modelFile, 'rb') as inputFile:
+            if inputFile.readline() != MappedNaiveBayes.MAGIC:
+                raise Exception("Not a mapped naive Bayes model: %s" % self.modelFile)
+            headerDict = json.loads(inputFile.readline().decode('utf-8'))
+            start = inputFile.tell()
+            self.mappedFile = mmap.mmap(inputFile.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if sys.byteorder != 'little':
+            raise Exception("Mapped models need a little endian platform")
+
+        self.labelsList = headerDict['labels']
+        self.labelsCount = len(self.labelsList)
+        self.namesDict = dict([(n, i) for i, n in enumerate(headerDict['names'])])
+        self.slotsMask = headerDict['slots'] - 1
+
+        keysCount = headerDict['keys']
+        sizesDict = {'priors': (self.labelsCount, 'd'),
+                     'unseen': (self.labelsCount * len(self.namesDict), 'd'),
+                     'slots': (headerDict['slots'], 'I'),
+                     'offsets': (keysCount + 1, 'I'),
+                     'logProbs': (keysCount * self.labelsCount, 'd')}
+
+        view = memoryview(self.mappedFile)
+        for name, (count, typeCode) in sizesDict.items():
+            offset = start + headerDict['sections'][name]
+            itemSize = array(typeCode).itemsize
+            setattr(self, name, view[offset:offset + count * itemSize].cast(typeCode))
+
+        offset = start + headerDict['sections']['keys']
+        self.keys = view[offset:offset + self.offsets[keysCount]]
+        view.release()
+
+    def _find(self, featureName, featureValue):
+        """Index of the key of 'featureValue' or None.
+        """
+        key = MappedNaiveBayes._getKey(featureName, featureValue)
+        slots, offsets, keys = self.slots, self.offsets, self.keys
+
+        slot = zlib.crc32(key) & self.slotsMask
+        while True:
+            keyIndex = slots[slot] - 1
+            if keyIndex < 0:
+                return None
+            if keys[offsets[keyIndex]:offsets[keyIndex + 1]] == key:
+                return keyIndex
+            slot = (slot + 1) & self.slotsMask
+
+    @staticmethod
+    def _getKey(featureName, featureValue):
+        return (featureName + MappedNaiveBayes.SEPARATOR +
+                repr(featureValue)).encode('utf-8', 'backslashreplace')
+
+    @staticmethod
+    def _getLogProb(classifier, label, featureName, featureValue):
+        probDist = classifier._feature_probdist.get((label, featureName))
+        if probDist is None:
+            return sum_logs([])
+        return probDist.logprob(featureValue)
+
+    @staticmethod
+    def _align(size):
+        return (size + 7) // 8 * 8
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import os
+import re
+import json
+import time
+import fcntl
+import pickle
+import logging
+import threading
+import contextlib
+
+from asrt.common.ClassifierWord import WordClassifier
+from asrt.common.ClassifierMappedModel import MappedNaiveBayes
+
+
+class StaleVersionException(Exception):
+    pass
+
+
+class ClassifierModelStore(object):
+    """Versions of the words classifier model in a
+       directory.
+
+       A version has the counts of its model, a pickled
+       'nltk.NaiveBayesClassifier' that can be updated, its
+       mapped export and a json description with its parent
+       version and the files it was updated with. Versions
+       are never modified, the 'current' file names the
+       version to use.
+
+       Mapped models are cached per file, a new current
+       version is used by the next 'getClassifier' call.
+
+       The 'current' file is changed under an exclusive
+       lock of the store, concurrent updates are applied
+       one after the other.
+    """
+    logger = logging.getLogger("Asrt.ClassifierModelStore")
+
+    CURRENTFILENAME = "current"
+    LOCKFILENAME    = "current.lock"
+    VERSIONFORMAT   = "model-%04d"
+    VERSIONREGEX    = re.compile(r"^model-(\d+)\.json$")
+    COUNTSEXTENSION = ".counts"
+    MAPEXTENSION    = ".map"
+    INFOEXTENSION   = ".json"
+
+    #Mapped models per file, shared by all stores
+    modelsCacheDict = {}
+    cacheLock = threading.Lock()
+
+    def __init__(self, storeDir):
+        """Default constructor.
+
+           param storeDir: the store directory, created
+                           if needed
+        """
+        self.storeDir = storeDir
+        if not os.path.isdir(storeDir):
+            os.makedirs(storeDir)
+
+    #####################
+    #Public interface
+    #
+    def getVersions(self):
+        """Sorted list of the stored versions.
+        """
+        versionsList = []
+        for fileName in os.listdir(self.storeDir):
+            match = ClassifierModelStore.VERSIONREGEX.match(fileName)
+            if match:
+                versionsList.append(int(match.group(1)))
+        return sorted(versionsList)
+
+    def getCurrentVersion(self):
+        """Current version or None for an empty store.
+        """
+        currentFile = self.storeDir + os.sep + ClassifierModelStore.CURRENTFILENAME
+        if not os.path.exists(currentFile):
+            return None
+        with open(currentFile) as inputFile:
+            return int(inputFile.read().strip())
+
+    def setCurrentVersion(self, version):
+        """Use 'version', i.e. to come back to a former one.
+        """
+        if version not in self.getVersions():
+            raise Exception("Unknown model version: %s" % version)
+
+        with self._lockStore():
+            self._writeCurrentVersion(version)
+
+    def getInfo(self, version=None):
+        """Description of 'version', default to the current one.
+        """
+        with open(self._getPath(version, ClassifierModelStore.INFOEXTENSION)) as inputFile:
+            return json.load(inputFile)
+
+    def addVersion(self, classifier, filePathsList=[], parentVersion=None):
+        """Store the model of 'classifier', a trained
+           'LanguageClassifier', as the new current version.
+
+           param parentVersion: the version 'classifier' was
+                                updated from, it needs to be
+                                still the current one
+           return the new version
+        """
+        version, outputFile = self._reserveVersion()
+        with outputFile:
+            pickle.dump(classifier.classifier, outputFile, protocol=pickle.HIGHEST_PROTOCOL)
+        classifier.exportModel(self._getPath(version, ClassifierModelStore.MAPEXTENSION))
+
+        #Written last, the version exists once described
+        infoDict = {'version': version, 'parent': parentVersion,
+                    'created': time.strftime("%Y-%m-%d %H:%M:%S"),
+                    'files': [os.path.abspath(f) for f in filePathsList]}
+        with open(self._getPath(version, ClassifierModelStore.INFOEXTENSION), 'w') as outputFile:
+            json.dump(infoDict, outputFile, indent=2, sort_keys=True)
+
+        with self._lockStore():
+            if parentVersion is not None and self.getCurrentVersion() != parentVersion:
+                self._removeVersion(version)
+                raise StaleVersionException("Version %d is not the current one anymore" %
+                                            parentVersion)
+            self._writeCurrentVersion(version)
+
+        ClassifierModelStore.logger.info("Stored model version %d" % version)
+        return version
+
+    def update(self, filePathsList, workers=1):
+        """Add labelled sentences files to the current model,
+           see 'LanguageClassifier.updateFromSources'.
+
+           Only the files are counted, the duration does not
+           depend on the former training data. When another
+           update changes the current version meanwhile, the
+           files are added to the new current version.
+
+           return the new version
+        """
+        while True:
+            parentVersion = self.getCurrentVersion()
+            if parentVersion is None:
+                raise Exception("No model to update in %s" % self.storeDir)
+
+            classifier = WordClassifier()
+            with open(self._getPath(parentVersion, ClassifierModelStore.COUNTSEXTENSION), 'rb') as inputFile:
+                classifier.classifier = pickle.load(inputFile)
+
+            classifier.updateFromSources(WordClassifier.readLabelledSources(filePathsList), workers)
+            try:
+                return self.addVersion(classifier, filePathsList, parentVersion)
+            except StaleVersionException:
+                ClassifierModelStore.logger.info("Version %d updated concurrently, " \
+                                                 "update the new current version" % parentVersion)
+
+    def getClassifier(self, version=None):
+        """A 'WordClassifier' with the mapped model of
+           'version', default to the current one.
+        """
+        if version is None and self.getCurrentVersion() is None:
+            raise Exception("No model in %s" % self.storeDir)
+
+        classifier = WordClassifier()
+        classifier.classifier = ClassifierModelStore.getMappedModel(
+            self._getPath(version, ClassifierModelStore.MAPEXTENSION))
+        return classifier
+
+    #####################
+    #Static methods
+    #
+    @staticmethod
+    def getMappedModel(modelFile):
+        """Mapped model of 'modelFile', mapped once per
+           process.
+        """
+        modelFile = os.path.abspath(modelFile)
+        with ClassifierModelStore.cacheLock:
+            if modelFile not in ClassifierModelStore.modelsCacheDict:
+                ClassifierModelStore.modelsCacheDict[modelFile] = MappedNaiveBayes(modelFile)
+            return ClassifierModelStore.modelsCacheDict[modelFile]
+
+    #####################
+    #Implementation
+    #
+    def _reserveVersion(self):
+        """Next free version, reserved by creating its counts
+           file exclusively: concurrent updates of the store
+           get distinct versions.
+
+           return a tuple (version, open counts file)
+        """
+        versionsList = self.getVersions()
+        version = versionsList[-1] + 1 if len(versionsList) > 0 else 1
+        while True:
+            try:
+                return version, open(self._getPath(
+                    version, ClassifierModelStore.COUNTSEXTENSION), 'xb')
+            except FileExistsError:
+                version += 1
+
+    @contextlib.contextmanager
+    def _lockStore(self):
+        """Exclusive lock of the store, between threads
+           and processes.
+        """
+        with open(self.storeDir + os.sep + ClassifierModelStore.LOCKFILENAME, 'a') as lockFile:
+            fcntl.flock(lockFile, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lockFile, fcntl.LOCK_UN)
+
+    def _writeCurrentVersion(self, version):
+        """Replace the 'current' file, the store is locked.
+        """
+        currentFile = self.storeDir + os.sep + ClassifierModelStore.CURRENTFILENAME
+        tempFile = currentFile + ".tmp"
+        with open(tempFile, 'w') as outputFile:
+            outputFile.write("%d\n" % version)
+        os.replace(tempFile, currentFile)
+
+    def _removeVersion(self, version):
+        """Remove a version that never was the current one,
+           the description first.
+        """
+        for extension in [ClassifierModelStore.INFOEXTENSION, ClassifierModelStore.MAPEXTENSION,
+                          ClassifierModelStore.COUNTSEXTENSION]:
+            os.remove(self._getPath(version, extension))
+
+    def _getPath(self, version, extension):
+        if version is None:
+            version = self.getCurrentVersion()
+        return self.storeDir + os.sep + ClassifierModelStore.VERSIONFORMAT % version + extension
@@ -23,9 +23,11 @@ __license__ = "BSD 3-Clause"
 
 import os 
 import pprint, logging
-import csv, io
+import io
 import unicodecsv
 
+from asrt.common.IndexedList import IndexedFile
+
 class DataList(object):
     """A map between a base name and a file path.
 
@@ -72,27 +74,10 @@ class DataList(object):
                 self.dataDictionary[row[0]] = row[1]
 
     def writeFile(self, dataListFile):
-        """Output the data list to a file.
+        """Output the data list to a file, sorted
+           by base name on disk.
         """
-        dataList = []
-        for key, value in list(self.dataDictionary.items()):
-                dataList.append([key, value])
-
-        dataList = sorted(dataList,key= lambda l: "%s %s" % ([0], l[1]))
-
-        with open(dataListFile,'wb') as csvFile:
-            dataListWriter = unicodecsv.writer(
-                csvFile, 
-                delimiter=DataList.FIELDSEPARATOR,
-                quotechar=DataList.QUOTECHAR,
-                quoting=csv.QUOTE_MINIMAL,
-                encoding='utf-8')
-
-            for key, value in dataList:
-                dataListWriter.writerow([key, value])
-
-            csvFile.seek(-2, os.SEEK_END) # len('\r\n')
-            csvFile.truncate()
+        IndexedFile.writeSorted(self.dataDictionary.items(), dataListFile)
 
     def getDataListFile(self):
         return self.dataListFile
@@ -23,10 +23,12 @@ __license__ = "BSD 3-Clause"
 
 import os 
 import logging
-import csv, copy, io
+import io
 from pprint import pprint
 import unicodecsv
 
+from asrt.common.IndexedList import IndexedFile
+
 class DataMap(object):
     """A tabular structure using the 'join' concept
        of relational databases.
@@ -69,25 +71,10 @@ class DataMap(object):
 
 
     def writeFile(self, mapListFile):
-        """Output the dictionary map to a file.
+        """Output the dictionary map to a file, sorted
+           on disk.
         """
-        #List representation
-        dataList = self.getDictionaryMapAsList()
-        dataList = sorted(dataList,key= lambda l: ";".join(l))
-
-        with open(mapListFile,'wb') as csvFile:
-            dataMapWriter = unicodecsv.writer(
-                csvFile, 
-                delimiter=DataMap.FIELDSEPARATOR,
-                quotechar=DataMap.QUOTECHAR,
-                quoting=csv.QUOTE_MINIMAL,
-                encoding='utf-8')
-
-            for row in dataList:
-                dataMapWriter.writerow(row)
-
-            csvFile.seek(-2, os.SEEK_END) # len('\r\n')
-            csvFile.truncate()
+        IndexedFile.writeSorted(self._iterListEntries(self.dataMap, []), mapListFile)
 
     ########################
     # Getters and setters
@@ -100,12 +87,17 @@ class DataMap(object):
         """
         return self.dataMap
 
+    def iterDictionaryMap(self):
+        """Iterate over (data, representations), same
+           interface as 'IndexedDataMap'.
+        """
+        for key, value in list(self.dataMap.items()):
+            yield key, value
+
     def getDictionaryMapAsList(self):
         """Get the dictionary map as a list representation.
         """
-        dataList = []
-        self._addListEntry(self.dataMap, [], dataList)
-        return dataList
+        return list(self._iterListEntries(self.dataMap, []))
 
     def getCount(self):
         """Number of input data.
@@ -147,20 +139,18 @@ class DataMap(object):
         #Recursive call
         self._addMapEntry(dataDict[entry], inputRow, offset + 1)
 
-    def _addListEntry(self, dataDict, rowList, dataList):
+    def _iterListEntries(self, dataDict, rowList):
         """Recursively got trough dictionaries
-             an output a row at the leaf level.
-
-             The result is stored in 'dataList'
+             and yield a row at the leaf level.
         """
         for key, value in list(dataDict.items()):
             rowList.append(key)
             #Stop condition
             if len(list(value.keys())) == 0:
-                dataList.append(copy.deepcopy(rowList))
+                yield list(rowList)
             else:
                 #Recursive call
-                self._addListEntry(value, rowList, dataList)
+                yield from self._iterListEntries(value, rowList)
             #Pop child entry
             rowList.pop()
 
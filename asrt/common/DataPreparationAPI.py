@@ -21,12 +21,19 @@ __date__ = "Date: 2015/08"
 __copyright__ = "Copyright (c) 2015 Idiap Research Institute"
 __license__ = "BSD 3-Clause"
 
+import os
 import logging
 
-from asrt.common.ioread import Ioread
 from asrt.common.TextDocument import TextDocument
+from asrt.common.SentenceWriter import SentencesWriter
 from asrt.common.ClassifierWord import WordClassifier
-from asrt.common.RegularExpressionList import RegexList
+from asrt.common.ClassifierCharNgram import CharNgramClassifier
+from asrt.common.ClassifierModelStore import ClassifierModelStore
+from asrt.common.RegularExpressionBundle import RegexBundle
+from asrt.common.RegularExpressionBackend import RegexEngine
+from asrt.common.SentenceWatchdog import SentenceWatchdog
+from asrt.common.WordCache import WordCache
+from asrt.common.formula.FormulaLMPreparation import LMPreparationFormula
 from asrt.common.formula.FormulaRegularExpression import RegularExpressionFormula
 from asrt.common.AsrtUtility import getByteString, getErrorMessage
 from asrt.config.AsrtConfig import VALIDATION_TYPE
@@ -55,12 +62,34 @@ class DataPreparationAPI():
         self.removePunctuation = False
         self.verbalizePunctuation = False
         self.segmentWithNLTK = True
+        self.segmenter = TextDocument.SEGMENTERPUNKT
+        self.segmentationWorkers = 1
+        self.segmentationChunkSize = None
+        self.normalizationWorkers = 1
+        self.normalizationBatchSize = None
+        self.stageThreads = 1
+        self.classifierEarlyStopping = False
+        self.classifierMaxWords = None
+        self.classifierModel = None
+        self.wordClassifierModel = None
+        self.classificationMode = TextDocument.CLASSIFYSENTENCES
         self.expandNumberInWords = True
         self.doc = None
         self.wordClassifier = None
+        self.deduplicator = None
+        self.regexProfiler = None
+        self.watchdog = None
+        self.outputCompression = None
+        self.outputShardSize = None
         self.substitutionRegexFormula = RegularExpressionFormula(None)
         self.validationPatternList = []
 
+        #Per run: the engine, the word cache and the
+        #abbreviations tries are shared between documents
+        self.regexEngine = RegexEngine()
+        self.lmPreparationFormula = LMPreparationFormula()
+        self.lmPreparationFormula.setRegexEngine(self.regexEngine)
+
     #####################
     #Getters and setters
     #
@@ -184,28 +213,214 @@ class DataPreparationAPI():
     def setSegmentWithNLTK(self, segmentWithNLTK):
         self.segmentWithNLTK = segmentWithNLTK
 
+    def setSegmenter(self, segmenter):
+        """Sentence segmentation engine, 'punkt' or 'rules'.
+        """
+        self.segmenter = segmenter
+
+    def setParallelSegmentation(self, workers, chunkSize=None):
+        """Segment large documents in chunks of 'chunkSize'
+           characters with 'workers' processes.
+        """
+        self.segmentationWorkers = workers
+        self.segmentationChunkSize = chunkSize
+
+    def setParallelNormalization(self, workers, batchSize=None):
+        """Apply user regular expressions to batches of
+           'batchSize' characters with 'workers' processes.
+        """
+        self.normalizationWorkers = workers
+        self.normalizationBatchSize = batchSize
+
+    def setStageThreads(self, threads):
+        """Run the per sentence stages with a pool of
+           'threads' threads, see 'TextDocument.setStageThreads'.
+        """
+        self.stageThreads = threads
+
+    def setClassificationMode(self, classificationMode):
+        """Language classification mode, 'sentence' or
+           'hierarchical', see 'TextDocument.setClassificationMode'.
+        """
+        self.classificationMode = classificationMode
+
+    def setClassifierBudget(self, earlyStopping, maxWords=None):
+        """Stop classifying the words of a sentence once its
+           language is settled and classify at most 'maxWords'
+           words per sentence, see 'LanguageClassifier'.
+        """
+        self.classifierEarlyStopping = earlyStopping
+        self.classifierMaxWords = maxWords
+        if self.wordClassifier is not None:
+            self.wordClassifier.setEarlyStopping(earlyStopping)
+            self.wordClassifier.setMaxWords(maxWords)
+
+    def setClassifierModel(self, classifierModel):
+        """Classify languages with the character n-grams
+           model file 'classifierModel' instead of training
+           the word classifier, see 'CharNgramClassifier'.
+        """
+        self.classifierModel = classifierModel
+
+    def setWordClassifierModel(self, wordClassifierModel):
+        """Map the words classifier model file written by
+           'LanguageClassifier.exportModel' instead of
+           training, workers share its memory.
+
+           For a 'ClassifierModelStore' directory, its current
+           version is used.
+        """
+        self.wordClassifierModel = wordClassifierModel
+
     def setExpandNumberInWords(self, expandNumberInWords):
         self.expandNumberInWords = expandNumberInWords
+        self.lmPreparationFormula.setExpandNumberInWords(expandNumberInWords)
+
+    def setDeduplicator(self, deduplicator):
+        """Remove duplicated sentences across documents
+           with a 'SentenceDeduplicator', None to disable.
+        """
+        self.deduplicator = deduplicator
+
+    def getDeduplicator(self):
+        return self.deduplicator
+
+    def setRegexProfiler(self, regexProfiler):
+        """Record the calls, matches and time of the user
+           regular expressions with a 'RegexProfiler', None
+           to disable. Sentences are then normalized one by
+           one in this process.
+        """
+        self.regexProfiler = regexProfiler
+        self.substitutionRegexFormula.setProfiler(regexProfiler)
+
+    def getRegexProfiler(self):
+        return self.regexProfiler
+
+    def setRegexBackend(self, backendName):
+        """Match all regular expressions with 'backendName',
+           see 'RegexEngine'. Patterns it does not support
+           are matched with 're'.
+        """
+        self.regexEngine = RegexEngine(backendName)
+        self.lmPreparationFormula.setRegexEngine(self.regexEngine)
+
+    def getRegexBackend(self):
+        return self.regexEngine.getBackendName()
+
+    def getRegexEngine(self):
+        return self.regexEngine
+
+    def setTimeBudget(self, sentenceSeconds, documentSeconds=None,
+                      quarantineFile=None):
+        """Seconds a sentence may spend in a stage and a
+           document from the start of 'prepareDocument', see
+           'SentenceWatchdog'. Sentences over budget are
+           written to 'quarantineFile' and removed.
+
+           Budgets of None disable the watchdog.
+        """
+        self.watchdog = None
+        if sentenceSeconds is not None or documentSeconds is not None:
+            self.watchdog = SentenceWatchdog(sentenceSeconds, documentSeconds,
+                                             quarantineFile)
+
+    def getWatchdog(self):
+        return self.watchdog
+
+    def setWordCacheSize(self, wordCacheSize):
+        """Maximum number of words per stage and language of
+           the word normalization cache, 0 to disable.
+
+           The cache is shared by all documents of this API.
+        """
+        wordCache = None
+        if wordCacheSize > 0:
+            wordCache = WordCache(wordCacheSize)
+        self.lmPreparationFormula.setWordCache(wordCache)
+
+    def getWordCache(self):
+        return self.lmPreparationFormula.getWordCache()
+
+    def setAbbreviationFiles(self, abbreviationFiles):
+        """User abbreviations files merged with the default
+           abbreviations, see 'AbbreviationTrie.readFile'.
+        """
+        self.lmPreparationFormula.setAbbreviationFiles(abbreviationFiles)
+
+    def setOutputCompression(self, outputCompression):
+        """Compression of the language files, None,
+           'gzip' or 'xz'.
+        """
+        self.outputCompression = outputCompression
+
+    def setOutputShardSize(self, outputShardSize):
+        """Maximum size in bytes of the language files,
+           None to disable sharding.
+        """
+        self.outputShardSize = outputShardSize
+
+    def getSentencesWriter(self, outputDir):
+        """A 'SentencesWriter' for 'outputDir' with the
+           output options.
+        """
+        return SentencesWriter(outputDir, self.outputCompression,
+                               self.outputShardSize)
 
     def getDocument(self):
         """Get the underlying 'TextDocument'.
         """
         return self.doc
 
+    def getClassifier(self):
+        """The language classifier, None until
+           'trainClassifier' is called.
+        """
+        return self.wordClassifier
+
+    def getClassificationStatistics(self):
+        """Sentences of the last document per classification
+           path, with the estimated document language in
+           hierarchical mode.
+        """
+        if self.doc is None:
+            return {}
+        return self.doc.getClassificationStatistics()
+
     #####################
     #Public interface
     #
     def trainClassifier(self):
-        """Train the underlying classifier.
+        """Train the underlying classifier, or load the
+           character n-grams model if one is set.
         """
-        if self.wordClassifier == None:
+        if self.wordClassifier != None:
+            return
+
+        if self.classifierModel is not None:
+            self.logger.info("Load the character n-grams classifier ...")
+            self.wordClassifier = CharNgramClassifier.load(self.classifierModel)
+        elif self.wordClassifierModel is not None and \
+                os.path.isdir(self.wordClassifierModel):
+            store = ClassifierModelStore(self.wordClassifierModel)
+            self.logger.info("Map the word classifier version %d ..." %
+                             store.getCurrentVersion())
+            self.wordClassifier = store.getClassifier()
+        elif self.wordClassifierModel is not None:
+            self.logger.info("Map the word classifier ...")
+            self.wordClassifier = WordClassifier()
+            self.wordClassifier.loadModel(self.wordClassifierModel)
+        else:
             self.logger.info("Prepare the word classifier ...")
             self.wordClassifier = WordClassifier()
             self.wordClassifier.train()
+        self.wordClassifier.setEarlyStopping(self.classifierEarlyStopping)
+        self.wordClassifier.setMaxWords(self.classifierMaxWords)
 
     def getRegexes(self):
         """Fetch validation and substitution regexes
-           from csv file.
+           from csv file or from its compiled bundle,
+           see 'RegexBundle.load'.
         """
         #User did not specified rules
         if self.regexFile == None:
@@ -216,8 +431,9 @@ class DataPreparationAPI():
             len(self.validationPatternList) > 0:
             return
 
-        regexList = RegexList().loadFromFile(self.regexFile)
-        self.setRegexList(regexList)
+        regexBundle = RegexBundle.load(self.regexFile)
+        self.setRegexList(regexBundle.getRegexList())
+        self.substitutionRegexFormula.setRules(regexBundle.getRules())
 
     def resetAllPatterns(self):
         """Empty all validation and substitution regexes.
@@ -255,6 +471,10 @@ class DataPreparationAPI():
         try:
             self.logger.info("Document file: %s" % self.inputFile)
 
+            #The formula may have been replaced with new regexes
+            self.substitutionRegexFormula.setProfiler(self.regexProfiler)
+            self.substitutionRegexFormula.setRegexEngine(self.regexEngine)
+
             #The main document
             self.doc = TextDocument(self.inputFile, language,
                                     self.substitutionRegexFormula,
@@ -262,6 +482,18 @@ class DataPreparationAPI():
                                     self.outputDir,
                                     self.segmentWithNLTK,
                                     self.expandNumberInWords)
+            self.doc.setSegmenter(self.segmenter)
+            self.doc.setParallelSegmentation(self.segmentationWorkers,
+                                             self.segmentationChunkSize)
+            self.doc.setParallelNormalization(self.normalizationWorkers,
+                                              self.normalizationBatchSize)
+            self.doc.setStageThreads(self.stageThreads)
+            self.doc.setClassificationMode(self.classificationMode)
+            self.doc.setWatchdog(self.watchdog)
+            self.doc.setRegexEngine(self.regexEngine)
+            self.doc.setLMPreparationFormula(self.lmPreparationFormula)
+            if self.watchdog is not None:
+                self.watchdog.startDocument(self.inputFile)
 
             if self.inputFile != None:
                 self.logger.info("Load file, convert to text when pdf document")
@@ -282,8 +514,11 @@ class DataPreparationAPI():
 
             if language == 0:
                 self.logger.info("Classifying sentences")
+                self.trainClassifier()
                 self.doc.setClassifier(self.wordClassifier)
                 self.doc.classifySentences()
+                self.logger.info("Classification paths: %s" %
+                                 self.doc.getClassificationStatistics())
             else:
                 self.doc.setSentencesLanguage(language)
 
@@ -321,6 +556,11 @@ class DataPreparationAPI():
                     self.logger.info("Filtering data - 2nd stage (remove web address and check German orthograph)")
                     self.doc.filterTextSentences2ndStage()
 
+            #Once sentences are in their final form
+            if self.deduplicator is not None:
+                self.logger.info("Removing duplicated sentences")
+                self.doc.deduplicateTextSentences(self.deduplicator)
+
         except Exception as e:
             errorMessage = "An error has occurred when importing sentences: %s\n%s" % \
                              (getByteString(e.message), self.inputFile)
@@ -343,7 +583,8 @@ class DataPreparationAPI():
                          UNKNOWN_LABEL:[]}
 
         self.appendDocumentSentences(self.doc, sentencesDict)
-        self.outputPerLanguage(sentencesDict, outputDir)
+        self.outputPerLanguage(sentencesDict, outputDir,
+                               self.outputCompression, self.outputShardSize)
 
     @staticmethod
     def appendDocumentSentences(textDocument, sentencesDict):
@@ -369,20 +610,15 @@ class DataPreparationAPI():
              sentencesDict[currentLanguage].append(strOut)
 
     @staticmethod
-    def outputPerLanguage(sentencesDict, outputDir):
+    def outputPerLanguage(sentencesDict, outputDir, compression=None,
+                          maxShardSize=None):
         """Output sentences in language files.
         """
-        io = Ioread()
         #Finally output to disk
-        for resultLanguage, results in list(sentencesDict.items()):
-            if len(results) > 0:
-                DataPreparationAPI.logger.info("%d sentences found for: %s" % (len(results), resultLanguage))
-                strContent = "\n".join(results)
-                strContent = strContent.rstrip() + "\n"
-                outputPath = "%s/sentences_%s.txt" % (outputDir,\
-                                                      resultLanguage)
-                DataPreparationAPI.logger.info("Writing content to: %s" % outputPath)
-                io.writeFileContent(outputPath,strContent)
-            else:
-                DataPreparationAPI.logger.info("No sentences found for: %s" % resultLanguage)
-
+        with SentencesWriter(outputDir, compression, maxShardSize) as writer:
+            for resultLanguage, results in list(sentencesDict.items()):
+                if len(results) == 0:
+                    DataPreparationAPI.logger.info("No sentences found for: %s" % resultLanguage)
+                    continue
+                for strSentence in results:
+                    writer.writeSentence(resultLanguage, strSentence)
@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import os
+import io
+import csv
+import mmap
+import heapq
+import logging
+import tempfile
+from array import array
+
+from asrt.common.MyFile import MyFile
+
+
+class IndexedFile(object):
+    """A list or map file indexed on disk.
+
+       The rows of the source file are sorted by key (first
+       field) with an external merge sort into a '.sorted'
+       file, which has the same format as the source. The
+       '.offsets' file holds the start offset of every row.
+       Both are memory-mapped, lookups are binary searches.
+
+       The index is rebuilt when the source file changes.
+       Fields spanning several lines are not supported.
+    """
+    logger = logging.getLogger("Asrt.IndexedFile")
+
+    FIELDSEPARATOR      = ";"
+    QUOTECHAR           = '"'
+    SORTEDEXTENSION     = ".sorted"
+    OFFSETSEXTENSION    = ".offsets"
+    TEMPEXTENSION       = ".part"
+
+    #Offsets file header
+    MAGIC               = 0x5844495452534100
+    VERSION             = 1
+    HEADERSIZE          = 6
+
+    #Rows sorted in memory at once
+    CHUNKSIZE           = 500000
+
+    #Lists have unique keys
+    UNIQUEKEYS          = False
+
+    def __init__(self, sourceFile, indexDir=None, chunkSize=CHUNKSIZE):
+        """Open the index of 'sourceFile', building it
+           if needed.
+
+           param indexDir : where to store the index files,
+                            default to the source directory
+           param chunkSize: number of rows per sorted run
+        """
+        self.sourceFile = sourceFile
+        self.chunkSize = chunkSize
+
+        if indexDir is None:
+            indexDir = os.path.dirname(os.path.abspath(sourceFile))
+        indexPath = indexDir + os.sep + os.path.basename(sourceFile)
+        self.sortedPath = indexPath + IndexedFile.SORTEDEXTENSION
+        self.offsetsPath = indexPath + IndexedFile.OFFSETSEXTENSION
+
+        self.sortedFile = None
+        self.sortedMap = None
+        self.offsetsFile = None
+        self.offsetsMap = None
+        self.offsets = None
+        self.rowCount = 0
+        self.keyCount = 0
+
+        if not self._isIndexValid():
+            self._buildIndex()
+        self._open()
+
+    #####################
+    #Public interface
+    #
+    def getRowCount(self):
+        return self.rowCount
+
+    def getKeyCount(self):
+        """Number of distinct keys.
+        """
+        return self.keyCount
+
+    def getRow(self, rowIndex):
+        """List of fields of row 'rowIndex'.
+        """
+        return self._parseRow(self._getLine(rowIndex))
+
+    def iterRows(self, start=0, end=None):
+        """Stream rows in key order.
+        """
+        if end is None:
+            end = self.rowCount
+
+        for rowIndex in range(start, end):
+            yield self._parseRow(self._getLine(rowIndex))
+
+    def getShards(self, nbShards):
+        """Split the rows into 'nbShards' balanced ranges,
+           rows with the same key stay together.
+
+           return a list of (start, end) row ranges
+        """
+        if nbShards < 1:
+            raise Exception("Number of shards should be positive")
+
+        boundariesList = [0]
+        for i in range(1, nbShards):
+            boundary = max(boundariesList[-1], i * self.rowCount // nbShards)
+            #Move to a key boundary
+            while 0 < boundary < self.rowCount and \
+                    self._getKey(boundary) == self._getKey(boundary - 1):
+                boundary += 1
+            boundariesList.append(boundary)
+        boundariesList.append(self.rowCount)
+
+        return [(boundariesList[i], boundariesList[i + 1])
+                for i in range(nbShards)]
+
+    @staticmethod
+    def writeSorted(rowsIterable, outputFile, tempDir=None, chunkSize=CHUNKSIZE):
+        """Write 'rowsIterable', lists of fields, sorted by key
+           to 'outputFile' in the list file format, with the
+           external merge sort of the index.
+
+           param tempDir: where to write the sorted runs,
+                          default to the output directory
+        """
+        if tempDir is None:
+            tempDir = os.path.dirname(os.path.abspath(outputFile))
+
+        runPathsList = []
+        try:
+            linesList = []
+            for row in rowsIterable:
+                linesList.append(IndexedFile._formatRow(row))
+                if len(linesList) >= chunkSize:
+                    runPathsList.append(IndexedFile._writeRun(linesList, tempDir))
+                    linesList = []
+            if len(linesList) > 0 or len(runPathsList) == 0:
+                runPathsList.append(IndexedFile._writeRun(linesList, tempDir))
+            linesList = None
+
+            #Same line terminators as 'csv', none after the
+            #last row
+            outputTemp = outputFile + IndexedFile.TEMPEXTENSION
+            with open(outputTemp, 'wb') as sortedFile:
+                separator = b''
+                for line in heapq.merge(*[IndexedFile._readRun(p) for p in runPathsList],
+                                        key=IndexedFile._getSortKey):
+                    sortedFile.write(separator + line)
+                    separator = b'\r\n'
+            os.replace(outputTemp, outputFile)
+        finally:
+            for runPath in runPathsList:
+                MyFile.removeFile(runPath)
+
+    def close(self):
+        """Release the memory maps.
+        """
+        if self.offsets is not None:
+            self.offsets.release()
+            self.offsets = None
+        for item in [self.offsetsMap, self.offsetsFile,
+                     self.sortedMap, self.sortedFile]:
+            if item is not None:
+                item.close()
+        self.offsetsMap = self.offsetsFile = None
+        self.sortedMap = self.sortedFile = None
+
+    def __len__(self):
+        return self.rowCount
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    #####################
+    #Implementation
+    #
+    def _lowerBound(self, key):
+        """Index of the first row whose key is not
+           lower than 'key'.
+        """
+        low, high = 0, self.rowCount
+        while low < high:
+            middle = (low + high) // 2
+            if self._getKey(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _getLine(self, rowIndex):
+        """Raw line of 'rowIndex' without line terminator.
+        """
+        offsetIndex = IndexedFile.HEADERSIZE + rowIndex
+        start, end = self.offsets[offsetIndex], self.offsets[offsetIndex + 1]
+        return self.sortedMap[start:end - 1]
+
+    def _getKey(self, rowIndex):
+        return IndexedFile._getLineKey(self._getLine(rowIndex))
+
+    @staticmethod
+    def _parseRow(line):
+        """Fields of a raw line.
+        """
+        strLine = line.decode('utf-8')
+        if IndexedFile.QUOTECHAR not in strLine:
+            return strLine.split(IndexedFile.FIELDSEPARATOR)
+
+        return next(csv.reader([strLine], delimiter=IndexedFile.FIELDSEPARATOR,
+                               quotechar=IndexedFile.QUOTECHAR))
+
+    @staticmethod
+    def _formatRow(row):
+        """Raw line of a list of fields.
+        """
+        outputLine = io.StringIO()
+        csv.writer(outputLine, delimiter=IndexedFile.FIELDSEPARATOR,
+                   quotechar=IndexedFile.QUOTECHAR, quoting=csv.QUOTE_MINIMAL,
+                   lineterminator="").writerow(row)
+        return outputLine.getvalue().encode('utf-8')
+
+    @staticmethod
+    def _getLineKey(line):
+        """First field of a raw line.
+        """
+        if b'"' in line:
+            return IndexedFile._parseRow(line)[0]
+
+        position = line.find(b';')
+        if position < 0:
+            return line.decode('utf-8')
+        return line[:position].decode('utf-8')
+
+    @staticmethod
+    def _getSortKey(line):
+        return (IndexedFile._getLineKey(line), line)
+
+    def _getSourceState(self):
+        stat = os.stat(self.sourceFile)
+        return stat.st_size, stat.st_mtime_ns
+
+    def _isIndexValid(self):
+        """Index files exist and match the source file.
+        """
+        if not MyFile.checkFileExists(self.sortedPath) or \
+                not MyFile.checkFileExists(self.offsetsPath):
+            return False
+
+        header = array('Q')
+        with open(self.offsetsPath, 'rb') as offsetsFile:
+            try:
+                header.fromfile(offsetsFile, IndexedFile.HEADERSIZE)
+            except EOFError:
+                return False
+
+        return list(header[:4]) == [IndexedFile.MAGIC, IndexedFile.VERSION] + \
+            list(self._getSourceState())
+
+    def _readSourceLines(self):
+        """Non empty raw lines of the source file.
+        """
+        with open(self.sourceFile, 'rb') as sourceFile:
+            for line in sourceFile:
+                line = line.rstrip(b'\r\n')
+                if len(line) > 0:
+                    yield line
+
+    @staticmethod
+    def _writeRun(linesList, tempDir):
+        """Sort 'linesList' into a temporary run file.
+        """
+        linesList.sort(key=IndexedFile._getSortKey)
+        runFile = tempfile.NamedTemporaryFile(dir=tempDir, delete=False,
+                                              suffix=".run")
+        with runFile:
+            for line in linesList:
+                runFile.write(line + b'\n')
+        return runFile.name
+
+    @staticmethod
+    def _readRun(runPath):
+        with open(runPath, 'rb') as runFile:
+            for line in runFile:
+                yield line[:-1]
+
+    def _buildIndex(self):
+        """External merge sort of the source file and
+           offsets computation.
+        """
+        self.logger.info("Indexing %s" % self.sourceFile)
+
+        sourceState = self._getSourceState()
+        tempDir = os.path.dirname(self.sortedPath)
+        runPathsList = []
+        try:
+            #Sorted runs
+            linesList = []
+            for line in self._readSourceLines():
+                linesList.append(line)
+                if len(linesList) >= self.chunkSize:
+                    runPathsList.append(self._writeRun(linesList, tempDir))
+                    linesList = []
+            if len(linesList) > 0 or len(runPathsList) == 0:
+                runPathsList.append(self._writeRun(linesList, tempDir))
+            linesList = None
+
+            #Merge
+            sortedTemp = self.sortedPath + IndexedFile.TEMPEXTENSION
+            offsetsTemp = self.offsetsPath + IndexedFile.TEMPEXTENSION
+            rowCount, keyCount = 0, 0
+            with open(sortedTemp, 'wb') as sortedFile, \
+                    open(offsetsTemp, 'wb') as offsetsFile:
+                array('Q', [0] * IndexedFile.HEADERSIZE).tofile(offsetsFile)
+
+                offsets, offset, previousKey = array('Q', [0]), 0, None
+                for line in heapq.merge(*[self._readRun(p) for p in runPathsList],
+                                        key=IndexedFile._getSortKey):
+                    key = IndexedFile._getLineKey(line)
+                    if key != previousKey:
+                        keyCount += 1
+                    elif self.UNIQUEKEYS:
+                        raise Exception(key + " is not a unique name!")
+                    previousKey = key
+
+                    sortedFile.write(line + b'\n')
+                    offset += len(line) + 1
+                    offsets.append(offset)
+                    rowCount += 1
+
+                    if len(offsets) >= self.chunkSize:
+                        offsets.tofile(offsetsFile)
+                        offsets = array('Q')
+                offsets.tofile(offsetsFile)
+
+                offsetsFile.seek(0)
+                array('Q', [IndexedFile.MAGIC, IndexedFile.VERSION] +
+                      list(sourceState) + [rowCount, keyCount]).tofile(offsetsFile)
+
+            os.replace(sortedTemp, self.sortedPath)
+            os.replace(offsetsTemp, self.offsetsPath)
+        finally:
+            for runPath in runPathsList:
+                MyFile.removeFile(runPath)
+
+    def _open(self):
+        """Memory map the index files.
+        """
+        self.offsetsFile = open(self.offsetsPath, 'rb')
+        self.offsetsMap = mmap.mmap(self.offsetsFile.fileno(), 0,
+                                    access=mmap.ACCESS_READ)
+        self.offsets = memoryview(self.offsetsMap).cast('Q')
+        self.rowCount = self.offsets[4]
+        self.keyCount = self.offsets[5]
+
+        self.sortedFile = open(self.sortedPath, 'rb')
+        if self.rowCount > 0:
+            self.sortedMap = mmap.mmap(self.sortedFile.fileno(), 0,
+                                       access=mmap.ACCESS_READ)
+
+
+class IndexedDataList(IndexedFile):
+    """Indexed version of 'DataList'.
+    """
+    logger = logging.getLogger("Asrt.IndexedDataList")
+
+    UNIQUEKEYS = True
+
+    def getDataListFile(self):
+        return self.sourceFile
+
+    def getPath(self, baseName):
+        """Return the full path of 'baseName'
+           or None.
+        """
+        rowIndex = self._lowerBound(baseName)
+        if rowIndex < self.rowCount:
+            row = self.getRow(rowIndex)
+            if row[0] == baseName:
+                return os.path.abspath(row[1])
+
+        return None
+
+    def getCount(self):
+        """Number of input data.
+        """
+        return self.rowCount
+
+    def __contains__(self, baseName):
+        return self.getPath(baseName) is not None
+
+    def __iter__(self):
+        """Stream (base name, path) in base name order.
+        """
+        for row in self.iterRows():
+            yield row[0], row[1]
+
+
+class IndexedDataMap(IndexedFile):
+    """Indexed version of 'DataMap'. Representations of
+       a data are returned as nested dictionaries like
+       in 'DataMap.getDictionaryMap'.
+    """
+    logger = logging.getLogger("Asrt.IndexedDataMap")
+
+    def getDataMapFile(self):
+        return self.sourceFile
+
+    def getCount(self):
+        """Number of input data.
+        """
+        return self.keyCount
+
+    def getRepresentations(self, key):
+        """Nested dictionary of the 'key' representations
+           or None.
+        """
+        rowIndex = self._lowerBound(key)
+        representations = None
+        while rowIndex < self.rowCount:
+            row = self.getRow(rowIndex)
+            if row[0] != key:
+                break
+            if representations is None:
+                representations = {}
+            self._addRepresentation(representations, row)
+            rowIndex += 1
+
+        return representations
+
+    def iterDictionaryMap(self, start=0, end=None):
+        """Stream (key, representations) in key order.
+
+           param start, end: a row range from 'getShards'
+        """
+        currentKey, representations = None, None
+        for row in self.iterRows(start, end):
+            if row[0] != currentKey:
+                if currentKey is not None:
+                    yield currentKey, representations
+                currentKey, representations = row[0], {}
+            self._addRepresentation(representations, row)
+
+        if currentKey is not None:
+            yield currentKey, representations
+
+    def __contains__(self, key):
+        rowIndex = self._lowerBound(key)
+        return rowIndex < self.rowCount and self._getKey(rowIndex) == key
+
+    @staticmethod
+    def _addRepresentation(representations, row):
+        for entry in row[1:]:
+            representations = representations.setdefault(entry, {})
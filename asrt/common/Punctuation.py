@@ -25,6 +25,7 @@ __license__     = "BSD 3-Clause"
 
 import sys
 import re, logging
+import functools
 
 from asrt.common.ioread import Ioread
 
@@ -112,65 +113,63 @@ class Punctuation(object):
     ########################
     # Private interface
     #
-    def __simpleRepl(self, match):
+    # The replacement value is bound per call, a model
+    # may be shared between threads
+    #
+    def __simpleRepl(self, value, match):
         """ just replace with the text no word associated with it
         """
-        return ' ' + self.replace_temp + ' '
+        return ' ' + value + ' '
 
-    def __simpleNSRepl(self, match):
+    def __simpleNSRepl(self, value, match):
         """ replace with the text and remove all space
         """
-        return self.replace_temp
+        return value
 
-    def __simpleNSRRepl(self, match):
+    def __simpleNSRRepl(self, value, match):
         """ replace with no space on the right
         """
-        return ' ' + self.replace_temp
+        return ' ' + value
 
-    def __simpleNSLRepl(self, match):
+    def __simpleNSLRepl(self, value, match):
         """ replace with no space on the left
         """
-        return self.replace_temp + ' '
+        return value + ' '
 
-    def __prefixRepl(self, match):
+    def __prefixRepl(self, value, match):
         """ replace a value prefixed with some text
         """
-        return ' ' + self.replace_temp + ' ' + match.group(1) + ' '
+        return ' ' + value + ' ' + match.group(1) + ' '
 
-    def __postfixRepl(self, match):
+    def __postfixRepl(self, value, match):
         """ replace a valus postfixed with some text
         """
-        return ' ' + match.group(1) + ' ' + self.replace_temp + ' '
+        return ' ' + match.group(1) + ' ' + value + ' '
 
-    def __middleRepl(self, match):
+    def __middleRepl(self, value, match):
         """ replace a value in the middle of a text
         """
-        return ' ' + self.replace_temp[0] + match.group(1).strip() + self.replace_temp[1] + ' '
+        return ' ' + value[0] + match.group(1).strip() + value[1] + ' '
 
     def __replaceList(self, list_word, input_text):
         """ replace a list of word by another using regexp
         """
+        replDict = {SIMPLE_t : self.__simpleRepl,
+                    SIMPLE_NS_t : self.__simpleNSRepl,
+                    SIMPLE_NSR_t : self.__simpleNSRRepl,
+                    SIMPLE_NSL_t : self.__simpleNSLRepl,
+                    MIDDLE_t : self.__middleRepl,
+                    PREFIX_t : self.__prefixRepl,
+                    POSTFIX_t : self.__postfixRepl}
+
         output_text = input_text
         for elem in list_word :
             key = elem[0]
             kind = elem[1]
             value = elem[2]
-            # cheat to pass value to the repl
-            self.replace_temp = value
-            if kind == SIMPLE_t :
-                output_text = re.sub(key, self.__simpleRepl, output_text)
-            elif kind == SIMPLE_NS_t :
-                output_text = re.sub(key, self.__simpleNSRepl, output_text)
-            elif kind == SIMPLE_NSR_t :
-                output_text = re.sub(key, self.__simpleNSRRepl, output_text)
-            elif kind == SIMPLE_NSL_t :
-                output_text = re.sub(key, self.__simpleNSLRepl, output_text)
-            elif kind == MIDDLE_t :
-                output_text = re.sub(key, self.__middleRepl, output_text)
-            elif kind == PREFIX_t :
-                output_text = re.sub(key, self.__prefixRepl, output_text)
-            elif kind == POSTFIX_t :
-                output_text = re.sub(key, self.__postfixRepl, output_text)
+            if kind in replDict :
+                output_text = re.sub(key, functools.partial(replDict[kind], value),
+                                     output_text)
         split_text = output_text.split()
         return " ".join(split_text)
 
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import re
+import logging
+import threading
+
+
+class RegexBackendException(Exception):
+    """A pattern the backend can not match as 're' does.
+    """
+
+    def __init__(self, message):
+        super(RegexBackendException, self).__init__(message)
+
+
+class RegexBackend(object):
+    """The python 're' engine, the default backend and
+       the base of the optional ones.
+
+       'compile' returns an object with the interface of
+       compiled 're' patterns: sub, subn, search, match,
+       split, groups and groupindex.
+    """
+    NAME = 're'
+
+    def isAvailable(self):
+        return True
+
+    def compile(self, strPattern, flags=0):
+        return re.compile(strPattern, flags)
+
+
+class RegexModuleBackend(RegexBackend):
+    """The 'regex' module, compatible with 're' in its
+       version 0 behaviour.
+    """
+    NAME = 'regex'
+
+    def __init__(self):
+        self.module = None
+
+    def isAvailable(self):
+        try:
+            import regex
+        except ImportError:
+            return False
+        self.module = regex
+        return True
+
+    def compile(self, strPattern, flags=0):
+        try:
+            return self.module.compile(strPattern, flags | self.module.VERSION0)
+        except self.module.error as e:
+            raise RegexBackendException(str(e))
+
+
+class Re2Backend(RegexBackend):
+    """The 'google-re2' module, matching in linear time
+       of the text length without backtracking.
+
+       Patterns are translated: the classes \\w, \\d and \\s
+       are made unicode as in 're' and the python flags
+       become inline flags. Back references, lookarounds,
+       word boundaries and '$' before a final new line have
+       no equivalent, these patterns are not supported.
+    """
+    NAME = 're2'
+
+    #Unicode classes of 're'
+    CLASSES         = {'w': "\\p{L}\\p{N}_",
+                       'd': "\\p{Nd}",
+                       's': "\\t\\n\\x{0b}\\f\\r\\x{1c}-\\x{20}\\x{85}\\x{a0}\\x{1680}" +
+                            "\\x{2000}-\\x{200a}\\x{2028}\\x{2029}\\x{202f}\\x{205f}\\x{3000}"}
+    INLINEFLAGS     = [(re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's')]
+    IGNOREDFLAGS    = re.UNICODE
+    TEMPLATEPARTS   = re.compile(r"\\g<([^>]*)>|\\([1-9][0-9]?)|\\(.)", re.DOTALL)
+    ESCAPES         = {'n': "\n", 't': "\t", 'r': "\r", 'f': "\f", 'v': "\v",
+                       'a': "\a", 'b': "\b", '\\': "\\"}
+
+    def __init__(self):
+        self.module = None
+
+    def isAvailable(self):
+        try:
+            import re2
+        except ImportError:
+            return False
+        #Another module with the same name
+        if not hasattr(re2, 'Options'):
+            return False
+        self.module = re2
+        return True
+
+    def compile(self, strPattern, flags=0):
+        options = self.module.Options()
+        options.log_errors = False
+        try:
+            regexp = self.module.compile(Re2Backend.translate(strPattern, flags), options)
+        except self.module.error as e:
+            raise RegexBackendException(str(e))
+        return _Re2Pattern(regexp, strPattern, flags)
+
+    #####################
+    #Static methods
+    #
+    @staticmethod
+    def translate(strPattern, flags=0):
+        """The RE2 pattern matching as 'strPattern' with
+           'flags' does with 're'.
+        """
+        strInline = ""
+        for flag, strFlag in Re2Backend.INLINEFLAGS:
+            if flags & flag:
+                strInline += strFlag
+                flags &= ~flag
+        if flags & ~Re2Backend.IGNOREDFLAGS:
+            raise RegexBackendException("unsupported flags %d" % flags)
+
+        partsList, i, inClass, classStart = [], 0, False, 0
+        while i < len(strPattern):
+            c = strPattern[i]
+            if c == '\\':
+                if i + 1 == len(strPattern):
+                    raise RegexBackendException("trailing backslash")
+                c = strPattern[i + 1]
+                i += 2
+                if c in Re2Backend.CLASSES:
+                    partsList.append(Re2Backend.CLASSES[c] if inClass
+                                     else "[%s]" % Re2Backend.CLASSES[c])
+                elif c == 'D':
+                    partsList.append("\\P{Nd}")
+                elif c in "WS" and not inClass:
+                    partsList.append("[^%s]" % Re2Backend.CLASSES[c.lower()])
+                elif c == 'Z':
+                    partsList.append("\\z")
+                elif c in "uU":
+                    digitsCount = 4 if c == 'u' else 8
+                    partsList.append("\\x{%s}" % strPattern[i:i + digitsCount])
+                    i += digitsCount
+                elif c in "WSbBN" or c.isdigit():
+                    raise RegexBackendException("unsupported escape \\%s" % c)
+                else:
+                    partsList.append("\\" + c)
+                continue
+
+            if inClass:
+                if c == ']' and i > classStart:
+                    inClass = False
+                elif c == '[' and strPattern[i + 1:i + 2] in [':', '=', '.']:
+                    raise RegexBackendException("unsupported nested set")
+            elif c == '[':
+                inClass = True
+                classStart = i + 2 if strPattern[i + 1:i + 2] == '^' else i + 1
+            elif c == '(' and strPattern[i + 1:i + 2] == '?':
+                if strPattern[i + 2:i + 3] in ['=', '!', '<', '>', '('] or \
+                   strPattern[i + 2:i + 4] == 'P=':
+                    raise RegexBackendException("unsupported group (?%s" %
+                                                strPattern[i + 2:i + 3])
+            elif c == '$' and not 'm' in strInline:
+                raise RegexBackendException("unsupported '$' without multiline")
+            partsList.append(c)
+            i += 1
+
+        if len(strInline) > 0:
+            partsList.insert(0, "(?%s)" % strInline)
+        return "".join(partsList)
+
+    @staticmethod
+    def compileTemplate(strTemplate):
+        """Pieces of an 're' substitution template: literal
+           strings and group references, as 1-tuples.
+
+           The 're2' module expands templates with escape
+           codecs that do not keep non ascii characters.
+        """
+        piecesList, start = [], 0
+        for match in Re2Backend.TEMPLATEPARTS.finditer(strTemplate):
+            piecesList.append(strTemplate[start:match.start()])
+            start = match.end()
+            name, number, escape = match.groups()
+            if number is not None:
+                piecesList.append((int(number),))
+            elif name is not None:
+                piecesList.append((int(name) if name.isdigit() else name,))
+            elif escape in Re2Backend.ESCAPES:
+                piecesList.append(Re2Backend.ESCAPES[escape])
+            elif escape.isascii() and escape.isalnum():
+                raise re.error("bad escape \\%s" % escape)
+            else:
+                piecesList.append("\\" + escape)
+        piecesList.append(strTemplate[start:])
+        return [p for p in piecesList if p != ""]
+
+
+class _Re2Pattern(object):
+    """A compiled RE2 pattern with the interface of 're'.
+    """
+
+    def __init__(self, regexp, strPattern, flags):
+        self.regexp = regexp
+        self.pattern = strPattern
+        self.flags = flags
+        self.groups = regexp.groups
+        self.groupindex = regexp.groupindex
+        self.replacementsDict = {}
+
+    def sub(self, repl, string, count=0):
+        return self.subn(repl, string, count)[0]
+
+    def subn(self, repl, string, count=0):
+        #The module substitutes in python, most rules
+        #do not match
+        if self.regexp.search(string) is None:
+            return string, 0
+        return self.regexp.subn(self._getReplacement(repl), string, count)
+
+    def search(self, string):
+        return self.regexp.search(string)
+
+    def match(self, string):
+        return self.regexp.match(string)
+
+    def split(self, string, maxsplit=0):
+        return self.regexp.split(string, maxsplit)
+
+    def _getReplacement(self, repl):
+        """A function expanding the template 'repl'.
+        """
+        if callable(repl):
+            return repl
+        if repl not in self.replacementsDict:
+            piecesList = Re2Backend.compileTemplate(repl)
+            for piece in piecesList:
+                if isinstance(piece, tuple) and piece[0] not in self.groupindex and \
+                   not (isinstance(piece[0], int) and piece[0] <= self.groups):
+                    raise re.error("invalid group reference %s" % piece[0])
+            self.replacementsDict[repl] = lambda m: "".join(
+                [p if isinstance(p, str) else m.group(p[0]) or "" for p in piecesList])
+        return self.replacementsDict[repl]
+
+
+class RegexEngine(object):
+    """Compile patterns with a backend, 're' by default.
+
+       A pattern the backend does not support is compiled
+       with 're', each pattern falls back on its own. An
+       optional backend that is not installed is replaced
+       by 're'.
+
+       An engine is created per run and passed to the
+       formulas, its compiled patterns and statistics are
+       its own. Only the backend name is pickled.
+
+       Usage:
+          regexEngine = RegexEngine('re2')
+          regexEngine.getRegex(strPattern, re.UNICODE).search(strText)
+    """
+    logger = logging.getLogger("Asrt.RegexEngine")
+
+    DEFAULT         = RegexBackend.NAME
+    BACKENDS        = [RegexBackend, RegexModuleBackend, Re2Backend]
+    MAXFALLBACKS    = 20
+
+    #The 're' engine of the fixed internal tables
+    defaultEngine = None
+
+    def __init__(self, backendName=DEFAULT):
+        """Default constructor.
+
+           param backendName: one of 'getBackendNames'
+        """
+        backendsDict = dict([(b.NAME, b) for b in RegexEngine.BACKENDS])
+        if backendName not in backendsDict:
+            raise Exception("Unknown regular expressions backend: %s" % backendName)
+
+        self.backend = backendsDict[backendName]()
+        if not self.backend.isAvailable():
+            self.logger.warning("Regular expressions backend %s is not installed, using %s" %
+                                (backendName, RegexEngine.DEFAULT))
+            self.backend = RegexBackend()
+
+        self.patternsDict = {}
+        self.lock = threading.Lock()
+        self.resetStatistics()
+
+    #####################
+    #Static methods
+    #
+    @staticmethod
+    def getBackendNames():
+        return [b.NAME for b in RegexEngine.BACKENDS]
+
+    @staticmethod
+    def getAvailableBackends():
+        """Names of the installed backends.
+        """
+        return [b.NAME for b in RegexEngine.BACKENDS if b().isAvailable()]
+
+    @staticmethod
+    def getDefault():
+        """The shared 're' engine, for the formulas that
+           are not given one.
+        """
+        if RegexEngine.defaultEngine is None:
+            RegexEngine.defaultEngine = RegexEngine()
+        return RegexEngine.defaultEngine
+
+    #####################
+    #Public interface
+    #
+    def getBackendName(self):
+        return self.backend.NAME
+
+    def compile(self, strPattern, flags=0):
+        """Compile 'strPattern' with the backend, with 're'
+           when not supported.
+        """
+        if self.backend.NAME == RegexEngine.DEFAULT:
+            return re.compile(strPattern, flags)
+
+        try:
+            pattern = self.backend.compile(strPattern, flags)
+            bFallback = False
+        except RegexBackendException as e:
+            pattern = re.compile(strPattern, flags)
+            bFallback = True
+            self.logger.debug("Pattern '%s' compiled with %s: %s" %
+                              (strPattern, RegexEngine.DEFAULT, e))
+
+        with self.lock:
+            statisticsDict = self.statisticsDict
+            statisticsDict['patterns'] += 1
+            if bFallback:
+                statisticsDict['fallbacks'] += 1
+                if len(statisticsDict['fallbacksList']) < RegexEngine.MAXFALLBACKS:
+                    statisticsDict['fallbacksList'].append(strPattern)
+        return pattern
+
+    def getRegex(self, strPattern, flags=0):
+        """Compiled 'strPattern', cached per engine.
+        """
+        key = (strPattern, flags)
+        pattern = self.patternsDict.get(key)
+        if pattern is None:
+            pattern = self.patternsDict[key] = self.compile(strPattern, flags)
+        return pattern
+
+    def getStatistics(self):
+        with self.lock:
+            return dict(self.statisticsDict, backend=self.getBackendName(),
+                        fallbacksList=list(self.statisticsDict['fallbacksList']))
+
+    def resetStatistics(self):
+        """Count the patterns again from zero, the compiled
+           patterns are kept.
+        """
+        with self.lock:
+            self.statisticsDict = {'patterns': 0, 'fallbacks': 0, 'fallbacksList': []}
+
+    def getReport(self):
+        statisticsDict = self.getStatistics()
+        strReport = "Regular expressions backend %s: %d patterns, %d compiled with %s" % \
+            (statisticsDict['backend'], statisticsDict['patterns'],
+             statisticsDict['fallbacks'], RegexEngine.DEFAULT)
+        if statisticsDict['fallbacks'] > 0:
+            strReport += " (%s)" % ", ".join(["'%s'" % p for p in statisticsDict['fallbacksList']])
+        return strReport
+
+    def __getstate__(self):
+        return {'backendName': self.getBackendName()}
+
+    def __setstate__(self, stateDict):
+        self.__init__(**stateDict)
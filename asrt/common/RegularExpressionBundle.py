@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import os
+import re
+import json
+import hashlib
+import logging
+
+from asrt.common.ioread import Ioread
+from asrt.common.RegularExpressionList import RegexList
+from asrt.common.formula.FormulaRegularExpression import RegexRule, RegularExpressionFormula
+from asrt.config.AsrtConfig import VALIDATION_TYPE, LANGUAGEID2LABELS
+
+
+class RegexBundle():
+    """User regular expressions validated and expanded
+       once, see 'RegexList.loadFromFile' for the csv
+       format.
+
+       A bundle keeps the csv rows and the substitution
+       rules with their type context and groups count. It
+       records the checksum of its csv file: a bundle is
+       stale once the csv changes. Python cannot store
+       compiled patterns, rules are compiled on first use.
+
+       File layout:
+          - magic line
+          - json header line with the checksums
+          - json content line
+    """
+    logger = logging.getLogger("Asrt.RegexBundle")
+
+    MAGIC           = b"ASRT-REGEXBUNDLE-1\n"
+    EXTENSION       = ".bundle"
+    FIELDSCOUNT     = 4
+    TYPES           = [VALIDATION_TYPE, 1, 2, 3, 4, 5, 6]
+    GROUPREFERENCE  = re.compile(r"\\g<([^>]*)>|\\([0-9]+)")
+
+    def __init__(self, regexList, rulesList, sourceFile=None, sourceChecksum=None):
+        """Default constructor.
+
+           param regexList     : csv rows, see 'RegexList.loadFromFile'
+           param rulesList     : the 'RegexRule' of the substitution rows
+           param sourceFile    : the csv file
+           param sourceChecksum: checksum of the csv file
+        """
+        self.regexList = regexList
+        self.rulesList = rulesList
+        self.sourceFile = sourceFile
+        self.sourceChecksum = sourceChecksum
+
+    #####################
+    #Public interface
+    #
+    def getRegexList(self):
+        return self.regexList
+
+    def getRules(self):
+        return self.rulesList
+
+    def save(self, bundleFile):
+        """Write the bundle to 'bundleFile'.
+        """
+        content = json.dumps({'regexList': self.regexList,
+                              'rules': [r.toList() for r in self.rulesList]},
+                             ensure_ascii=False, sort_keys=True).encode('utf-8')
+        headerDict = {'source': self.sourceFile, 'sourceChecksum': self.sourceChecksum,
+                      'checksum': hashlib.sha256(content).hexdigest(),
+                      'rows': len(self.regexList), 'rules': len(self.rulesList)}
+
+        with open(bundleFile + ".tmp", 'wb') as outputFile:
+            outputFile.write(RegexBundle.MAGIC)
+            outputFile.write((json.dumps(headerDict, sort_keys=True) + "\n").encode('utf-8'))
+            outputFile.write(content)
+        os.replace(bundleFile + ".tmp", bundleFile)
+
+        RegexBundle.logger.info("Saved %d rules of %d rows to %s" %
+                                (len(self.rulesList), len(self.regexList), bundleFile))
+
+    #####################
+    #Static methods
+    #
+    @staticmethod
+    def compile(regexFile, bundleFile=None):
+        """Validate 'regexFile' and save its bundle to
+           'bundleFile', default to 'regexFile.bundle'.
+
+           return the bundle
+        """
+        rowsList = Ioread().readCSV(regexFile, '\t')[1:]
+        rulesList, errorsList = RegexBundle.validate(rowsList)
+        if len(errorsList) > 0:
+            raise Exception("Invalid regular expressions file %s:\n%s" %
+                            (regexFile, "\n".join(errorsList)))
+
+        bundle = RegexBundle(RegexBundle._getRegexList(rowsList), rulesList,
+                             os.path.abspath(regexFile), RegexBundle.getChecksum(regexFile))
+        bundle.save(bundleFile or regexFile + RegexBundle.EXTENSION)
+        return bundle
+
+    @staticmethod
+    def validate(rowsList):
+        """Check the csv rows, without their header: fields
+           count, type, language, patterns, lambda substitutions
+           and groups references.
+
+           return the compiled rules and a list of errors
+        """
+        rulesList, errorsList = [], []
+        for i, row in enumerate(rowsList):
+            strLine = "line %d" % (i + 2)
+            if len(row) < RegexBundle.FIELDSCOUNT:
+                errorsList.append("%s: %d fields instead of %d" %
+                                  (strLine, len(row), RegexBundle.FIELDSCOUNT))
+                continue
+
+            try:
+                regexType = int(row[RegexList.TYPEINDICE])
+                languageId = int(row[RegexList.LANGUAGEINDICE])
+            except ValueError:
+                errorsList.append("%s: type and language need to be integers" % strLine)
+                continue
+            if regexType not in RegexBundle.TYPES:
+                errorsList.append("%s: unknown type %d" % (strLine, regexType))
+                continue
+            if languageId not in LANGUAGEID2LABELS:
+                errorsList.append("%s: unknown language %d" % (strLine, languageId))
+                continue
+
+            if regexType == VALIDATION_TYPE:
+                try:
+                    re.compile(row[RegexList.MATCHINGINDICE], flags=re.UNICODE)
+                except re.error as e:
+                    errorsList.append("%s: %s" % (strLine, e))
+                continue
+
+            try:
+                rowRulesList = RegularExpressionFormula.prepareRules(
+                    RegexList.removeComments([row]))
+                for rule in rowRulesList:
+                    rule.compile()
+                    RegexBundle._checkReferences(rule)
+            except Exception as e:
+                errorsList.append("%s: %s" % (strLine, e))
+                continue
+
+            rulesList.extend(rowRulesList)
+
+        return rulesList, errorsList
+
+    @staticmethod
+    def read(bundleFile):
+        """Read a bundle, its content checksum is verified.
+        """
+        with open(bundleFile, 'rb') as inputFile:
+            if inputFile.readline() != RegexBundle.MAGIC:
+                raise Exception("Not a regular expressions bundle: %s" % bundleFile)
+            headerDict = json.loads(inputFile.readline().decode('utf-8'))
+            content = inputFile.read()
+
+        if hashlib.sha256(content).hexdigest() != headerDict['checksum']:
+            raise Exception("Corrupted regular expressions bundle: %s" % bundleFile)
+
+        contentDict = json.loads(content.decode('utf-8'))
+        return RegexBundle(contentDict['regexList'],
+                           [RegexRule(*r) for r in contentDict['rules']],
+                           headerDict['source'], headerDict['sourceChecksum'])
+
+    @staticmethod
+    def load(regexFile):
+        """Regular expressions of 'regexFile', a bundle or
+           a csv file.
+
+           The bundle of a csv file, 'regexFile.bundle', is
+           used when valid. The csv file of a stale bundle is
+           loaded instead.
+        """
+        if RegexBundle.isBundle(regexFile):
+            bundleFile, sourceFile = regexFile, None
+        else:
+            bundleFile, sourceFile = regexFile + RegexBundle.EXTENSION, regexFile
+
+        if os.path.exists(bundleFile):
+            try:
+                bundle = RegexBundle.read(bundleFile)
+                sourceFile = sourceFile or bundle.sourceFile
+                if not os.path.exists(sourceFile) or \
+                   RegexBundle.getChecksum(sourceFile) == bundle.sourceChecksum:
+                    RegexBundle.logger.info("Loaded %d rules from %s" %
+                                            (len(bundle.rulesList), bundleFile))
+                    return bundle
+                RegexBundle.logger.warning("Stale bundle %s, loading %s" %
+                                           (bundleFile, sourceFile))
+            except Exception as e:
+                if sourceFile is None:
+                    raise
+                RegexBundle.logger.warning("%s, loading %s" % (e, sourceFile))
+
+        regexList = RegexBundle._getRegexList(RegexList.loadFromFile(sourceFile))
+        rulesList = RegularExpressionFormula.prepareRules(
+            [r for r in regexList if int(r[RegexList.TYPEINDICE]) != VALIDATION_TYPE])
+        return RegexBundle(regexList, rulesList, os.path.abspath(sourceFile))
+
+    @staticmethod
+    def isBundle(filePath):
+        with open(filePath, 'rb') as inputFile:
+            return inputFile.read(len(RegexBundle.MAGIC)) == RegexBundle.MAGIC
+
+    @staticmethod
+    def getChecksum(filePath):
+        digest = hashlib.sha256()
+        with open(filePath, 'rb') as inputFile:
+            for block in iter(lambda: inputFile.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    #####################
+    #Implementation
+    #
+    @staticmethod
+    def _getRegexList(rowsList):
+        """Rows as lists of their first four fields.
+        """
+        return [list(row[:RegexBundle.FIELDSCOUNT]) for row in rowsList]
+
+    @staticmethod
+    def _checkReferences(rule):
+        """Groups referenced by the substitution need to
+           exist in the pattern.
+        """
+        if rule.isCallable():
+            if not callable(rule.replacement):
+                raise Exception("substitution is not callable")
+            return
+
+        for name, number in RegexBundle.GROUPREFERENCE.findall(rule.strSubstitution):
+            reference = name or number
+            if reference.isdigit():
+                if int(reference) > rule.groups:
+                    raise Exception("group %s referenced, %d in '%s'" %
+                                    (reference, rule.groups, rule.strPattern))
+            elif reference not in rule.pattern.groupindex:
+                raise Exception("unknown group %s in '%s'" % (reference, rule.strPattern))
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import json
+import math
+import logging
+import threading
+
+
+class RegexProfiler(object):
+    """Calls, matches and time of each substitution rule
+       per language, recorded by 'RegularExpressionFormula'
+       once set with 'setProfiler'.
+
+       Times are also summed per text length bucket, powers
+       of two, to estimate how the time of a rule grows with
+       the length: about 1 for a linear scan, more for rules
+       that backtrack. Shorter texts than 'MINLENGTH' are
+       left out, their time is mostly the call overhead.
+
+       Rules registered with 'registerRules' and never
+       applied are reported with 0 calls.
+
+       Usage:
+          profiler = RegexProfiler()
+          formula.setProfiler(profiler)
+          ...
+          print(profiler.getReport())
+    """
+    logger = logging.getLogger("Asrt.RegexProfiler")
+
+    SUPERLINEAREXPONENT = 1.5
+    MINBUCKETS          = 3
+    MINLENGTH           = 64
+
+    def __init__(self):
+        self.rulesDict = {}
+        self.registeredDict = {}
+        self.lock = threading.Lock()
+
+    #####################
+    #Public interface
+    #
+    def registerRules(self, rulesList):
+        """Register all the rules of a formula, 'RegexRule'
+           objects, applied or not.
+        """
+        with self.lock:
+            for rule in rulesList:
+                self.registeredDict.setdefault((rule.strPattern, rule.strSubstitution),
+                                               rule.languageId)
+
+    def record(self, rule, languageId, textLength, seconds, matches):
+        """Record one application of 'rule', a 'RegexRule',
+           to a text of 'textLength' characters.
+        """
+        key = (rule.strPattern, rule.strSubstitution, languageId)
+        with self.lock:
+            statsDict = self.rulesDict.get(key)
+            if statsDict is None:
+                statsDict = self.rulesDict[key] = RegexProfiler._getEmptyStats()
+            statsDict['calls'] += 1
+            statsDict['matches'] += matches
+            statsDict['seconds'] += seconds
+            if seconds > statsDict['maxSeconds']:
+                statsDict['maxSeconds'] = seconds
+                statsDict['maxLength'] = textLength
+
+            bucket = statsDict['buckets'].setdefault(textLength.bit_length(), [0, 0, 0.0])
+            bucket[0] += 1
+            bucket[1] += textLength
+            bucket[2] += seconds
+
+    def merge(self, profiler):
+        """Add the records of 'profiler'.
+        """
+        otherItems, otherRegisteredDict = profiler._getSnapshot()
+        with self.lock:
+            for key, languageId in otherRegisteredDict.items():
+                self.registeredDict.setdefault(key, languageId)
+            for key, otherDict in otherItems:
+                statsDict = self.rulesDict.setdefault(key, RegexProfiler._getEmptyStats())
+                for name in ['calls', 'matches', 'seconds']:
+                    statsDict[name] += otherDict[name]
+                if otherDict['maxSeconds'] > statsDict['maxSeconds']:
+                    statsDict['maxSeconds'] = otherDict['maxSeconds']
+                    statsDict['maxLength'] = otherDict['maxLength']
+                for bucketIndex, otherBucket in otherDict['buckets'].items():
+                    bucket = statsDict['buckets'].setdefault(bucketIndex, [0, 0, 0.0])
+                    for i in range(3):
+                        bucket[i] += otherBucket[i]
+
+    def getStatistics(self):
+        """Statistics per rule and language, with the
+           estimated growth exponent, None with less than
+           'MINBUCKETS' length buckets.
+
+           return a list of dictionaries, slowest first
+        """
+        rulesItems, registeredDict = self._getSnapshot()
+        statisticsList = []
+        for (strPattern, strSubstitution, languageId), statsDict in rulesItems:
+            statisticsList.append({'pattern': strPattern, 'substitution': strSubstitution,
+                                   'languageId': languageId,
+                                   'calls': statsDict['calls'],
+                                   'matches': statsDict['matches'],
+                                   'seconds': statsDict['seconds'],
+                                   'maxSeconds': statsDict['maxSeconds'],
+                                   'maxLength': statsDict['maxLength'],
+                                   'exponent': RegexProfiler.getExponent(statsDict['buckets'])})
+
+        #Registered rules never applied
+        appliedSet = set([k[:2] for k, statsDict in rulesItems])
+        for (strPattern, strSubstitution), languageId in registeredDict.items():
+            if (strPattern, strSubstitution) not in appliedSet:
+                statisticsList.append({'pattern': strPattern, 'substitution': strSubstitution,
+                                       'languageId': languageId, 'calls': 0, 'matches': 0,
+                                       'seconds': 0.0, 'maxSeconds': 0.0, 'maxLength': 0,
+                                       'exponent': None})
+
+        return sorted(statisticsList, key=lambda s: (-s['seconds'], s['pattern']))
+
+    def getHottestRules(self, count=10):
+        return self.getStatistics()[:count]
+
+    def getDeadRules(self):
+        """Rules without any match in all languages,
+           including the registered rules never applied.
+        """
+        rulesItems, registeredDict = self._getSnapshot()
+        matchesDict = dict([(k, 0) for k in registeredDict.keys()])
+        for (strPattern, strSubstitution, languageId), statsDict in rulesItems:
+            key = (strPattern, strSubstitution)
+            matchesDict[key] = matchesDict.get(key, 0) + statsDict['matches']
+        return sorted([k for k, matches in matchesDict.items() if matches == 0])
+
+    def getSuperlinearRules(self):
+        """Rules whose time grows faster than the text
+           length, backtracking suspects.
+        """
+        return [s for s in self.getStatistics() if s['exponent'] is not None and
+                s['exponent'] > RegexProfiler.SUPERLINEAREXPONENT]
+
+    def getReport(self, count=10):
+        """A summary of the hottest rules, the dead rules
+           and the backtracking suspects.
+        """
+        rulesItems, registeredDict = self._getSnapshot()
+        linesList = ["Regular expressions profile: %d rules, %.3f s" %
+                     (len(set([k[:2] for k, s in rulesItems]) | set(registeredDict.keys())),
+                      sum([s['seconds'] for k, s in rulesItems]))]
+
+        linesList.append("Hottest rules (seconds, max seconds, calls, matches, language, pattern):")
+        for statsDict in self.getHottestRules(count):
+            linesList.append("  %.4f %.6f %d %d %d %s" %
+                             (statsDict['seconds'], statsDict['maxSeconds'], statsDict['calls'],
+                              statsDict['matches'], statsDict['languageId'], statsDict['pattern']))
+
+        deadList = self.getDeadRules()
+        linesList.append("Dead rules: %d" % len(deadList))
+        for strPattern, strSubstitution in deadList[:count]:
+            linesList.append("  %s" % strPattern)
+
+        superlinearList = self.getSuperlinearRules()
+        linesList.append("Backtracking suspects (exponent, max seconds, max length, pattern): %d" %
+                         len(superlinearList))
+        for statsDict in superlinearList[:count]:
+            linesList.append("  %.2f %.6f %d %s" %
+                             (statsDict['exponent'], statsDict['maxSeconds'],
+                              statsDict['maxLength'], statsDict['pattern']))
+
+        return "\n".join(linesList)
+
+    def save(self, profileFile):
+        """Write the records to 'profileFile' as json.
+        """
+        rulesItems, registeredDict = self._getSnapshot()
+        rulesList = []
+        for (strPattern, strSubstitution, languageId), statsDict in sorted(rulesItems):
+            ruleDict = dict(statsDict)
+            ruleDict['buckets'] = dict([(str(b), v) for b, v in statsDict['buckets'].items()])
+            ruleDict.update({'pattern': strPattern, 'substitution': strSubstitution,
+                             'languageId': languageId})
+            rulesList.append(ruleDict)
+
+        with open(profileFile, 'w') as outputFile:
+            json.dump({'rules': rulesList,
+                       'registered': [{'pattern': p, 'substitution': s, 'languageId': l}
+                                      for (p, s), l in sorted(registeredDict.items())]},
+                      outputFile, indent=1, sort_keys=True)
+
+    #####################
+    #Static methods
+    #
+    @staticmethod
+    def load(profileFilesList):
+        """Merged profile of 'profileFilesList', see 'save'.
+        """
+        profiler = RegexProfiler()
+        for profileFile in profileFilesList:
+            fileProfiler = RegexProfiler()
+            with open(profileFile) as inputFile:
+                profileDict = json.load(inputFile)
+                for ruleDict in profileDict.get('registered', []):
+                    fileProfiler.registeredDict[(ruleDict['pattern'], ruleDict['substitution'])] = \
+                        ruleDict['languageId']
+                for ruleDict in profileDict['rules']:
+                    key = (ruleDict.pop('pattern'), ruleDict.pop('substitution'),
+                           ruleDict.pop('languageId'))
+                    ruleDict['buckets'] = dict([(int(b), v) for b, v in ruleDict['buckets'].items()])
+                    fileProfiler.rulesDict[key] = ruleDict
+            profiler.merge(fileProfiler)
+        return profiler
+
+    @staticmethod
+    def getExponent(bucketsDict):
+        """Slope of the log mean time against the log mean
+           length of the buckets, least squares.
+        """
+        pointsList = [(math.log(length / float(calls)), math.log(seconds / calls))
+                      for calls, length, seconds in bucketsDict.values()
+                      if length >= RegexProfiler.MINLENGTH * calls and seconds > 0]
+        if len(pointsList) < RegexProfiler.MINBUCKETS:
+            return None
+
+        meanX = sum([x for x, y in pointsList]) / len(pointsList)
+        meanY = sum([y for x, y in pointsList]) / len(pointsList)
+        variance = sum([(x - meanX) ** 2 for x, y in pointsList])
+        if variance == 0:
+            return None
+        return sum([(x - meanX) * (y - meanY) for x, y in pointsList]) / variance
+
+    #####################
+    #Implementation
+    #
+    def _getSnapshot(self):
+        """Copies of the records and of the registered rules,
+           'record' may run concurrently.
+
+           return a tuple (list of (key, stats), registered
+                  rules dictionary)
+        """
+        with self.lock:
+            rulesItems = []
+            for key, statsDict in self.rulesDict.items():
+                statsDict = dict(statsDict)
+                statsDict['buckets'] = dict([(b, list(v)) for b, v in statsDict['buckets'].items()])
+                rulesItems.append((key, statsDict))
+            return rulesItems, dict(self.registeredDict)
+
+    @staticmethod
+    def _getEmptyStats():
+        return {'calls': 0, 'matches': 0, 'seconds': 0.0, 'maxSeconds': 0.0,
+                'maxLength': 0, 'buckets': {}}
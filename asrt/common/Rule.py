@@ -21,9 +21,10 @@ __date__ = "Date: 2015/02"
 __copyright__ = "Copyright (c) 2015 Idiap Research Institute"
 __license__ = "BSD 3-Clause"
 
-import re
 import logging
 
+from asrt.common.RegularExpressionBackend import RegexEngine
+
 # Allow for exception filtering and
 # traceback output
 
@@ -79,7 +80,7 @@ class Pattern():
         strCurrent = Pattern.getWord(wordsList, indice)
 
         # The center context does not apply
-        if not re.match(self.getCenter(), strCurrent):
+        if not RegexEngine.getDefault().getRegex(self.getCenter()).match(strCurrent):
             raise RuleException('Bad center %s, should be %s' % (strCurrent,
                                                                  self.getCenter()))
 
@@ -91,7 +92,7 @@ class Pattern():
 
         # Previous context need checking
         if self.prevContext != None:
-            matchPrevious = bool(re.match(self.prevContext, strPrevious))
+            matchPrevious = bool(RegexEngine.getDefault().getRegex(self.prevContext).match(strPrevious))
             if debug:
                 print(("  >", matchPrevious, self.prevContext, strPrevious))
             if self.matchNegative:
@@ -99,7 +100,7 @@ class Pattern():
 
         # Next context need checking
         if self.nextContext != None:
-            matchNext = bool(re.match(self.nextContext, strNext))
+            matchNext = bool(RegexEngine.getDefault().getRegex(self.nextContext).match(strNext))
             if debug:
                 print(("  >", matchNext, self.nextContext, strNext))
             if self.matchNegative:
@@ -111,7 +112,7 @@ class Pattern():
         """Check validity of the rule given
              the 'testCenter'.
         """
-        if not re.match(self.getCenter(), testCenter):
+        if not RegexEngine.getDefault().getRegex(self.getCenter()).match(testCenter):
             raise RuleException('Non matching center %s, should be %s!' % (
                 testCenter, self.getCenter()))
         if self.getPrevContext() == None or self.getNextContext() == None:
@@ -222,7 +223,7 @@ class Rule():
         # Get the test pattern
         strCurrent = Pattern.getWord(wordsList, indice)
 
-        return re.match(self.getCenter(), strCurrent)
+        return RegexEngine.getDefault().getRegex(self.getCenter()).match(strCurrent)
 
     def validate(self):
         """Check that all context's centers are the
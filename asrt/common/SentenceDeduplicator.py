@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import re
+import math
+import random
+import hashlib
+import logging
+from array import array
+
+from asrt.common.AsrtConstants import SPACEPATTERN
+
+
+def hash64(strText):
+    """64 bits hash of an utf-8 string.
+    """
+    digest = hashlib.blake2b(strText.encode('utf-8', 'surrogateescape'),
+                             digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class HashSet(object):
+    """A set of 64 bits hashes stored in an open
+       addressing table backed by an unsigned 64 bits
+       array (8 bytes per slot).
+    """
+    EMPTY       = 0
+    MAXLOAD     = 0.5
+
+    def __init__(self, initialSize=1024):
+        size = 1
+        while size < initialSize:
+            size <<= 1
+        self.table = array('Q', bytes(8 * size))
+        self.mask = size - 1
+        self.count = 0
+
+    def add(self, hashValue):
+        """Add 'hashValue'.
+
+           return True if it was not in the set
+        """
+        # Zero marks empty slots
+        if hashValue == HashSet.EMPTY:
+            hashValue = 1
+
+        table, mask = self.table, self.mask
+        i = hashValue & mask
+        while True:
+            current = table[i]
+            if current == HashSet.EMPTY:
+                break
+            if current == hashValue:
+                return False
+            i = (i + 1) & mask
+
+        table[i] = hashValue
+        self.count += 1
+
+        if self.count > HashSet.MAXLOAD * len(table):
+            self._grow()
+
+        return True
+
+    def __contains__(self, hashValue):
+        if hashValue == HashSet.EMPTY:
+            hashValue = 1
+
+        table, mask = self.table, self.mask
+        i = hashValue & mask
+        while True:
+            current = table[i]
+            if current == HashSet.EMPTY:
+                return False
+            if current == hashValue:
+                return True
+            i = (i + 1) & mask
+
+    def __len__(self):
+        return self.count
+
+    def getMemorySize(self):
+        """Size of the table in bytes.
+        """
+        return len(self.table) * self.table.itemsize
+
+    def _grow(self):
+        """Double the table size and rehash.
+        """
+        oldTable = self.table
+        self.table = array('Q', bytes(16 * len(oldTable)))
+        self.mask = len(self.table) - 1
+        self.count = 0
+        for hashValue in oldTable:
+            if hashValue != HashSet.EMPTY:
+                self.add(hashValue)
+
+
+class BloomFilter(object):
+    """A Bloom filter over 64 bits hashes. Memory is
+       fixed at construction from the expected capacity
+       and the false positive rate.
+    """
+
+    def __init__(self, capacity=10000000, errorRate=0.001):
+        self.nbBits = max(8, int(-capacity * math.log(errorRate) /
+                                 (math.log(2) ** 2)))
+        self.nbHashes = max(1, int(round(self.nbBits / float(capacity) *
+                                         math.log(2))))
+        self.bits = bytearray((self.nbBits + 7) // 8)
+        self.count = 0
+
+    def add(self, hashValue):
+        """Add 'hashValue'.
+
+           return True if it was (probably) not in the filter
+        """
+        bits, nbBits = self.bits, self.nbBits
+        h1, h2 = hashValue & 0xffffffff, (hashValue >> 32) | 1
+
+        bNew = False
+        for i in range(self.nbHashes):
+            bit = (h1 + i * h2) % nbBits
+            byte, mask = bit >> 3, 1 << (bit & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                bNew = True
+
+        if bNew:
+            self.count += 1
+        return bNew
+
+    def __contains__(self, hashValue):
+        h1, h2 = hashValue & 0xffffffff, (hashValue >> 32) | 1
+        for i in range(self.nbHashes):
+            bit = (h1 + i * h2) % self.nbBits
+            if not self.bits[bit >> 3] & (1 << (bit & 7)):
+                return False
+        return True
+
+    def __len__(self):
+        return self.count
+
+    def getMemorySize(self):
+        return len(self.bits)
+
+
+class MinHashLSH(object):
+    """Near duplicates detection with MinHash signatures
+       over word shingles and locality sensitive hashing
+       of signature bands.
+
+       Two sentences with a Jaccard similarity 's' share
+       a band with probability 1 - (1 - s^rows)^bands.
+       Sentences sharing a band are candidates, a candidate
+       is a near duplicate when the Jaccard similarity
+       estimated from the signatures is at least 'threshold'.
+
+       The signatures of the added sentences are kept
+       in memory, 8 bytes per permutation.
+    """
+    MERSENNEPRIME   = (1 << 61) - 1
+    SEED            = 1
+    THRESHOLD       = 0.8
+
+    def __init__(self, nbPermutations=64, nbBands=16, shingleSize=3,
+                 threshold=THRESHOLD):
+        if nbPermutations % nbBands != 0:
+            raise Exception("Permutations should be a multiple of bands")
+        if not 0.0 < threshold <= 1.0:
+            raise Exception("Similarity threshold should be in ]0, 1]")
+
+        self.nbPermutations = nbPermutations
+        self.nbBands = nbBands
+        self.rows = nbPermutations // nbBands
+        self.shingleSize = shingleSize
+        self.threshold = threshold
+
+        rand = random.Random(MinHashLSH.SEED)
+        self.permutations = [(rand.randrange(1, MinHashLSH.MERSENNEPRIME),
+                              rand.randrange(0, MinHashLSH.MERSENNEPRIME))
+                             for i in range(nbPermutations)]
+
+        #Signatures of the added sentences, one after
+        #the other, and per band the sentences of a
+        #band hash
+        self.signatures = array('Q')
+        self.buckets = [{} for i in range(nbBands)]
+
+    def add(self, strText):
+        """Add the sentence signature.
+
+           return True if no similar sentence was added before
+        """
+        signature = self.getSignature(strText)
+        bandHashes = self._getBandHashes(signature)
+
+        candidates = set()
+        for bucket, bandHash in zip(self.buckets, bandHashes):
+            candidates.update(bucket.get(bandHash, ()))
+
+        for index in candidates:
+            if self.getSimilarity(signature, index) >= self.threshold:
+                return False
+
+        index = len(self.signatures) // self.nbPermutations
+        self.signatures.extend(signature)
+        for bucket, bandHash in zip(self.buckets, bandHashes):
+            bucket.setdefault(bandHash, []).append(index)
+        return True
+
+    def getSimilarity(self, signature, index):
+        """Jaccard similarity estimated from 'signature' and
+           the signature of the sentence added at 'index'.
+        """
+        offset = index * self.nbPermutations
+        other = self.signatures[offset:offset + self.nbPermutations]
+        return sum([1 for a, b in zip(signature, other) if a == b]) / \
+            float(self.nbPermutations)
+
+    def getSignature(self, strText):
+        """MinHash signature of 'strText'.
+        """
+        prime = MinHashLSH.MERSENNEPRIME
+        shingles = self._getShingles(strText)
+        return [min((a * s + b) % prime for s in shingles)
+                for a, b in self.permutations]
+
+    def _getBandHashes(self, signature):
+        bandHashes = []
+        for i in range(self.nbBands):
+            band = signature[i * self.rows:(i + 1) * self.rows]
+            bandHashes.append(hash64("%d:%s" % (i, ",".join(map(str, band)))))
+        return bandHashes
+
+    def _getShingles(self, strText):
+        """Hashed word n-grams, lower cased.
+        """
+        wordsList = re.split(SPACEPATTERN, strText.lower().strip())
+        n = min(self.shingleSize, len(wordsList))
+        return set(hash64(" ".join(wordsList[i:i + n]))
+                   for i in range(len(wordsList) - n + 1))
+
+
+class SentenceDeduplicator(object):
+    """Remove duplicated sentences across all the
+       documents it sees.
+
+       Modes are:
+         - exact: exact 64 bits hashes in a 'HashSet'
+         - bloom: 64 bits hashes in a fixed size 'BloomFilter',
+                  a small rate of unique sentences is dropped
+       Near duplicates detection is optional, see 'MinHashLSH'.
+    """
+    logger = logging.getLogger("Asrt.SentenceDeduplicator")
+
+    EXACT   = 'exact'
+    BLOOM   = 'bloom'
+    MODES   = [EXACT, BLOOM]
+
+    def __init__(self, mode=EXACT, nearDuplicates=False,
+                 bloomCapacity=10000000, bloomErrorRate=0.001,
+                 nearThreshold=MinHashLSH.THRESHOLD):
+        if mode not in SentenceDeduplicator.MODES:
+            raise Exception("Unknown deduplication mode: %s" % mode)
+
+        self.mode = mode
+        if mode == SentenceDeduplicator.BLOOM:
+            self.seenSet = BloomFilter(bloomCapacity, bloomErrorRate)
+        else:
+            self.seenSet = HashSet()
+
+        self.nearDuplicates = None
+        if nearDuplicates:
+            self.nearDuplicates = MinHashLSH(threshold=nearThreshold)
+
+        self.sentencesCount = 0
+        self.exactCount = 0
+        self.nearCount = 0
+
+    #####################
+    #Public interface
+    #
+    def isDuplicate(self, strSentence):
+        """Check if 'strSentence' has been seen, remembering
+           it otherwise.
+        """
+        self.sentencesCount += 1
+
+        if not self.seenSet.add(hash64(strSentence)):
+            self.exactCount += 1
+            return True
+
+        if self.nearDuplicates is not None and \
+                not self.nearDuplicates.add(strSentence):
+            self.nearCount += 1
+            return True
+
+        return False
+
+    def filterSentences(self, sentencesList):
+        """Return 'sentencesList' without duplicates.
+        """
+        return [s for s in sentencesList if not self.isDuplicate(s)]
+
+    def getDedupRatio(self):
+        """Ratio of removed sentences.
+        """
+        if self.sentencesCount == 0:
+            return 0.0
+        return (self.exactCount + self.nearCount) / float(self.sentencesCount)
+
+    def getReport(self):
+        """A one line summary of the deduplication.
+        """
+        return "Deduplication (%s): %d sentences, %d exact and %d near duplicates removed, ratio %.4f, %d bytes" % \
+            (self.mode, self.sentencesCount, self.exactCount, self.nearCount,
+             self.getDedupRatio(), self.seenSet.getMemorySize())
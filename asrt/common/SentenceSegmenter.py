@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import re
+import logging
+
+from asrt.common.AsrtConstants import ABBREVIATIONS, TRANSITIONNUMBERS
+
+
+class RuleSegmenter(object):
+    """Rule based sentence segmentation.
+
+       A faster alternative to the NLTK punkt tokenizer.
+       Text is scanned once with a single compiled regex
+       matching tabs, ';', ':', '!', '?' and periods followed
+       by a space or the end of the text.
+
+       A period does not end a sentence when it follows:
+         - an abbreviation of the 'ABBREVIATIONS' tables
+         - a one or two digits number, i.e. '3. Mai' or a
+           transition number
+         - a single letter or an acronym like 'U.S.'
+       or when the next word starts with a lower case letter.
+    """
+    logger = logging.getLogger("Asrt.RuleSegmenter")
+
+    BOUNDARYREGEX   = re.compile(r"(?P<delimiter>[\t;:!?])|" +
+                                 r"[.](?P<close>[\"'»”’)\]]*)" +
+                                 r"(?=\s+(?P<next>\S)|\s*\Z)",
+                                 flags=re.UNICODE)
+    OPENINGCHARS    = "\"'«“‘(["
+    NUMBERREGEX     = re.compile(r"^[0-9]{1,2}$")
+    ACRONYMREGEX    = re.compile(r"^(\w[.])+\w$", flags=re.UNICODE)
+
+    def __init__(self, languageId=0):
+        """Default constructor.
+
+           param languageId: abbreviations of all languages
+                             are used for unknown language 0
+        """
+        self.languageId = languageId
+        self.abbreviationsSet = self._getAbbreviations(languageId)
+
+    #####################
+    #Public interface
+    #
+    def segment(self, strText):
+        """Segment 'strText' into sentences.
+
+           New lines are not considered at the end of a
+           sentence, words split by an hyphen at the end of
+           a line are joined.
+
+           param strText: an utf-8 encoded string
+           return a list of sentences
+        """
+        strText = strText.replace("-\n", "").replace("\n", " ")
+
+        sentencesList, start = [], 0
+        for match in RuleSegmenter.BOUNDARYREGEX.finditer(strText):
+            if match.group('delimiter') is not None:
+                sentencesList.append(strText[start:match.start()])
+                start = match.end()
+            else:
+                #Word preceding the period
+                wordStart = max(strText.rfind(" ", start, match.start()) + 1, start)
+                if self._isBoundary(strText[wordStart:match.start()],
+                                    match.group('next')):
+                    sentencesList.append(strText[start:match.end()])
+                    start = match.end()
+        sentencesList.append(strText[start:])
+
+        return [s.strip() for s in sentencesList if len(s.strip()) > 0]
+
+    #####################
+    #Implementation
+    #
+    def _getAbbreviations(self, languageId):
+        """Abbreviations ending with a period, for all
+           languages if 'languageId' is unknown.
+        """
+        languagesList = [languageId] if languageId in ABBREVIATIONS \
+            else list(ABBREVIATIONS.keys())
+
+        abbreviationsSet = set()
+        for language in languagesList:
+            for abbreviation in ABBREVIATIONS[language]:
+                if abbreviation.endswith("."):
+                    abbreviationsSet.add(abbreviation[:-1])
+
+        for language in list(TRANSITIONNUMBERS.keys()):
+            for number in TRANSITIONNUMBERS[language]:
+                abbreviationsSet.add(number[:-1])
+
+        return abbreviationsSet
+
+    def _isBoundary(self, word, nextChar):
+        """Decide if the period after 'word' ends a sentence.
+
+           param word    : the text preceding the period
+           param nextChar: first character of the next word,
+                           None at the end of the text
+        """
+        if nextChar is None:
+            return True
+
+        if nextChar.islower():
+            return False
+
+        word = word.lstrip(RuleSegmenter.OPENINGCHARS)
+
+        if word in self.abbreviationsSet:
+            return False
+
+        if (len(word) == 1 and word.isalpha()) or \
+                RuleSegmenter.NUMBERREGEX.match(word) or \
+                RuleSegmenter.ACRONYMREGEX.match(word):
+            return False
+
+        return True
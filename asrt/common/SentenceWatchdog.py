@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import time
+import signal
+import logging
+import threading
+
+
+class SentenceTimeoutException(Exception):
+    pass
+
+
+class SentenceWatchdog(object):
+    """Time budget per sentence and per document of the
+       sentence stages, see 'TextDocument.setWatchdog'.
+
+       A sentence exceeding its budget in a stage is
+       quarantined: it is removed from the document and
+       written to the quarantine file with the stage, the
+       reason and the elapsed time, tab separated. Once the
+       document budget is spent, the next sentences are
+       quarantined without being processed.
+
+       In the main thread, the stage is interrupted by a
+       SIGALRM timer: Python code and the 're' matching
+       loop stop within the budget, a long C call when it
+       returns. In other threads the time is only checked
+       once the stage returns.
+
+       Usage:
+          watchdog = SentenceWatchdog(1.0, 60.0, "quarantine.txt")
+          watchdog.startDocument("doc.pdf")
+          bProcessed, result = watchdog.run("prepareLM", strSentence,
+                                            function, strSentence)
+    """
+    logger = logging.getLogger("Asrt.SentenceWatchdog")
+
+    REASONSENTENCE  = 'sentence'
+    REASONDOCUMENT  = 'document'
+    FIELDSEPARATOR  = "\t"
+
+    def __init__(self, sentenceSeconds=None, documentSeconds=None, quarantineFile=None):
+        """Default constructor.
+
+           param sentenceSeconds: budget of a sentence per
+                                  stage, None for no limit
+           param documentSeconds: budget of a document from
+                                  'startDocument', None for
+                                  no limit
+           param quarantineFile : file the quarantined sentences
+                                  are appended to, None to only
+                                  count them
+        """
+        self.sentenceSeconds = sentenceSeconds
+        self.documentSeconds = documentSeconds
+        self.quarantineFile = quarantineFile
+        self.documentName = None
+        self.documentStartTime = time.time()
+        self.bDocumentOverBudget = False
+        self.bWarnedThread = False
+        self.statisticsDict = SentenceWatchdog._getEmptyStats()
+        self.lock = threading.Lock()
+
+    #####################
+    #Public interface
+    #
+    def startDocument(self, documentName):
+        """Start the budget of 'documentName'.
+        """
+        self.documentName = documentName
+        self.documentStartTime = time.time()
+        self.bDocumentOverBudget = False
+        with self.lock:
+            self.statisticsDict['documents'] += 1
+
+    def run(self, stage, strSentence, function, *args):
+        """Call 'function' with 'args' within the budget of
+           'strSentence'.
+
+           return a tuple (True, function result), or (False,
+                  None) when the sentence is quarantined
+        """
+        seconds, reason = self._getBudget()
+        if seconds is None:
+            return True, function(*args)
+
+        if seconds <= 0:
+            self._quarantine(stage, reason, 0.0, strSentence)
+            return False, None
+
+        startTime = time.time()
+        if self._isInterruptible():
+            bTimedOut, result = SentenceWatchdog._runWithAlarm(seconds, function, args)
+        else:
+            bTimedOut, result = False, function(*args)
+
+        elapsedSeconds = time.time() - startTime
+        if bTimedOut or elapsedSeconds > seconds:
+            self._quarantine(stage, reason, elapsedSeconds, strSentence)
+            return False, None
+        return True, result
+
+    def getStatistics(self):
+        """Quarantined sentences in total, per stage and
+           per reason, documents and documents over budget.
+        """
+        with self.lock:
+            statisticsDict = dict(self.statisticsDict)
+            statisticsDict['stages'] = dict(self.statisticsDict['stages'])
+            statisticsDict['reasons'] = dict(self.statisticsDict['reasons'])
+        return statisticsDict
+
+    def getReport(self):
+        """A one line summary of the quarantine.
+        """
+        statisticsDict = self.getStatistics()
+        return "Time budget: %d sentences quarantined (%s), " \
+               "%d of %d documents over budget, %.3f s max" % \
+               (statisticsDict['quarantined'],
+                ", ".join(["%s: %d" % (s, c) for s, c in
+                           sorted(statisticsDict['stages'].items())]) or "none",
+                statisticsDict['documentsOverBudget'], statisticsDict['documents'],
+                statisticsDict['maxSeconds'])
+
+    #####################
+    #Implementation
+    #
+    def _getBudget(self):
+        """Seconds left for the next sentence with the budget
+           reason, None when there is no limit.
+        """
+        seconds, reason = self.sentenceSeconds, SentenceWatchdog.REASONSENTENCE
+        if self.documentSeconds is not None:
+            documentLeft = self.documentSeconds - (time.time() - self.documentStartTime)
+            if seconds is None or documentLeft < seconds:
+                seconds, reason = documentLeft, SentenceWatchdog.REASONDOCUMENT
+        return seconds, reason
+
+    def _isInterruptible(self):
+        if hasattr(signal, 'setitimer') and \
+                threading.current_thread() is threading.main_thread():
+            return True
+
+        if not self.bWarnedThread:
+            self.bWarnedThread = True
+            self.logger.warning("Not in the main thread, sentences over budget are " \
+                                "quarantined but not interrupted")
+        return False
+
+    @staticmethod
+    def _runWithAlarm(seconds, function, args):
+        """Call 'function' until a SIGALRM timer of 'seconds'
+           expires.
+
+           return a tuple (timed out flag, function result)
+        """
+        previousHandler = signal.signal(signal.SIGALRM, _raiseTimeout)
+        try:
+            try:
+                signal.setitimer(signal.ITIMER_REAL, seconds)
+                try:
+                    return False, function(*args)
+                finally:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+            except SentenceTimeoutException:
+                return True, None
+        finally:
+            signal.signal(signal.SIGALRM, previousHandler)
+
+    def _quarantine(self, stage, reason, elapsedSeconds, strSentence):
+        """Count and write a sentence over budget.
+        """
+        with self.lock:
+            statisticsDict = self.statisticsDict
+            statisticsDict['quarantined'] += 1
+            statisticsDict['stages'][stage] = statisticsDict['stages'].get(stage, 0) + 1
+            statisticsDict['reasons'][reason] = statisticsDict['reasons'].get(reason, 0) + 1
+            statisticsDict['maxSeconds'] = max(statisticsDict['maxSeconds'], elapsedSeconds)
+
+            if reason == SentenceWatchdog.REASONDOCUMENT and not self.bDocumentOverBudget:
+                self.bDocumentOverBudget = True
+                statisticsDict['documentsOverBudget'] += 1
+                self.logger.warning("Document %s over its budget of %.3f s at stage %s, " \
+                                    "next sentences are quarantined" %
+                                    (self.documentName, self.documentSeconds, stage))
+
+            if self.quarantineFile is not None:
+                fieldsList = [str(self.documentName), stage, reason, "%.6f" % elapsedSeconds,
+                              " ".join(strSentence.split("\n"))]
+                with open(self.quarantineFile, 'a', encoding='utf-8') as outputFile:
+                    outputFile.write(SentenceWatchdog.FIELDSEPARATOR.join(fieldsList) + "\n")
+
+    @staticmethod
+    def _getEmptyStats():
+        return {'quarantined': 0, 'stages': {}, 'reasons': {}, 'documents': 0,
+                'documentsOverBudget': 0, 'maxSeconds': 0.0}
+
+
+def _raiseTimeout(signalNumber, frame):
+    raise SentenceTimeoutException("Sentence over its time budget")
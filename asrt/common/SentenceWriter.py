@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import os
+import gzip
+import lzma
+import json
+import logging
+
+from asrt.common.MyFile import MyFile
+
+
+class LanguageStreamWriter(object):
+    """Buffered stream of sentences for one language.
+
+       Sentences are appended to temporary '.part' files
+       that are renamed to their final name on commit. When
+       a maximum shard size is given, the output is split
+       into numbered shards.
+    """
+    logger = logging.getLogger("Asrt.LanguageStreamWriter")
+
+    FILEPREFIX      = "sentences_"
+    TEXTEXTENSION   = ".txt"
+    TEMPEXTENSION   = ".part"
+    GZIP            = 'gzip'
+    XZ              = 'xz'
+    COMPRESSIONS    = {GZIP: ".gz", XZ: ".xz"}
+    BUFFERSIZE      = 1024 * 1024
+
+    def __init__(self, outputDir, languageLabel, compression=None,
+                 maxShardSize=None):
+        """Default constructor.
+
+           param compression : None, 'gzip' or 'xz'
+           param maxShardSize: approximate maximum number of
+                               uncompressed bytes per file
+        """
+        if compression is not None and \
+                compression not in LanguageStreamWriter.COMPRESSIONS:
+            raise Exception("Unknown compression: %s" % compression)
+
+        self.outputDir = outputDir
+        self.languageLabel = languageLabel
+        self.compression = compression
+        self.maxShardSize = maxShardSize
+
+        self.stream = None
+        self.shardSize = 0
+        self.pendingEmptyLines = 0
+        self.sentencesCount = 0
+        #Committed shards information
+        self.shardsList = []
+        self.partPathsList = []
+
+    #####################
+    #Public interface
+    #
+    def write(self, strSentence):
+        """Append one sentence.
+        """
+        self.sentencesCount += 1
+
+        #Trailing empty lines are not output
+        if len(strSentence) == 0:
+            self.pendingEmptyLines += 1
+            return
+
+        strLine = "\n" * self.pendingEmptyLines + strSentence + "\n"
+        self.pendingEmptyLines = 0
+
+        if self.stream is None or (self.maxShardSize is not None and
+                                   self.shardSize >= self.maxShardSize):
+            self._openShard()
+
+        self.stream.write(strLine)
+        self.shardSize += len(strLine.encode('utf-8'))
+        self.shardsList[-1]['sentences'] += 1
+
+    def commit(self):
+        """Flush and atomically rename all shards.
+
+           return the list of output files
+        """
+        if self.sentencesCount > 0 and self.stream is None:
+            #Only empty sentences
+            self._openShard()
+            self.stream.write("\n")
+
+        self._closeStream()
+
+        outputFilesList = []
+        for partPath, shard in zip(self.partPathsList, self.shardsList):
+            finalPath = partPath[:-len(LanguageStreamWriter.TEMPEXTENSION)]
+            os.replace(partPath, finalPath)
+            outputFilesList.append(finalPath)
+
+        self.partPathsList = []
+        return outputFilesList
+
+    def abort(self):
+        """Remove temporary files.
+        """
+        self._closeStream()
+        for partPath in self.partPathsList:
+            MyFile.removeFile(partPath)
+        self.partPathsList = []
+        self.shardsList = []
+
+    def getShardsList(self):
+        """A list of dictionaries with the file name, the number
+           of sentences and uncompressed bytes of every shard.
+        """
+        return self.shardsList
+
+    def getSentencesCount(self):
+        return self.sentencesCount
+
+    #####################
+    #Implementation
+    #
+    def _getFileName(self, shardIndex):
+        """File name for 'shardIndex'.
+        """
+        fileName = LanguageStreamWriter.FILEPREFIX + self.languageLabel
+        if self.maxShardSize is not None:
+            fileName += ".%05d" % shardIndex
+        fileName += LanguageStreamWriter.TEXTEXTENSION
+
+        if self.compression is not None:
+            fileName += LanguageStreamWriter.COMPRESSIONS[self.compression]
+
+        return fileName
+
+    def _openShard(self):
+        """Close current stream and open the next shard.
+        """
+        self._closeStream()
+        MyFile.checkDirExists(self.outputDir)
+
+        fileName = self._getFileName(len(self.shardsList))
+        partPath = "%s%s%s%s" % (self.outputDir, os.sep, fileName,
+                                 LanguageStreamWriter.TEMPEXTENSION)
+
+        self.logger.info("Writing content to: %s" % partPath)
+
+        if self.compression == LanguageStreamWriter.GZIP:
+            self.stream = gzip.open(partPath, 'wt', encoding='utf-8',
+                                    errors='surrogateescape')
+        elif self.compression == LanguageStreamWriter.XZ:
+            self.stream = lzma.open(partPath, 'wt', encoding='utf-8',
+                                    errors='surrogateescape')
+        else:
+            self.stream = open(partPath, 'w', encoding='utf-8',
+                               errors='surrogateescape',
+                               buffering=LanguageStreamWriter.BUFFERSIZE)
+
+        self.partPathsList.append(partPath)
+        self.shardsList.append({'file': fileName, 'sentences': 0, 'bytes': 0})
+        self.shardSize = 0
+
+    def _closeStream(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.shardsList[-1]['bytes'] = self.shardSize
+            self.stream = None
+
+
+class SentencesWriter(object):
+    """One 'LanguageStreamWriter' per language.
+
+       Usage:
+          with SentencesWriter(outputDir) as writer:
+              writer.writeSentencesDict(sentencesDict)
+
+       Output files only appear once committed. A manifest
+       listing the shards is written when sharding.
+    """
+    logger = logging.getLogger("Asrt.SentencesWriter")
+
+    MANIFESTFILENAME = "sentences_manifest.json"
+
+    def __init__(self, outputDir, compression=None, maxShardSize=None):
+        self.outputDir = outputDir
+        self.compression = compression
+        self.maxShardSize = maxShardSize
+        self.writersDict = {}
+
+    #####################
+    #Public interface
+    #
+    def writeSentence(self, languageLabel, strSentence):
+        """Append 'strSentence' to the 'languageLabel' stream.
+        """
+        if languageLabel not in self.writersDict:
+            self.writersDict[languageLabel] = LanguageStreamWriter(
+                self.outputDir, languageLabel, self.compression,
+                self.maxShardSize)
+
+        self.writersDict[languageLabel].write(strSentence)
+
+    def writeSentencesDict(self, sentencesDict):
+        """Append sentences from a dictionary of lists of
+           sentences per language label.
+        """
+        for languageLabel, sentencesList in list(sentencesDict.items()):
+            for strSentence in sentencesList:
+                self.writeSentence(languageLabel, strSentence)
+
+    def commit(self):
+        """Commit all languages.
+
+           return the list of output files
+        """
+        outputFilesList = []
+        for languageLabel in sorted(self.writersDict.keys()):
+            writer = self.writersDict[languageLabel]
+            self.logger.info("%d sentences found for: %s" %
+                             (writer.getSentencesCount(), languageLabel))
+            outputFilesList.extend(writer.commit())
+
+        if self.maxShardSize is not None:
+            outputFilesList.append(self._writeManifest())
+
+        return outputFilesList
+
+    def abort(self):
+        for writer in list(self.writersDict.values()):
+            writer.abort()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        if excType is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
+
+    #####################
+    #Implementation
+    #
+    def _writeManifest(self):
+        """Atomically write the shards manifest.
+        """
+        manifest = {'compression': self.compression,
+                    'maxShardSize': self.maxShardSize,
+                    'languages': {}}
+
+        for languageLabel, writer in list(self.writersDict.items()):
+            manifest['languages'][languageLabel] = {
+                'sentences': writer.getSentencesCount(),
+                'shards': writer.getShardsList()}
+
+        MyFile.checkDirExists(self.outputDir)
+        manifestPath = self.outputDir + os.sep + SentencesWriter.MANIFESTFILENAME
+        with open(manifestPath + LanguageStreamWriter.TEMPEXTENSION, 'w',
+                  encoding='utf-8') as manifestFile:
+            json.dump(manifest, manifestFile, indent=2, sort_keys=True)
+        os.replace(manifestPath + LanguageStreamWriter.TEMPEXTENSION, manifestPath)
+
+        return manifestPath
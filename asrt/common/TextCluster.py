@@ -23,12 +23,12 @@ __license__ = "BSD 3-Clause"
 
 import re
 import logging
+import threading
 import unicodedata
 
 from asrt.common.Cluster import Cluster
 from asrt.common.Classifier import LanguageClassifier
 from asrt.common.Punctuation import Punctuation
-from asrt.common.formula.FormulaLMPreparation import LMPreparationFormula
 from asrt.config.AsrtConfig import FRENCH_LABEL, GERMAN_LABEL, ENGLISH_LABEL
 from asrt.config.AsrtConfig import ITALIAN_LABEL, LANGUAGEID2LABELS
 from asrt.config.AsrtConfig import MAX_SENTENCE_LENGTH, MIN_SENTENCE_LENGTH
@@ -51,29 +51,25 @@ class TextCluster(Cluster):
 
     LANGUAGE_ATTRIBUTE = 'language'
     ID_COUNTER = 0
+    ID_LOCK = threading.Lock()
+
+    # Punctuation verbalization, read only
+    PUNCTUATION = Punctuation()
 
     def __init__(self, document, sentenceText):
         """Constructor.
         """
-        # Give a unique id to cluster
-        TextCluster.ID_COUNTER += 1
-
         # Unknown language
         attributesList = [(TextCluster.LANGUAGE_ATTRIBUTE, 0)]
 
         # Key is mlf pattern
-        Cluster.__init__(self, str(TextCluster.ID_COUNTER), attributesList)
+        Cluster.__init__(self, str(TextCluster.nextId()), attributesList)
 
         self.document = document
 
         # Actual data
         self.addElement(sentenceText)
 
-        # LM normalization
-        self.lmPreparationFormula = LMPreparationFormula()
-        self.lmPreparationFormula.setExpandNumberInWords(
-            document.expandNumberInWords)
-
     #####################
     #Getters and setters
     #
@@ -145,6 +141,19 @@ class TextCluster(Cluster):
         l, score = classifier.classify(self.getTextSentence())
         self.setAttribute(TextCluster.LANGUAGE_ATTRIBUTE, l)
 
+    def classifyWithPrior(self, classifier, label, maxWords):
+        """Assign 'label' if a few words agree with it,
+           classify the whole sentence otherwise.
+
+           return True if the sentence took the fast path
+        """
+        if classifier.agrees(self.getTextSentence(), label, maxWords):
+            self.setAttribute(TextCluster.LANGUAGE_ATTRIBUTE, label)
+            return True
+
+        self.classify(classifier)
+        return False
+
     def removeTextPunctuation(self):
         """Remove punctuation symbols.
         """
@@ -158,21 +167,18 @@ class TextCluster(Cluster):
            Currently only implemented for French.
         """
         if self.isFrench():
-            p = Punctuation()
-            self.setTextSentence(p.replaceText(self.getTextSentence()))
+            self.setTextSentence(TextCluster.PUNCTUATION.replaceText(
+                self.getTextSentence()))
         else:
             raise Exception(
                 "Text verbalization is only implemented for French!")
 
     def prepareLM(self):
-        """Prepare for language modeling.
+        """Prepare for language modeling with the
+           document formula.
         """
-        strText = self.getTextSentence()
-        languageId = self.getLanguageId()
-
-        self.lmPreparationFormula.setText(strText)
-        self.lmPreparationFormula.setLanguageId(languageId)
-        strText = self.lmPreparationFormula.prepareText()
+        strText = self.document.lmPreparationFormula.prepare(
+            self.getTextSentence(), self.getLanguageId())
 
         self.setTextSentence(strText)
 
@@ -206,7 +212,7 @@ class TextCluster(Cluster):
             return False
 
         # Nb digit groups
-        if len(re.split("\d+", strText)) > MAX_DIGITS_GROUPS:
+        if len(self.document.getRegexEngine().getRegex("\d+").split(strText)) > MAX_DIGITS_GROUPS:
             # print strText
             TextCluster.logger.info(
                 "Discard sentence, to many groups of digits! '%s'" % strText)
@@ -243,7 +249,7 @@ class TextCluster(Cluster):
         pattern = "^[a-zA-ZäöüÄÖÜß.']+$"
         # print( pattern )
 
-        recmped = re.compile(pattern)   # re compiled
+        recmped = self.document.getRegexEngine().getRegex(pattern)   # re compiled
         words = strText.split()
         for word in words:
             # German orthography check
@@ -318,7 +324,7 @@ class TextCluster(Cluster):
                 continue
             # Ignore case available
             # if re.search(regex, strText, re.IGNORECASE) != None:
-            if re.search(regex, strText, flags=re.UNICODE) != None:
+            if self.document.getRegexEngine().getRegex(regex, re.UNICODE).search(strText) != None:
                 TextCluster.logger.info("Discard:%s\n%s" % (
                     regex, strText))
                 return False
@@ -334,6 +340,15 @@ class TextCluster(Cluster):
     ########################
     # Implementation
     #
+    @staticmethod
+    def nextId():
+        """A unique cluster id, clusters may be created
+           by several threads.
+        """
+        with TextCluster.ID_LOCK:
+            TextCluster.ID_COUNTER += 1
+            return TextCluster.ID_COUNTER
+
     @staticmethod
     def normalizeText(textUtterance):
         """Normalize text:
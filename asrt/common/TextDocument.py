@@ -21,7 +21,9 @@ __date__ = "Date: 2011/05/21"
 __copyright__ = "Copyright (c) 2008 Alexandre Nanchen"
 __license__ = "BSD 3-Clause"
 
-import logging, re
+import logging, re, os
+import collections
+import concurrent.futures
 
 import nltk.data
 
@@ -31,8 +33,12 @@ from asrt.common.Document import Document
 
 from asrt.common.TextCluster import TextCluster
 from asrt.common.TextRepresentation import TextRepresentation
+from asrt.common.SentenceSegmenter import RuleSegmenter
 from asrt.common.ClassifierWord import WordClassifier
+from asrt.common.formula.FormulaLMPreparation import LMPreparationFormula
+from asrt.common.RegularExpressionBackend import RegexEngine
 from asrt.config.AsrtConfig import FRENCH_PICKLE_FOLDER, GERMAN_PICKLE_FOLDER
+from asrt.config.AsrtConfig import UNKNOWN_LABEL
 
 class TextDocument(Document):
     """A text document.
@@ -48,6 +54,33 @@ class TextDocument(Document):
     #sentence segmentation is ocurring
     DIGITANDENTITYREGEX = "( |^)([0-9]{1,2})&#46( |$)"
     DIGITANDENTITYSUB   = "\g<1>\g<2>&#46\g<3>"
+
+    #Sentence segmentation engines
+    SEGMENTERPUNKT      = 'punkt'
+    SEGMENTERRULES      = 'rules'
+    SEGMENTERS          = [SEGMENTERPUNKT, SEGMENTERRULES]
+
+    #Parallel segmentation of large documents
+    SEGMENTATIONCHUNKSIZE = 32 * 1024 * 1024
+
+    #Regular expressions are applied to batches of
+    #sentences of about this number of characters
+    NORMALIZATIONBATCHSIZE = 1024 * 1024
+
+    #Sentences per task when stages run in threads
+    STAGEBATCHSIZE      = 1000
+
+    #Language classification modes
+    CLASSIFYSENTENCES   = 'sentence'
+    CLASSIFYHIERARCHICAL = 'hierarchical'
+    CLASSIFICATIONMODES = [CLASSIFYSENTENCES, CLASSIFYHIERARCHICAL]
+
+    #Hierarchical classification: sentences sampled for the
+    #document distribution, minimum share of the dominant
+    #language and words checked per sentence
+    DOCUMENTSAMPLESIZE  = 100
+    DOMINANTSHARE       = 0.8
+    FASTCHECKWORDS      = 4
     
     ########################
     # Default constructor
@@ -63,7 +96,21 @@ class TextDocument(Document):
         self.logDir = logDir
         self.classifier = None
         self.segmentWithNLTK = segmentWithNLTK
+        self.segmenter = TextDocument.SEGMENTERPUNKT
+        self.segmentationWorkers = 1
+        self.segmentationChunkSize = TextDocument.SEGMENTATIONCHUNKSIZE
+        self.normalizationWorkers = 1
+        self.normalizationBatchSize = TextDocument.NORMALIZATIONBATCHSIZE
+        self.stageThreads = 1
+        self.classificationMode = TextDocument.CLASSIFYSENTENCES
+        self.classificationStatistics = {}
         self.expandNumberInWords = expandNumberInWords
+        self.watchdog = None
+        self.regexEngine = None
+
+        #LM normalization, shared by all clusters
+        self.lmPreparationFormula = LMPreparationFormula()
+        self.lmPreparationFormula.setExpandNumberInWords(expandNumberInWords)
 
     ########################
     #Getter and setters
@@ -74,6 +121,90 @@ class TextDocument(Document):
         """
         self.classifier = classifier
 
+    def setSegmenter(self, segmenter):
+        """Sentence segmentation engine, 'punkt' or
+           'rules'. Ignored when segmenting with new lines.
+        """
+        if segmenter not in TextDocument.SEGMENTERS:
+            raise Exception("Unknown segmenter: %s" % segmenter)
+        self.segmenter = segmenter
+
+    def setParallelSegmentation(self, workers, chunkSize=None):
+        """Segment documents larger than 'chunkSize' characters
+           in chunks, with 'workers' processes.
+
+           Peak memory is about 'chunkSize' times 'workers'.
+        """
+        self.segmentationWorkers = workers
+        self.segmentationChunkSize = chunkSize or TextDocument.SEGMENTATIONCHUNKSIZE
+
+    def setParallelNormalization(self, workers, batchSize=None):
+        """Apply user regular expressions to batches of about
+           'batchSize' characters, with 'workers' processes.
+
+           A batch size of 0 applies them to all sentences of
+           a language at once.
+        """
+        self.normalizationWorkers = workers
+        if batchSize is not None:
+            self.normalizationBatchSize = batchSize
+
+    def setStageThreads(self, threads):
+        """Run the per sentence stages (cleaning, language
+           classification, punctuation and LM preparation)
+           with a pool of 'threads' threads sharing the
+           formulas and the classifier.
+
+           Gains need a free-threaded Python build, the
+           output is the same as with one thread.
+        """
+        self.stageThreads = max(threads, 1)
+
+    def setClassificationMode(self, classificationMode):
+        """Language classification mode, 'sentence' or
+           'hierarchical'.
+
+           In hierarchical mode, the document language is
+           estimated from a sample of sentences and sentences
+           whose words agree with it are not fully classified.
+        """
+        if classificationMode not in TextDocument.CLASSIFICATIONMODES:
+            raise Exception("Unknown classification mode: %s" % classificationMode)
+        self.classificationMode = classificationMode
+
+    def setWatchdog(self, watchdog):
+        """Apply the per sentence stages within the time
+           budget of a 'SentenceWatchdog', None to disable.
+
+           Sentences are then processed one by one in this
+           thread, without stage threads nor normalization
+           workers, and those over budget are removed.
+        """
+        self.watchdog = watchdog
+
+    def setRegexEngine(self, regexEngine):
+        """Match the validation regexes and the sentence
+           checks with 'regexEngine', a 'RegexEngine', None
+           for 'RegexEngine.getDefault'.
+        """
+        self.regexEngine = regexEngine
+
+    def getRegexEngine(self):
+        return self.regexEngine or RegexEngine.getDefault()
+
+    def setLMPreparationFormula(self, lmPreparationFormula):
+        """Prepare the sentences for language modeling with
+           'lmPreparationFormula', i.e. one formula per run
+           sharing its word cache between documents.
+        """
+        self.lmPreparationFormula = lmPreparationFormula
+
+    def getClassificationStatistics(self):
+        """Sentences classified per path by the last
+           'classifySentences' call.
+        """
+        return self.classificationStatistics
+
     def setSentencesLanguage(self, languageId):
         """Language is known.
 
@@ -101,8 +232,9 @@ class TextDocument(Document):
         #Segment into sentences using NLTK toolkit
         self._loadTextDocumentAsSentences(tempFileName)
 
-        #Delete temporary file
-        MyFile(tempFileName).removeFile(tempFileName)
+        #Delete temporary file, text files are not copied
+        if tempFileName != self.sourceFileName:
+            MyFile(tempFileName).removeFile(tempFileName)
 
     def loadAsSentences(self, strText):
         """Load the given text string as sentences.
@@ -149,32 +281,31 @@ class TextDocument(Document):
            the sentences.
 
            First group clusters per languages and then
-           apply language based normalization.
+           apply language based normalization to batches
+           of sentences. Batches of all languages run
+           concurrently when there are several workers.
         """
         #Get cluster per language
         lang2clusterDict = self._getLanguage2ClustersDict()
 
-        bEmpty = True
-
-        #Normalize text per language
+        batchesList = []
         for languageId, clusterList in list(lang2clusterDict.items()):
-            #Read all cluster texts
-            textList = []
-            for textCluster in clusterList:
-                textList.append(textCluster.getTextSentence())
-
-            #Join all text
-            allText = self.MERGECLUSTERSEP.join(textList)
+            for clustersBatch in self._iterClustersBatches(clusterList):
+                batchesList.append((languageId, clustersBatch))
 
-            #Normalize text
-            allText = self.regexSubstitutionFormula.apply(allText, languageId)
-            sentencesList = allText.split(self.MERGECLUSTERSEP)
+        if len(batchesList) == 0:
+            return
 
-            #Add and set language id
-            self._addSentences(sentencesList, languageId, bEmpty)
+        #Clusters are rebuilt from the normalized sentences,
+        #the current ones are released batch per batch
+        del lang2clusterDict, clusterList, clustersBatch
+        self.reset()
 
-            if bEmpty:
-                bEmpty = False
+        #Add and set language id, in languages order
+        for i, normalizedList in enumerate(self._iterNormalizedBatches(batchesList)):
+            languageId = batchesList[i][0]
+            batchesList[i] = None
+            self._addSentences(normalizedList, languageId, False)
 
     def prepareLM(self):
         """Prepare text sentences for N-Gram modeling.
@@ -200,26 +331,25 @@ class TextDocument(Document):
             - number of digit groups
             - user defined rules
         """
-        filteredContentList = []
-        for textCluster in self.listContent:
-            if textCluster.isValid():
-                filteredContentList.append(textCluster)
-
-        self.listContent = filteredContentList
-        filteredContentList = [ ]
+        self._filterClusters('isValid')
 
     def filterTextSentences2ndStage(self):
         """Filter sentences before LM preparation.
         
            Remove web address and check German orthography https://en.wikipedia.org/wiki/German_orthography .
         """
+        self._filterClusters('isValid2ndStage')
+
+    def deduplicateTextSentences(self, deduplicator):
+        """Remove sentences already seen by 'deduplicator',
+           in this document or a previous one.
+        """
         filteredContentList = []
         for textCluster in self.listContent:
-            if textCluster.isValid2ndStage():
+            if not deduplicator.isDuplicate(textCluster.getTextSentence()):
                 filteredContentList.append(textCluster)
 
         self.listContent = filteredContentList
-        filteredContentList = [ ]
 
     def classifySentences(self):
         """Classify sentences by language (FRENCH or
@@ -229,8 +359,13 @@ class TextDocument(Document):
             self.classifier = WordClassifier()
             self.classifier.train()
 
-        for textCluster in self.listContent:
-            textCluster.classify(self.classifier)
+        if self.classificationMode == TextDocument.CLASSIFYHIERARCHICAL:
+            self._classifyHierarchically()
+            return
+
+        self._applyAllClusters('classify', self.classifier)
+        self.classificationStatistics = {'sentences': len(self.listContent),
+                                         'fullPath': len(self.listContent)}
 
     def display(self):
         """Display document content.
@@ -241,12 +376,71 @@ class TextDocument(Document):
     ########################
     #Implementation
     #
+    def _classifyHierarchically(self):
+        """Classify a sample of sentences, then give the
+           dominant language to sentences agreeing with it.
+
+           Without dominant language, all sentences are
+           fully classified.
+        """
+        allList = list(self.listContent)
+        count = len(allList)
+        sampleSize = min(TextDocument.DOCUMENTSAMPLESIZE, count)
+        sampleIndices = set([i * count // sampleSize for i in range(sampleSize)])
+
+        sampleList = [allList[i] for i in sorted(sampleIndices)]
+        self._applyAllClusters('classify', self.classifier, clustersList=sampleList)
+
+        #Sampled clusters over the time budget are removed
+        #from the document and not counted
+        if len(self.listContent) < count:
+            keptSet = set([id(c) for c in self.listContent])
+            sampleList = [c for c in sampleList if id(c) in keptSet]
+        sampleSize = len(sampleList)
+
+        labelCountDict = collections.Counter(
+            [c.getAttribute(TextCluster.LANGUAGE_ATTRIBUTE) for c in sampleList])
+        dominantLabel, dominantCount = UNKNOWN_LABEL, 0
+        if len(labelCountDict) > 0:
+            dominantLabel, dominantCount = labelCountDict.most_common(1)[0]
+
+        otherList = [c for i, c in enumerate(allList) if i not in sampleIndices]
+        self.classificationStatistics = {'sampled': sampleSize,
+                                         'dominantLanguage': dominantLabel,
+                                         'dominantShare': dominantCount / float(max(sampleSize, 1))}
+
+        if dominantLabel == UNKNOWN_LABEL or \
+                dominantCount < TextDocument.DOMINANTSHARE * sampleSize:
+            TextDocument.logger.info("No dominant language, classify all sentences")
+            self._applyAllClusters('classify', self.classifier, clustersList=otherList)
+            fastCount = 0
+        else:
+            fastCount = sum(self._applyAllClusters('classifyWithPrior', self.classifier,
+                                                   dominantLabel, TextDocument.FASTCHECKWORDS,
+                                                   clustersList=otherList))
+
+        count = len(self.listContent)
+        self.classificationStatistics['sentences'] = count
+        self.classificationStatistics['fastPath'] = fastCount
+        self.classificationStatistics['fullPath'] = count - fastCount
+        TextDocument.logger.info("Language classification: %d sentences, %d on fast path (%s)" %
+                                 (count, fastCount, dominantLabel))
+
     def _loadTextDocumentAsSentences(self, filePath):
         """Load a text document and segment
            it into sentences using NLTK.
 
            Initial new lines are first removed.
         """
+        if self.segmentWithNLTK and self.segmentationWorkers > 1 and \
+                os.path.getsize(filePath) > self.segmentationChunkSize:
+            TextDocument.logger.info("Segment in chunks with %d workers" %
+                                     self.segmentationWorkers)
+            sentences, bSplit = self._segmentInChunks(filePath)
+            self._addSentences(sentences, bSplit=bSplit)
+            TextDocument.logger.info("Loaded %d raw sentences!" % len(sentences))
+            return
+
         io = Ioread()
 
         #One string for the whole
@@ -257,21 +451,46 @@ class TextDocument(Document):
     def _loadAsSentences(self, strText):
         """Load the given text as sentences.
 
-           Algorithm is:
+           param strText: an utf-8 encoded string
+        """
+        if not self.segmentWithNLTK:
+            TextDocument.logger.info("Segment with new lines")
+        elif self.segmenter == TextDocument.SEGMENTERRULES:
+            TextDocument.logger.info("Segment with rules")
+        else:
+            TextDocument.logger.info("Segment with NLTK")
+
+        sentences, bSplit = self._segmentText(strText)
+
+        #Make text clusters with unknown language id
+        self._addSentences(sentences, bSplit=bSplit)
+
+        TextDocument.logger.info("Loaded %d raw sentences!" % len(sentences))
+
+    def _segmentText(self, strText):
+        """Segment the given text into sentences.
+
+           Algorithm with the punkt segmenter is:
              - New lines removal
              - Problematic periods replacement
              - Sentences segmentation with nltk
              - Problematic periods restauration
 
            param strText: an utf-8 encoded string
+           return a tuple (sentences list, True if sentences
+                  still need to be split on delimiters)
         """
         tokenizer_path = FRENCH_PICKLE_FOLDER
         if self.languageId == 2:
             tokenizer_path = GERMAN_PICKLE_FOLDER
 
         sentences = []
-        if self.segmentWithNLTK:
-            TextDocument.logger.info("Segment with NLTK")
+        bSplit = True
+        if self.segmentWithNLTK and self.segmenter == TextDocument.SEGMENTERRULES:
+            #Delimiters are split in the same pass
+            sentences = RuleSegmenter(self.languageId).segment(strText)
+            bSplit = False
+        elif self.segmentWithNLTK:
             #Trim new lines
             strText = self._replaceNewLines(strText)
 
@@ -285,19 +504,233 @@ class TextDocument(Document):
             for i, s in enumerate(sentences):
                 sentences[i] = self._replaceProblematicPeriods(s, forward=False)
         else:
-            TextDocument.logger.info("Segment with new lines")
             sentences = strText.split("\n")
 
-        #Make text clusters with unknown language id
-        self._addSentences(sentences)
+        return sentences, bSplit
 
-        TextDocument.logger.info("Loaded %d raw sentences!" % len(sentences))
+    def _segmentInChunks(self, filePath):
+        """Segment a large document chunk by chunk in a
+           process pool.
 
-    def _applyAllClusters(self, method):
-        """Apply 'method' to all clusters.
+           Chunks end on a blank line, or on a new line when
+           there is none. The sentences around the end of a
+           chunk are segmented again as one overlap window,
+           which gives the whole document segmentation as
+           long as boundary decisions only depend on the
+           surrounding words.
+
+           return a tuple (sentences list, split flag)
         """
-        for textCluster in self.listContent:
-            getattr(textCluster, method)()
+        sentencesList, separator, bSplit = [], "", True
+        for chunkSentences, leading, trailing, bSplit in \
+                self._iterChunksSentences(filePath):
+            #No sentence in the chunk
+            if len(chunkSentences) == 0:
+                separator += leading
+                continue
+
+            #Overlap window
+            if len(sentencesList) > 0:
+                window = sentencesList.pop() + separator + leading + chunkSentences[0]
+                chunkSentences = self._segmentText(window)[0] + chunkSentences[1:]
+
+            sentencesList.extend(chunkSentences)
+            separator = trailing
+
+        return sentencesList, bSplit
+
+    def _iterChunksSentences(self, filePath):
+        """Segment chunks in parallel, results are
+           yielded in document order.
+
+           At most 'segmentationWorkers' chunks are pending.
+        """
+        pendingFutures = collections.deque()
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.segmentationWorkers) as executor:
+            for strChunk in self._iterTextChunks(filePath):
+                pendingFutures.append(executor.submit(
+                    _segmentChunk, self.languageId, self.segmenter, strChunk))
+                del strChunk
+
+                if len(pendingFutures) >= self.segmentationWorkers:
+                    yield pendingFutures.popleft().result()
+
+            while len(pendingFutures) > 0:
+                yield pendingFutures.popleft().result()
+
+    def _iterClustersBatches(self, clusterList):
+        """Split 'clusterList' in batches of about
+           'normalizationBatchSize' characters.
+        """
+        clustersBatch, batchSize = [], 0
+        for textCluster in clusterList:
+            clustersBatch.append(textCluster)
+            batchSize += len(textCluster.getTextSentence()) + 1
+
+            if self.normalizationBatchSize > 0 and \
+                    batchSize >= self.normalizationBatchSize:
+                yield clustersBatch
+                clustersBatch, batchSize = [], 0
+
+        if len(clustersBatch) > 0:
+            yield clustersBatch
+
+    def _iterNormalizedBatches(self, batchesList):
+        """Normalize 'batchesList', a list of (language id,
+           clusters list), results are yielded in order.
+
+           With several workers, batches of all languages run
+           in a pool and at most two batches per worker are
+           pending. A profiled formula runs in this process,
+           as well as a formula within a time budget.
+        """
+        if self.watchdog is not None:
+            for languageId, clustersBatch in batchesList:
+                yield self._normalizeWithBudget(languageId, clustersBatch)
+            return
+
+        if self.normalizationWorkers <= 1 or len(batchesList) == 1 or \
+                self.regexSubstitutionFormula.getProfiler() is not None:
+            for languageId, clustersBatch in batchesList:
+                sentencesList = [c.getTextSentence() for c in clustersBatch]
+                yield _normalizeSentences(self.regexSubstitutionFormula,
+                                          languageId, sentencesList)
+            return
+
+        pendingFutures = collections.deque()
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.normalizationWorkers,
+                initializer=_initNormalization,
+                initargs=(self.regexSubstitutionFormula,)) as executor:
+            for languageId, clustersBatch in batchesList:
+                sentencesList = [c.getTextSentence() for c in clustersBatch]
+                pendingFutures.append(executor.submit(
+                    _normalizeBatch, languageId, sentencesList))
+                del sentencesList
+
+                if len(pendingFutures) >= 2 * self.normalizationWorkers:
+                    yield pendingFutures.popleft().result()
+
+            while len(pendingFutures) > 0:
+                yield pendingFutures.popleft().result()
+
+    def _normalizeWithBudget(self, languageId, clustersBatch):
+        """Apply the user regular expressions to each
+           sentence of 'clustersBatch' within the watchdog
+           budget.
+
+           return the list of normalized sentences, without
+                  the quarantined ones
+        """
+        normalizedList = []
+        for textCluster in clustersBatch:
+            strSentence = textCluster.getTextSentence()
+            bProcessed, strText = self.watchdog.run(
+                'normalize', strSentence, self.regexSubstitutionFormula.apply,
+                strSentence, languageId)
+            if bProcessed:
+                normalizedList.extend(strText.split(TextDocument.MERGECLUSTERSEP))
+        return normalizedList
+
+    def _iterTextChunks(self, filePath):
+        """Read 'filePath' in chunks of about
+           'segmentationChunkSize' characters, ending on
+           a blank line or a new line.
+        """
+        piecesList, piecesSize = [], 0
+        for strData in Ioread().iterChunks(filePath):
+            piecesList.append(strData)
+            piecesSize += len(strData)
+            if piecesSize < self.segmentationChunkSize:
+                continue
+
+            strBuffer = "".join(piecesList)
+            while len(strBuffer) >= self.segmentationChunkSize:
+                end = self.segmentationChunkSize
+                position = strBuffer.rfind("\n\n", 0, end)
+                if position != -1:
+                    position += 2
+                else:
+                    position = strBuffer.rfind("\n", 0, end) + 1
+
+                #No new line yet, read further
+                if position == 0:
+                    position = strBuffer.find("\n", end) + 1
+                    if position == 0:
+                        break
+
+                yield strBuffer[:position]
+                strBuffer = strBuffer[position:]
+
+            piecesList, piecesSize = [strBuffer], len(strBuffer)
+            del strBuffer
+
+        if piecesSize > 0:
+            yield "".join(piecesList)
+
+    def _applyAllClusters(self, method, *args, clustersList=None):
+        """Apply 'method' to all clusters, default to the
+           document ones, in batches of 'STAGEBATCHSIZE'
+           clusters with several threads.
+
+           return the list of results
+        """
+        if clustersList is None:
+            clustersList = self.listContent
+
+        if self.watchdog is not None:
+            return self._applyWithBudget(clustersList, method, args)
+
+        if self.stageThreads <= 1 or \
+                len(clustersList) <= TextDocument.STAGEBATCHSIZE:
+            return _applyClusters(clustersList, method, args)
+
+        batchSize = TextDocument.STAGEBATCHSIZE
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.stageThreads) as executor:
+            futuresList = [executor.submit(_applyClusters,
+                                           clustersList[i:i + batchSize],
+                                           method, args)
+                           for i in range(0, len(clustersList), batchSize)]
+
+            #Raise the first error
+            resultsList = []
+            for future in futuresList:
+                resultsList.extend(future.result())
+            return resultsList
+
+    def _applyWithBudget(self, clustersList, method, args):
+        """Apply 'method' to 'clustersList' one cluster at
+           a time within the watchdog budget. Quarantined
+           clusters are removed from the document.
+
+           return the list of results, False for the
+                  quarantined clusters
+        """
+        resultsList, quarantinedSet = [], set()
+        for textCluster in clustersList:
+            bProcessed, result = self.watchdog.run(method, textCluster.getTextSentence(),
+                                                   getattr(textCluster, method), *args)
+            if not bProcessed:
+                quarantinedSet.add(id(textCluster))
+                result = False
+            resultsList.append(result)
+
+        if len(quarantinedSet) > 0:
+            self.listContent = [c for c in self.listContent
+                                if id(c) not in quarantinedSet]
+        return resultsList
+
+    def _filterClusters(self, method):
+        """Keep the clusters for which 'method' is true.
+        """
+        clustersList = self.listContent
+        if self.watchdog is None:
+            validList = [getattr(c, method)() for c in clustersList]
+        else:
+            validList = self._applyWithBudget(clustersList, method, ())
+        self.listContent = [c for c, bValid in zip(clustersList, validList) if bValid]
 
     def _replaceNewLines(self, data):
         """Replace new lines by spaces.
@@ -347,23 +780,26 @@ class TextDocument(Document):
 
         except Exception as e:
             TextDocument.logger.critical("Tokenizer error: " + str(e))
-            raise Exception("Tokenizer error: " + self.tokenizer_path)
+            raise Exception("Tokenizer error: " + tokenizer_path)
 
         return sentences
         
-    def _addSentences(self, sentencesList, languageId=0, bEmpty = True):
+    def _addSentences(self, sentencesList, languageId=0, bEmpty = True,
+                      bSplit = True):
         """Add the given sentences to the document.
 
            param 'sentencesList': a list of text sentences
            param 'languageId'   : the language id for the sentences list
            param 'bEmpty'       : empty current document is set otherwise
                                   add to existing clusters 
+           param 'bSplit'       : split sentences on tabs, ';', ':', '!'
+                                  and '?' when segmenting with NLTK
         """
         if bEmpty: self.reset()
 
         #Add sentences as clusters
         for line in sentencesList:
-            if self.segmentWithNLTK:
+            if self.segmentWithNLTK and bSplit:
                 #Further sentence split to avoid long paragraphes
                 for utterance in re.split(r"\t|;|:|!|\?", line, flags=re.UNICODE):
                     self._addClusterText(utterance, languageId)
@@ -406,3 +842,84 @@ class TextDocument(Document):
         """
         tr = TextRepresentation(sourcePath,destinationPath,logDir)
         return tr.convertToText()
+
+
+###############
+# Worker process
+#
+def _segmentChunk(languageId, segmenter, strChunk):
+    """Segment one chunk of a document.
+
+       return a tuple (sentences list, text before the first
+              sentence, text after the last sentence, split
+              flag), new lines being removed
+    """
+    textDocument = TextDocument(None, languageId, None, [], None, True, False)
+    textDocument.setSegmenter(segmenter)
+
+    strChunk = textDocument._replaceNewLines(strChunk)
+    sentences, bSplit = textDocument._segmentText(strChunk)
+    if len(sentences) == 0:
+        return [], strChunk, "", bSplit
+
+    #Delimiters and white spaces around the sentences
+    start = max(strChunk.find(sentences[0]), 0)
+    end = strChunk.rfind(sentences[-1])
+    end = len(strChunk.rstrip()) if end == -1 else end + len(sentences[-1])
+
+    return sentences, strChunk[:start], strChunk[end:], bSplit
+
+
+_normalizationFormula = None
+
+
+def _initNormalization(regexSubstitutionFormula):
+    """Worker initializer, the formula is sent once
+       per worker with its regular expressions engine.
+    """
+    global _normalizationFormula
+    _normalizationFormula = regexSubstitutionFormula
+
+
+def _normalizeBatch(languageId, sentencesList):
+    return _normalizeSentences(_normalizationFormula, languageId, sentencesList)
+
+
+def _normalizeSentences(regexSubstitutionFormula, languageId, sentencesList):
+    """Apply 'regexSubstitutionFormula' to a batch of
+       sentences joined with new lines.
+
+       If a rule adds or removes a new line, the sentences
+       count changes and each sentence is normalized on its
+       own: a rule can then not merge two sentences.
+       Sentences are also normalized one by one when the
+       formula is profiled, times are then per sentence.
+
+       return the list of normalized sentences
+    """
+    separator = TextDocument.MERGECLUSTERSEP
+    if regexSubstitutionFormula.getProfiler() is None:
+        strText = regexSubstitutionFormula.apply(separator.join(sentencesList), languageId)
+        normalizedList = strText.split(separator)
+        if len(normalizedList) == len(sentencesList):
+            return normalizedList
+
+        TextDocument.logger.warning("Sentences count changed from %d to %d, " \
+                                    "normalizing sentences one by one" %
+                                    (len(sentencesList), len(normalizedList)))
+    normalizedList = []
+    for strSentence in sentencesList:
+        normalizedList.extend(regexSubstitutionFormula.apply(
+            strSentence, languageId).split(separator))
+    return normalizedList
+
+
+###############
+# Worker thread
+#
+def _applyClusters(clustersList, method, args):
+    """Apply 'method' with 'args' to 'clustersList'.
+
+       return the list of results
+    """
+    return [getattr(textCluster, method)(*args) for textCluster in clustersList]
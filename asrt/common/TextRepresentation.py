@@ -64,14 +64,19 @@ class TextRepresentation(object):
     def convertToText(self):
         """Convert the underlying to text and load the
            file as sentences.
+
+           return the text file path, the source file
+           itself for text files
         """
-        documentType = self._getDocumentType()
+        documentType = self.getDocumentType()
         self.tempFilePath = self.getTempFilePath()
 
         callback = getattr(self, TextRepresentation.KNOWNTYPES[documentType])
 
-        #Call function to convert
-        callback(self.sourceFileName, self.tempFilePath, self.logDir)
+        #Call function to convert, text files are
+        #not copied
+        self.tempFilePath = callback(self.sourceFileName, self.tempFilePath,
+                                     self.logDir)
 
         return self.tempFilePath
         
@@ -99,11 +104,7 @@ class TextRepresentation(object):
         """
         return self.tempDir + os.sep + MyFile(self.sourceFileName).getCurrentFileName() + ".tmp"
 
-
-    #############################
-    # Implementation
-    #                            
-    def _getDocumentType(self):
+    def getDocumentType(self):
         """Return the type of the underlying document.
            Raise an exception when unknown.
         """
@@ -143,15 +144,14 @@ class TextRepresentation(object):
             TextRepresentation.logger.critical("Failure: " + convertString)
             raise Exception("Error converting pdf: " + sourcePath)
 
+        return destinationPath
+
 
     @staticmethod
     def text2text(sourcePath, destinationPath, logDir):
-        """Make a copy of 'destinationPath'.
+        """Text files are read in place, no copy
+           to 'destinationPath' is made.
         """
-        TextRepresentation.logger.info("Copying txt file: " + sourcePath + " into text.")
-        
-        io = Ioread()
-        strContent = io.readFileContent(sourcePath)
+        TextRepresentation.logger.info("Using txt file: " + sourcePath + " as text.")
 
-        #Write utf8
-        io.writeFileContent(destinationPath, strContent)
+        return sourcePath
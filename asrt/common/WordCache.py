@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import logging
+import threading
+import collections
+
+
+class LRUCache(object):
+    """A bounded least recently used cache of word
+       transformations.
+
+       Words whose transformation depends on their context
+       are stored with the 'BYPASS' marker, the caller then
+       computes them again.
+
+       Lookups and updates hold a lock, the cache may be
+       shared between threads.
+    """
+    BYPASS = object()
+
+    def __init__(self, maxSize):
+        self.maxSize = maxSize
+        self.entriesDict = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+
+    def get(self, strWord):
+        """Cached value for 'strWord', 'BYPASS' or
+           None when not cached.
+        """
+        with self.lock:
+            value = self.entriesDict.get(strWord)
+            if value is None:
+                self.misses += 1
+                return None
+
+            self.entriesDict.move_to_end(strWord)
+            if value is LRUCache.BYPASS:
+                self.bypasses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def put(self, strWord, value):
+        """Cache 'value' for 'strWord', evicting the least
+           recently used entry when full.
+        """
+        with self.lock:
+            self.entriesDict[strWord] = value
+            if len(self.entriesDict) > self.maxSize:
+                self.entriesDict.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entriesDict)
+
+
+class WordCache(object):
+    """Word transformation caches shared by all sentences
+       of a run, one 'LRUCache' per stage and language.
+       A run holds its cache on its formula, see
+       'LMPreparationFormula.setWordCache'.
+
+       Usage:
+          cache = wordCache.getCache(WordCache.NOISE, languageId)
+          bNoise = cache.get(strWord)
+          if bNoise is None:
+              bNoise = isNoise(strWord)
+              cache.put(strWord, bNoise)
+    """
+    logger = logging.getLogger("Asrt.WordCache")
+
+    #Context free stages
+    NOISE           = 'noise'
+    NUMBERINWORDS   = 'numberInWords'
+    NUMBERS         = 'numbers'
+    STAGES          = [NOISE, NUMBERINWORDS, NUMBERS]
+
+    DEFAULTSIZE     = 100000
+
+    def __init__(self, maxSize=DEFAULTSIZE):
+        """Default constructor.
+
+           param maxSize: maximum number of words per stage
+                          and language
+        """
+        self.maxSize = maxSize
+        self.cachesDict = {}
+        self.lock = threading.Lock()
+
+    #####################
+    #Public interface
+    #
+    def getCache(self, stage, languageId):
+        """The 'LRUCache' of 'stage' for 'languageId'.
+        """
+        key = (stage, languageId)
+        cache = self.cachesDict.get(key)
+        if cache is None:
+            with self.lock:
+                cache = self.cachesDict.setdefault(key, LRUCache(self.maxSize))
+        return cache
+
+    def clear(self):
+        with self.lock:
+            self.cachesDict = {}
+
+    def getStageStatistics(self):
+        """Hits, misses, bypasses and hit rate per stage.
+
+           return a dictionary with one entry per stage
+        """
+        statisticsDict = {}
+        for (stage, languageId), cache in sorted(self.cachesDict.items()):
+            stageDict = statisticsDict.setdefault(stage, {'hits': 0, 'misses': 0,
+                                                          'bypasses': 0, 'entries': 0})
+            stageDict['hits'] += cache.hits
+            stageDict['misses'] += cache.misses
+            stageDict['bypasses'] += cache.bypasses
+            stageDict['entries'] += len(cache)
+
+        for stageDict in list(statisticsDict.values()):
+            lookups = stageDict['hits'] + stageDict['misses'] + stageDict['bypasses']
+            stageDict['hitRate'] = stageDict['hits'] / float(max(lookups, 1))
+
+        return statisticsDict
+
+    def getReport(self):
+        """A one line summary of the hit rates per stage.
+        """
+        stagesList = []
+        for stage, stageDict in sorted(self.getStageStatistics().items()):
+            stagesList.append("%s %.1f%% hits (%d misses, %d bypasses, %d entries)" %
+                              (stage, 100 * stageDict['hitRate'], stageDict['misses'],
+                               stageDict['bypasses'], stageDict['entries']))
+
+        return "Word cache: " + ", ".join(stagesList)
+
+    def __getstate__(self):
+        """Only the size is pickled, a worker process
+           starts with an empty cache.
+        """
+        return {'maxSize': self.maxSize}
+
+    def __setstate__(self, stateDict):
+        self.__init__(**stateDict)
@@ -21,13 +21,18 @@ __date__ = "Date: 2015/09"
 __copyright__ = "Copyright (c) 2015 Idiap Research Institute"
 __license__ = "BSD 3-Clause"
 
+import copy
 import logging
 import re
+import threading
 from asrt.common.english.FormulaNumber import NumberFormula as EnglishNumberFormula
 from asrt.common.french.FormulaNumber import NumberFormula as FrenchNumberFormula
 from asrt.common.german.FormulaNumber import NumberFormula as GermanNumberFormula
 from asrt.common.formula.FormulaRegularExpression import RegularExpressionFormula
 from asrt.common.RegularExpressionList import RegexList
+from asrt.common.RegularExpressionBackend import RegexEngine
+from asrt.common.WordCache import WordCache
+from asrt.common.AbbreviationTrie import AbbreviationTrie
 from asrt.common.AsrtConstants import UTF8MAP, PUNCTUATIONEXCLUDE, PUNCTUATIONKEEPINWORD, DOTCOMMAEXCLUDE
 from asrt.common.AsrtConstants import PUNCTUATIONMAP, PUNCTUATIONPATTERN, SPACEPATTERN
 from asrt.common.AsrtConstants import DATEREGEXLIST, CONTRACTIONPREFIXELIST, ACRONYMREGEXLIST
@@ -40,11 +45,31 @@ from asrt.config.AsrtConfig import FRENCH, GERMAN, ENGLISH
 class LMPreparationFormula():
     """Main formula for language modeling text
        preparation.
+
+       The text is held either as a string or as a list
+       of words, converted lazily: consecutive word based
+       stages share one split and the string is only joined
+       again for the stages working on the full text.
+
+       Shared tables are built once and never modified. The
+       word cache, the abbreviations tries and the regular
+       expressions engine are held per formula, i.e. one
+       formula per run. A formula may be shared between
+       threads through 'prepare', which works on a copy.
     """
     logger = logging.getLogger("Asrt.LMPreparationFormula")
 
-    ordDict = {}
-    abbreviationsDict = {}
+    # Utf-8 mapping tables per language, read only
+    ordDicts = {}
+
+    # Guards the build of the tables
+    tablesLock = threading.Lock()
+
+    NUMBERFORMULAS = {
+        FRENCH: FrenchNumberFormula,
+        GERMAN: GermanNumberFormula,
+        ENGLISH: EnglishNumberFormula
+    }
 
     # Regular expressions formulas
     dateFormula = RegularExpressionFormula(None,
@@ -62,18 +87,34 @@ class LMPreparationFormula():
     def __init__(self):
         """Default constructor.
         """
-        self.strText = ""
+        self._strText = ""
+        self._wordsList = None
         self.languageId = 0
         self.expandNumberInWords = True
-        self.numberFormula = {
-            FRENCH: FrenchNumberFormula,
-            GERMAN: GermanNumberFormula,
-            ENGLISH: EnglishNumberFormula
-        }
+        self.numberFormula = LMPreparationFormula.NUMBERFORMULAS
+        self.wordCache = WordCache()
+        self.abbreviationFiles = []
+        # Abbreviations tries per language, merged with
+        # the user abbreviations files when first used
+        self.abbreviationTries = None
+        self.regexEngine = None
 
     #####################
     #Getters and setters
     #
+    @property
+    def strText(self):
+        """The text, joined from the words list if needed.
+        """
+        if self._strText is None:
+            self._strText = " ".join(self._wordsList)
+        return self._strText
+
+    @strText.setter
+    def strText(self, strText):
+        self._strText = strText
+        self._wordsList = None
+
     def getText(self):
         return self.strText
 
@@ -101,18 +142,62 @@ class LMPreparationFormula():
            3:'English', 4:'Italian'
         """
         self.languageId = languageId
-        LMPreparationFormula.ordDict = {}
-        LMPreparationFormula.ordDict = LMPreparationFormula._getOrdDict(
-            self.languageId)
 
     def setExpandNumberInWords(self, expandNumberInWords):
         """Keep new words.
         """
         self.expandNumberInWords = expandNumberInWords
 
+    def setWordCache(self, wordCache):
+        """Cache of the context free word transformations,
+           shared by the sentences of 'prepare', None to
+           disable.
+        """
+        self.wordCache = wordCache
+
+    def getWordCache(self):
+        return self.wordCache
+
+    def setAbbreviationFiles(self, abbreviationFiles):
+        """User abbreviations files merged with the
+           'ABBREVIATIONS' tables, they take precedence.
+        """
+        with LMPreparationFormula.tablesLock:
+            self.abbreviationFiles = list(abbreviationFiles)
+            self.abbreviationTries = None
+
+    def getAbbreviationFiles(self):
+        return self.abbreviationFiles
+
+    def setRegexEngine(self, regexEngine):
+        """Match the regular expressions with 'regexEngine',
+           a 'RegexEngine', None for 'RegexEngine.getDefault'.
+        """
+        self.regexEngine = regexEngine
+
+    def getRegexEngine(self):
+        return self.regexEngine or RegexEngine.getDefault()
+
     ##################
     # Public interface
     #
+    def prepare(self, strText, languageId):
+        """Prepare 'strText' of language 'languageId' with
+           the settings of this formula.
+
+           Re-entrant: the work is done on a copy sharing the
+           word cache, the abbreviations tries and the engine,
+           the same formula can be used by several threads.
+
+           return the normalized text in utf-8 encoding
+        """
+        self._getAbbreviationTries()
+
+        formula = copy.copy(self)
+        formula.setText(strText)
+        formula.setLanguageId(languageId)
+        return formula.prepareText()
+
     def prepareText(self):
         """Prepare 'strText' for language modeling.
 
@@ -176,13 +261,16 @@ class LMPreparationFormula():
            For example words consisting of 4 or more punctuation
            characters.
         """
-        wordsList = re.split(SPACEPATTERN, self.strText, flags=re.UNICODE)
+        wordsList = self._getWords()
+        noiseList = self._transformWords(WordCache.NOISE, wordsList,
+                                         self._isNoise)
+
         newWordsList = []
-        for w in wordsList:
-            if not LMPreparationFormula._isNoise(w):
+        for w, bNoise in zip(wordsList, noiseList):
+            if not bNoise:
                 newWordsList.append(w)
 
-        self.strText = " ".join(newWordsList)
+        self._setWords(newWordsList)
         return self.strText
 
     def _normalizeUtf8(self):
@@ -194,15 +282,7 @@ class LMPreparationFormula():
         # Mapping dictionary
         ordDict = LMPreparationFormula._getOrdDict(languageId)
 
-        utf8List = []
-        # Loop through unicode characters
-        for i, c in enumerate(self.strText):
-            if ord(c) in ordDict:
-                utf8List.append(ordDict[ord(c)])
-            else:
-                utf8List.append(c)
-
-        self.strText = "".join(utf8List).rstrip().strip()
+        self.strText = self.strText.translate(ordDict).strip()
 
         if len(self.strText) > 1 and \
                 self.strText[-1] in self.ALLPUNCTUATIONSYMBOLS and \
@@ -214,25 +294,19 @@ class LMPreparationFormula():
     def _normalizeDates(self):
         """Normalize dates.
         """
-        self.strText = self.dateFormula.apply(self.strText, self.languageId)
+        self.strText = self.dateFormula.apply(self.strText, self.languageId,
+                                              regexEngine=self.regexEngine)
 
     def _expandAbbreviations(self):
-        """Expand language abbreviations.
+        """Expand language abbreviations, including their
+           spaced forms and forms glued to punctuation.
         """
-        aDict = self._getAbbreviationsDict()
-        if self.languageId not in aDict:
+        aTries = self._getAbbreviationTries()
+        if self.languageId not in aTries:
             return
 
-        wordsList = re.split(SPACEPATTERN, self.strText, flags=re.UNICODE)
-        newWordsList = []
-        for w in wordsList:
-            wByte = w.encode('utf-8')
-            if wByte in aDict[self.languageId]:
-                newWordsList.append(aDict[self.languageId][wByte])
-            else:
-                newWordsList.append(w)
-
-        self.strText = " ".join(newWordsList)
+        newWordsList, bSplit = aTries[self.languageId].expand(self._getWords())
+        self._setWords(newWordsList, bSplit)
 
     def _expandNumberInWords(self):
         """If there are numbers in words, split them except if
@@ -243,44 +317,50 @@ class LMPreparationFormula():
                 P5B4 --> P. 5 B. 4
                 PPB5 --> PPB 5 (acronyms are expanded later on)
         """
-        wordsList = re.split(SPACEPATTERN, self.strText, flags=re.UNICODE)
+        newWordsList = self._transformWords(WordCache.NUMBERINWORDS,
+                                            self._getWords(),
+                                            self._expandNumberInWord)
 
-        newWordsList = []
-        for w in wordsList:
-            if self.isOrdinalNumber(w, self.languageId):
-                self.logger.info("Skipping ordinal number %s" % w)
-                newWordsList.append(w)
-                continue
-            tokenList = re.split(CAPTURINGDIGITPATTERN, w, flags=re.UNICODE)
-            # Numbers need to contain a digit
-            # Ordinal numbers are not expanded
-            if not re.search("[0-9]", w) or (self.languageId in EXPANDEXCEPTIONS and
-                                             re.search(EXPANDEXCEPTIONS[self.languageId], w, flags=re.UNICODE)):
-                newWordsList.append(w)
-            # We have a match
-            elif len(tokenList) > 1:
-                # Single letter acronyms
-                for i, t in enumerate(tokenList):
-                    # Digit return false
-                    if len(t) == 1 and t.isupper():
-                        tokenList[i] = tokenList[i] + "."
-                newWord = " ".join(tokenList).strip()
-                # Group P . 5 into P. 5
-                newWord = re.sub(GROUPINGDOTCOMMAPATTERN, "\g<2> ", newWord)
-                newWordsList.append(newWord)
-            else:
-                newWordsList.append(w)
+        # Split words span several words
+        self._setWords(newWordsList, True)
 
-        self.strText = " ".join(newWordsList)
+    def _expandNumberInWord(self, w):
+        """Split numbers in word 'w'.
+
+           return the new word
+        """
+        if self.isOrdinalNumber(w, self.languageId):
+            self.logger.info("Skipping ordinal number %s" % w)
+            return w
+        regexEngine = self.getRegexEngine()
+        tokenList = regexEngine.getRegex(CAPTURINGDIGITPATTERN, re.UNICODE).split(w)
+        # Numbers need to contain a digit
+        # Ordinal numbers are not expanded
+        if not regexEngine.getRegex("[0-9]").search(w) or (self.languageId in EXPANDEXCEPTIONS and
+                regexEngine.getRegex(EXPANDEXCEPTIONS[self.languageId], re.UNICODE).search(w)):
+            return w
+        # We have a match
+        elif len(tokenList) > 1:
+            # Single letter acronyms
+            for i, t in enumerate(tokenList):
+                # Digit return false
+                if len(t) == 1 and t.isupper():
+                    tokenList[i] = tokenList[i] + "."
+            newWord = " ".join(tokenList).strip()
+            # Group P . 5 into P. 5
+            return regexEngine.getRegex(GROUPINGDOTCOMMAPATTERN).sub("\g<2> ", newWord)
+
+        return w
 
     def _expandAcronyms(self):
         """Acronyms are splitted.
 
            i.e. PDC --> p. d. c.
         """
-        self.strText = self.acronymFormula.apply(self.strText, self.languageId)
-        self.strText = re.sub(ACRONYMDELIMITER, "",
-                              self.strText, flags=re.UNICODE)
+        self.strText = self.acronymFormula.apply(self.strText, self.languageId,
+                                                 regexEngine=self.regexEngine)
+        self.strText = self.getRegexEngine().getRegex(ACRONYMDELIMITER, re.UNICODE).sub(
+            "", self.strText)
 
     def _normalizePunctuation(self, excludeList):
         """Some punctuation characters are
@@ -331,11 +411,10 @@ class LMPreparationFormula():
             prevC = strC
 
         self.strText = "".join(unicodeList).rstrip().strip()
-        self.strText = re.sub("(^- *| - |-$)", "",
-                              self.strText)
-        self.strText = re.sub("(- )", " ", self.strText)
-        self.strText = re.sub(SPACEPATTERN, " ",
-                              self.strText)
+        regexEngine = self.getRegexEngine()
+        self.strText = regexEngine.getRegex("(^- *| - |-$)").sub("", self.strText)
+        self.strText = regexEngine.getRegex("(- )").sub(" ", self.strText)
+        self.strText = regexEngine.getRegex(SPACEPATTERN).sub(" ", self.strText)
 
     def _normalizeWords(self):
         """Word base normalization.
@@ -356,16 +435,20 @@ class LMPreparationFormula():
             return
         numberFormula = self.numberFormula[languageId]
 
-        self.strText = numberFormula.apply(self.strText)
+        cache = None
+        if self.wordCache is not None:
+            cache = self.wordCache.getCache(WordCache.NUMBERS, languageId)
+
+        self.strText = numberFormula.apply(self.strText, cache)
 
     def _normalizeContractionPrefixes(self):
         """Contraction prefixes are separated and
            acronyms are normalized.
         """
         self.strText = self.apostropheFormula.apply(
-            self.strText, self.languageId)
+            self.strText, self.languageId, regexEngine=self.regexEngine)
         self.strText = self.contractionPrefixFormula.apply(
-            self.strText, self.languageId, False)
+            self.strText, self.languageId, False, self.regexEngine)
 
     def _normalizeCase(self):
         """Case normalization (change to lower case)
@@ -375,17 +458,71 @@ class LMPreparationFormula():
     def _normalizeSpaces(self):
         """Case normalization (change to lower case)
         """
-        self.strText = re.sub(SPACEPATTERN, " ",
-                              self.strText, flags=re.UNICODE)
+        self.strText = self.getRegexEngine().getRegex(SPACEPATTERN, re.UNICODE).sub(
+            " ", self.strText)
+
+    def _getWords(self):
+        """The text as a list of words, split once for
+           consecutive word based stages.
+        """
+        if self._wordsList is None:
+            self._wordsList = self.getRegexEngine().getRegex(SPACEPATTERN, re.UNICODE).split(
+                self._strText)
+        return self._wordsList
+
+    def _setWords(self, newWordsList, bSplit=False):
+        """Set the text from a list of words.
+
+           param newWordsList: the transformed words
+           param bSplit      : True if some words are empty or
+                               span several words, the text is
+                               then joined and split again
+        """
+        if bSplit:
+            self.strText = " ".join(newWordsList)
+            return
+
+        self._strText = None
+        self._wordsList = newWordsList
+
+    def _transformWords(self, stage, wordsList, function):
+        """Apply 'function' to every word, through the
+           'stage' word cache when enabled.
+
+           return the list of results
+        """
+        if self.wordCache is None:
+            return [function(w) for w in wordsList]
+
+        cache = self.wordCache.getCache(stage, self.languageId)
+
+        resultsList = []
+        for w in wordsList:
+            value = cache.get(w)
+            if value is None:
+                value = function(w)
+                cache.put(w, value)
+            resultsList.append(value)
+
+        return resultsList
 
     @staticmethod
     def _getOrdDict(langId):
-        """Utf-8 characters mapping in the form of a
-           code point dictionary.
+        """Utf-8 characters mapping of language 'langId' in
+           the form of a code point dictionary, built once.
         """
-        if len(list(LMPreparationFormula.ordDict.keys())) > 0:
-            return LMPreparationFormula.ordDict
+        ordDict = LMPreparationFormula.ordDicts.get(langId)
+        if ordDict is not None:
+            return ordDict
 
+        with LMPreparationFormula.tablesLock:
+            if langId not in LMPreparationFormula.ordDicts:
+                LMPreparationFormula.ordDicts[langId] = \
+                    LMPreparationFormula._buildOrdDict(langId)
+            return LMPreparationFormula.ordDicts[langId]
+
+    @staticmethod
+    def _buildOrdDict(langId):
         # Substitution dictionary, assume one character only
         ordDict = {}
         for match, sub, comment, languageId in UTF8MAP:
@@ -399,39 +536,46 @@ class LMPreparationFormula():
             if (langId == int(languageId) or int(languageId) == 0):
                 ordDict[ord(match)] = sub
 
-        LMPreparationFormula.ordDict = ordDict
-        return LMPreparationFormula.ordDict
+        return ordDict
 
-    @staticmethod
-    def _getAbbreviationsDict():
-        """Get the abbreviations dictionary with keys
-           encoded in byte string for comparison.
+    def _getAbbreviationTries(self):
+        """Get the abbreviations tries per language, built
+           once from the 'ABBREVIATIONS' tables and the user
+           abbreviations files.
         """
-        if len(list(LMPreparationFormula.abbreviationsDict.keys())) > 0:
-            return LMPreparationFormula.abbreviationsDict
+        aTries = self.abbreviationTries
+        if aTries is not None:
+            return aTries
+
+        with LMPreparationFormula.tablesLock:
+            if self.abbreviationTries is None:
+                self.abbreviationTries = self._buildAbbreviationTries()
+            return self.abbreviationTries
 
-        aDict = {}
+    def _buildAbbreviationTries(self):
+        aTries = {}
         for lang in list(ABBREVIATIONS.keys()):
-            if lang not in aDict:
-                aDict[lang] = {}
-            for k, v in list(ABBREVIATIONS[lang].items()):
-                aDict[lang][k.encode('utf-8')] = v
+            aTries[lang] = AbbreviationTrie(ABBREVIATIONS[lang])
 
-        LMPreparationFormula.abbreviationsDict = aDict
-        return LMPreparationFormula.abbreviationsDict
+        for abbreviationFile in self.abbreviationFiles:
+            for lang, abbreviationsDict in AbbreviationTrie.readFile(abbreviationFile).items():
+                if lang not in aTries:
+                    aTries[lang] = AbbreviationTrie()
+                aTries[lang].addAll(abbreviationsDict)
 
-    @staticmethod
-    def _isNoise(strWord):
+        return aTries
+
+    def _isNoise(self, strWord):
         """Check if 'strWord' is a noise word.
 
            return True or False
         """
-        return LMPreparationFormula.PUNCTUATIONREGEX.search(strWord) != None
+        return self.getRegexEngine().getRegex(PUNCTUATIONPATTERN, re.UNICODE).search(strWord) != None
 
-    @staticmethod
-    def _applyRegexes(strText, regexList):
+    def _applyRegexes(self, strText, regexList):
+        regexEngine = self.getRegexEngine()
         for p, r, t in regexList:
-            strText = re.sub(p, r, strText, flags=re.UNICODE)
+            strText = regexEngine.getRegex(p, re.UNICODE).sub(r, strText)
         return strText
 
     @staticmethod
@@ -22,9 +22,11 @@ __copyright__ = "Copyright (c) 2015 Idiap Research Institute"
 __license__ = "BSD 3-Clause"
 
 import sys
+import time
 import logging
 import re
 from asrt.common.RegularExpressionList import RegexList
+from asrt.common.RegularExpressionBackend import RegexEngine
 
 
 class RegexType():
@@ -105,14 +107,97 @@ class RegexType():
         return re.compile(regex).groups
 
 
+class RegexRule():
+    """A substitution regular expression with its type
+       context, compiled on first use with a 'RegexEngine'.
+       Engines cache their patterns: a rule shared by
+       several engines is compiled once per engine.
+
+       Lambda substitutions are evaluated once per process,
+       only the rule sources are pickled.
+    """
+    FLAGS = re.UNICODE | re.MULTILINE
+
+    def __init__(self, strPattern, strSubstitution, languageId, groups=None):
+        self.strPattern = strPattern
+        self.strSubstitution = strSubstitution
+        self.languageId = languageId
+        self.groups = groups
+        self.pattern = None
+        self.replacement = None
+        self.compiled = None
+
+    def isCallable(self):
+        return self.strSubstitution.startswith("lambda")
+
+    def compile(self, regexEngine=None):
+        """Compile the pattern with 'regexEngine', default
+           to 'RegexEngine.getDefault', and evaluate a lambda
+           substitution.
+
+           The engine and its pattern are set together last,
+           other threads use the rule once complete.
+
+           return the compiled pattern
+        """
+        regexEngine = regexEngine or RegexEngine.getDefault()
+        if self.replacement is None:
+            replacement = self.strSubstitution
+            if self.isCallable():
+                replacement = eval(self.strSubstitution)
+            self.replacement = replacement
+        pattern = regexEngine.getRegex(self.strPattern, RegexRule.FLAGS)
+        self.groups = pattern.groups
+        self.pattern = pattern
+        self.compiled = (regexEngine, pattern)
+        return pattern
+
+    def sub(self, strText, regexEngine=None):
+        return self._getPattern(regexEngine).sub(self.replacement, strText)
+
+    def subn(self, strText, regexEngine=None):
+        """Substitution and its number of matches.
+        """
+        return self._getPattern(regexEngine).subn(self.replacement, strText)
+
+    def toList(self):
+        return [self.strPattern, self.strSubstitution, self.languageId, self.groups]
+
+    def __getstate__(self):
+        return {'strPattern': self.strPattern, 'strSubstitution': self.strSubstitution,
+                'languageId': self.languageId, 'groups': self.groups}
+
+    def __setstate__(self, stateDict):
+        self.__init__(**stateDict)
+
+    def _getPattern(self, regexEngine):
+        """The pattern compiled with 'regexEngine'.
+        """
+        regexEngine = regexEngine or RegexEngine.getDefault()
+        compiled = self.compiled
+        if compiled is None or compiled[0] is not regexEngine:
+            return self.compile(regexEngine)
+        return compiled[1]
+
+
 class RegularExpressionFormula():
     """Formula that applies regular expressions.
+
+       The substitution patterns are expanded once into
+       'RegexRule' objects, see 'prepareRules'.
+
+       Rules applications are timed once a profiler is set,
+       see 'RegexProfiler'. Rules are matched with the engine
+       of the formula, see 'setRegexEngine'.
     """
     logger = logging.getLogger("Asrt.RegexFormula")
 
     def __init__(self, rulesFile=None, substitutionPatternList=[]):
         self.rulesFile = rulesFile
         self.substitutionPatternList = substitutionPatternList
+        self.profiler = None
+        self.regexEngine = None
+        self.setRules(None)
 
     ####################
     #Getters and setters
@@ -128,16 +213,64 @@ class RegularExpressionFormula():
         """
         self.logger.info("Set patterns list")
         self.substitutionPatternList = substitutionPatternList
+        self.setRules(None)
 
     def getSubstitutionPatterns(self):
         return self.substitutionPatternList
 
+    def setRules(self, rulesList):
+        """Set the rules prepared from the substitution
+           patterns, i.e. from a 'RegexBundle'. They are
+           prepared again when None.
+        """
+        self.rulesList = rulesList
+        self.languageRulesDict = {}
+
+    def getRules(self):
+        if self.rulesList is None:
+            self.rulesList = RegularExpressionFormula.prepareRules(
+                self.substitutionPatternList)
+        return self.rulesList
+
+    def getLanguageRules(self, languageId):
+        """Rules of 'languageId' and of all languages, in
+           file order.
+        """
+        if languageId not in self.languageRulesDict:
+            self.languageRulesDict[languageId] = [r for r in self.getRules()
+                                                  if r.languageId in (0, languageId)]
+        return self.languageRulesDict[languageId]
+
+    def setProfiler(self, profiler):
+        """Record each rule application into 'profiler', a
+           'RegexProfiler', or stop recording when None.
+           All the rules are registered, applied or not.
+        """
+        self.profiler = profiler
+        if profiler is not None and self.hasPatterns():
+            profiler.registerRules(self.getRules())
+
+    def getProfiler(self):
+        return self.profiler
+
+    def setRegexEngine(self, regexEngine):
+        """Match the rules with 'regexEngine', a 'RegexEngine',
+           None for 'RegexEngine.getDefault'.
+        """
+        self.regexEngine = regexEngine
+
+    def getRegexEngine(self):
+        return self.regexEngine or RegexEngine.getDefault()
+
     ####################
     # Public methods
     #
-    def apply(self, strText, languageId, debug=False):
+    def apply(self, strText, languageId, debug=False, regexEngine=None):
         """Apply regular expressions to 'strText'.
 
+             param regexEngine: the 'RegexEngine' to match with,
+                                default to the formula one
+
              return an utf-8 formatted string.
         """
         if len(self.substitutionPatternList) == 0:
@@ -146,11 +279,14 @@ class RegularExpressionFormula():
             else:
                 self.logger.info("Loading regexes from %s" %
                                  str(self.rulesFile))
-                self.substitutionPatternList = \
-                    RegexList.loadFromFile(self.rulesFile)
+                self.setSubstitutionPatternList(RegexList.loadFromFile(self.rulesFile))
+                if self.profiler is not None:
+                    self.profiler.registerRules(self.getRules())
 
-        return RegularExpressionFormula.applyRegularExpressions(strText,
-                                                                self.substitutionPatternList, languageId, debug)
+        return RegularExpressionFormula.applyRules(strText,
+                                                   self.getLanguageRules(languageId), debug,
+                                                   self.profiler, languageId,
+                                                   regexEngine or self.regexEngine)
 
     def hasPatterns(self):
         return len(self.substitutionPatternList) != 0
@@ -175,6 +311,24 @@ class RegularExpressionFormula():
                        "'" + regexSubstitution + "'"))
         print("\n")
 
+    @staticmethod
+    def prepareRules(substitutionPatternList):
+        """Expand the substitution patterns with the
+           contexts of their type.
+
+           return a list of 'RegexRule', in file order
+        """
+        rulesList = []
+        for regex, alternate, regexType, regexLanguageId in substitutionPatternList:
+            for regexPattern, regexSubstitution in \
+                    RegexType.typeToRegularExpressions(regex, alternate, int(regexType)):
+                # Is it some python code
+                if alternate.startswith("lambda"):
+                    regexSubstitution = alternate
+                rulesList.append(RegexRule(regexPattern, regexSubstitution,
+                                           int(regexLanguageId)))
+        return rulesList
+
     @staticmethod
     def applyRegularExpressions(strText, substitutionPatternList, languageId, debug=False):
         """Apply the regular expressions in function of there type.
@@ -182,7 +336,22 @@ class RegularExpressionFormula():
 
              The order of application is the file order.
         """
-        # print substitutionPatternList
+        rulesList = [r for r in RegularExpressionFormula.prepareRules(substitutionPatternList)
+                     if r.languageId in (0, languageId)]
+        return RegularExpressionFormula.applyRules(strText, rulesList, debug)
+
+    @staticmethod
+    def applyRules(strText, rulesList, debug=False, profiler=None, languageId=0,
+                   regexEngine=None):
+        """Apply 'rulesList', a list of 'RegexRule' of the
+           text language, in order.
+
+           param profiler   : a 'RegexProfiler' recording each
+                              rule application or None
+           param languageId : the text language, for the profiler
+           param regexEngine: the 'RegexEngine' to match with,
+                              None for 'RegexEngine.getDefault'
+        """
         if debug:
             RegularExpressionFormula.logger.info(
                 "Applying regular expressions to transcript ...")
@@ -194,47 +363,21 @@ class RegularExpressionFormula():
             RegularExpressionFormula.logger.info(
                 "Initial transcript: " + strText)
 
-        # For each known regular expression
-        for regex, alternate, regexType, regexLanguageId in substitutionPatternList:
-            regexLanguageId = int(regexLanguageId)
-
-            # Does it match the text language
-            if regexLanguageId != languageId and \
-               regexLanguageId != 0:
-                continue
-
-            # Convert from type
-            regexListForType = \
-                RegexType.typeToRegularExpressions(
-                    regex, alternate, int(regexType))
-
-            # Get regular expressions for the given type
-            for regexForType in regexListForType:
-                regexPattern = regexForType[0]  # What to match
-                regexSubstitution = regexForType[1]  # What to substitute
-
-                strLineOriginal = strText
-
-                # Is it some python code
-                if alternate.startswith("lambda"):
-                    # Use alternate version
-                    strText = re.sub(regexPattern, eval(
-                        alternate), strText, flags=re.UNICODE | re.MULTILINE)
-                else:
-                    # print regexPattern, regexSubstitution
-                    # No ignore case available
-                    # print regexPattern, " --> ", strText
-                    strText = re.sub(regexPattern, regexSubstitution,
-                                     strText, flags=re.UNICODE | re.MULTILINE)
-
-                if debug:
-                    if strText.encode('utf-8') != strLineOriginal.encode('utf-8'):
-                        sys.stdout.write(
-                            "  --> Original string: >" + strLineOriginal.encode('utf-8') + "<\n")
-                        sys.stdout.write("      Match pattern: >" + regexPattern.encode('utf-8') + "<"
-                                         "\n      Substitution: >" + regexSubstitution.encode('utf-8') + "<")
-                        sys.stdout.write(
-                            "\n      >" + strText.encode('utf-8') + "<\n")
+        for rule in rulesList:
+            strLineOriginal = strText
+            if profiler is None:
+                strText = rule.sub(strText, regexEngine)
+            else:
+                startTime = time.perf_counter()
+                strText, matches = rule.subn(strText, regexEngine)
+                profiler.record(rule, languageId, len(strLineOriginal),
+                                time.perf_counter() - startTime, matches)
+
+            if debug and strText != strLineOriginal:
+                sys.stdout.write("  --> Original string: >" + strLineOriginal + "<\n")
+                sys.stdout.write("      Match pattern: >" + rule.strPattern + "<"
+                                 "\n      Substitution: >" + rule.strSubstitution + "<")
+                sys.stdout.write("\n      >" + strText + "<\n")
 
         strText = RegularExpressionFormula.normalizeSpaces(strText)
 
@@ -23,10 +23,14 @@ __license__ = "BSD 3-Clause"
 
 import unittest
 import re
+import sys
 import string
+import pickle
 import logging
+import concurrent.futures
 
 from asrt.common.formula.FormulaLMPreparation import LMPreparationFormula
+from asrt.common.WordCache import WordCache, LRUCache
 from asrt.common.AsrtConstants import UTF8MAP, SPACEPATTERN, DOTCOMMAEXCLUDE, PUNCTUATIONEXCLUDE
 from asrt.common.AsrtConstants import ABBREVIATIONS
 from asrt.common.LoggingSetup import setupLogging
@@ -119,7 +123,7 @@ class TestFormulaLMPreparation(unittest.TestCase):
     def testIsNoise(self):
         for p in list(string.punctuation):
             strTest = p * 4
-            self.assertTrue(LMPreparationFormula._isNoise(strTest))
+            self.assertTrue(LMPreparationFormula()._isNoise(strTest))
 
     def testFilterNoiseWords(self):
         strTest = "!-?- hello how !!!! are you *-+$"
@@ -279,3 +283,155 @@ class TestFormulaLMPreparation(unittest.TestCase):
             f.setText(t)
             r = f.prepareText()
             self.assertEqual(gt.encode('utf-8'), r.encode('utf-8'))
+
+    def testWordCache(self):
+        testDict = {1: ["le 1er janvier 2015 à 10h30, 3,5 %", "la 2e place et le 1er",
+                        "object A1 et P3B du XXe siècle", "le 1er janvier 2015"],
+                    2: ["am 2. Dezember 2015", "der 2. Dezember", "am 2. Dezember 2015"],
+                    3: ["the 1st of 20 objects", "object 5 of 20"]}
+
+        def prepare(wordCache):
+            resultsList = []
+            f = LMPreparationFormula()
+            f.setWordCache(wordCache)
+            f.setExpandNumberInWords(True)
+            for languageId, sentencesList in sorted(testDict.items()):
+                f.setLanguageId(languageId)
+                for t in sentencesList:
+                    f.setText(t)
+                    resultsList.append(f.prepareText())
+            return resultsList
+
+        gtList = prepare(None)
+
+        wordCache = WordCache(100)
+        self.assertEqual(gtList, prepare(wordCache))
+        self.assertEqual(gtList, prepare(wordCache))
+
+        #German ordinals depend on the previous word
+        self.assertEqual("der zweite dezember", gtList[5])
+        self.assertEqual("am zweiten dezember zwei tausend fünfzehn", gtList[4])
+
+        statisticsDict = wordCache.getStageStatistics()
+        self.assertEqual(sorted(WordCache.STAGES), sorted(statisticsDict.keys()))
+        for stage in WordCache.STAGES:
+            self.assertTrue(statisticsDict[stage]['hitRate'] > 0.4)
+        self.assertTrue(statisticsDict[WordCache.NUMBERS]['bypasses'] > 0)
+        self.assertTrue(wordCache.getReport().startswith("Word cache: "))
+
+        #Formulas do not share a cache, the copies of
+        #'prepare' share the one of their formula
+        f, g = LMPreparationFormula(), LMPreparationFormula()
+        self.assertFalse(f.getWordCache() is g.getWordCache())
+        f.prepare("le 1er janvier", 1)
+        self.assertEqual(0, len(g.getWordCache().getStageStatistics()))
+        self.assertTrue(len(f.getWordCache().getStageStatistics()) > 0)
+
+        #Only the size is pickled
+        self.assertEqual({}, pickle.loads(pickle.dumps(f.getWordCache())).cachesDict)
+
+    def testLRUCache(self):
+        cache = LRUCache(2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        self.assertEqual("1", cache.get("a"))
+        cache.put("c", "3")
+        self.assertEqual(None, cache.get("b"))
+        self.assertEqual("1", cache.get("a"))
+        self.assertEqual("3", cache.get("c"))
+        self.assertEqual(2, len(cache))
+        self.assertEqual((3, 1), (cache.hits, cache.misses))
+
+    def testWordsRepresentation(self):
+        f = LMPreparationFormula()
+        f.setLanguageId(1)
+        f.setText(" A/R  P3B ")
+        self.assertEqual(["", "A/R", "P3B", ""], f._getWords())
+        self.assertEqual(" A/R  P3B ", f.getText())
+
+        #Multi words expansion is split again
+        f._expandAbbreviations()
+        self.assertEqual(" accusé de réception P3B ", f.getText())
+        self.assertEqual(["", "accusé", "de", "réception", "P3B", ""], f._getWords())
+        f._expandNumberInWords()
+        self.assertEqual(" accusé de réception P. 3 B. ", f.getText())
+
+        #Same result as applying each stage on a new text
+        gtList = []
+        for stage in ["_filterNoiseWords", "_expandAbbreviations", "_expandNumberInWords"]:
+            g = LMPreparationFormula()
+            g.setLanguageId(1)
+            g.setText(gtList[-1] if len(gtList) > 0 else "le  1er A/R ,,,, de A1 ")
+            getattr(g, stage)()
+            gtList.append(g.getText())
+
+        f.setText("le  1er A/R ,,,, de A1 ")
+        f._filterNoiseWords()
+        f._expandAbbreviations()
+        f._expandNumberInWords()
+        self.assertEqual(gtList[-1], f.getText())
+
+    def testExpandAbbreviationsForms(self):
+        testList = [(r"z. B. und (u.a. hier),", r"zum Beispiel und (unter anderem hier),", 2),
+                    (r"u. a. z.", r"unter anderem z.", 2),
+                    (r"«Dr.» et cetera", r"«Doktor» et cetera", 2),
+                    (r"(etc.), Mr. Smith", r"(et cetera), Mister Smith", 3),
+                    (r"C. Q. F. D.", r"ce qu’il fallait démontrer", 1)]
+
+        f = LMPreparationFormula()
+        for t, gt, languageId in testList:
+            f.setLanguageId(languageId)
+            self.verifyEqual([(t, gt)], f, f._expandAbbreviations)
+
+    def testAbbreviationFiles(self):
+        abbreviationFile = TEMPDIRUNITTEST + "/abbreviations.csv"
+        with open(abbreviationFile, 'w', encoding='utf-8') as outputFile:
+            outputFile.write("abbreviation\texpansion\tlanguage\tcomment\n")
+            outputFile.write("ggf.\tgegebenenfalls\t2\t\n")
+            outputFile.write("Mr.\tMister user\t3\tOverride\n")
+            outputFile.write("S. A.\tsociété anonyme\t1\tSpaced\n")
+
+        f = LMPreparationFormula()
+        f.setAbbreviationFiles([abbreviationFile])
+        testList = [(r"ggf. (z.B.)", r"gegebenenfalls (zum Beispiel)", 2),
+                    (r"Mr. Smith", r"Mister user Smith", 3),
+                    (r"la S. A. Mme", r"la société anonyme madame", 1)]
+        for t, gt, languageId in testList:
+            f.setLanguageId(languageId)
+            self.verifyEqual([(t, gt)], f, f._expandAbbreviations)
+        self.assertEqual("mister user smith", f.prepare("Mr. Smith", 3))
+
+        #Other formulas keep the default abbreviations
+        g = LMPreparationFormula()
+        g.setLanguageId(3)
+        self.verifyEqual([(r"Mr. Smith", r"Mister Smith")], g, g._expandAbbreviations)
+
+        f.setAbbreviationFiles([])
+        f.setLanguageId(3)
+        self.verifyEqual([(r"Mr. Smith", r"Mister Smith")], f, f._expandAbbreviations)
+
+    def testPrepareThreads(self):
+        sentencesList = [("Le 3e prix (env. 1'200 CHF), p. ex. à l'HES-SO.", 1),
+                         ("Am 2. Mai kostet es z. B. 1'000.50 Fr. laut BAG", 2),
+                         ("Mr. Smith paid $25 for the 21st A4 copy, etc.", 3),
+                         ("«Ça» coûte 12,5% – un P5B4 de 1990", 1),
+                         ("Die 3. Auflage des ABC-Berichts (ca. 200 Seiten)", 2)]
+        sentencesList = [(s + " %d" % i, l) for i in range(40) for s, l in sentencesList]
+
+        f = LMPreparationFormula()
+        previousSwitchInterval = sys.getswitchinterval()
+        try:
+            #Small cache for evictions, tables built concurrently
+            f.setWordCache(WordCache(50))
+            LMPreparationFormula.ordDicts = {}
+            sys.setswitchinterval(1e-6)
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+                futuresList = [executor.submit(f.prepare, s, l) for s, l in sentencesList]
+                threadsList = [future.result() for future in futuresList]
+        finally:
+            sys.setswitchinterval(previousSwitchInterval)
+
+        serialList = [f.prepare(s, l) for s, l in sentencesList]
+        self.assertEqual(serialList, threadsList)
+        self.assertEqual("", f.getText())
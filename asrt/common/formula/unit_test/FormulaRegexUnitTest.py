@@ -21,18 +21,49 @@ __date__ = "Date: 2015/09"
 __copyright__ = "Copyright (c) 2015 Idiap Research Institute"
 __license__ = "BSD 3-Clause"
 
-import unittest
+import os
 import re
+import pickle
+import shutil
+import unittest
 
-from asrt.common.formula.FormulaRegularExpression import RegularExpressionFormula
+from asrt.common.formula.FormulaRegularExpression import RegularExpressionFormula, RegexRule
 from asrt.common.RegularExpressionList import RegexList
+from asrt.common.RegularExpressionBundle import RegexBundle
+from asrt.common.RegularExpressionProfiler import RegexProfiler
+from asrt.common.RegularExpressionBackend import RegexEngine, Re2Backend, RegexBackendException
+from asrt.config.AsrtConfig import TEMPDIRUNITTEST
 from asrt.common.AsrtConstants import CONTRACTIONPREFIXELIST, ACRONYMREGEXLIST
 from asrt.common.AsrtConstants import DATEREGEXLIST, APOSTHROPHELIST, ACRONYMDELIMITER
 
 class TestFormulaRegex(unittest.TestCase):
+    OUTPUTDIR = TEMPDIRUNITTEST + "/regexbundle"
+
+    RULESLIST = [("regexPatternString", "regexPatternAlternate", "regexPatternType_id",
+                  "Language", "regexPatternComment"),
+                 ("aaa", "", "-1", "0", ""),
+                 ("IV", "I. V.", "2", "0", ""),
+                 ("([0-9]+)'([0-9]*)", "\\g<1>\\g<2>", "1", "0", ""),
+                 ("etc[.]?", "et cetera", "2", "1", ""),
+                 ("ADG", "lambda m: m.group(0).lower()", "1", "2", "")]
+
     def setUp(self):
         print("")
 
+    def writeRules(self, rulesList):
+        if not os.path.exists(self.OUTPUTDIR):
+            os.makedirs(self.OUTPUTDIR)
+        regexFile = self.OUTPUTDIR + "/regex.csv"
+        with open(regexFile, 'w', encoding='utf-8') as outputFile:
+            outputFile.write("".join(["\t".join(r) + "\n" for r in rulesList]))
+        return regexFile
+
+    def applyBundle(self, regexBundle, strText, languageId):
+        f = RegularExpressionFormula(None, [r for r in regexBundle.getRegexList()
+                                            if int(r[RegexList.TYPEINDICE]) != -1])
+        f.setRules(regexBundle.getRules())
+        return f.apply(strText, languageId)
+
     def verifyEqual(self, testList, f, languageId):
         for t, gt in testList:
             resultString = f.apply(t, languageId, False)
@@ -118,3 +149,172 @@ class TestFormulaRegex(unittest.TestCase):
         for t, gt in TESTLIST:
             r = f.apply(t, 0)
             self.assertEqual(gt.encode('utf-8'), r.encode('utf-8'))
+
+    def testPrepareRules(self):
+        substitutionList = RegexList.removeComments(self.RULESLIST[2:])
+        f = RegularExpressionFormula(None, substitutionList)
+
+        self.assertEqual(4, len(f.getRules()))
+        self.assertEqual(["( |^)IV( |$)", "\\g<1>I. V.\\g<2>", 0],
+                         f.getRules()[0].toList()[:3])
+
+        for strText, languageId in [("IV 12'5 etc. ADG", 1), ("IV etc ADG", 2)]:
+            self.assertEqual(RegularExpressionFormula.applyRegularExpressions(
+                strText, substitutionList, languageId), f.apply(strText, languageId))
+        self.assertEqual("I. V. 125 et cetera ADG", f.apply("IV 12'5 etc. ADG", 1))
+        self.assertEqual("I. V. etc adg", f.apply("IV etc ADG", 2))
+
+        #Only the sources are pickled
+        rule = pickle.loads(pickle.dumps(f.getRules()[-1]))
+        self.assertIsNone(rule.pattern)
+        self.assertEqual("adg", rule.sub("ADG"))
+
+    def testRegexBundle(self):
+        if os.path.exists(self.OUTPUTDIR):
+            shutil.rmtree(self.OUTPUTDIR)
+        regexFile = self.writeRules(self.RULESLIST)
+
+        #No bundle yet, the csv file is loaded
+        csvBundle = RegexBundle.load(regexFile)
+        self.assertEqual(5, len(csvBundle.getRegexList()))
+        self.assertIsNone(csvBundle.sourceChecksum)
+
+        regexBundle = RegexBundle.compile(regexFile)
+        bundleFile = regexFile + RegexBundle.EXTENSION
+        self.assertTrue(RegexBundle.isBundle(bundleFile))
+        self.assertEqual([2, 2, 2, 0], [r.groups for r in regexBundle.getRules()])
+
+        for loadedFile in [regexFile, bundleFile]:
+            loadedBundle = RegexBundle.load(loadedFile)
+            self.assertIsNotNone(loadedBundle.sourceChecksum)
+            self.assertEqual(csvBundle.getRegexList(), loadedBundle.getRegexList())
+            self.assertEqual([r.toList()[:3] for r in csvBundle.getRules()],
+                             [r.toList()[:3] for r in loadedBundle.getRules()])
+            self.assertEqual("I. V. 125 et cetera ADG",
+                             self.applyBundle(loadedBundle, "IV 12'5 etc. ADG", 1))
+
+        #Stale bundle, the csv file is loaded
+        self.writeRules(self.RULESLIST + [("ADG", "A. D. G.", "1", "1", "")])
+        for loadedFile in [regexFile, bundleFile]:
+            loadedBundle = RegexBundle.load(loadedFile)
+            self.assertIsNone(loadedBundle.sourceChecksum)
+            self.assertEqual("A. D. G.", self.applyBundle(loadedBundle, "ADG", 1))
+
+        #Corrupted bundle
+        RegexBundle.compile(regexFile)
+        with open(bundleFile, 'ab') as outputFile:
+            outputFile.write(b" ")
+        self.assertRaises(Exception, RegexBundle.read, bundleFile)
+        self.assertEqual("A. D. G.", self.applyBundle(RegexBundle.load(regexFile), "ADG", 1))
+
+        #Validation
+        rowsList = [["IV", "I. V.", "9", "0"], ["IV", "I. V.", "1", "7"],
+                    ["I(V", "I. V.", "1", "0"], ["IV", "\\g<2>", "1", "0"],
+                    ["IV", "lambda m:", "1", "0"], ["IV", "I. V.", "1"],
+                    ["IV", "I. V.", "1", "0"]]
+        rulesList, errorsList = RegexBundle.validate(rowsList)
+        self.assertEqual(["line %d" % i for i in range(2, 8)],
+                         [e.split(":")[0] for e in errorsList])
+        self.assertEqual(1, len(rulesList))
+
+        self.writeRules(self.RULESLIST[:1] + [tuple(r) for r in rowsList])
+        self.assertRaises(Exception, RegexBundle.compile, regexFile)
+
+    def testRegexProfiler(self):
+        regexBundle = RegexBundle.load(self.writeRules(self.RULESLIST))
+        f = RegularExpressionFormula(None, [r for r in regexBundle.getRegexList()
+                                            if int(r[RegexList.TYPEINDICE]) != -1])
+        f.setRules(regexBundle.getRules())
+
+        profiler = RegexProfiler()
+        f.setProfiler(profiler)
+        for strText in ["IV 12'5 etc.", "IV etc.", "rien"]:
+            self.assertEqual(self.applyBundle(regexBundle, strText, 1), f.apply(strText, 1))
+
+        #Rules of all languages and of french, the german one
+        #is never applied
+        statisticsList = profiler.getStatistics()
+        self.assertEqual([("ADG", 2)], [(s['pattern'], s['languageId'])
+                                        for s in statisticsList if s['calls'] == 0])
+        statisticsList = [s for s in statisticsList if s['calls'] > 0]
+        self.assertEqual(len(f.getLanguageRules(1)), len(statisticsList))
+        self.assertEqual([3], list(set([s['calls'] for s in statisticsList])))
+        self.assertEqual([1], list(set([s['languageId'] for s in statisticsList])))
+        matchesDict = dict([(s['pattern'], s['matches']) for s in statisticsList])
+        self.assertEqual(1, sum([m for p, m in matchesDict.items() if "0-9" in p]))
+        self.assertEqual(2, sum([m for p, m in matchesDict.items() if "etc" in p]))
+        self.assertEqual(len(statisticsList) - 3 + 1, len(profiler.getDeadRules()))
+        self.assertIn(("ADG", "lambda m: m.group(0).lower()"), profiler.getDeadRules())
+
+        #Saved profiles are merged
+        if not os.path.exists(self.OUTPUTDIR):
+            os.makedirs(self.OUTPUTDIR)
+        profileFile = self.OUTPUTDIR + "/profile.json"
+        profiler.save(profileFile)
+        mergedProfiler = RegexProfiler.load([profileFile, profileFile])
+        self.assertEqual([0, 6], sorted(set([s['calls'] for s in mergedProfiler.getStatistics()])))
+        self.assertEqual(profiler.getDeadRules(), mergedProfiler.getDeadRules())
+        self.assertIn("Dead rules: %d" % len(profiler.getDeadRules()), mergedProfiler.getReport())
+
+        #Not profiled any more
+        f.setProfiler(None)
+        f.apply("IV", 1)
+        self.assertEqual([0, 3], sorted(set([s['calls'] for s in profiler.getStatistics()])))
+
+        #Growth of the time with the text length, short
+        #texts are left out
+        profiler = RegexProfiler()
+        linearRule, quadraticRule = RegexRule("a", "b", 0), RegexRule("a*c", "b", 0)
+        for length in [100, 1000, 10000, 100000]:
+            profiler.record(linearRule, 0, length, length * 1e-8, 0)
+            profiler.record(quadraticRule, 0, length, length * length * 1e-10, 0)
+            profiler.record(quadraticRule, 0, 10, 1.0, 0)
+        self.assertAlmostEqual(1.0, profiler.getStatistics()[1]['exponent'])
+        self.assertEqual(["a*c"], [s['pattern'] for s in profiler.getSuperlinearRules()])
+
+    def testRegexBackends(self):
+        #Translation to RE2, without the module
+        self.assertEqual("(?m)[\\p{L}\\p{N}_]+[\\p{Nd}-]\\z",
+                         Re2Backend.translate("\\w+[\\d-]\\Z", re.UNICODE | re.MULTILINE))
+        self.assertEqual("\\x{00e9}[^\\p{L}\\p{N}_]", Re2Backend.translate("\\u00e9\\W"))
+        for strPattern in ["(a)\\1", "(?<=a)b", "a(?!b)", "\\bIV\\b", "[\\W]", "a$"]:
+            self.assertRaises(RegexBackendException, Re2Backend.translate, strPattern)
+        self.assertEqual(["€ ", (1,), "\n", ("x",)],
+                         Re2Backend.compileTemplate("€ \\g<1>\\n\\g<x>"))
+
+        testsList = [("([0-9]+)%", "\\g<1> pour cent", "10% et 5%"),
+                     ("(?P<x>é)t", "\\g<x>€", "été"),
+                     ("(x)?a", "[\\1]", "a"),
+                     ("^(\\w+)  ", "lambda m: m.group(1).upper() + ' '", "élan  vital\nsoir  là"),
+                     ("\\s+", " ", "a\xa0\u2009b"),
+                     ("(a)\\1", "b", "aab")]
+        expectedList = [re.sub(p, r if not r.startswith("lambda") else eval(r), t,
+                               flags=re.UNICODE | re.MULTILINE)
+                        for p, r, t in testsList]
+        for backendName in RegexEngine.getAvailableBackends():
+            regexEngine = RegexEngine(backendName)
+            self.assertEqual(backendName, regexEngine.getBackendName())
+            rulesList = [RegexRule(p, r, 0) for p, r, t in testsList]
+            self.assertEqual(expectedList, [rule.sub(t, regexEngine) for rule, (p, r, t) in
+                                            zip(rulesList, testsList)])
+            self.assertEqual(["a", "1", "b"], regexEngine.getRegex("([0-9])").split("a1b"))
+
+            #Only the backend name is pickled
+            self.assertEqual(backendName,
+                             pickle.loads(pickle.dumps(regexEngine)).getBackendName())
+
+            #Back references are not supported by RE2
+            statisticsDict = regexEngine.getStatistics()
+            if backendName == RegexEngine.DEFAULT:
+                continue
+            self.assertEqual(len(testsList) + 1, statisticsDict['patterns'])
+            self.assertEqual(1 if backendName == Re2Backend.NAME else 0,
+                             statisticsDict['fallbacks'])
+
+        #Rules are compiled again with another engine, the
+        #default one is not changed
+        self.assertEqual(RegexEngine.DEFAULT, RegexEngine.getDefault().getBackendName())
+        self.assertEqual("10 pour cent et 5 pour cent", rulesList[0].sub("10% et 5%"))
+        self.assertTrue(isinstance(rulesList[0].pattern, re.Pattern))
+        self.assertRaises(Exception, RegexEngine, "unknown")
+
@@ -49,7 +49,7 @@ class NumberFormula():
     # Public interface
     #
     @classmethod
-    def apply(cls, strText):
+    def apply(cls, strText, cache=None):
         """Apply formula to numbers.
 
            Numbers cateories are:
@@ -59,9 +59,10 @@ class NumberFormula():
              - Roman numbers
 
            param strText: an utf-8 encoded string
+           param cache  : an optional 'LRUCache' of converted words
            return an utf-8 encoded string
         """
-        return convertNumber(cls, strText)
+        return convertNumber(cls, strText, cache)
 
     ##################
     # Implementation
@@ -21,7 +21,9 @@ __date__ = "Date: 2011/04"
 __copyright__ = "Copyright (c) 2011 Idiap Research Institute"
 __license__ = "BSD 3-Clause"
 
+import io
 import os
+import mmap
 import logging
 import codecs
 import csv
@@ -34,6 +36,9 @@ class Ioread:
     """
     logger = logging.getLogger("Asrt.Ioread")
 
+    #Bytes decoded at once by the iterators
+    CHUNKSIZE = 1024 * 1024
+
     #######################################
     # Public members
     #
@@ -61,20 +66,8 @@ class Ioread:
     def readFileContent(self, fullFilePath):
         """Take the path of the file to read and return its content.
         """
-        fileContent = ""  # Immutable
-
-        try:
-            f = open(fullFilePath, encoding="utf-8", errors="surrogateescape")
-            fileContent = f.read()
-            f.close()
-        except IOError as ex:
-            try:
-                f.close()
-            except Exception:
-                pass
-            raise ex
-
-        return fileContent
+        return self._translateNewLines(
+            self._decodeMappedFile(fullFilePath, "surrogateescape"))
 
     def readFileContentList(self, fullFilePath):
         """Take the path of the file to read and return its content.
@@ -92,7 +85,75 @@ class Ioread:
                 pass
             raise ex
 
-        return self.removeNewLine(fileContent)
+        #In place, no second copy of the lines
+        for i, line in enumerate(fileContent):
+            fileContent[i] = line[:-1]
+
+        return fileContent
+
+    def iterLines(self, fullFilePath, keepEnds=False, chunkSize=CHUNKSIZE):
+        """Iterate over the lines of a file without
+           loading it, new lines are translated as
+           in 'readFileContent'.
+        """
+        newLine = "\n" if keepEnds else ""
+        pendingLine = ""
+        for strChunk in self.iterChunks(fullFilePath, chunkSize):
+            linesList = strChunk.split("\n")
+            linesList[0] = pendingLine + linesList[0]
+            pendingLine = linesList.pop()
+            for line in linesList:
+                yield line + newLine
+
+        if len(pendingLine) > 0:
+            yield pendingLine
+
+    def iterParagraphs(self, fullFilePath, chunkSize=CHUNKSIZE):
+        """Iterate over the paragraphs of a file, i.e.
+           blocks of lines separated by blank lines.
+        """
+        linesList = []
+        for line in self.iterLines(fullFilePath, chunkSize=chunkSize):
+            if len(line.strip()) == 0:
+                if len(linesList) > 0:
+                    yield "\n".join(linesList)
+                    linesList = []
+            else:
+                linesList.append(line)
+
+        if len(linesList) > 0:
+            yield "\n".join(linesList)
+
+    def iterChunks(self, fullFilePath, chunkSize=CHUNKSIZE):
+        """Incrementally decode a memory mapped file,
+           utf-8 characters split across chunks and
+           surrogate escapes are preserved.
+        """
+        with open(fullFilePath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mappedFile:
+                if hasattr(mappedFile, "madvise"):
+                    mappedFile.madvise(mmap.MADV_SEQUENTIAL)
+
+                decoder = io.IncrementalNewlineDecoder(
+                    codecs.getincrementaldecoder("utf-8")(errors="surrogateescape"),
+                    translate=True)
+                #Whole pages
+                chunkSize = max(mmap.PAGESIZE, chunkSize - chunkSize % mmap.PAGESIZE)
+                size = len(mappedFile)
+                for start in range(0, size, chunkSize):
+                    strChunk = decoder.decode(mappedFile[start:start + chunkSize],
+                                              final=start + chunkSize >= size)
+
+                    #Decoded pages no longer count in the resident size
+                    if hasattr(mmap, "MADV_DONTNEED"):
+                        mappedFile.madvise(mmap.MADV_DONTNEED, start,
+                                           min(chunkSize, size - start))
+
+                    if len(strChunk) > 0:
+                        yield strChunk
 
     def readCSV(self, filePath, delim=';', quote='"'):
         """Read a csv file.
@@ -156,15 +217,30 @@ class Ioread:
 
            return a string representation of the file.
         """
-        fp = codecs.open(fullFilePath, 'r', 'utf-8')
-        data = fp.read()
-        fp.close()
-
-        return data
+        return self._translateNewLines(self._decodeMappedFile(fullFilePath))
 
     #######################################
     # Implementation
     #
+    def _decodeMappedFile(self, fullFilePath, errors="strict"):
+        """Decode a whole file from a memory map, the
+           content is decoded without intermediate bytes
+           copy.
+        """
+        with open(fullFilePath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return ""
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mappedFile:
+                return str(mappedFile, "utf-8", errors)
+
+    def _translateNewLines(self, strText):
+        """Universal new lines, as in text mode.
+        """
+        if "\r" not in strText:
+            return strText
+        return strText.replace("\r\n", "\n").replace("\r", "\n")
+
     def _unicode_csv_reader(self, unicode_csv_data, dialect=csv.excel, **kwargs):
         """Unicode wrapper to read unicode csv.
         """
@@ -26,6 +26,7 @@ import logging, os
 from asrt.common.MyFile import MyFile
 from asrt.common.DataList import DataList
 from asrt.common.DataMap import DataMap
+from asrt.common.IndexedList import IndexedDataList, IndexedDataMap
 from asrt.common.AsrtUtility import getErrorMessage
 
 ###############
@@ -85,6 +86,9 @@ class TaskInfo(object):
     def getTargetDirectory(self):
         return self.targetDirectory
 
+    def setTargetDirectory(self, targetDirectory):
+        self.targetDirectory = os.path.abspath(targetDirectory)
+
 
 ###############
 # Main class
@@ -106,6 +110,9 @@ class Task(object):
     OUTPUTLISTEXTENSION             = ".olist"
 
     COMMON_PARAMETERS               = []
+
+    #Optional common parameters
+    INDEXEDLISTS                    = 'indexedLists'
     
     def __init__(self, taskInfo):
         """Default constructor. Takes a task info as 
@@ -120,6 +127,7 @@ class Task(object):
         self.mapLists = []
         self.resultErrorFlag = 0
         self.resultMessage = ""
+        self.dependencyOutputDirectories = []
 
     #####################
     #Interface
@@ -173,11 +181,7 @@ class Task(object):
         """Prepare task directories and load data list
            and map lists.
         """
-        workingDirectory = self.getWorkingDirectory()
-        targetDirectory = self.getTargetDirectory()
-        
-        self.taskDirectory = "%s%s%s" % (workingDirectory, os.sep,
-                                         self.taskInstanceName)
+        self.setupTaskDirectory()
 
         #Don't want to keep old results
         MyFile.forceRemoveDir(self.taskDirectory)
@@ -219,6 +223,19 @@ class Task(object):
         """
         return self.taskInstanceName
 
+    def setTaskInstanceName(self, taskInstanceName):
+        """Use a stable name, the task directory is
+           named after it.
+        """
+        self.taskInstanceName = taskInstanceName
+
+    def setupTaskDirectory(self):
+        """Set the task directory path without
+           creating it.
+        """
+        self.taskDirectory = "%s%s%s" % (self.getWorkingDirectory(), os.sep,
+                                         self.taskInstanceName)
+
     def getWorkingDirectory(self):
         """Directory in which the task is executed.
         """
@@ -230,6 +247,15 @@ class Task(object):
         """
         return self.taskInfo.getTargetDirectory()
 
+    def getDependencyOutputDirectories(self):
+        """Output directories of the tasks this task
+           depends on, set by the 'TaskRunner'.
+        """
+        return self.dependencyOutputDirectories
+
+    def setDependencyOutputDirectories(self, directoriesList):
+        self.dependencyOutputDirectories = directoriesList
+
     def getTaskDirectory(self):
         """Task directory.
         """
@@ -260,6 +286,12 @@ class Task(object):
         """Save error status and message."""
         self.resultErrorFlag = error
         self.resultMessage = message        
+
+    def getResultErrorFlag(self):
+        return self.resultErrorFlag
+
+    def getResultMessage(self):
+        return self.resultMessage
     
     #####################
     #Implementation
@@ -323,8 +355,11 @@ class Task(object):
         MyFile.copyFile(dataListSrcPath, dataListDestPath)
 
         #Read content
-        self.inputList = DataList()
-        self.inputList.readFile(dataListDestPath)
+        if self._useIndexedLists():
+            self.inputList = IndexedDataList(dataListDestPath)
+        else:
+            self.inputList = DataList()
+            self.inputList.readFile(dataListDestPath)
 
     def _readMapLists(self):
         """Read the data maps from 'target directory'.
@@ -350,8 +385,11 @@ class Task(object):
             MyFile.copyFile(dataMapSrcPath, dataMapDestPath)
 
             #Read content
-            tempDataMap = DataMap()
-            tempDataMap.readFile(dataMapDestPath)
+            if self._useIndexedLists():
+                tempDataMap = IndexedDataMap(dataMapDestPath)
+            else:
+                tempDataMap = DataMap()
+                tempDataMap.readFile(dataMapDestPath)
             self.mapLists.append(tempDataMap)
 
         self._log(logging.INFO, "Lists have been copied to %s" % self.getInputDirectory())
@@ -360,6 +398,12 @@ class Task(object):
         dataListFiles = MyFile.dirContent(self.getInputDirectory(), "*")
         self._log(logging.INFO, "Files in input directory: '%s'." %  ", ".join(dataListFiles))
 
+    def _useIndexedLists(self):
+        """Lists and maps are read through an on disk
+           index instead of being loaded in memory.
+        """
+        return self.taskParameters.get(Task.INDEXEDLISTS) == "True"
+
     def _log(self, level, strMessage):
         """Log with task instance name.
         """
@@ -21,11 +21,17 @@ __date__ = "Date: 2012/05"
 __copyright__ = "Copyright (c) 2012 Idiap Research Institute"
 __license__ = "BSD 3-Clause"
 
-import logging, shutil, os
+import logging, shutil, os, json, hashlib
 
 from asrt.common.MyFile import MyFile
 from asrt.common.tasks.AsrtTask import Task
 from asrt.common.DataPreparationAPI import DataPreparationAPI
+from asrt.common.TextDocument import TextDocument
+from asrt.common.SentenceDeduplicator import SentenceDeduplicator, MinHashLSH
+from asrt.common.WordCache import WordCache
+from asrt.common.RegularExpressionProfiler import RegexProfiler
+from asrt.common.RegularExpressionBackend import RegexEngine
+from asrt.common.SentenceWriter import LanguageStreamWriter
 from asrt.common.AsrtUtility import getErrorMessage
 from asrt.config.AsrtConfig import LANGUAGE2ID
 from asrt.config.AsrtConfig import UNKNOWN_LABEL, FRENCH_LABEL, GERMAN_LABEL
@@ -47,6 +53,37 @@ class ImportDocumentTask(Task):
     PARAMETERS              = [PARAMREGEXFILE,TEXTFILTERING,PARAMDEBUG,REMOVEPUNCTUATION,
                                VERBALIZEPUNCTUATION, SEGMENTWITHNLTK, LMMODELING]
 
+    #Optional parameters
+    DEDUPLICATE             = 'deduplicate'
+    NEARDUPLICATES          = 'nearDuplicates'
+    NEARTHRESHOLD           = 'nearThreshold'
+    NODEDUPLICATION         = 'none'
+    OUTPUTCOMPRESSION       = 'outputCompression'
+    OUTPUTSHARDSIZE         = 'outputShardSize'
+    SHARD                   = 'shard'
+    SEGMENTER               = 'segmenter'
+    SEGMENTATIONWORKERS     = 'segmentationWorkers'
+    SEGMENTATIONCHUNKSIZE   = 'segmentationChunkSize'
+    NORMALIZATIONWORKERS    = 'normalizationWorkers'
+    NORMALIZATIONBATCHSIZE  = 'normalizationBatchSize'
+    STAGETHREADS            = 'stageThreads'
+    CLASSIFIEREARLYSTOPPING = 'classifierEarlyStopping'
+    CLASSIFIERMAXWORDS      = 'classifierMaxWords'
+    CLASSIFICATIONMODE      = 'classificationMode'
+    CLASSIFIERMODEL         = 'classifierModel'
+    WORDCLASSIFIERMODEL     = 'wordClassifierModel'
+    WORDCACHESIZE           = 'wordCacheSize'
+    ABBREVIATIONFILES       = 'abbreviationFiles'
+    REGEXPROFILE            = 'regexProfile'
+    REGEXBACKEND            = 'regexBackend'
+    SENTENCEBUDGET          = 'sentenceBudget'
+    DOCUMENTBUDGET          = 'documentBudget'
+    FILESEPARATOR           = ','
+
+    SHARDINFOFILENAME       = "shard_info.json"
+    REGEXPROFILEFILENAME    = "regex_profile.json"
+    QUARANTINEFILENAME      = "quarantine.txt"
+
     def __init__(self, taskInfo):
         """Default constructor.
         """
@@ -58,7 +95,31 @@ class ImportDocumentTask(Task):
         self.removePunctuation = False
         self.verbalizePunctuation = False
         self.segmentWithNLTK = True
+        self.segmenter = TextDocument.SEGMENTERPUNKT
+        self.segmentationWorkers = 1
+        self.segmentationChunkSize = None
+        self.normalizationWorkers = 1
+        self.normalizationBatchSize = None
+        self.stageThreads = 1
+        self.classifierEarlyStopping = False
+        self.classifierMaxWords = None
+        self.classificationMode = TextDocument.CLASSIFYSENTENCES
+        self.classifierModel = None
+        self.wordClassifierModel = None
+        self.wordCacheSize = WordCache.DEFAULTSIZE
+        self.abbreviationFiles = []
+        self.regexProfile = False
+        self.regexBackend = RegexEngine.DEFAULT
+        self.sentenceBudget = None
+        self.documentBudget = None
         self.lmModeling = False
+        self.deduplicate = ImportDocumentTask.NODEDUPLICATION
+        self.nearDuplicates = False
+        self.nearThreshold = MinHashLSH.THRESHOLD
+        self.outputCompression = None
+        self.outputShardSize = None
+        self.shardIndex = 0
+        self.shardsCount = 1
 
     ############
     #Interface
@@ -83,7 +144,57 @@ class ImportDocumentTask(Task):
         self.verbalizePunctuation = self.taskParameters[ImportDocumentTask.VERBALIZEPUNCTUATION] == "True"
         self.segmentWithNLTK = self.taskParameters[ImportDocumentTask.SEGMENTWITHNLTK] == "True"
         self.lmModeling = self.taskParameters[ImportDocumentTask.LMMODELING] == "True"
-        
+        self.segmenter = self.taskParameters.get(ImportDocumentTask.SEGMENTER,
+                                                 TextDocument.SEGMENTERPUNKT)
+        self.segmentationWorkers = int(self.taskParameters.get(
+            ImportDocumentTask.SEGMENTATIONWORKERS, 1))
+        self.wordCacheSize = int(self.taskParameters.get(
+            ImportDocumentTask.WORDCACHESIZE, WordCache.DEFAULTSIZE))
+        self.regexProfile = self.taskParameters.get(
+            ImportDocumentTask.REGEXPROFILE, "False") == "True"
+        self.regexBackend = self.taskParameters.get(ImportDocumentTask.REGEXBACKEND,
+                                                    RegexEngine.DEFAULT)
+        if ImportDocumentTask.SENTENCEBUDGET in self.taskParameters:
+            self.sentenceBudget = float(self.taskParameters[ImportDocumentTask.SENTENCEBUDGET])
+        if ImportDocumentTask.DOCUMENTBUDGET in self.taskParameters:
+            self.documentBudget = float(self.taskParameters[ImportDocumentTask.DOCUMENTBUDGET])
+        if ImportDocumentTask.ABBREVIATIONFILES in self.taskParameters:
+            self.abbreviationFiles = self.taskParameters[
+                ImportDocumentTask.ABBREVIATIONFILES].split(
+                    ImportDocumentTask.FILESEPARATOR)
+        if ImportDocumentTask.SEGMENTATIONCHUNKSIZE in self.taskParameters:
+            self.segmentationChunkSize = int(
+                self.taskParameters[ImportDocumentTask.SEGMENTATIONCHUNKSIZE])
+        self.normalizationWorkers = int(self.taskParameters.get(
+            ImportDocumentTask.NORMALIZATIONWORKERS, 1))
+        if ImportDocumentTask.NORMALIZATIONBATCHSIZE in self.taskParameters:
+            self.normalizationBatchSize = int(
+                self.taskParameters[ImportDocumentTask.NORMALIZATIONBATCHSIZE])
+        self.stageThreads = int(self.taskParameters.get(
+            ImportDocumentTask.STAGETHREADS, 1))
+        self.classifierEarlyStopping = self.taskParameters.get(
+            ImportDocumentTask.CLASSIFIEREARLYSTOPPING, "False") == "True"
+        if ImportDocumentTask.CLASSIFIERMAXWORDS in self.taskParameters:
+            self.classifierMaxWords = int(
+                self.taskParameters[ImportDocumentTask.CLASSIFIERMAXWORDS])
+        self.classificationMode = self.taskParameters.get(
+            ImportDocumentTask.CLASSIFICATIONMODE, TextDocument.CLASSIFYSENTENCES)
+        self.classifierModel = self.taskParameters.get(ImportDocumentTask.CLASSIFIERMODEL)
+        self.wordClassifierModel = self.taskParameters.get(
+            ImportDocumentTask.WORDCLASSIFIERMODEL)
+        self.deduplicate = self.taskParameters.get(ImportDocumentTask.DEDUPLICATE,
+                                                   ImportDocumentTask.NODEDUPLICATION)
+        self.nearDuplicates = self.taskParameters.get(ImportDocumentTask.NEARDUPLICATES,
+                                                      "False") == "True"
+        if ImportDocumentTask.NEARTHRESHOLD in self.taskParameters:
+            self.nearThreshold = float(self.taskParameters[ImportDocumentTask.NEARTHRESHOLD])
+        self.outputCompression = self.taskParameters.get(ImportDocumentTask.OUTPUTCOMPRESSION)
+        if ImportDocumentTask.OUTPUTSHARDSIZE in self.taskParameters:
+            self.outputShardSize = int(self.taskParameters[ImportDocumentTask.OUTPUTSHARDSIZE])
+        if ImportDocumentTask.SHARD in self.taskParameters:
+            self.shardIndex, self.shardsCount = self._parseShard(
+                self.taskParameters[ImportDocumentTask.SHARD])
+
         self._log(logging.INFO, "Debug is set to " + str(self.debug))
 
     def doWork(self):
@@ -95,13 +206,16 @@ class ImportDocumentTask(Task):
             self._log(logging.CRITICAL,"Only one map list accepted!")
 
         documentUrl = None
+        writer = None
 
         try:
-            #All pdf documents
-            textDocumentsList = []
-            dictMap = self.mapLists[0].getDictionaryMap()
+            dataMap = self.mapLists[0]
 
-            totalCount = len(list(dictMap.keys()))
+            shardDocuments = None
+            totalCount = dataMap.getCount()
+            if self.shardsCount > 1:
+                shardDocuments = self._getShardDocuments(dataMap)
+                totalCount = len(shardDocuments)
             count = 0
 
             self._log(logging.INFO, "Temp dir is: %s" % self.getTempDirectory())
@@ -118,12 +232,44 @@ class ImportDocumentTask(Task):
             api.setRemovePunctuation(self.removePunctuation)
             api.setVerbalizePunctuation(self.verbalizePunctuation)
             api.setSegmentWithNLTK(self.segmentWithNLTK)
+            api.setSegmenter(self.segmenter)
+            api.setParallelSegmentation(self.segmentationWorkers,
+                                        self.segmentationChunkSize)
+            api.setParallelNormalization(self.normalizationWorkers,
+                                         self.normalizationBatchSize)
+            api.setStageThreads(self.stageThreads)
+            api.setClassifierBudget(self.classifierEarlyStopping,
+                                    self.classifierMaxWords)
+            api.setClassificationMode(self.classificationMode)
+            api.setClassifierModel(self.classifierModel)
+            api.setWordClassifierModel(self.wordClassifierModel)
             api.setLMModeling(self.lmModeling)
+            api.setWordCacheSize(self.wordCacheSize)
+            api.setAbbreviationFiles(self.abbreviationFiles)
+            if self.regexProfile:
+                api.setRegexProfiler(RegexProfiler())
+            api.setRegexBackend(self.regexBackend)
+            api.setTimeBudget(self.sentenceBudget, self.documentBudget,
+                              self.getTempDirectory() + os.sep +
+                              ImportDocumentTask.QUARANTINEFILENAME)
+            if self.deduplicate != ImportDocumentTask.NODEDUPLICATION:
+                api.setDeduplicator(SentenceDeduplicator(self.deduplicate,
+                                                         self.nearDuplicates,
+                                                         nearThreshold=self.nearThreshold))
+            api.setOutputCompression(self.outputCompression)
+            api.setOutputShardSize(self.outputShardSize)
             api.trainClassifier()
 
+            #Sentences are written as soon as a document
+            #is prepared
+            writer = api.getSentencesWriter(self.getTempDirectory())
+
             #Loop trough map file
-            for documentName in list(dictMap.keys()):
-                for language in dictMap[documentName]:
+            for documentName, languages in dataMap.iterDictionaryMap():
+                if shardDocuments is not None and documentName not in shardDocuments:
+                    continue
+
+                for language in languages:
                     documentUrl = self.inputList.getPath(documentName)
 
                     #Set the current document information
@@ -131,13 +277,31 @@ class ImportDocumentTask(Task):
                    
                     #Main processing
                     api.prepareDocument(LANGUAGE2ID[language])
-                    textDocumentsList.append(api.getDocument())
+                    self.outputDocumentSentences(api.getDocument(), writer)
 
                 count += 1
                 self._log(logging.INFO, "%d remaining files to process!" % (totalCount-count))
 
-            self._log(logging.INFO, "Output results to language files.")
-            self.outputSentencesToFiles(textDocumentsList)
+            if api.getDeduplicator() is not None:
+                self._log(logging.INFO, api.getDeduplicator().getReport())
+
+            if api.getWordCache() is not None:
+                self._log(logging.INFO, api.getWordCache().getReport())
+
+            if api.getRegexBackend() != RegexEngine.DEFAULT:
+                self._log(logging.INFO, api.getRegexEngine().getReport())
+
+            if api.getWatchdog() is not None:
+                self._log(logging.INFO, api.getWatchdog().getReport())
+
+            if api.getRegexProfiler() is not None:
+                api.getRegexProfiler().save(self.getTempDirectory() + os.sep +
+                                            ImportDocumentTask.REGEXPROFILEFILENAME)
+                self._log(logging.INFO, api.getRegexProfiler().getReport())
+
+            self._log(logging.INFO, "Commit language files.")
+            writer.commit()
+            self._writeShardInfo(totalCount)
 
             #Outcome of the work to be saved
             self.setResult(False, "Success importing sentences from %s" % self.mapLists[0].getDataMapFile())
@@ -145,6 +309,8 @@ class ImportDocumentTask(Task):
         except Exception as e:
             errorMessage = "An error as occurred when importing sentences from %s" % documentUrl
             self._log(logging.CRITICAL, getErrorMessage(e, errorMessage))
+            if writer is not None:
+                writer.abort()
             raise e
 
     def prepareOutputData(self):
@@ -156,21 +322,99 @@ class ImportDocumentTask(Task):
 
         #Data maps
         dataMapFiles = MyFile.dirContent(self.getTempDirectory(),
-                                         "*sentences_*.txt")
+                                         "sentences_*")
         for sentenceFile in dataMapFiles:
+            if sentenceFile.endswith(LanguageStreamWriter.TEMPEXTENSION):
+                continue
             srcFile = self.getTempDirectory() + os.sep + sentenceFile
             shutil.copy(srcFile,self.getOutputDirectory())
 
-    def outputSentencesToFiles(self, textDocumentsList):
-        """Output the original sentences with language
-           information to the database.
+        for fileName in [ImportDocumentTask.SHARDINFOFILENAME,
+                         ImportDocumentTask.REGEXPROFILEFILENAME,
+                         ImportDocumentTask.QUARANTINEFILENAME]:
+            srcFile = self.getTempDirectory() + os.sep + fileName
+            if MyFile.checkFileExists(srcFile):
+                shutil.copy(srcFile, self.getOutputDirectory())
+
+    def outputDocumentSentences(self, textDocument, writer):
+        """Append the sentences of 'textDocument' to the
+           language files.
         """
         sentencesDict = {FRENCH_LABEL:[], GERMAN_LABEL:[],
                          ITALIAN_LABEL:[], ENGLISH_LABEL:[],
                          UNKNOWN_LABEL:[]}
 
-        for textDocument in textDocumentsList:
-            DataPreparationAPI.appendDocumentSentences(textDocument, sentencesDict)
+        DataPreparationAPI.appendDocumentSentences(textDocument, sentencesDict)
+        writer.writeSentencesDict(sentencesDict)
+
+    @staticmethod
+    def assignShards(documentSizesList, shardsCount):
+        """Deterministic assignment of documents to shards.
+
+           Largest documents first, each going to the least
+           loaded shard. Documents of unknown size are hash
+           partitioned.
+
+           param documentSizesList: a list of (name, size in bytes)
+           return a dictionary of document name to shard index
+        """
+        def getHash(documentName):
+            return hashlib.md5(documentName.encode('utf-8')).hexdigest()
+
+        shardsDict = {}
+        loadsList = [0] * shardsCount
+        for documentName, size in sorted(documentSizesList,
+                                         key=lambda d: (-d[1], getHash(d[0]))):
+            if size <= 0:
+                shardIndex = int(getHash(documentName), 16) % shardsCount
+            else:
+                shardIndex = loadsList.index(min(loadsList))
+                loadsList[shardIndex] += size
+            shardsDict[documentName] = shardIndex
+
+        return shardsDict
+
+    def _parseShard(self, strShard):
+        """Parse 'i/N'.
+        """
+        try:
+            shardIndex, shardsCount = [int(v) for v in strShard.split("/")]
+        except ValueError:
+            raise Exception("Incorrect shard: %s, expected i/N" % strShard)
+
+        if shardsCount < 1 or shardIndex < 0 or shardIndex >= shardsCount:
+            raise Exception("Incorrect shard: %s, expected i/N" % strShard)
+
+        return shardIndex, shardsCount
+
+    def _getShardDocuments(self, dataMap):
+        """Names of the documents of this shard.
+        """
+        documentSizesList = []
+        for documentName, languages in dataMap.iterDictionaryMap():
+            documentUrl = self.inputList.getPath(documentName)
+            size = 0
+            if documentUrl is not None and os.path.isfile(documentUrl):
+                size = os.path.getsize(documentUrl)
+            documentSizesList.append((documentName, size))
+
+        shardsDict = ImportDocumentTask.assignShards(documentSizesList,
+                                                     self.shardsCount)
+        shardDocuments = set([d for d, i in list(shardsDict.items())
+                              if i == self.shardIndex])
+
+        self._log(logging.INFO, "Shard %d/%d: %d of %d documents" %
+                  (self.shardIndex, self.shardsCount, len(shardDocuments),
+                   len(documentSizesList)))
+
+        return shardDocuments
+
+    def _writeShardInfo(self, documentsCount):
+        """Shard position, used to merge shards in order.
+        """
+        shardInfo = {'shard': self.shardIndex, 'shards': self.shardsCount,
+                     'documents': documentsCount}
 
-        DataPreparationAPI.outputPerLanguage(sentencesDict, self.getTempDirectory())
-        
+        with open(self.getTempDirectory() + os.sep +
+                  ImportDocumentTask.SHARDINFOFILENAME, 'w') as outputFile:
+            json.dump(shardInfo, outputFile, indent=2)
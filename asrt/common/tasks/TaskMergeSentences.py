@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import re
+import os
+import json
+import shutil
+import logging
+
+from asrt.common.MyFile import MyFile
+from asrt.common.tasks.AsrtTask import Task
+from asrt.common.tasks.TaskImportDocument import ImportDocumentTask
+from asrt.common.AsrtUtility import getErrorMessage
+
+
+class MergeSentencesTask(Task):
+    """Merge the language files of 'ImportDocumentTask'
+       shards.
+
+       Files are concatenated in shard order so that the
+       result does not depend on which shard finished
+       first. Compressed files are concatenated as is,
+       gzip and xz both accept several streams.
+
+       Shard output directories are the outputs of the
+       task dependencies when run by a 'TaskRunner', or
+       the comma separated 'shardDirectories' parameter.
+    """
+    logger                  = logging.getLogger("task.MergeSentencesTask")
+
+    SHARDDIRECTORIES        = 'shardDirectories'
+    DIRECTORYSEPARATOR      = ','
+
+    SENTENCESFILEPATTERN    = re.compile(r"^sentences_(?P<label>[^.]+)(\.\d+)?\.txt(?P<extension>\.gz|\.xz)?$")
+
+    def __init__(self, taskInfo):
+        """Default constructor.
+        """
+        Task.__init__(self, taskInfo)
+        self.shardDirectories = []
+
+    ############
+    #Interface
+    #
+    def validateParameters(self):
+        return Task.validateParameters(self, [])
+
+    def setParameters(self):
+        """Set parameters from given values.
+        """
+        if MergeSentencesTask.SHARDDIRECTORIES in self.taskParameters:
+            self.shardDirectories = self.taskParameters[
+                MergeSentencesTask.SHARDDIRECTORIES].split(
+                    MergeSentencesTask.DIRECTORYSEPARATOR)
+        else:
+            self.shardDirectories = self.getDependencyOutputDirectories()
+
+    def gatherInputData(self):
+        """Prepare task directories, there is no data
+           list to read.
+        """
+        self.setupTaskDirectory()
+        MyFile.forceRemoveDir(self.getTaskDirectory())
+
+        MyFile.makeDir(self.getTaskDirectory())
+        MyFile.makeDir(self.getInputDirectory())
+        MyFile.makeDir(self.getTempDirectory())
+        MyFile.makeDir(self.getOutputDirectory())
+
+    def doWork(self):
+        """Concatenate the shards language files.
+        """
+        self._log(logging.INFO, "Do work!")
+
+        try:
+            shardsList = self._getOrderedShards()
+
+            #Files per language, in shard order
+            filesDict = {}
+            for shardDirectory in shardsList:
+                for fileName in sorted(os.listdir(shardDirectory)):
+                    match = MergeSentencesTask.SENTENCESFILEPATTERN.match(fileName)
+                    if match is None:
+                        continue
+
+                    outputName = "sentences_%s.txt%s" % (match.group('label'),
+                                                         match.group('extension') or "")
+                    filesDict.setdefault(outputName, []).append(
+                        shardDirectory + os.sep + fileName)
+
+            for outputName, filesList in sorted(filesDict.items()):
+                self._log(logging.INFO, "Merge %d files into %s" %
+                          (len(filesList), outputName))
+                with open(self.getTempDirectory() + os.sep + outputName, 'wb') as outputFile:
+                    for filePath in filesList:
+                        with open(filePath, 'rb') as inputFile:
+                            shutil.copyfileobj(inputFile, outputFile)
+
+            self.setResult(False, "Success merging %d shards" % len(shardsList))
+
+        except Exception as e:
+            errorMessage = "An error as occurred when merging shards"
+            self._log(logging.CRITICAL, getErrorMessage(e, errorMessage))
+            raise e
+
+    def prepareOutputData(self):
+        """Move merged files to the output folder.
+        """
+        for fileName in MyFile.dirContent(self.getTempDirectory(), "sentences_*"):
+            shutil.move(self.getTempDirectory() + os.sep + fileName,
+                        self.getOutputDirectory() + os.sep + fileName)
+
+    ############
+    #Implementation
+    #
+    def _getOrderedShards(self):
+        """Shard directories sorted by shard index, checking
+           that all shards are there.
+        """
+        if len(self.shardDirectories) == 0:
+            raise Exception("No shard directory given!")
+
+        shardsDict, shardsCount = {}, None
+        for shardDirectory in self.shardDirectories:
+            with open(shardDirectory + os.sep +
+                      ImportDocumentTask.SHARDINFOFILENAME) as inputFile:
+                shardInfo = json.load(inputFile)
+
+            if shardsCount is None:
+                shardsCount = shardInfo['shards']
+            elif shardsCount != shardInfo['shards']:
+                raise Exception("Inconsistent number of shards in %s" % shardDirectory)
+
+            if shardInfo['shard'] in shardsDict:
+                raise Exception("Shard %d given twice" % shardInfo['shard'])
+            shardsDict[shardInfo['shard']] = shardDirectory
+
+        if sorted(shardsDict.keys()) != list(range(shardsCount)):
+            raise Exception("Missing shards, %d of %d found" %
+                            (len(shardsDict), shardsCount))
+
+        return [shardsDict[i] for i in range(shardsCount)]
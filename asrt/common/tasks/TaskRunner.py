@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import concurrent.futures
+import multiprocessing
+
+from asrt.common.MyFile import MyFile
+from asrt.common.IndexedList import IndexedDataList
+from asrt.common.tasks.AsrtTask import Task, TaskException
+
+
+###############
+# Worker process
+#
+def _executeTask(task):
+    """Run 'task' and return its outcome.
+
+       return a tuple (errorFlag, message, duration)
+    """
+    startTime = time.time()
+    task.execute()
+    return (task.getResultErrorFlag(), task.getResultMessage(),
+            time.time() - startTime)
+
+
+###############
+# Main class
+#
+class TaskRunner(object):
+    """Run a graph of tasks.
+
+       The output directory of the first dependency of a
+       task becomes its target directory. Independent
+       tasks run concurrently in a process pool. A task
+       whose parameters and input files did not change
+       since its last successful run is skipped.
+
+       Usage:
+          runner = TaskRunner(maxWorkers=4)
+          runner.addTask(importTask, name="import")
+          runner.addTask(otherTask, ["import"], name="other")
+          runner.run()
+          runner.writeReport(reportFile)
+    """
+    logger = logging.getLogger("Asrt.TaskRunner")
+
+    FINGERPRINTFILENAME = "task.fingerprint"
+    HASHBLOCKSIZE       = 1 << 20
+
+    #Task status
+    PENDING     = 'pending'
+    SUCCESS     = 'success'
+    ERROR       = 'error'
+    UPTODATE    = 'uptodate'
+    CANCELLED   = 'cancelled'
+
+    def __init__(self, maxWorkers=None, incremental=True):
+        """Default constructor.
+
+           param maxWorkers : size of the process pool, default
+                              to the number of cpus
+           param incremental: skip unchanged tasks
+        """
+        self.maxWorkers = maxWorkers or os.cpu_count() or 1
+        self.incremental = incremental
+        self.mpContext = None
+
+        #Insertion ordered
+        self.tasksDict = {}
+        self.dependenciesDict = {}
+        self.reportDict = {}
+        self.runDuration = 0.0
+
+    #####################
+    #Getters and setters
+    #
+    def setMultiprocessingContext(self, mpContext):
+        """Start method of the worker processes, i.e.
+           'fork', 'spawn' or 'forkserver'.
+        """
+        self.mpContext = mpContext
+
+    def getTask(self, name):
+        return self.tasksDict[name]
+
+    def getStatus(self, name):
+        return self.reportDict[name]['status']
+
+    #####################
+    #Public interface
+    #
+    def addTask(self, task, dependencies=None, name=None):
+        """Add 'task' to the graph.
+
+           param dependencies: names of already added tasks
+           param name        : a stable task name, needed for
+                               incremental runs
+           return the task name
+        """
+        dependencies = dependencies or []
+
+        if name is not None:
+            task.setTaskInstanceName(name)
+        name = task.getTaskInstanceName()
+
+        if name in self.tasksDict:
+            raise TaskException("Duplicated task name: %s" % name)
+
+        for dependency in dependencies:
+            if dependency not in self.tasksDict:
+                raise TaskException("Unknown dependency '%s' for task %s" %
+                                    (dependency, name))
+
+        self.tasksDict[name] = task
+        self.dependenciesDict[name] = list(dependencies)
+        return name
+
+    def run(self):
+        """Run all tasks, dependencies first.
+
+           return True if no task failed
+        """
+        startTime = time.time()
+        self.reportDict = {}
+        for name in self.tasksDict:
+            self.reportDict[name] = {'status': TaskRunner.PENDING,
+                                     'dependencies': self.dependenciesDict[name],
+                                     'duration': 0.0, 'message': ""}
+
+        futuresDict = {}
+        executor = None
+        try:
+            while True:
+                readyList = self._getReadyTasks(futuresDict)
+                while len(readyList) > 0:
+                    for name in readyList:
+                        if not self._prepareTask(name):
+                            continue
+
+                        if executor is None:
+                            executor = self._getExecutor()
+
+                        self.logger.info("Starting task %s" % name)
+                        self.reportDict[name]['start'] = time.time() - startTime
+                        futuresDict[executor.submit(_executeTask,
+                                                    self.tasksDict[name])] = name
+
+                    #Up to date tasks may unlock other tasks
+                    readyList = self._getReadyTasks(futuresDict)
+
+                if len(futuresDict) == 0:
+                    break
+
+                doneSet, pendingSet = concurrent.futures.wait(
+                    futuresDict, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in doneSet:
+                    self._taskDone(futuresDict.pop(future), future)
+        finally:
+            if executor is not None:
+                executor.shutdown(True)
+
+        #Tasks depending on failed tasks
+        for name, report in list(self.reportDict.items()):
+            if report['status'] == TaskRunner.PENDING:
+                report['status'] = TaskRunner.CANCELLED
+
+        self.runDuration = time.time() - startTime
+
+        return len([r for r in list(self.reportDict.values())
+                    if r['status'] in [TaskRunner.ERROR, TaskRunner.CANCELLED]]) == 0
+
+    def getReport(self):
+        """Run report with per task status and timing.
+        """
+        return {'duration': self.runDuration, 'tasks': self.reportDict}
+
+    def writeReport(self, reportFile):
+        """Output the run report as json.
+        """
+        with open(reportFile, 'w', encoding='utf-8') as outputFile:
+            json.dump(self.getReport(), outputFile, indent=2)
+
+    #####################
+    #Implementation
+    #
+    def _getReadyTasks(self, futuresDict):
+        """Pending tasks whose dependencies are done.
+        """
+        runningSet = set(futuresDict.values())
+        readyList = []
+        for name, dependencies in list(self.dependenciesDict.items()):
+            if self.reportDict[name]['status'] != TaskRunner.PENDING or \
+                    name in runningSet:
+                continue
+
+            statusList = [self.reportDict[d]['status'] for d in dependencies]
+            if all([s in [TaskRunner.SUCCESS, TaskRunner.UPTODATE]
+                    for s in statusList]):
+                readyList.append(name)
+
+        return readyList
+
+    def _prepareTask(self, name):
+        """Chain the task to its dependencies and check if
+           it is up to date.
+
+           return True if the task needs to run
+        """
+        task = self.tasksDict[name]
+
+        outputDirectories = []
+        for dependency in self.dependenciesDict[name]:
+            dependencyTask = self.tasksDict[dependency]
+            dependencyTask.setupTaskDirectory()
+            outputDirectories.append(dependencyTask.getOutputDirectory())
+
+        if len(outputDirectories) > 0:
+            task.getTaskInfo().setTargetDirectory(outputDirectories[0])
+        task.setDependencyOutputDirectories(outputDirectories)
+
+        task.setupTaskDirectory()
+        fingerprint = self._getFingerprint(task)
+        self.reportDict[name]['fingerprint'] = fingerprint
+
+        #Without fingerprint, i.e. a missing target, the
+        #task always runs
+        if self.incremental and fingerprint is not None and \
+                fingerprint == self._readFingerprint(task):
+            self.logger.info("Task %s is up to date" % name)
+            self.reportDict[name]['status'] = TaskRunner.UPTODATE
+            return False
+
+        return True
+
+    def _taskDone(self, name, future):
+        """Record the outcome of a task.
+        """
+        report = self.reportDict[name]
+        try:
+            errorFlag, message, duration = future.result()
+        except Exception as e:
+            errorFlag, message, duration = True, str(e), 0.0
+
+        report['duration'] = duration
+        report['message'] = message
+
+        if errorFlag:
+            self.logger.critical("Task %s failed: %s" % (name, message))
+            report['status'] = TaskRunner.ERROR
+            return
+
+        self.logger.info("Task %s done in %.2f seconds" % (name, duration))
+        report['status'] = TaskRunner.SUCCESS
+        self._writeFingerprint(self.tasksDict[name], report['fingerprint'])
+
+    def _getFingerprint(self, task):
+        """Hash of the task type, its parameters and the state
+           of its input files.
+
+           Lists and maps are hashed by content, other files
+           by size and modification time.
+        """
+        fingerprint = hashlib.sha256()
+        fingerprint.update(task.__class__.__name__.encode('utf-8'))
+        fingerprint.update(task.getTaskInfo().getParametersString().encode('utf-8'))
+
+        #Files given as parameter, i.e. a regex file
+        for key, value in sorted(task.getTaskInfo().getParametersDict().items()):
+            if os.path.isfile(value):
+                fingerprint.update(self._getFileState(value))
+
+        targetDirectory = task.getTargetDirectory()
+        if not os.path.isdir(targetDirectory):
+            return None
+
+        for fileName in sorted(os.listdir(targetDirectory)):
+            filePath = targetDirectory + os.sep + fileName
+            if not os.path.isfile(filePath):
+                continue
+
+            if fileName.endswith(Task.OUTPUTLISTEXTENSION) or \
+                    fileName.endswith(Task.OUTPUTMAPEXTENSION):
+                fingerprint.update(fileName.encode('utf-8'))
+                fingerprint.update(self._getFileHash(filePath))
+            else:
+                fingerprint.update(self._getFileState(filePath))
+
+            #Data referenced by the list, in base name order
+            if fileName.endswith(Task.OUTPUTLISTEXTENSION):
+                with tempfile.TemporaryDirectory() as indexDir, \
+                        IndexedDataList(filePath, indexDir) as dataList:
+                    for baseName, path in dataList:
+                        fingerprint.update(self._getFileState(os.path.abspath(path)))
+
+        return fingerprint.hexdigest()
+
+    def _getFileHash(self, filePath):
+        """Hash of the content of 'filePath', read by blocks.
+        """
+        fileHash = hashlib.sha256()
+        with open(filePath, 'rb') as inputFile:
+            for block in iter(lambda: inputFile.read(TaskRunner.HASHBLOCKSIZE), b''):
+                fileHash.update(block)
+        return fileHash.digest()
+
+    def _getFileState(self, filePath):
+        """Path, size and modification time of 'filePath'.
+        """
+        try:
+            stat = os.stat(filePath)
+            strState = "%s:%d:%d" % (filePath, stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            strState = "%s:missing" % filePath
+        return strState.encode('utf-8', 'surrogateescape')
+
+    def _getFingerprintPath(self, task):
+        return task.getTaskDirectory() + os.sep + TaskRunner.FINGERPRINTFILENAME
+
+    def _readFingerprint(self, task):
+        """Fingerprint of the last successful run, if
+           its output is still there.
+        """
+        fingerprintPath = self._getFingerprintPath(task)
+        if not MyFile.checkFileExists(fingerprintPath) or \
+                not MyFile.checkFileExists(task.getOutputDirectory()):
+            return None
+
+        with open(fingerprintPath, 'r') as inputFile:
+            return inputFile.read().strip()
+
+    def _writeFingerprint(self, task, fingerprint):
+        if fingerprint is None:
+            return
+
+        with open(self._getFingerprintPath(task), 'w') as outputFile:
+            outputFile.write(fingerprint + "\n")
+
+    def _getExecutor(self):
+        mpContext = None
+        if self.mpContext is not None:
+            mpContext = multiprocessing.get_context(self.mpContext)
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.maxWorkers, mp_context=mpContext)
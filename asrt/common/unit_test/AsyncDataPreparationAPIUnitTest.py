@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import os
+scriptsDir = os.path.abspath(os.path.dirname(__file__))
+
+import shutil
+import asyncio
+import unittest
+
+from asrt.common.ioread import Ioread
+from asrt.common.TextDocument import TextDocument
+from asrt.common.DataPreparationAPI import DataPreparationAPI
+from asrt.common.AsyncDataPreparationAPI import AsyncDataPreparationAPI
+from asrt.common.ClassifierCharNgram import CharNgramClassifier
+from asrt.config.AsrtConfig import TEMPDIRUNITTEST, FRENCH_LABEL, GERMAN_LABEL
+
+
+class TestAsyncDataPreparationAPI(unittest.TestCase):
+    textFile = scriptsDir + "/resources/punctuation.txt"
+    unknownFile = scriptsDir + "/resources/punctuation.doc"
+
+    def getAPI(self, maxConcurrency=None):
+        api = AsyncDataPreparationAPI(TEMPDIRUNITTEST, maxWorkers=2,
+                                      maxConcurrency=maxConcurrency)
+        api.getAPI().setSegmentWithNLTK(False)
+        return api
+
+    def getSerialSentences(self):
+        api = DataPreparationAPI(None, TEMPDIRUNITTEST)
+        api.setSegmentWithNLTK(False)
+        api.setFormattedText(Ioread().nltkRead(self.textFile))
+        api.prepareDocument(1)
+        return api.getCleanedText().split("\n")
+
+    ############
+    # Tests
+    #
+    def testPrepare(self):
+        async def run():
+            async with self.getAPI() as api:
+                return await api.prepare(self.textFile, 1)
+
+        sentencesDict = asyncio.run(run())
+        self.assertEqual(self.getSerialSentences(), sentencesDict[FRENCH_LABEL])
+
+    def testPrepareBatch(self):
+        async def run():
+            results = []
+            async with self.getAPI(maxConcurrency=2) as api:
+                async for result in api.prepareBatch(
+                        [self.textFile, self.unknownFile, self.textFile], 1):
+                    results.append(result)
+            return results
+
+        results = asyncio.run(run())
+        self.assertEqual(3, len(results))
+        self.assertEqual(1, len([r for r in results if r.isError()]))
+
+        for result in results:
+            if not result.isError():
+                self.assertEqual(self.getSerialSentences(),
+                                 result.getSentencesDict()[FRENCH_LABEL])
+
+    def testCancelBatch(self):
+        countsDict = {'prepared': 0, 'cancelled': 0}
+        futuresList = []
+
+        async def run():
+            async with self.getAPI(maxConcurrency=1) as api:
+                prepare = api.prepare
+
+                async def countedPrepare(inputFile, language):
+                    try:
+                        sentencesDict = await prepare(inputFile, language)
+                    except asyncio.CancelledError:
+                        countsDict['cancelled'] += 1
+                        raise
+                    countsDict['prepared'] += 1
+                    return sentencesDict
+                api.prepare = countedPrepare
+
+                executor = api._getExecutor()
+                submit = executor.submit
+
+                def recordedSubmit(*args):
+                    futuresList.append(submit(*args))
+                    return futuresList[-1]
+                executor.submit = recordedSubmit
+
+                resultsList = []
+                batch = api.prepareBatch([self.textFile] * 4, 1)
+                async for result in batch:
+                    resultsList.append(result)
+                    break
+                await batch.aclose()
+
+                #No document left in the pool
+                self.assertTrue(all([f.done() for f in futuresList]))
+                return resultsList
+
+        resultsList = asyncio.run(run())
+        self.assertEqual(1, len(resultsList))
+        self.assertFalse(resultsList[0].isError())
+        self.assertEqual({'prepared': 1, 'cancelled': 3}, countsDict)
+        self.assertTrue(len(futuresList) <= 2)
+
+    def testTrainClassifier(self):
+        modelFile = TEMPDIRUNITTEST + "/async_charngram.bin"
+        classifier = CharNgramClassifier(bucketsBits=12)
+        classifier.trainFromTexts({FRENCH_LABEL: ["Le chat dort sur le canapé."],
+                                   GERMAN_LABEL: ["Die Katze schläft auf dem Sofa."]})
+        classifier.save(modelFile)
+
+        async def run(api):
+            #Workers started without classifier
+            await api.prepare(self.textFile, 1)
+            await api.prepare(self.textFile, 0)
+
+            #The workers do not load the model
+            os.remove(modelFile)
+            return await api.prepare(self.textFile, 0)
+
+        api = self.getAPI()
+        api.getAPI().setClassifierModel(modelFile)
+        try:
+            sentencesDict = asyncio.run(run(api))
+        finally:
+            asyncio.run(api.close())
+            if os.path.exists(modelFile):
+                os.remove(modelFile)
+
+        self.assertIsInstance(api.getAPI().getClassifier(), CharNgramClassifier)
+        self.assertTrue(sum([len(l) for l in sentencesDict.values()]) > 0)
+
+    def testSameFileNames(self):
+        #Documents of different directories with the same
+        #name, converted with a copy
+        inputDir = TEMPDIRUNITTEST + "/samenames"
+        filesList = []
+        for directory, strText in [("a", "Le chat dort."), ("b", "Le chien mange.")]:
+            os.makedirs(inputDir + "/" + directory, exist_ok=True)
+            filesList.append(inputDir + "/" + directory + "/report.pdf")
+            with open(filesList[-1], 'w') as outputFile:
+                outputFile.write(strText + "\n")
+
+        async def run():
+            async with self.getAPI(maxConcurrency=2) as api:
+                return [r async for r in api.prepareBatch(filesList, 1)]
+
+        convertCommand = TextDocument.CONVERT_COMMAND
+        TextDocument.CONVERT_COMMAND = ['cp']
+        try:
+            results = asyncio.run(run())
+        finally:
+            TextDocument.CONVERT_COMMAND = convertCommand
+            shutil.rmtree(inputDir)
+
+        self.assertEqual([["Le chat dort."], ["Le chien mange."]],
+                         sorted([r.getSentencesDict()[FRENCH_LABEL] for r in results]))
+        self.assertEqual([], [f for f in os.listdir(TEMPDIRUNITTEST) if f.startswith("report.")])
+
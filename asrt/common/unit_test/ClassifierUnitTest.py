@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import os
+import json
+import pickle
+import random
+import shutil
+import unittest
+
+import nltk
+
+from asrt.common.ClassifierWord import WordClassifier
+from asrt.common.ClassifierCharNgram import CharNgramClassifier
+from asrt.common.ClassifierModelStore import ClassifierModelStore
+from asrt.common.TextDocument import TextDocument
+from asrt.common.TextCluster import TextCluster
+from asrt.benchmark.LanguageIdBenchmark import LanguageIdBenchmark
+from asrt.config.AsrtConfig import FRENCH_LABEL, GERMAN_LABEL, ENGLISH_LABEL
+from asrt.config.AsrtConfig import ITALIAN_LABEL, UNKNOWN_LABEL
+from asrt.config.AsrtConfig import TEMPDIRUNITTEST
+
+
+class TestLanguageClassifier(unittest.TestCase):
+    wordsDict = {FRENCH_LABEL: "le la les un une des et est dans pour avec sur pas".split(),
+                 GERMAN_LABEL: "der die das und ist nicht mit auf für ein eine dem".split(),
+                 ENGLISH_LABEL: "the and is of to in that with for not on this".split(),
+                 ITALIAN_LABEL: "il lo gli e di che per non una sono della nel".split()}
+
+    def setUp(self):
+        self.classifier = WordClassifier()
+        trainList = []
+        for label, wordsList in list(self.wordsDict.items()):
+            trainList.extend(self.classifier.getFeatures(wordsList, label))
+        self.classifier.classifier = nltk.NaiveBayesClassifier.train(trainList)
+
+    def getSentences(self):
+        """Sentences of 1 to 60 words, mostly of one
+           language, some mixed and some tied.
+        """
+        randomGenerator = random.Random(1)
+        labelsList = sorted(self.wordsDict.keys())
+        sentencesList = []
+        for i in range(400):
+            mainLabel = labelsList[i % 4]
+            mixRate = [0.0, 0.2, 0.45, 0.5][(i // 4) % 4]
+            wordsList = []
+            for j in range(randomGenerator.randint(1, 60)):
+                label = mainLabel
+                if randomGenerator.random() < mixRate:
+                    label = labelsList[(i + 1) % 4]
+                wordsList.append(randomGenerator.choice(self.wordsDict[label]))
+            sentencesList.append(" ".join(wordsList))
+        return sentencesList
+
+    def classifiedCount(self):
+        return len(self.classifier.getScoreDetails().splitlines())
+
+    def getSources(self, sentencesList):
+        sourcesDict = {}
+        for i, strSentence in enumerate(sentencesList):
+            sourcesDict.setdefault(sorted(self.wordsDict.keys())[i % 4], []).append(
+                strSentence.split())
+        return sorted(sourcesDict.items())
+
+    def assertSameModel(self, expected, trained):
+        self.assertEqual(sorted(expected._feature_probdist.keys()),
+                         sorted(trained._feature_probdist.keys()))
+        for key, probDist in expected._feature_probdist.items():
+            self.assertEqual(probDist.freqdist(), trained._feature_probdist[key].freqdist())
+            self.assertEqual(probDist._bins, trained._feature_probdist[key]._bins)
+
+    ############
+    # Tests
+    #
+    def testEarlyStopping(self):
+        sentencesList = self.getSentences()
+
+        fullList = [self.classifier.classify(s)[0] for s in sentencesList]
+        fullCount = sum([len(s.split()) for s in sentencesList])
+
+        self.classifier.setEarlyStopping(True)
+        earlyList, earlyCount = [], 0
+        for s in sentencesList:
+            earlyList.append(self.classifier.classify(s)[0])
+            earlyCount += self.classifiedCount()
+
+        self.assertEqual(fullList, earlyList)
+        self.assertIn(UNKNOWN_LABEL, fullList)
+        self.assertLess(earlyCount, fullCount)
+
+        #Unanimous sentence, settled after 11 of 20 words
+        self.assertEqual(GERMAN_LABEL, self.classifier.classify("die " * 20)[0])
+        self.assertEqual(11, self.classifiedCount())
+
+    def testMaxWords(self):
+        strSentence = " ".join(["der"] * 30 + ["the"] * 30)
+
+        self.classifier.setMaxWords(6)
+        self.assertEqual(UNKNOWN_LABEL, self.classifier.classify(strSentence)[0])
+        self.assertEqual(6, self.classifiedCount())
+
+        #Even stride
+        self.classifier.setMaxWords(3)
+        self.assertEqual(["a", "c", "e"], self.classifier._sampleWords(list("abcdef")))
+
+        self.classifier.setMaxWords(None)
+        self.classifier.classify(strSentence)
+        self.assertEqual(60, self.classifiedCount())
+
+    def testTrainFromSources(self):
+        sourcesList = self.getSources(self.getSentences())
+
+        expected = nltk.NaiveBayesClassifier.train(
+            self.classifier.getLabelledFeaturesSet(sourcesList))
+
+        for workers in [1, 2]:
+            self.classifier.trainFromSources(sourcesList, workers)
+            trained = self.classifier.classifier
+
+            self.assertEqual(expected._label_probdist.freqdist(),
+                             trained._label_probdist.freqdist())
+            self.assertSameModel(expected, trained)
+
+            for label, sentencesList in sourcesList:
+                for (featuresDict, noLabel) in self.classifier.getFeatures(sentencesList[0], None):
+                    self.assertEqual(expected.classify(featuresDict), trained.classify(featuresDict))
+
+    def testUpdateFromSources(self):
+        sentencesList = self.getSentences()
+        #New words in the update
+        sentencesList += ["pharmazeutisch der die"] * 4 + ["pharmaceutique le la"] * 4
+
+        self.classifier.trainFromSources(self.getSources(sentencesList))
+        expected = self.classifier.classifier
+
+        self.classifier.trainFromSources(self.getSources(sentencesList[:200]))
+        self.classifier.updateFromSources(self.getSources(sentencesList[200:]))
+        self.assertSameModel(expected, self.classifier.classifier)
+        self.assertEqual(expected._label_probdist.freqdist(),
+                         self.classifier.classifier._label_probdist.freqdist())
+
+        self.assertRaises(Exception, self.classifier.updateFromSources,
+                          [("swiss", [["grüezi"]])])
+
+    def testModelStore(self):
+        storeDir = TEMPDIRUNITTEST + "/modelstore"
+        if os.path.exists(storeDir):
+            shutil.rmtree(storeDir)
+
+        sentencesList = self.getSentences()
+        labelledFile = TEMPDIRUNITTEST + "/labelled.txt"
+        with open(labelledFile, 'w', encoding='utf-8') as outputFile:
+            for label, sentencesWords in self.getSources(sentencesList[200:]):
+                for wordsList in sentencesWords:
+                    outputFile.write("%s\t%s\n" % (label, " ".join(wordsList)))
+
+        store = ClassifierModelStore(storeDir)
+        self.assertIsNone(store.getCurrentVersion())
+        self.assertRaises(Exception, store.update, [labelledFile])
+
+        self.classifier.trainFromSources(self.getSources(sentencesList[:200]))
+        self.classifier.setUniformPriors()
+        self.assertEqual(1, store.addVersion(self.classifier))
+        self.assertEqual(2, store.update([labelledFile]))
+        self.assertEqual([1, 2], store.getVersions())
+        self.assertEqual(1, store.getInfo()['parent'])
+
+        self.classifier.trainFromSources(self.getSources(sentencesList))
+        self.classifier.setUniformPriors()
+        classifier = store.getClassifier()
+        self.assertEqual([self.classifier.classify(s) for s in sentencesList],
+                         [classifier.classify(s) for s in sentencesList])
+
+        #Mapped once, former versions are kept
+        self.assertIs(classifier.classifier, store.getClassifier().classifier)
+        store.setCurrentVersion(1)
+        self.assertIsNot(classifier.classifier, store.getClassifier().classifier)
+        self.assertRaises(Exception, store.setCurrentVersion, 3)
+
+        #Version 3 reserved by a concurrent update
+        reservedFile = storeDir + "/model-0003" + ClassifierModelStore.COUNTSEXTENSION
+        with open(reservedFile, 'wb') as outputFile:
+            outputFile.write(b"reserved")
+        self.assertEqual(4, store.addVersion(self.classifier))
+        self.assertEqual([1, 2, 4], store.getVersions())
+        with open(reservedFile, 'rb') as inputFile:
+            self.assertEqual(b"reserved", inputFile.read())
+
+    def testConcurrentUpdates(self):
+        storeDir = TEMPDIRUNITTEST + "/modelstore_concurrent"
+        if os.path.exists(storeDir):
+            shutil.rmtree(storeDir)
+
+        sentencesList = self.getSentences()
+        labelledFiles = []
+        for i, partList in enumerate([sentencesList[200:300], sentencesList[300:]]):
+            labelledFiles.append(TEMPDIRUNITTEST + "/labelled_%d.txt" % i)
+            with open(labelledFiles[-1], 'w', encoding='utf-8') as outputFile:
+                for label, sentencesWords in self.getSources(partList):
+                    for wordsList in sentencesWords:
+                        outputFile.write("%s\t%s\n" % (label, " ".join(wordsList)))
+
+        store = ClassifierModelStore(storeDir)
+        self.classifier.trainFromSources(self.getSources(sentencesList[:200]))
+        self.classifier.setUniformPriors()
+        self.assertEqual(1, store.addVersion(self.classifier))
+
+        #A second update from version 1 is stored while
+        #the first one is counted
+        otherStore = ClassifierModelStore(storeDir)
+        addVersion = store.addVersion
+
+        def concurrentAddVersion(*args):
+            if otherStore.getCurrentVersion() == 1:
+                self.assertEqual(2, otherStore.update([labelledFiles[1]]))
+            return addVersion(*args)
+        store.addVersion = concurrentAddVersion
+
+        self.assertEqual(3, store.update([labelledFiles[0]]))
+        self.assertEqual([1, 2, 3], store.getVersions())
+        self.assertEqual(3, store.getCurrentVersion())
+        self.assertEqual(2, store.getInfo()['parent'])
+        self.assertRaises(Exception, store.addVersion, self.classifier, [], 1)
+        self.assertEqual([1, 2, 3], store.getVersions())
+
+        #The counts of both updates
+        self.classifier.trainFromSources(self.getSources(sentencesList[:200]) +
+                                         self.getSources(sentencesList[300:]) +
+                                         self.getSources(sentencesList[200:300]))
+        with open(storeDir + "/model-0003" + ClassifierModelStore.COUNTSEXTENSION, 'rb') as inputFile:
+            self.assertSameModel(self.classifier.classifier, pickle.load(inputFile))
+
+    def testMappedModel(self):
+        outputDir = TEMPDIRUNITTEST + "/mappedmodel"
+        if os.path.exists(outputDir):
+            shutil.rmtree(outputDir)
+        os.makedirs(outputDir)
+
+        modelFile = outputDir + "/model.map"
+        self.classifier.exportModel(modelFile)
+        mappedClassifier = WordClassifier()
+        mappedClassifier.loadModel(modelFile)
+
+        sentencesList = self.getSentences() + ["unseen words only", "la der"]
+        self.assertEqual([self.classifier.classify(s) for s in sentencesList],
+                         [mappedClassifier.classify(s) for s in sentencesList])
+        for (featuresDict, noLabel) in self.classifier.getFeatures("le x zzzzz 12".split(), None):
+            self.assertEqual(self.classifier.classifier.classify(featuresDict),
+                             mappedClassifier.classifier.classify(featuresDict))
+
+        #Only the path is pickled
+        strPickled = pickle.dumps(mappedClassifier)
+        self.assertLess(len(strPickled), 1000)
+        self.assertEqual(mappedClassifier.classify(sentencesList[0]),
+                         pickle.loads(strPickled).classify(sentencesList[0]))
+        mappedClassifier.classifier.close()
+
+    def testHierarchicalClassification(self):
+        randomGenerator = random.Random(2)
+
+        def getDocument(labelsList):
+            sentencesList = [" ".join([randomGenerator.choice(self.wordsDict[l])
+                                       for j in range(randomGenerator.randint(3, 20))])
+                             for l in labelsList]
+            textDocument = TextDocument(None, 0, None, [], None, False, False)
+            textDocument._addSentences(sentencesList, bSplit=False)
+            textDocument.setClassifier(self.classifier)
+            return textDocument, sentencesList
+
+        def getLabels(textDocument):
+            return [c.getAttribute(TextCluster.LANGUAGE_ATTRIBUTE) for c in textDocument.listContent]
+
+        #Mostly French with German passages
+        labelsList = [GERMAN_LABEL if i % 20 == 7 else FRENCH_LABEL for i in range(500)]
+        textDocument, sentencesList = getDocument(labelsList)
+        textDocument.setClassificationMode(TextDocument.CLASSIFYHIERARCHICAL)
+        textDocument.classifySentences()
+
+        self.assertEqual(labelsList, getLabels(textDocument))
+        self.assertEqual([self.classifier.classify(s)[0] for s in sentencesList],
+                         getLabels(textDocument))
+
+        statisticsDict = textDocument.getClassificationStatistics()
+        self.assertEqual(FRENCH_LABEL, statisticsDict['dominantLanguage'])
+        self.assertEqual(100, statisticsDict['sampled'])
+        self.assertEqual(375, statisticsDict['fastPath'])
+        self.assertEqual(125, statisticsDict['fullPath'])
+
+        #No dominant language
+        labelsList = [[FRENCH_LABEL, GERMAN_LABEL][i % 2] for i in range(200)]
+        textDocument, sentencesList = getDocument(labelsList)
+        textDocument.setClassificationMode(TextDocument.CLASSIFYHIERARCHICAL)
+        textDocument.classifySentences()
+
+        self.assertEqual(labelsList, getLabels(textDocument))
+        self.assertEqual(0, textDocument.getClassificationStatistics()['fastPath'])
+
+
+class TestCharNgramClassifier(unittest.TestCase):
+    OUTPUTDIR = TEMPDIRUNITTEST + "/charngram"
+
+    textsDict = {FRENCH_LABEL: ["Le chat dort sur le canapé du salon.",
+                                "Nous avons mangé une tarte aux pommes délicieuse.",
+                                "Les enfants jouent dans la cour de l'école."],
+                 GERMAN_LABEL: ["Die Katze schläft auf dem Sofa im Wohnzimmer.",
+                                "Wir haben einen köstlichen Apfelkuchen gegessen.",
+                                "Die Kinder spielen auf dem Schulhof."],
+                 ENGLISH_LABEL: ["The cat is sleeping on the living room sofa.",
+                                 "We have eaten a delicious apple pie.",
+                                 "The children are playing in the school yard."],
+                 ITALIAN_LABEL: ["Il gatto dorme sul divano del soggiorno.",
+                                 "Abbiamo mangiato una deliziosa torta di mele.",
+                                 "I bambini giocano nel cortile della scuola."]}
+
+    testsList = [(FRENCH_LABEL, "Les chats mangent une pomme dans la cour."),
+                 (GERMAN_LABEL, "Die Kinder haben einen Kuchen gegessen."),
+                 (ENGLISH_LABEL, "The children are eating apple pie."),
+                 (ITALIAN_LABEL, "I bambini mangiano una torta nel cortile.")]
+
+    def setUp(self):
+        if os.path.exists(self.OUTPUTDIR):
+            shutil.rmtree(self.OUTPUTDIR)
+        os.makedirs(self.OUTPUTDIR)
+
+        self.classifier = CharNgramClassifier(bucketsBits=12)
+        self.classifier.trainFromTexts(self.textsDict)
+
+    ############
+    # Tests
+    #
+    def testClassify(self):
+        for label, strSentence in self.testsList:
+            result, probability = self.classifier.classify(strSentence)
+            self.assertEqual(label, result)
+            self.assertGreater(probability, 0.5)
+            self.assertTrue(self.classifier.agrees(strSentence, label, 4))
+
+        #Nothing to score
+        self.assertEqual(UNKNOWN_LABEL, self.classifier.classify(" ... ")[0])
+
+        #Character n-grams of ' é ', not byte n-grams
+        self.assertEqual(3 + 2 + 1, len(self.classifier.getBuckets("é")))
+        self.assertEqual(len(self.classifier.getBuckets("e")),
+                         len(self.classifier.getBuckets("é")))
+        self.assertEqual([], self.classifier.getBuckets(""))
+
+        self.assertTrue(self.classifier.isTrained())
+        self.assertFalse(CharNgramClassifier().isTrained())
+        self.assertRaises(Exception, CharNgramClassifier().classify, "le chat")
+
+    def testTrainFromSources(self):
+        #Two sources per label are merged
+        sourcesList = []
+        for label, textsList in self.textsDict.items():
+            sourcesList.append((label, [t.split() for t in textsList[:1]]))
+        for label, textsList in self.textsDict.items():
+            sourcesList.append((label, [t.split() for t in textsList[1:]]))
+
+        classifier = CharNgramClassifier(bucketsBits=12)
+        classifier.trainFromSources(sourcesList)
+        self.assertEqual(self.classifier.labelsList, classifier.labelsList)
+        self.assertEqual(self.classifier.logProbsList, classifier.logProbsList)
+
+    def testSaveLoad(self):
+        modelFile = self.OUTPUTDIR + "/model.bin"
+        self.classifier.save(modelFile)
+        self.assertEqual(len(CharNgramClassifier.MAGIC), open(modelFile, 'rb').read().index(b"{"))
+
+        loadedClassifier = CharNgramClassifier.load(modelFile)
+        self.assertEqual(self.classifier.labelsList, loadedClassifier.labelsList)
+        self.assertEqual(self.classifier.logProbsList, loadedClassifier.logProbsList)
+        for label, strSentence in self.testsList:
+            self.assertEqual(self.classifier.classify(strSentence),
+                             loadedClassifier.classify(strSentence))
+
+        badFile = self.OUTPUTDIR + "/bad.bin"
+        with open(badFile, 'wb') as outputFile:
+            outputFile.write(b"not a model\n")
+        self.assertRaises(Exception, CharNgramClassifier.load, badFile)
+
+    def testReadLabelledFiles(self):
+        labelledFile = self.OUTPUTDIR + "/labelled.txt"
+        with open(labelledFile, 'w', encoding='utf-8') as outputFile:
+            outputFile.write("french\tLe chat dort.\n\ngerman\t \nenglish\tThe cat\tsleeps.\n")
+
+        self.assertEqual([(FRENCH_LABEL, "Le chat dort."), (ENGLISH_LABEL, "The cat\tsleeps.")],
+                         CharNgramClassifier.readLabelledFiles([labelledFile]))
+
+    def testBenchmarkHarness(self):
+        metricsDict = LanguageIdBenchmark.getMetrics(
+            [FRENCH_LABEL, FRENCH_LABEL, GERMAN_LABEL, GERMAN_LABEL],
+            [FRENCH_LABEL, GERMAN_LABEL, GERMAN_LABEL, UNKNOWN_LABEL])
+        self.assertEqual(0.5, metricsDict['accuracy'])
+        self.assertEqual(0.25, metricsDict['unknown'])
+        self.assertEqual(1.0, metricsDict['labels'][FRENCH_LABEL]['precision'])
+        self.assertEqual(0.5, metricsDict['labels'][FRENCH_LABEL]['recall'])
+        self.assertEqual(0.5, metricsDict['labels'][GERMAN_LABEL]['precision'])
+        self.assertEqual(0.5, metricsDict['labels'][GERMAN_LABEL]['unknown'])
+
+        trainFile, testFile = self.OUTPUTDIR + "/train.txt", self.OUTPUTDIR + "/test.txt"
+        with open(trainFile, 'w', encoding='utf-8') as outputFile:
+            for label, textsList in sorted(self.textsDict.items()):
+                outputFile.write("".join(["%s\t%s\n" % (label, t) for t in textsList]))
+        with open(testFile, 'w', encoding='utf-8') as outputFile:
+            outputFile.write("".join(["%s\t%s\n" % (l, s) for l, s in self.testsList]))
+
+        benchmark = LanguageIdBenchmark([testFile], europarl=False, trainFilePathsList=[trainFile])
+        benchmark.addConfiguration('reference', lambda: self.classifier)
+        resultsDict = benchmark.run([LanguageIdBenchmark.WORDS, LanguageIdBenchmark.NGRAMS,
+                                     'reference'])
+
+        self.assertEqual({testFile: 4}, resultsDict['sources'])
+        self.assertEqual([LanguageIdBenchmark.NGRAMS, LanguageIdBenchmark.WORDS],
+                         sorted(resultsDict['trainSeconds'].keys()))
+        for measureDict in resultsDict['configurations'].values():
+            self.assertEqual(sorted(self.textsDict.keys()), sorted(measureDict['labels'].keys()))
+            self.assertGreater(measureDict['sentencesPerSecond'], 0)
+            self.assertGreaterEqual(measureDict['loadSeconds'], 0)
+        self.assertEqual(1.0, resultsDict['configurations']['reference']['accuracy'])
+        json.dumps(resultsDict)
+
+    def testTextDocument(self):
+        sentencesList = [s for l, s in self.testsList]
+        textDocument = TextDocument(None, 0, None, [], None, False, False)
+        textDocument._addSentences(sentencesList, bSplit=False)
+        textDocument.setClassifier(self.classifier)
+        textDocument.classifySentences()
+
+        self.assertEqual([l for l, s in self.testsList],
+                         [c.getAttribute(TextCluster.LANGUAGE_ATTRIBUTE)
+                          for c in textDocument.listContent])
@@ -34,6 +34,16 @@ from asrt.common.unit_test.TextRepresentationUnitTest import TestTextRepresentat
 from asrt.common.unit_test.ListUnitTest import TestDataList, TestDataMap
 from asrt.common.unit_test.PunctuationUnitTest import PunctuationUnitTest
 from asrt.common.unit_test.IoreadUnitTest import TestIoread
+from asrt.common.unit_test.AsyncDataPreparationAPIUnitTest import TestAsyncDataPreparationAPI
+from asrt.common.unit_test.SentenceDeduplicatorUnitTest import TestSentenceDeduplicator
+from asrt.common.unit_test.SentenceWriterUnitTest import TestSentenceWriter
+from asrt.common.unit_test.TaskRunnerUnitTest import TestTaskRunner
+from asrt.common.unit_test.IndexedListUnitTest import TestIndexedDataList, TestIndexedDataMap
+from asrt.common.unit_test.TaskMergeSentencesUnitTest import TestMergeSentences
+from asrt.common.unit_test.SentenceSegmenterUnitTest import TestSentenceSegmenter
+from asrt.common.unit_test.TextDocumentUnitTest import TestTextDocument
+from asrt.common.unit_test.ClassifierUnitTest import TestLanguageClassifier, TestCharNgramClassifier
+from asrt.common.unit_test.SentenceWatchdogUnitTest import TestSentenceWatchdog
 
 
 def getSuite(strName=None):
@@ -49,11 +59,30 @@ def getSuite(strName=None):
     ).loadTestsFromTestCase(TestTextRepresentation)
     punctuationSuite = unittest.TestLoader().loadTestsFromTestCase(PunctuationUnitTest)
     ioreadSuite = unittest.TestLoader().loadTestsFromTestCase(TestIoread)
+    asyncDataPreparationAPISuite = unittest.TestLoader(
+    ).loadTestsFromTestCase(TestAsyncDataPreparationAPI)
+    deduplicatorSuite = unittest.TestLoader().loadTestsFromTestCase(TestSentenceDeduplicator)
+    sentenceWriterSuite = unittest.TestLoader().loadTestsFromTestCase(TestSentenceWriter)
+    taskRunnerSuite = unittest.TestLoader().loadTestsFromTestCase(TestTaskRunner)
+    indexedDataListSuite = unittest.TestLoader().loadTestsFromTestCase(TestIndexedDataList)
+    indexedDataMapSuite = unittest.TestLoader().loadTestsFromTestCase(TestIndexedDataMap)
+    mergeSentencesSuite = unittest.TestLoader().loadTestsFromTestCase(TestMergeSentences)
+    sentenceSegmenterSuite = unittest.TestLoader().loadTestsFromTestCase(TestSentenceSegmenter)
+    textDocumentSuite = unittest.TestLoader().loadTestsFromTestCase(TestTextDocument)
+    classifierSuite = unittest.TestLoader().loadTestsFromTestCase(TestLanguageClassifier)
+    charNgramClassifierSuite = unittest.TestLoader().loadTestsFromTestCase(TestCharNgramClassifier)
+    sentenceWatchdogSuite = unittest.TestLoader().loadTestsFromTestCase(TestSentenceWatchdog)
 
     testSuiteMap = {'taskInfo': taskInfoSuite, 'task': taskSuite, 'dataPreparationAPI': dataPreparationAPISuite,
                     'dataList': dataListSuite, 'dataMap': dataMapSuite,
                     'textRepresentation': textRepresentationSuite, 'punctuation': punctuationSuite,
-                    'ioread': ioreadSuite}
+                    'ioread': ioreadSuite, 'asyncDataPreparationAPI': asyncDataPreparationAPISuite,
+                    'deduplicator': deduplicatorSuite, 'sentenceWriter': sentenceWriterSuite,
+                    'taskRunner': taskRunnerSuite, 'indexedDataList': indexedDataListSuite,
+                    'indexedDataMap': indexedDataMapSuite, 'mergeSentences': mergeSentencesSuite,
+                    'sentenceSegmenter': sentenceSegmenterSuite, 'textDocument': textDocumentSuite,
+                    'classifier': classifierSuite, 'charNgramClassifier': charNgramClassifierSuite,
+                    'sentenceWatchdog': sentenceWatchdogSuite}
 
     if strName == None:
         return ", ".join(sorted(testSuiteMap.keys()))
@@ -61,7 +90,11 @@ def getSuite(strName=None):
     # All unit tests
     if strName == 'all':
         return [taskInfoSuite, taskSuite, dataPreparationAPISuite, dataListSuite,
-                dataMapSuite, textRepresentationSuite, punctuationSuite, ioreadSuite]
+                dataMapSuite, textRepresentationSuite, punctuationSuite, ioreadSuite,
+                asyncDataPreparationAPISuite, deduplicatorSuite, sentenceWriterSuite,
+                taskRunnerSuite, indexedDataListSuite, indexedDataMapSuite,
+                mergeSentencesSuite, sentenceSegmenterSuite, textDocumentSuite,
+                classifierSuite, charNgramClassifierSuite, sentenceWatchdogSuite]
 
     if strName not in testSuiteMap:
         return []
@@ -29,6 +29,7 @@ import logging
 
 from asrt.common.ioread import Ioread
 from asrt.common.DataPreparationAPI import DataPreparationAPI
+from asrt.common.RegularExpressionBackend import RegexEngine
 from asrt.config.AsrtConfig import TEMPDIRUNITTEST
 
 
@@ -108,3 +109,34 @@ class TestDataPreparationAPI(unittest.TestCase):
                 self.assertEqual(formattedText, gt,
                                  "'%s' is not '%s':%s for '%s'" % (formattedText,
                                                                    gt, strFileName, test))
+
+    def testRunState(self):
+        abbreviationFile = TEMPDIRUNITTEST + "/abbreviations-api.csv"
+        with open(abbreviationFile, 'w', encoding='utf-8') as outputFile:
+            outputFile.write("abbreviation\texpansion\tlanguage\tcomment\n")
+            outputFile.write("Mr.\tMister user\t3\t\n")
+
+        backendName = RegexEngine.getAvailableBackends()[-1]
+        firstAPI, secondAPI = DataPreparationAPI(None, None), DataPreparationAPI(None, None)
+        firstAPI.setRegexBackend(backendName)
+        firstAPI.setWordCacheSize(10)
+        firstAPI.setAbbreviationFiles([abbreviationFile])
+
+        resultsList = []
+        for api in [firstAPI, secondAPI]:
+            api.setSegmentWithNLTK(False)
+            api.setLMModeling(True)
+            api.setFormattedText("Mr. Smith")
+            api.prepareDocument(3)
+            resultsList.append(api.getCleanedText())
+        self.assertEqual(["mister user smith", "mister smith"], resultsList)
+
+        #Engines and caches are held per API, statistics
+        #start from zero
+        self.assertEqual(backendName, firstAPI.getRegexBackend())
+        self.assertEqual(RegexEngine.DEFAULT, secondAPI.getRegexBackend())
+        self.assertEqual(RegexEngine.DEFAULT, RegexEngine.getDefault().getBackendName())
+        self.assertFalse(firstAPI.getWordCache() is secondAPI.getWordCache())
+        self.assertEqual(10, firstAPI.getWordCache().maxSize)
+        self.assertEqual(2, secondAPI.getWordCache().getStageStatistics()['noise']['misses'])
+        self.assertEqual({}, DataPreparationAPI(None, None).getWordCache().getStageStatistics())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import os
+scriptsDir = os.path.abspath(os.path.dirname(__file__))
+
+import time
+import random
+import shutil
+import unittest
+
+from asrt.common.DataList import DataList
+from asrt.common.DataMap import DataMap
+from asrt.common.IndexedList import IndexedFile, IndexedDataList, IndexedDataMap
+from asrt.config.AsrtConfig import TEMPDIRUNITTEST
+
+
+class TestIndexedDataList(unittest.TestCase):
+    IDATALIST = scriptsDir + "/resources/target-folder-1/data.ilist"
+    OUTPUTDIR = TEMPDIRUNITTEST + "/indexedlist"
+
+    def setUp(self):
+        if os.path.exists(self.OUTPUTDIR):
+            shutil.rmtree(self.OUTPUTDIR)
+        os.makedirs(self.OUTPUTDIR)
+
+    def writeList(self, fileName, rowsList):
+        filePath = self.OUTPUTDIR + os.sep + fileName
+        with open(filePath, 'w', encoding='utf-8') as outputFile:
+            outputFile.write("\r\n".join(rowsList))
+        return filePath
+
+    ############
+    # Tests
+    #
+    def testSameAsDataList(self):
+        dataList = DataList()
+        dataList.readFile(self.IDATALIST)
+
+        with IndexedDataList(self.IDATALIST, self.OUTPUTDIR, chunkSize=4) as indexedList:
+            self.assertEqual(dataList.getCount(), indexedList.getCount())
+            for key in dataList.dataDictionary:
+                self.assertEqual(dataList.getPath(key), indexedList.getPath(key))
+            self.assertEqual(None, indexedList.getPath("unknown"))
+
+            #Key order
+            keysList = [key for key, path in indexedList]
+            self.assertEqual(sorted(dataList.dataDictionary.keys()), keysList)
+
+    def testWriteSorted(self):
+        dataList = DataList()
+        keysList = ["doc%d" % i for i in range(2000)]
+        random.Random(2).shuffle(keysList)
+        dataList.dataDictionary = dict([(k, "/path/%s.pdf" % k) for k in keysList])
+        dataList.dataDictionary["doc;quoted"] = '/path/"quoted".pdf'
+
+        listFile = self.OUTPUTDIR + "/written.olist"
+        IndexedFile.writeSorted(dataList.dataDictionary.items(), listFile, chunkSize=100)
+        with open(listFile, 'rb') as inputFile:
+            strContent = inputFile.read()
+        self.assertFalse(strContent.endswith(b"\n"))
+        self.assertEqual(sorted(dataList.dataDictionary.keys()),
+                         [IndexedFile._getLineKey(l) for l in strContent.split(b"\r\n")])
+        self.assertEqual([], [f for f in os.listdir(self.OUTPUTDIR) if f.endswith(".run")])
+
+        #Read back
+        writtenList = DataList()
+        dataList.writeFile(listFile)
+        writtenList.readFile(listFile)
+        self.assertEqual(dataList.dataDictionary, writtenList.dataDictionary)
+        with IndexedDataList(listFile) as indexedList:
+            self.assertEqual('/path/"quoted".pdf', indexedList.getPath("doc;quoted"))
+
+    def testLargeList(self):
+        keysList = ["doc%d" % i for i in range(2000)]
+        random.Random(1).shuffle(keysList)
+        listFile = self.writeList("large.olist", ["%s;/path/%s.pdf" % (k, k)
+                                                  for k in keysList])
+
+        indexedList = IndexedDataList(listFile, chunkSize=100)
+        self.assertEqual(2000, indexedList.getCount())
+        self.assertEqual("/path/doc1234.pdf", indexedList.getPath("doc1234"))
+        self.assertTrue("doc0" in indexedList)
+        self.assertFalse("doc2000" in indexedList)
+
+        shardsList = indexedList.getShards(3)
+        self.assertEqual([(0, 666), (666, 1333), (1333, 2000)], shardsList)
+        indexedList.close()
+
+    def testQuotedAndUnique(self):
+        listFile = self.writeList("quoted.olist", ['"a;b";/path/a b', 'c;/path/c'])
+        indexedList = IndexedDataList(listFile)
+        self.assertEqual("/path/a b", indexedList.getPath("a;b"))
+        indexedList.close()
+
+        listFile = self.writeList("duplicated.olist", ['a;/path/a', 'a;/path/b'])
+        with self.assertRaises(Exception):
+            IndexedDataList(listFile)
+
+    def testRebuild(self):
+        listFile = self.writeList("rebuild.olist", ['a;/path/a'])
+        indexedList = IndexedDataList(listFile)
+        self.assertEqual(1, indexedList.getCount())
+        indexedList.close()
+
+        #Source is newer
+        time.sleep(0.01)
+        self.writeList("rebuild.olist", ['a;/path/a', 'b;/path/b'])
+        indexedList = IndexedDataList(listFile)
+        self.assertEqual(2, indexedList.getCount())
+        indexedList.close()
+
+
+class TestIndexedDataMap(unittest.TestCase):
+    IDATAMAP = scriptsDir + "/resources/target-folder-1/audio.imap"
+    OUTPUTDIR = TEMPDIRUNITTEST + "/indexedmap"
+
+    def setUp(self):
+        if os.path.exists(self.OUTPUTDIR):
+            shutil.rmtree(self.OUTPUTDIR)
+        os.makedirs(self.OUTPUTDIR)
+
+    ############
+    # Tests
+    #
+    def testSameAsDataMap(self):
+        dataMap = DataMap()
+        dataMap.readFile(self.IDATAMAP)
+
+        with IndexedDataMap(self.IDATAMAP, self.OUTPUTDIR, chunkSize=2) as indexedMap:
+            self.assertEqual(dataMap.getCount(), indexedMap.getCount())
+            self.assertEqual(dataMap.getDictionaryMap(),
+                             dict(indexedMap.iterDictionaryMap()))
+            for key, value in dataMap.iterDictionaryMap():
+                self.assertEqual(value, indexedMap.getRepresentations(key))
+                self.assertTrue(key in indexedMap)
+            self.assertEqual(None, indexedMap.getRepresentations("unknown"))
+
+    def testShards(self):
+        mapFile = self.OUTPUTDIR + "/large.omap"
+        with open(mapFile, 'w') as outputFile:
+            for i in range(100):
+                outputFile.write("doc%02d;french\ndoc%02d;german\n" % (i, i))
+
+        with IndexedDataMap(mapFile, chunkSize=7) as indexedMap:
+            self.assertEqual(100, indexedMap.getCount())
+
+            #Keys are not split across shards
+            keysList = []
+            for start, end in indexedMap.getShards(3):
+                for key, languages in indexedMap.iterDictionaryMap(start, end):
+                    self.assertEqual({'french': {}, 'german': {}}, languages)
+                    keysList.append(key)
+            self.assertEqual(["doc%02d" % i for i in range(100)], keysList)
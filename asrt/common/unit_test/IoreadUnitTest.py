@@ -24,6 +24,7 @@ __license__ = "BSD 3-Clause"
 import os
 scriptsDir = os.path.abspath(os.path.dirname(__file__))
 
+import mmap
 import unittest
 import logging
 
@@ -75,3 +76,32 @@ class TestIoread(unittest.TestCase):
 
         readStrContent = self.ioread.readFileContent(self.testFile)
         self.assertEquals(strContent, readStrContent)
+
+    def testIterLines(self):
+        self.assertEqual(self.ioread.readFileContentList(self.testFile),
+                         list(self.ioread.iterLines(self.testFile)))
+        self.assertEqual(self.testsString[0],
+                         "".join(self.ioread.iterLines(self.testFile, keepEnds=True)))
+
+        #Characters and new lines split across chunks, invalid bytes
+        pageSize = mmap.PAGESIZE
+        content = b"a" * (pageSize - 1) + "é".encode('utf-8') + \
+                  b"b" * (pageSize - 3) + b"\r\n\xff\n\nlast"
+        testFile = TEMPDIRUNITTEST + "/iterlines.txt"
+        with open(testFile, 'wb') as f:
+            f.write(content)
+
+        linesList = list(self.ioread.iterLines(testFile, chunkSize=pageSize))
+        self.assertEqual(self.ioread.readFileContent(testFile).split("\n"), linesList)
+        self.assertEqual("a" * (pageSize - 1) + "é" + "b" * (pageSize - 3), linesList[0])
+        self.assertEqual("\udcff", linesList[1])
+
+        self.assertEqual([linesList[0] + "\n\udcff", "last"],
+                         list(self.ioread.iterParagraphs(testFile, chunkSize=pageSize)))
+
+    def testEmptyFile(self):
+        testFile = TEMPDIRUNITTEST + "/empty.txt"
+        open(testFile, 'w').close()
+        self.assertEqual("", self.ioread.readFileContent(testFile))
+        self.assertEqual("", self.ioread.nltkRead(testFile))
+        self.assertEqual([], list(self.ioread.iterLines(testFile)))
@@ -24,7 +24,9 @@ __license__ = "BSD 3-Clause"
 import os
 scriptsDir = os.path.abspath(os.path.dirname(__file__))
 
+import sys
 import unittest
+import concurrent.futures
 from asrt.common.Punctuation import Punctuation
 
 class PunctuationUnitTest(unittest.TestCase):
@@ -108,3 +110,15 @@ class PunctuationUnitTest(unittest.TestCase):
 			if not result:
 				print((key, '|', p.removeVerbalized(key), '|', value))
 			self.assertTrue(result)
+
+	def test_sharedModelThreads(self):
+		p = Punctuation()
+		textsList = [" ".join([t] * 200) for t in self.replace_text.keys()] * 20
+		previousSwitchInterval = sys.getswitchinterval()
+		try:
+			sys.setswitchinterval(1e-6)
+			with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+				resultsList = list(executor.map(p.replaceText, textsList))
+		finally:
+			sys.setswitchinterval(previousSwitchInterval)
+		self.assertEqual([p.replaceText(t) for t in textsList], resultsList)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import unittest
+
+from asrt.common.DataPreparationAPI import DataPreparationAPI
+from asrt.common.SentenceDeduplicator import SentenceDeduplicator
+from asrt.common.SentenceDeduplicator import HashSet, BloomFilter, MinHashLSH, hash64
+
+
+class TestSentenceDeduplicator(unittest.TestCase):
+
+    sentencesList = ["Ceci est une phrase de test.",
+                     "Tous droits réservés.",
+                     "Ceci est une phrase de test.",
+                     "Une autre phrase.",
+                     "Tous droits réservés."]
+
+    ############
+    # Tests
+    #
+    def testHashSet(self):
+        hashSet = HashSet(initialSize=4)
+        for i in range(1000):
+            self.assertTrue(hashSet.add(hash64(str(i))))
+        for i in range(1000):
+            self.assertFalse(hashSet.add(hash64(str(i))))
+            self.assertTrue(hash64(str(i)) in hashSet)
+
+        self.assertEqual(1000, len(hashSet))
+        self.assertFalse(hash64("1000") in hashSet)
+        self.assertTrue(hashSet.add(0))
+        self.assertTrue(0 in hashSet)
+
+    def testBloomFilter(self):
+        bloomFilter = BloomFilter(capacity=1000, errorRate=0.01)
+        for i in range(1000):
+            bloomFilter.add(hash64(str(i)))
+        for i in range(1000):
+            self.assertTrue(hash64(str(i)) in bloomFilter)
+
+        falsePositives = len([i for i in range(1000, 11000)
+                              if hash64(str(i)) in bloomFilter])
+        self.assertTrue(falsePositives < 300)
+
+    def testExact(self):
+        for mode in SentenceDeduplicator.MODES:
+            deduplicator = SentenceDeduplicator(mode, bloomCapacity=1000)
+            self.assertEqual(["Ceci est une phrase de test.",
+                              "Tous droits réservés.",
+                              "Une autre phrase."],
+                             deduplicator.filterSentences(self.sentencesList))
+            self.assertAlmostEqual(0.4, deduplicator.getDedupRatio())
+
+    def testNearDuplicates(self):
+        strSentence = "le conseil d'administration a approuvé les comptes " + \
+                      "de l'exercice deux mille quinze à l'unanimité des membres"
+
+        deduplicator = SentenceDeduplicator(nearDuplicates=True)
+        self.assertFalse(deduplicator.isDuplicate(strSentence))
+        self.assertTrue(deduplicator.isDuplicate(strSentence + " présents"))
+        self.assertFalse(deduplicator.isDuplicate("une phrase sans aucun rapport"))
+        self.assertEqual(1, deduplicator.nearCount)
+
+    def testNearThreshold(self):
+        #A Jaccard similarity of 0.5 shares a band most of
+        #the time, below the default threshold
+        wordsList = ["mot%d" % i for i in range(42)]
+        firstSentence, secondSentence = " ".join(wordsList[:32]), " ".join(wordsList[10:])
+        minHash = MinHashLSH()
+        self.assertTrue(minHash.add(firstSentence))
+        similarity = minHash.getSimilarity(minHash.getSignature(secondSentence), 0)
+        self.assertTrue(0.3 < similarity < 0.7)
+        self.assertTrue(minHash.add(secondSentence))
+
+        #11 of the 12 shingles are shared
+        strSentence = "le conseil d'administration a approuvé les comptes " + \
+                      "de l'exercice deux mille quinze à l'unanimité des membres"
+        for threshold, bDuplicate in [(0.95, False), (0.5, True)]:
+            deduplicator = SentenceDeduplicator(nearDuplicates=True, nearThreshold=threshold)
+            self.assertFalse(deduplicator.isDuplicate(strSentence))
+            self.assertEqual(bDuplicate, deduplicator.isDuplicate(strSentence + " présents"))
+
+        self.assertRaises(Exception, MinHashLSH, threshold=0.0)
+
+    def testDataPreparationAPI(self):
+        api = DataPreparationAPI(None, None)
+        api.setSegmentWithNLTK(False)
+        api.setDeduplicator(SentenceDeduplicator())
+
+        api.setFormattedText("\n".join(self.sentencesList))
+        api.prepareDocument(1)
+        self.assertEqual(3, len(api.getCleanedText().split("\n")))
+
+        #Across documents
+        api.setFormattedText("Une autre phrase.\nUne nouvelle phrase.")
+        api.prepareDocument(1)
+        self.assertEqual("Une nouvelle phrase.", api.getCleanedText())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import unittest
+
+from asrt.common.DataPreparationAPI import DataPreparationAPI
+from asrt.common.TextDocument import TextDocument
+from asrt.common.SentenceSegmenter import RuleSegmenter
+from asrt.benchmark.SegmenterBenchmark import SegmenterBenchmark
+from asrt.common.MyFile import MyFile
+from asrt.config.AsrtConfig import FRENCH, GERMAN, TEMPDIRUNITTEST
+
+
+class TestSentenceSegmenter(unittest.TestCase):
+
+    ############
+    # Tests
+    #
+    def testSegment(self):
+        strText = "Le Dr. Martin est arrivé. Il a dit: bonjour! Vraiment? Oui."
+        self.assertEqual(["Le Dr. Martin est arrivé.", "Il a dit", "bonjour",
+                          "Vraiment", "Oui."],
+                         RuleSegmenter(FRENCH).segment(strText))
+
+    def testNewLines(self):
+        strText = "Une phrase sur deux\nlignes avec un mot cou-\npé. Une autre\tphrase."
+        self.assertEqual(["Une phrase sur deux lignes avec un mot coupé.",
+                          "Une autre", "phrase."],
+                         RuleSegmenter(FRENCH).segment(strText))
+
+    def testPeriods(self):
+        testList = [("Voir art. 12 et fig. 3 ici. La suite.",
+                     ["Voir art. 12 et fig. 3 ici.", "La suite."]),
+                    ("Le point 3. Le point 10.",
+                     ["Le point 3. Le point 10."]),
+                    ("Am 3. Mai kam Hr. Meier, z.B. mit Prof. Müller.",
+                     ["Am 3. Mai kam Hr. Meier, z.B. mit Prof. Müller."]),
+                    ("J. Dupont et la U.S. Army. En 2015. Fin",
+                     ["J. Dupont et la U.S. Army.", "En 2015.", "Fin"]),
+                    ("Il est parti (le soir.) \"Oui.\" etc. et fin.",
+                     ["Il est parti (le soir.)", "\"Oui.\" etc. et fin."])]
+
+        segmenter = RuleSegmenter(0)
+        for strText, sentencesList in testList:
+            self.assertEqual(sentencesList, segmenter.segment(strText))
+
+    def testLanguageAbbreviations(self):
+        strText = "Siehe Abb. Drei."
+        self.assertEqual(["Siehe Abb. Drei."], RuleSegmenter(GERMAN).segment(strText))
+        self.assertEqual(["Siehe Abb.", "Drei."], RuleSegmenter(FRENCH).segment(strText))
+
+    def testParallelSegmentation(self):
+        #Sentences across chunks, delimiters and hyphens at chunk ends
+        partsList = ["Le Dr. Martin est arrivé le 3.", "\n\n", "Mai avec J. Dupont",
+                     "\n", "Les membres sont pré-\nsents!", "\n\n\n",
+                     "Titre sans point", "\n\n", "Est-ce vrai? Oui.", " ", "abc-\n",
+                     "def. Fin.\n"]
+        MyFile.checkDirExists(TEMPDIRUNITTEST)
+        testFile = TEMPDIRUNITTEST + "/segmentation.txt"
+        with open(testFile, 'w', encoding='utf-8') as f:
+            f.write("".join(partsList * 20))
+
+        def load(workers, chunkSize):
+            textDocument = TextDocument(testFile, FRENCH, None, [], None, True, False)
+            textDocument.setSegmenter(TextDocument.SEGMENTERRULES)
+            textDocument.setParallelSegmentation(workers, chunkSize)
+            textDocument._loadTextDocumentAsSentences(testFile)
+            return [c.getTextSentence() for c in textDocument.listContent]
+
+        sentencesList = load(1, None)
+        self.assertEqual(80, len(sentencesList))
+        for chunkSize in [1, 13, 100]:
+            self.assertEqual(sentencesList, load(2, chunkSize))
+
+    def testRawSegmentation(self):
+        api = DataPreparationAPI(None, None)
+        api.setSegmentWithNLTK(False)
+        api.setSegmenter(TextDocument.SEGMENTERRULES)
+        api.setFormattedText("Première phrase. Deuxième\nTroisième phrase")
+        api.prepareDocument(1)
+        self.assertEqual(["Première phrase. Deuxième", "Troisième phrase"],
+                         api.getCleanedText().split("\n"))
+
+    def testAgreement(self):
+        referenceList = [["Une phrase.", "Deux phrases ici.", "Trois."]]
+        self.assertEqual(1.0, SegmenterBenchmark.getAgreement(
+            referenceList, referenceList)['boundaryF1'])
+
+        agreement = SegmenterBenchmark.getAgreement(
+            referenceList, [["Une phrase. Deux phrases ici.", "Trois."]])
+        self.assertEqual(1.0, agreement['boundaryPrecision'])
+        self.assertAlmostEqual(2 / 3.0, agreement['boundaryRecall'])
+        self.assertAlmostEqual(1 / 3.0, agreement['sentences'])
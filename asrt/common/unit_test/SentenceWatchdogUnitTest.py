@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import os
+import re
+import time
+import shutil
+import tempfile
+import unittest
+import threading
+
+from asrt.common.SentenceWatchdog import SentenceWatchdog
+from asrt.common.TextDocument import TextDocument
+from asrt.common.formula.FormulaRegularExpression import RegularExpressionFormula
+from asrt.common.TextCluster import TextCluster
+from asrt.config.AsrtConfig import FRENCH, FRENCH_LABEL
+
+#Exponential backtracking on a line of 'a'
+BACKTRACKINGPATTERN = "(a+)+b"
+
+
+class SlowClassifier(object):
+    """French for all sentences, slow for 'slowSentence'.
+    """
+    def __init__(self, slowSentence):
+        self.slowSentence = slowSentence
+
+    def classify(self, strSentence):
+        if strSentence == self.slowSentence:
+            time.sleep(1)
+        return FRENCH_LABEL, 1.0
+
+    def agrees(self, strSentence, label, maxWords):
+        return label == FRENCH_LABEL
+
+
+class TestSentenceWatchdog(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp()
+        self.quarantineFile = os.path.join(self.tempDir, "quarantine.txt")
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    ############
+    # Tests
+    #
+    def testSentenceBudget(self):
+        watchdog = SentenceWatchdog(0.2, None, self.quarantineFile)
+        watchdog.startDocument("doc.txt")
+        self.assertEqual((True, "ABC"), watchdog.run("upper", "abc", str.upper, "abc"))
+
+        startTime = time.time()
+        strSentence = "a" * 40
+        self.assertEqual((False, None), watchdog.run("search", strSentence,
+                                                     re.compile(BACKTRACKINGPATTERN).search,
+                                                     strSentence))
+        self.assertTrue(time.time() - startTime < 2)
+
+        #Not interrupted outside the main thread
+        resultsList = []
+        thread = threading.Thread(target=lambda: resultsList.append(
+            watchdog.run("sleep", "slow\nline", time.sleep, 0.3)))
+        thread.start()
+        thread.join()
+        self.assertEqual([(False, None)], resultsList)
+
+        with open(self.quarantineFile, encoding='utf-8') as inputFile:
+            linesList = [l.rstrip("\n").split("\t") for l in inputFile]
+        self.assertEqual([["doc.txt", "search", "sentence", strSentence],
+                          ["doc.txt", "sleep", "sentence", "slow line"]],
+                         [l[:3] + l[4:] for l in linesList])
+        self.assertTrue(float(linesList[1][3]) >= 0.3)
+
+        statisticsDict = watchdog.getStatistics()
+        self.assertEqual(2, statisticsDict['quarantined'])
+        self.assertEqual({'search': 1, 'sleep': 1}, statisticsDict['stages'])
+        self.assertEqual(0, statisticsDict['documentsOverBudget'])
+
+    def testDocumentBudget(self):
+        watchdog = SentenceWatchdog(None, 0.2)
+        watchdog.startDocument("doc.txt")
+        self.assertEqual((False, None), watchdog.run("sleep", "s1", time.sleep, 1))
+        self.assertEqual((False, None), watchdog.run("upper", "s2", str.upper, "s2"))
+
+        #A new document has its own budget
+        watchdog.startDocument("doc2.txt")
+        self.assertEqual((True, "S3"), watchdog.run("upper", "s3", str.upper, "s3"))
+
+        statisticsDict = watchdog.getStatistics()
+        self.assertEqual({'document': 2}, statisticsDict['reasons'])
+        self.assertEqual(1, statisticsDict['documentsOverBudget'])
+        self.assertEqual(2, statisticsDict['documents'])
+        self.assertTrue(watchdog.getReport().startswith("Time budget: 2 sentences quarantined"))
+
+    def testTextDocument(self):
+        formula = RegularExpressionFormula(None, [("chat", "chien", "1", "1"),
+                                                  (BACKTRACKINGPATTERN, "b", "1", "1")])
+        sentencesList = ["le chat %d" % i for i in range(5)]
+        sentencesList.insert(2, "a" * 40)
+
+        watchdog = SentenceWatchdog(0.2, None, self.quarantineFile)
+        watchdog.startDocument("doc.txt")
+        textDocument = TextDocument(None, FRENCH, formula, [], None, False, False)
+        textDocument.setWatchdog(watchdog)
+        textDocument.loadAsSentences("\n".join(sentencesList))
+        textDocument.setSentencesLanguage(FRENCH)
+        textDocument.cleanTextSentences()
+        textDocument.normalizeTextSentences()
+        textDocument.prepareLM()
+
+        self.assertEqual(["le chien %s" % w for w in ["zéro", "un", "deux", "trois", "quatre"]],
+                         [c.getTextSentence() for c in textDocument.listContent])
+        self.assertEqual({'normalize': 1}, watchdog.getStatistics()['stages'])
+        with open(self.quarantineFile, encoding='utf-8') as inputFile:
+            self.assertEqual("a" * 40, inputFile.read().rstrip("\n").split("\t")[-1])
+
+    def testHierarchicalClassification(self):
+        sentencesList = ["phrase %d" % i for i in range(300)]
+
+        watchdog = SentenceWatchdog(0.1)
+        watchdog.startDocument("doc.txt")
+        textDocument = TextDocument(None, 0, None, [], None, False, False)
+        textDocument._addSentences(sentencesList, bSplit=False)
+        textDocument.setWatchdog(watchdog)
+        #The first sentence is always sampled
+        textDocument.setClassifier(SlowClassifier(sentencesList[0]))
+        textDocument.setClassificationMode(TextDocument.CLASSIFYHIERARCHICAL)
+        textDocument.classifySentences()
+
+        self.assertEqual(sentencesList[1:],
+                         [c.getTextSentence() for c in textDocument.listContent])
+        self.assertEqual([FRENCH_LABEL] * 299,
+                         [c.getAttribute(TextCluster.LANGUAGE_ATTRIBUTE)
+                          for c in textDocument.listContent])
+
+        statisticsDict = textDocument.getClassificationStatistics()
+        self.assertEqual(299, statisticsDict['sentences'])
+        self.assertEqual(99, statisticsDict['sampled'])
+        self.assertEqual(1.0, statisticsDict['dominantShare'])
+        self.assertEqual(200, statisticsDict['fastPath'])
+        self.assertEqual(99, statisticsDict['fullPath'])
+        self.assertEqual({'classify': 1}, watchdog.getStatistics()['stages'])
+
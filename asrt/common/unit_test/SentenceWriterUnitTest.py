@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import os
+import gzip
+import lzma
+import json
+import shutil
+import unittest
+
+from asrt.common.SentenceWriter import SentencesWriter
+from asrt.common.DataPreparationAPI import DataPreparationAPI
+from asrt.config.AsrtConfig import TEMPDIRUNITTEST, FRENCH_LABEL, GERMAN_LABEL
+
+
+class TestSentenceWriter(unittest.TestCase):
+    outputDir = TEMPDIRUNITTEST + "/sentencewriter"
+
+    sentencesDict = {FRENCH_LABEL: ["une phrase", "", "une autre phrase", "", ""],
+                     GERMAN_LABEL: ["ein Satz"]}
+
+    def setUp(self):
+        if os.path.exists(self.outputDir):
+            shutil.rmtree(self.outputDir)
+
+    def readFile(self, fileName, openFunction=open):
+        with openFunction(self.outputDir + os.sep + fileName, 'rt',
+                          encoding='utf-8') as inputFile:
+            return inputFile.read()
+
+    ############
+    # Tests
+    #
+    def testOutputPerLanguage(self):
+        DataPreparationAPI.outputPerLanguage(self.sentencesDict, self.outputDir)
+
+        #Same content as a single join of all sentences
+        self.assertEqual("une phrase\n\nune autre phrase\n",
+                         self.readFile("sentences_%s.txt" % FRENCH_LABEL))
+        self.assertEqual("ein Satz\n", self.readFile("sentences_%s.txt" % GERMAN_LABEL))
+        self.assertEqual(2, len(os.listdir(self.outputDir)))
+
+    def testCompression(self):
+        for compression, openFunction in [('gzip', gzip.open), ('xz', lzma.open)]:
+            DataPreparationAPI.outputPerLanguage(self.sentencesDict,
+                                                 self.outputDir, compression)
+            self.assertEqual("ein Satz\n",
+                             self.readFile("sentences_%s.txt.%s" % (GERMAN_LABEL,
+                                           compression[:2]), openFunction))
+
+    def testShards(self):
+        writer = SentencesWriter(self.outputDir, maxShardSize=20)
+        for i in range(10):
+            writer.writeSentence(FRENCH_LABEL, "phrase numéro %d" % i)
+        outputFiles = writer.commit()
+
+        manifest = json.loads(self.readFile(SentencesWriter.MANIFESTFILENAME))
+        shardsList = manifest['languages'][FRENCH_LABEL]['shards']
+        self.assertEqual(5, len(shardsList))
+        self.assertEqual(6, len(outputFiles))
+
+        #Sizes in utf-8 bytes
+        for shardDict in shardsList:
+            self.assertEqual(os.path.getsize(self.outputDir + os.sep + shardDict['file']),
+                             shardDict['bytes'])
+
+        strContent = "".join([self.readFile(s['file']) for s in shardsList])
+        self.assertEqual("\n".join(["phrase numéro %d" % i for i in range(10)]) + "\n",
+                         strContent)
+
+    def testAbort(self):
+        try:
+            with SentencesWriter(self.outputDir) as writer:
+                writer.writeSentence(FRENCH_LABEL, "une phrase")
+                self.assertTrue(os.path.exists(self.outputDir + os.sep +
+                                "sentences_%s.txt.part" % FRENCH_LABEL))
+                raise ValueError("failure")
+        except ValueError:
+            pass
+
+        self.assertEqual([], os.listdir(self.outputDir))
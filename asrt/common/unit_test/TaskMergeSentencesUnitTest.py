@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import os
+import json
+import shutil
+import unittest
+
+from asrt.common.tasks.AsrtTask import TaskInfo
+from asrt.common.tasks.TaskImportDocument import ImportDocumentTask
+from asrt.common.tasks.TaskMergeSentences import MergeSentencesTask
+from asrt.config.AsrtConfig import TEMPDIRUNITTEST
+
+
+class TestMergeSentences(unittest.TestCase):
+    workingDirectory = os.path.abspath(TEMPDIRUNITTEST + "/mergesentences")
+
+    def setUp(self):
+        if os.path.exists(self.workingDirectory):
+            shutil.rmtree(self.workingDirectory)
+
+    def writeShard(self, shardIndex, shardsCount, sentencesDict):
+        shardDirectory = "%s/shard%d" % (self.workingDirectory, shardIndex)
+        os.makedirs(shardDirectory)
+        with open(shardDirectory + os.sep + ImportDocumentTask.SHARDINFOFILENAME, 'w') as f:
+            json.dump({'shard': shardIndex, 'shards': shardsCount, 'documents': 1}, f)
+        for fileName, strContent in list(sentencesDict.items()):
+            with open(shardDirectory + os.sep + fileName, 'w') as f:
+                f.write(strContent)
+        return shardDirectory
+
+    def getMergeTask(self, shardDirectories):
+        strParameters = "%s=%s" % (MergeSentencesTask.SHARDDIRECTORIES,
+                                   ",".join(shardDirectories))
+        return MergeSentencesTask(TaskInfo(strParameters, self.workingDirectory,
+                                           self.workingDirectory))
+
+    ############
+    # Tests
+    #
+    def testAssignShards(self):
+        documentSizesList = [("doc%d" % i, (i * 37) % 101 + 1) for i in range(100)]
+        shardsDict = ImportDocumentTask.assignShards(documentSizesList, 4)
+
+        #Same assignment whatever the input order
+        self.assertEqual(shardsDict, ImportDocumentTask.assignShards(
+            list(reversed(documentSizesList)), 4))
+
+        loadsList = [0] * 4
+        for documentName, size in documentSizesList:
+            loadsList[shardsDict[documentName]] += size
+        self.assertTrue(max(loadsList) - min(loadsList) <= 101)
+
+        #Unknown sizes are spread
+        shardsDict = ImportDocumentTask.assignShards(
+            [("doc%d" % i, 0) for i in range(100)], 4)
+        self.assertEqual(4, len(set(shardsDict.values())))
+
+    def testParseShard(self):
+        task = ImportDocumentTask(TaskInfo("", self.workingDirectory,
+                                           self.workingDirectory))
+        self.assertEqual((1, 4), task._parseShard("1/4"))
+        for strShard in ["4/4", "-1/2", "1", "a/b"]:
+            with self.assertRaises(Exception):
+                task._parseShard(strShard)
+
+    def testMerge(self):
+        shard1 = self.writeShard(1, 2, {"sentences_fr.txt": "deux\n"})
+        shard0 = self.writeShard(0, 2, {"sentences_fr.txt": "un\n",
+                                        "sentences_de.txt": "eins\n"})
+
+        task = self.getMergeTask([shard1, shard0])
+        task.execute()
+        self.assertFalse(task.getResultErrorFlag())
+
+        with open(task.getOutputDirectory() + "/sentences_fr.txt") as f:
+            self.assertEqual("un\ndeux\n", f.read())
+        with open(task.getOutputDirectory() + "/sentences_de.txt") as f:
+            self.assertEqual("eins\n", f.read())
+
+    def testMissingShard(self):
+        shard0 = self.writeShard(0, 2, {"sentences_fr.txt": "un\n"})
+
+        task = self.getMergeTask([shard0])
+        task.execute()
+        self.assertTrue(task.getResultErrorFlag())
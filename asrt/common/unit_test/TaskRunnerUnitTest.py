@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import os
+scriptsDir = os.path.abspath(os.path.dirname(__file__))
+
+import json
+import shutil
+import unittest
+
+from asrt.common.MyFile import MyFile
+from asrt.common.tasks.AsrtTask import Task, TaskInfo
+from asrt.common.tasks.TaskRunner import TaskRunner
+from asrt.config.AsrtConfig import TEMPDIRUNITTEST
+
+
+class CopyListsTask(Task):
+    """Output the input lists unchanged.
+    """
+    def validateParameters(self):
+        return Task.validateParameters(self, [])
+
+    def prepareOutputData(self):
+        for fileName in MyFile.dirContent(self.getInputDirectory(), "*"):
+            baseName, extension = MyFile.removeExtension(fileName)
+            if extension == Task.INPUTLISTEXTENSION:
+                extension = Task.OUTPUTLISTEXTENSION
+            else:
+                extension = Task.OUTPUTMAPEXTENSION
+            shutil.copy(self.getInputDirectory() + os.sep + fileName,
+                        self.getOutputDirectory() + os.sep + baseName + extension)
+
+
+class FailingTask(CopyListsTask):
+    def doWork(self):
+        raise Exception("Failure")
+
+
+class TestTaskRunner(unittest.TestCase):
+    workingDirectory = os.path.abspath(TEMPDIRUNITTEST + "/taskrunner")
+    targetFolder1 = scriptsDir + "/resources/target-folder-1"
+
+    def setUp(self):
+        if os.path.exists(self.workingDirectory):
+            shutil.rmtree(self.workingDirectory)
+
+    def getRunner(self, taskClass=CopyListsTask):
+        runner = TaskRunner(maxWorkers=2)
+        runner.addTask(taskClass(TaskInfo("", self.workingDirectory,
+                                          self.targetFolder1)), name="first")
+        runner.addTask(CopyListsTask(TaskInfo("", self.workingDirectory,
+                                              self.targetFolder1)),
+                       ["first"], name="second")
+        runner.addTask(CopyListsTask(TaskInfo("", self.workingDirectory,
+                                              self.targetFolder1)),
+                       name="independent")
+        return runner
+
+    ############
+    # Tests
+    #
+    def testRun(self):
+        runner = self.getRunner()
+        self.assertTrue(runner.run())
+
+        for name in ["first", "second", "independent"]:
+            self.assertEqual(TaskRunner.SUCCESS, runner.getStatus(name))
+
+        #Output of 'first' is the target of 'second'
+        self.assertEqual(self.workingDirectory + "/first/output",
+                         runner.getTask("second").getTargetDirectory())
+        self.assertTrue(MyFile.checkFileExists(self.workingDirectory +
+                                               "/second/output/data.olist"))
+
+        reportFile = self.workingDirectory + "/report.json"
+        runner.writeReport(reportFile)
+        with open(reportFile) as inputFile:
+            report = json.load(inputFile)
+        self.assertEqual(["first"], report['tasks']['second']['dependencies'])
+
+    def testIncremental(self):
+        self.assertTrue(self.getRunner().run())
+
+        runner = self.getRunner()
+        self.assertTrue(runner.run())
+        for name in ["first", "second", "independent"]:
+            self.assertEqual(TaskRunner.UPTODATE, runner.getStatus(name))
+
+        #Changed parameters
+        runner = TaskRunner()
+        runner.addTask(CopyListsTask(TaskInfo("param=1", self.workingDirectory,
+                                              self.targetFolder1)), name="first")
+        self.assertTrue(runner.run())
+        self.assertEqual(TaskRunner.SUCCESS, runner.getStatus("first"))
+
+    def testMissingTarget(self):
+        #Never up to date, even without previous fingerprint
+        for i in range(2):
+            runner = TaskRunner()
+            runner.addTask(CopyListsTask(TaskInfo("", self.workingDirectory,
+                                                  "/nonexistent/target")), name="first")
+            self.assertFalse(runner.run())
+            self.assertEqual(TaskRunner.ERROR, runner.getStatus("first"))
+
+    def testFailure(self):
+        runner = self.getRunner(FailingTask)
+        self.assertFalse(runner.run())
+
+        self.assertEqual(TaskRunner.ERROR, runner.getStatus("first"))
+        self.assertEqual(TaskRunner.CANCELLED, runner.getStatus("second"))
+        self.assertEqual(TaskRunner.SUCCESS, runner.getStatus("independent"))
+
+    def testAddTask(self):
+        runner = TaskRunner()
+        task = CopyListsTask(TaskInfo("", self.workingDirectory, self.targetFolder1))
+
+        with self.assertRaises(Exception):
+            runner.addTask(task, ["unknown"])
+
+        runner.addTask(task, name="first")
+        with self.assertRaises(Exception):
+            runner.addTask(task, name="first")
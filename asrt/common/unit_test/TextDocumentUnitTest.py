@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+import sys
+import unittest
+import concurrent.futures
+
+from asrt.common.TextDocument import TextDocument
+from asrt.common.TextCluster import TextCluster
+from asrt.common.formula.FormulaRegularExpression import RegularExpressionFormula
+from asrt.config.AsrtConfig import FRENCH, GERMAN, ENGLISH
+
+
+class TestTextDocument(unittest.TestCase):
+
+    ############
+    # Tests
+    #
+    def testNormalizeTextSentences(self):
+        #The last rule merges sentences when joined
+        formula = RegularExpressionFormula(None, [("chat", "chien", "1", "1"),
+                                                  ("Katze", "Hund", "1", "2"),
+                                                  ("fin\n", "fin ", "1", "0")])
+        sentencesList = ["le chat %d fin" % i if i % 3 else "die Katze %d" % i
+                         for i in range(30)]
+
+        def normalize(workers, batchSize):
+            textDocument = TextDocument(None, FRENCH, formula, [], None, False, False)
+            textDocument.loadAsSentences("\n".join(sentencesList))
+            for textCluster in textDocument.listContent:
+                bGerman = textCluster.getTextSentence().startswith("die")
+                textCluster.setLanguage(GERMAN if bGerman else FRENCH)
+            textDocument.setParallelNormalization(workers, batchSize)
+            textDocument.normalizeTextSentences()
+            return [(c.getLanguageId(), c.getTextSentence()) for c in textDocument.listContent]
+
+        #Languages in order of first sentence
+        gtList = [(GERMAN, s.replace("Katze", "Hund")) for s in sentencesList if s.startswith("die")] + \
+                 [(FRENCH, s.replace("chat", "chien")) for s in sentencesList if s.startswith("le")]
+
+        for workers, batchSize in [(1, 0), (1, 1), (1, 40), (2, 1), (2, 40)]:
+            self.assertEqual(gtList, normalize(workers, batchSize))
+
+    def testStageThreads(self):
+        sentencesList = ["Le 3e prix (env. 1'200 CHF), p. ex. à l'HES-SO %d" % i if i % 3 == 0 else
+                         "Am 2. Mai kostet es z. B. 1'000.50 Fr. laut BAG %d" % i if i % 3 == 1 else
+                         "Mr. Smith paid $25 for the 21st A4 copy, etc. %d" % i
+                         for i in range(300)]
+        languagesList = [FRENCH, GERMAN, ENGLISH]
+
+        def prepare(threads):
+            textDocument = TextDocument(None, FRENCH, None, [], None, False, True)
+            textDocument.loadAsSentences("\n".join(sentencesList))
+            for i, textCluster in enumerate(textDocument.listContent):
+                textCluster.setLanguage(languagesList[i % 3])
+            textDocument.setStageThreads(threads)
+            textDocument.cleanTextSentences()
+            textDocument.prepareLM()
+            return [(c.getLanguageId(), c.getTextSentence()) for c in textDocument.listContent]
+
+        previousBatchSize = TextDocument.STAGEBATCHSIZE
+        previousSwitchInterval = sys.getswitchinterval()
+        try:
+            TextDocument.STAGEBATCHSIZE = 7
+            sys.setswitchinterval(1e-6)
+            threadsList = prepare(8)
+        finally:
+            sys.setswitchinterval(previousSwitchInterval)
+            TextDocument.STAGEBATCHSIZE = previousBatchSize
+
+        self.assertEqual(prepare(1), threadsList)
+
+    def testClusterIds(self):
+        textDocument = TextDocument(None, FRENCH, None, [], None, False, False)
+        previousSwitchInterval = sys.getswitchinterval()
+        try:
+            sys.setswitchinterval(1e-6)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+                clustersList = list(executor.map(lambda i: TextCluster(textDocument, str(i)),
+                                                 range(2000)))
+        finally:
+            sys.setswitchinterval(previousSwitchInterval)
+
+        self.assertEqual(2000, len(set([c.getKey() for c in clustersList])))
@@ -36,6 +36,7 @@ sys.path.append(scriptsDir + "/../../../")
 from asrt.common.ioread import Ioread
 from asrt.config.AsrtConfig import FRENCH
 from asrt.common.formula.FormulaRegularExpression import RegularExpressionFormula
+from asrt.common.RegularExpressionBundle import RegexBundle
 from asrt.common.LoggingSetup import setupLogging
 
 ################
@@ -47,9 +48,12 @@ def applyRegexes(inputFile, outputFile, regularFile):
        params: - inputFile   : a text file in 'utf-8' encoding
                - outputFile  : the result text file in 'utf-8' encoding
                - regularFile : the file containing the regular expressions
-                               to apply.
+                               to apply or its compiled bundle.
     """
-    regexFormula = RegularExpressionFormula(rulesFile=regularFile)
+    regexBundle = RegexBundle.load(regularFile)
+    regexFormula = RegularExpressionFormula(None,
+        [r for r in regexBundle.getRegexList() if int(r[2]) != -1])
+    regexFormula.setRules(regexBundle.getRules())
 
     io = Ioread()
     fd = io.openFile(inputFile)
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+usage = """
+    Performance benchmarks, results are output as json.
+"""
+
+import sys
+import os
+
+scriptsDir = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(scriptsDir + "/../../../")
+sys.path.append(scriptsDir + "/../../lib/num2words")
+
+import json
+import logging
+import argparse
+
+from asrt.common.LoggingSetup import setupLogging
+from asrt.common.TextDocument import TextDocument
+from asrt.benchmark.IoreadBenchmark import IoreadBenchmark
+from asrt.benchmark.SegmenterBenchmark import SegmenterBenchmark
+from asrt.benchmark.LMPreparationBenchmark import LMPreparationBenchmark
+from asrt.benchmark.NormalizationBenchmark import NormalizationBenchmark
+from asrt.benchmark.ClassifierBenchmark import ClassifierBenchmark
+from asrt.benchmark.LanguageIdBenchmark import LanguageIdBenchmark
+from asrt.benchmark.TrainingBenchmark import TrainingBenchmark
+from asrt.benchmark.ModelSharingBenchmark import ModelSharingBenchmark
+from asrt.benchmark.RegexLoadBenchmark import RegexLoadBenchmark
+from asrt.benchmark.RegexBackendBenchmark import RegexBackendBenchmark
+
+
+def runIoread(args):
+    """Peak RSS of the 'Ioread' readers.
+    """
+    benchmark = IoreadBenchmark(args.inputFile[0])
+    if args.generate is not None:
+        benchmark.generate(args.generate)
+
+    return benchmark.run(args.readers)
+
+
+def runSegmenter(args):
+    """Throughput of the sentence segmenters and agreement
+       with punkt on the input files.
+    """
+    benchmark = SegmenterBenchmark(args.inputFile, int(args.language[0]))
+    return benchmark.run(args.segmenters)
+
+
+def runLMPreparation(args):
+    """Sentences per second of the language modeling
+       preparation, one sentence per line in the input files.
+    """
+    benchmark = LMPreparationBenchmark(args.inputFile, int(args.language[0]))
+    return benchmark.run()
+
+
+def runNormalization(args):
+    """Peak RSS and throughput of the user regular expressions
+       stage, one sentence per line in the input files.
+    """
+    if args.regexFile is None:
+        raise Exception("A regular expressions file is needed (-r)")
+
+    benchmark = NormalizationBenchmark(args.inputFile, args.regexFile)
+    return benchmark.run(args.normworkers, args.normbatchsize)
+
+
+def runClassifier(args):
+    """Throughput of the language classifier with early
+       stopping and a words budget, one sentence per line
+       in the input files.
+    """
+    benchmark = ClassifierBenchmark(args.inputFile, maxWords=args.maxwords)
+    return benchmark.run()
+
+
+#Input of the training and languageid benchmarks for europarl_raw
+TRAININGEUROPARL = 'europarl'
+
+
+def runLanguageId(args):
+    """Per language precision and recall, unknown rate,
+       throughput and load time of language classifiers, on
+       held out europarl_raw files with '-i europarl' and on
+       labelled input files.
+    """
+    filePathsList = [f for f in args.inputFile if f != TRAININGEUROPARL]
+    benchmark = LanguageIdBenchmark(filePathsList, europarl=TRAININGEUROPARL in args.inputFile,
+                                    trainFilePathsList=args.trainFile,
+                                    heldOutEvery=args.heldout, maxSentences=args.maxsentences,
+                                    maxWords=args.maxwords, wordModelFile=args.wordmodel,
+                                    ngramModelFile=args.ngrammodel, workers=args.trainworkers)
+    return benchmark.run(args.classifiers)
+
+
+def runTraining(args):
+    """Duration and peak memory of the words classifier
+       training, on the labelled input files or on
+       europarl_raw with '-i europarl'.
+    """
+    filePathsList = [f for f in args.inputFile if f != TRAININGEUROPARL]
+    benchmark = TrainingBenchmark(filePathsList)
+    return benchmark.run(args.trainworkers)
+
+
+def runModelSharing(args):
+    """Memory of worker processes sharing the words
+       classifier model, trained on the labelled input files.
+    """
+    benchmark = ModelSharingBenchmark(args.inputFile)
+    return benchmark.run(args.trainworkers)
+
+
+def runRegexLoad(args):
+    """Load time of the user regular expressions from the
+       csv file and from its compiled bundle, one sentence
+       per line in the input files.
+    """
+    if args.regexFile is None:
+        raise Exception("A regular expressions file is needed (-r)")
+
+    benchmark = RegexLoadBenchmark(args.inputFile, args.regexFile, int(args.language[0]) or 1)
+    if args.generaterules is not None:
+        benchmark.generate(args.generaterules)
+
+    return benchmark.run()
+
+
+def runRegexBackend(args):
+    """Throughput of the regular expressions backends on
+       the user rules and the lm preparation, and duration
+       of an adversarial line.
+    """
+    benchmark = RegexBackendBenchmark(args.inputFile, args.regexFile,
+                                      int(args.language[0]) or 1, args.adversarial)
+    return benchmark.run(args.backends)
+
+
+BENCHMARKS = {'ioread': runIoread, 'segmenter': runSegmenter,
+              'lmpreparation': runLMPreparation, 'normalization': runNormalization,
+              'classifier': runClassifier, 'languageid': runLanguageId,
+              'training': runTraining, 'modelsharing': runModelSharing,
+              'regexload': runRegexLoad, 'regexbackend': runRegexBackend}
+
+
+####################
+# Main
+#
+if __name__ == "__main__":
+    # Setup parser
+    parser = argparse.ArgumentParser(description=usage)
+    parser.add_argument("benchmark", help="benchmark to run",
+                        choices=sorted(BENCHMARKS.keys()))
+    parser.add_argument("-i", "--input", help="input files, only the first one for ioread",
+                        nargs='+', dest="inputFile", required=True)
+    parser.add_argument("-o", "--output", help="json output file, default to stdout",
+                        nargs=1, dest="outputFile", default=[None])
+    parser.add_argument("--history", help="also append the results as one json line to this file",
+                        dest="historyFile", default=None)
+    parser.add_argument("--generate", help="first generate an input file of this size in bytes",
+                        dest="generate", type=int, default=None)
+    parser.add_argument("--readers", help="ioread readers to measure",
+                        nargs='+', dest="readers",
+                        choices=sorted(IoreadBenchmark.READERS.keys()), default=None)
+    parser.add_argument("--segmenters", help="sentence segmenters to measure",
+                        nargs='+', dest="segmenters",
+                        choices=TextDocument.SEGMENTERS, default=None)
+    parser.add_argument("-r", "--regex", help="regular expressions file for normalization and regexload",
+                        dest="regexFile", default=None)
+    parser.add_argument("--generaterules", help="first generate a regular expressions file " +
+                        "with this number of rules for regexload", dest="generaterules",
+                        type=int, default=None)
+    parser.add_argument("--backends", help="regular expressions backends to measure",
+                        nargs='+', dest="backends",
+                        choices=RegexBackendBenchmark.CONFIGURATIONS, default=None)
+    parser.add_argument("--adversarial", help="characters of the regexbackend adversarial line, 0 to disable",
+                        dest="adversarial", type=int, default=20000)
+    parser.add_argument("--normworkers", help="normalization processes of the parallel configuration",
+                        dest="normworkers", type=int, default=2)
+    parser.add_argument("--normbatchsize", help="size in characters of the normalization batches",
+                        dest="normbatchsize", type=int, default=None)
+    parser.add_argument("--maxwords", help="words budget per sentence of the classifier",
+                        dest="maxwords", type=int, default=10)
+    parser.add_argument("--classifiers", help="language classifiers to measure",
+                        nargs='+', dest="classifiers",
+                        choices=LanguageIdBenchmark.CONFIGURATIONS, default=None)
+    parser.add_argument("--train", help="labelled training files of languageid, europarl otherwise",
+                        nargs='+', dest="trainFile", default=None)
+    parser.add_argument("--heldout", help="one europarl file in this number is held out for languageid",
+                        dest="heldout", type=int, default=10)
+    parser.add_argument("--maxsentences", help="languageid test sentences per label and input",
+                        dest="maxsentences", type=int, default=None)
+    parser.add_argument("--wordmodel", help="words model file or model store, trained otherwise",
+                        dest="wordmodel", default=None)
+    parser.add_argument("--ngrammodel", help="character n-grams model file, trained otherwise",
+                        dest="ngrammodel", default=None)
+    parser.add_argument("--trainworkers", help="processes of the training parallel configuration and of modelsharing",
+                        dest="trainworkers", type=int, default=4)
+    parser.add_argument("-l", "--language", help="language of the segmenter and lmpreparation corpus " +
+                        "(0=unk,1=fr,2=ge,3=en,4=it)", nargs=1, dest="language", default=[0])
+
+    # Parse arguments
+    args = parser.parse_args()
+
+    setupLogging(logging.INFO)
+
+    results = BENCHMARKS[args.benchmark](args)
+
+    strResults = json.dumps(results, indent=2, sort_keys=True)
+    if args.outputFile[0] is None:
+        print(strResults)
+    else:
+        with open(args.outputFile[0], 'w') as outputFile:
+            outputFile.write(strResults + "\n")
+
+    if args.historyFile is not None:
+        with open(args.historyFile, 'a') as historyFile:
+            historyFile.write(json.dumps({'benchmark': args.benchmark, 'results': results},
+                                         sort_keys=True) + "\n")
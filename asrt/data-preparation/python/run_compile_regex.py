@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+usage = """
+    Validate a regular expressions file and save its
+    bundle, used instead of the file until it changes.
+"""
+
+import sys
+import os
+
+scriptsDir = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(scriptsDir + "/../../../")
+sys.path.append(scriptsDir + "/../../lib/num2words")
+
+import logging
+import argparse
+
+from asrt.common.LoggingSetup import setupLogging
+from asrt.common.RegularExpressionBundle import RegexBundle
+
+
+####################
+# Main
+#
+if __name__ == "__main__":
+    # Setup parser
+    parser = argparse.ArgumentParser(description=usage)
+    parser.add_argument("-r", "--regex", help="regular expressions file",
+                        nargs=1, dest="regexFile", required=True)
+    parser.add_argument("-o", "--output", help="bundle file, default to the regular " +
+                        "expressions file with a .bundle extension", nargs=1,
+                        dest="bundleFile", default=[None])
+
+    # Parse arguments
+    args = parser.parse_args()
+
+    setupLogging(logging.INFO)
+
+    try:
+        RegexBundle.compile(args.regexFile[0], args.bundleFile[0])
+    except Exception as e:
+        print(str(e))
+        sys.exit(1)
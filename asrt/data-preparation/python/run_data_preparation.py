@@ -36,7 +36,13 @@ import logging
 import argparse
 
 from asrt.common.DataPreparationAPI import DataPreparationAPI
+from asrt.common.TextDocument import TextDocument
 from asrt.common.LoggingSetup import setupLogging
+from asrt.common.SentenceDeduplicator import SentenceDeduplicator, MinHashLSH
+from asrt.common.WordCache import WordCache
+from asrt.common.RegularExpressionProfiler import RegexProfiler
+from asrt.common.RegularExpressionBackend import RegexEngine
+from asrt.common.SentenceWriter import LanguageStreamWriter
 
 ####################
 # Main
@@ -62,10 +68,60 @@ if __name__ == "__main__":
                         dest="vbpunct", action="store_true")
     parser.add_argument("-s", "--rawseg", help="do not segment sentences with NLTK",
                         dest="rawseg", action="store_true")
+    parser.add_argument("--segmenter", help="sentence segmentation engine, ignored with -s",
+                        dest="segmenter", choices=TextDocument.SEGMENTERS,
+                        default=TextDocument.SEGMENTERPUNKT)
+    parser.add_argument("--segworkers", help="segment large documents in chunks with this number of processes",
+                        dest="segworkers", type=int, default=1)
+    parser.add_argument("--segchunksize", help="size in characters of the segmentation chunks",
+                        dest="segchunksize", type=int, default=None)
+    parser.add_argument("--normworkers", help="apply the regular expressions of all languages with this number of processes",
+                        dest="normworkers", type=int, default=1)
+    parser.add_argument("--normbatchsize", help="size in characters of the regular expressions batches, 0 for one batch per language",
+                        dest="normbatchsize", type=int, default=None)
+    parser.add_argument("--threads", help="run the per sentence stages with this number of threads",
+                        dest="threads", type=int, default=1)
+    parser.add_argument("--earlystop", help="stop classifying the words of a sentence once its language is settled",
+                        dest="earlystop", action="store_true")
+    parser.add_argument("--maxwords", help="classify at most this number of words per sentence",
+                        dest="maxwords", type=int, default=None)
+    parser.add_argument("--classification", help="classify each sentence or first estimate the document language",
+                        dest="classification", choices=TextDocument.CLASSIFICATIONMODES,
+                        default=TextDocument.CLASSIFYSENTENCES)
+    parser.add_argument("--ngrammodel", help="classify languages with this character n-grams model file",
+                        dest="ngrammodel", default=None)
+    parser.add_argument("--wordmodel", help="map this words classifier model file or model store directory instead of training",
+                        dest="wordmodel", default=None)
     parser.add_argument(
         "-m", "--lm", help="prepare for lm modeling", dest="lm", action="store_true")
     parser.add_argument(
         "-t", "--split", help="Split words with numbers", dest="split", action="store_true")
+    parser.add_argument("--dedup", help="remove duplicated sentences",
+                        dest="dedup", choices=SentenceDeduplicator.MODES, default=None)
+    parser.add_argument("--neardup", help="also remove near duplicated sentences (with --dedup)",
+                        dest="neardup", action="store_true")
+    parser.add_argument("--nearthreshold", help="estimated Jaccard similarity of near duplicates (with --neardup)",
+                        dest="nearthreshold", type=float, default=MinHashLSH.THRESHOLD)
+    parser.add_argument("--wordcache", help="words per stage and language in the normalization cache, 0 to disable",
+                        dest="wordcache", type=int, default=WordCache.DEFAULTSIZE)
+    parser.add_argument("--abbreviations", help="user abbreviations files (tab separated: abbreviation, expansion, language id)",
+                        nargs='+', dest="abbreviations", default=[])
+    parser.add_argument("--regexprofile", help="profile the user regular expressions into this json file, see run_regex_report.py",
+                        dest="regexprofile", default=None)
+    parser.add_argument("--regexbackend", help="regular expressions engine, patterns it does not support use re",
+                        dest="regexbackend", choices=RegexEngine.getBackendNames(),
+                        default=RegexEngine.DEFAULT)
+    parser.add_argument("--sentencebudget", help="seconds a sentence may spend in a stage before being quarantined",
+                        dest="sentencebudget", type=float, default=None)
+    parser.add_argument("--documentbudget", help="seconds for the whole document, the next sentences are quarantined",
+                        dest="documentbudget", type=float, default=None)
+    parser.add_argument("--quarantine", help="file of the sentences over budget, default to quarantine.txt in the output directory",
+                        dest="quarantine", default=None)
+    parser.add_argument("--compress", help="compress the language files",
+                        dest="compress", choices=list(LanguageStreamWriter.COMPRESSIONS.keys()),
+                        default=None)
+    parser.add_argument("--shardsize", help="maximum size in bytes of the language files",
+                        dest="shardsize", type=int, default=None)
     parser.add_argument(
         "-d", "--debug", help="enable debug output", dest="debug", action="store_true")
 
@@ -97,8 +153,31 @@ if __name__ == "__main__":
     api.setRemovePunctuation(removePunctuation)
     api.setVerbalizePunctuation(verbalizePunctuation)
     api.setSegmentWithNLTK(not rawSeg)
+    api.setSegmenter(args.segmenter)
+    api.setParallelSegmentation(args.segworkers, args.segchunksize)
+    api.setParallelNormalization(args.normworkers, args.normbatchsize)
+    api.setStageThreads(args.threads)
+    api.setClassifierBudget(args.earlystop, args.maxwords)
+    api.setClassificationMode(args.classification)
+    api.setClassifierModel(args.ngrammodel)
+    api.setWordClassifierModel(args.wordmodel)
 
     api.setExpandNumberInWords(expandNumberInWords)
+    api.setWordCacheSize(args.wordcache)
+    api.setAbbreviationFiles(args.abbreviations)
+
+    if args.regexprofile is not None:
+        api.setRegexProfiler(RegexProfiler())
+    api.setRegexBackend(args.regexbackend)
+    api.setTimeBudget(args.sentencebudget, args.documentbudget,
+                      args.quarantine or os.path.join(outputDir, "quarantine.txt"))
+
+    if args.dedup is not None:
+        api.setDeduplicator(SentenceDeduplicator(args.dedup, args.neardup,
+                                                 nearThreshold=args.nearthreshold))
+
+    api.setOutputCompression(args.compress)
+    api.setOutputShardSize(args.shardsize)
 
     if language == 0:
         api.trainClassifier()
@@ -106,3 +185,15 @@ if __name__ == "__main__":
     # Main processing
     api.prepareDocument(language)
     api.outputSentencesToFiles(outputDir)
+
+    if api.getDeduplicator() is not None:
+        logging.getLogger("Asrt").info(api.getDeduplicator().getReport())
+    if api.getWordCache() is not None:
+        logging.getLogger("Asrt").info(api.getWordCache().getReport())
+    if api.getRegexBackend() != RegexEngine.DEFAULT:
+        logging.getLogger("Asrt").info(api.getRegexEngine().getReport())
+    if api.getWatchdog() is not None:
+        logging.getLogger("Asrt").info(api.getWatchdog().getReport())
+    if api.getRegexProfiler() is not None:
+        api.getRegexProfiler().save(args.regexprofile)
+        logging.getLogger("Asrt").info(api.getRegexProfiler().getReport())
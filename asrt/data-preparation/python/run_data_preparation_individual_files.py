@@ -36,7 +36,10 @@ import logging
 import argparse
 
 from asrt.common.DataPreparationAPI import DataPreparationAPI
+from asrt.common.TextDocument import TextDocument
 from asrt.common.LoggingSetup import setupLogging
+from asrt.common.SentenceDeduplicator import SentenceDeduplicator, MinHashLSH
+from asrt.common.WordCache import WordCache
 from asrt.common.ioread import Ioread
 from asrt.common.MyFile import MyFile
 
@@ -64,10 +67,23 @@ if __name__ == "__main__":
                         dest="vbpunct", action="store_true")
     parser.add_argument("-s", "--rawseg", help="do not segment sentences with NLTK",
                         dest="rawseg", action="store_true")
+    parser.add_argument("--segmenter", help="sentence segmentation engine, ignored with -s",
+                        dest="segmenter", choices=TextDocument.SEGMENTERS,
+                        default=TextDocument.SEGMENTERPUNKT)
     parser.add_argument(
         "-m", "--lm", help="prepare for lm modeling", dest="lm", action="store_true")
     parser.add_argument(
         "-t", "--trim", help="remove special characters in words", dest="trim", action="store_true")
+    parser.add_argument("--dedup", help="remove duplicated sentences",
+                        dest="dedup", choices=SentenceDeduplicator.MODES, default=None)
+    parser.add_argument("--neardup", help="also remove near duplicated sentences (with --dedup)",
+                        dest="neardup", action="store_true")
+    parser.add_argument("--nearthreshold", help="estimated Jaccard similarity of near duplicates (with --neardup)",
+                        dest="nearthreshold", type=float, default=MinHashLSH.THRESHOLD)
+    parser.add_argument("--wordcache", help="words per stage and language in the normalization cache, 0 to disable",
+                        dest="wordcache", type=int, default=WordCache.DEFAULTSIZE)
+    parser.add_argument("--abbreviations", help="user abbreviations files (tab separated: abbreviation, expansion, language id)",
+                        nargs='+', dest="abbreviations", default=[])
     parser.add_argument(
         "-d", "--debug", help="enable debug output", dest="debug", action="store_true")
 
@@ -99,7 +115,14 @@ if __name__ == "__main__":
     api.setRemovePunctuation(removePunctuation)
     api.setVerbalizePunctuation(verbalizePunctuation)
     api.setSegmentWithNLTK(not rawSeg)
+    api.setSegmenter(args.segmenter)
     api.setExpandNumberInWords(expandNumberInWords)
+    api.setWordCacheSize(args.wordcache)
+    api.setAbbreviationFiles(args.abbreviations)
+
+    if args.dedup is not None:
+        api.setDeduplicator(SentenceDeduplicator(args.dedup, args.neardup,
+                                                 nearThreshold=args.nearthreshold))
 
     if language == 0:
         api.trainClassifier()
@@ -118,3 +141,8 @@ if __name__ == "__main__":
         outputFile = "%s/%s.lab" % (outputDir,
                                     os.path.splitext(os.path.basename(f))[0])
         io.writeFileContent(outputFile, strUnformatted + "\n")
+
+    if api.getDeduplicator() is not None:
+        logging.getLogger("Asrt").info(api.getDeduplicator().getReport())
+    if api.getWordCache() is not None:
+        logging.getLogger("Asrt").info(api.getWordCache().getReport())
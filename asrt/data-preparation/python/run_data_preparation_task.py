@@ -38,7 +38,12 @@ import argparse
 
 from asrt.common.tasks.AsrtTask import TaskInfo
 from asrt.common.tasks.TaskImportDocument import ImportDocumentTask
+from asrt.common.TextDocument import TextDocument
 from asrt.common.LoggingSetup import setupLogging
+from asrt.common.SentenceDeduplicator import SentenceDeduplicator, MinHashLSH
+from asrt.common.WordCache import WordCache
+from asrt.common.RegularExpressionBackend import RegexEngine
+from asrt.common.SentenceWriter import LanguageStreamWriter
 
 
 STRPARAMETERS = "regexfile=%s;debug=%s;removePunctuation=%s;verbalizePunctuation=%s;" + \
@@ -67,8 +72,60 @@ if __name__ == "__main__":
                         help="verbalize punctuation", action="store_true")
     parser.add_argument("-s", "--rawseg", help="do not segment sentences with NLTK",
                         dest="rawseg", action="store_true")
+    parser.add_argument("--segmenter", help="sentence segmentation engine, ignored with -s",
+                        dest="segmenter", choices=TextDocument.SEGMENTERS,
+                        default=TextDocument.SEGMENTERPUNKT)
+    parser.add_argument("--segworkers", help="segment large documents in chunks with this number of processes",
+                        dest="segworkers", type=int, default=1)
+    parser.add_argument("--segchunksize", help="size in characters of the segmentation chunks",
+                        dest="segchunksize", type=int, default=None)
+    parser.add_argument("--normworkers", help="apply the regular expressions of all languages with this number of processes",
+                        dest="normworkers", type=int, default=1)
+    parser.add_argument("--normbatchsize", help="size in characters of the regular expressions batches, 0 for one batch per language",
+                        dest="normbatchsize", type=int, default=None)
+    parser.add_argument("--threads", help="run the per sentence stages with this number of threads",
+                        dest="threads", type=int, default=1)
+    parser.add_argument("--earlystop", help="stop classifying the words of a sentence once its language is settled",
+                        dest="earlystop", action="store_true")
+    parser.add_argument("--maxwords", help="classify at most this number of words per sentence",
+                        dest="maxwords", type=int, default=None)
+    parser.add_argument("--classification", help="classify each sentence or first estimate the document language",
+                        dest="classification", choices=TextDocument.CLASSIFICATIONMODES,
+                        default=TextDocument.CLASSIFYSENTENCES)
+    parser.add_argument("--ngrammodel", help="classify languages with this character n-grams model file",
+                        dest="ngrammodel", default=None)
+    parser.add_argument("--wordmodel", help="map this words classifier model file or model store directory instead of training",
+                        dest="wordmodel", default=None)
     parser.add_argument(
         "-m", "--lm", help="prepare for lm modeling", dest="lm", action="store_true")
+    parser.add_argument("--dedup", help="remove duplicated sentences across documents",
+                        dest="dedup", choices=SentenceDeduplicator.MODES, default=None)
+    parser.add_argument("--neardup", help="also remove near duplicated sentences (with --dedup)",
+                        dest="neardup", action="store_true")
+    parser.add_argument("--nearthreshold", help="estimated Jaccard similarity of near duplicates (with --neardup)",
+                        dest="nearthreshold", type=float, default=MinHashLSH.THRESHOLD)
+    parser.add_argument("--wordcache", help="words per stage and language in the normalization cache, 0 to disable",
+                        dest="wordcache", type=int, default=WordCache.DEFAULTSIZE)
+    parser.add_argument("--abbreviations", help="user abbreviations files (tab separated: abbreviation, expansion, language id)",
+                        nargs='+', dest="abbreviations", default=[])
+    parser.add_argument("--regexprofile", help="profile the user regular expressions into regex_profile.json, see run_regex_report.py",
+                        dest="regexprofile", action="store_true")
+    parser.add_argument("--regexbackend", help="regular expressions engine, patterns it does not support use re",
+                        dest="regexbackend", choices=RegexEngine.getBackendNames(),
+                        default=RegexEngine.DEFAULT)
+    parser.add_argument("--sentencebudget", help="seconds a sentence may spend in a stage before being quarantined",
+                        dest="sentencebudget", type=float, default=None)
+    parser.add_argument("--documentbudget", help="seconds per document, the next sentences are quarantined",
+                        dest="documentbudget", type=float, default=None)
+    parser.add_argument("--compress", help="compress the language files",
+                        dest="compress", choices=list(LanguageStreamWriter.COMPRESSIONS.keys()),
+                        default=None)
+    parser.add_argument("--shard", help="only process shard i of N, i.e. 0/4",
+                        dest="shard", default=None)
+    parser.add_argument("--indexed", help="read data lists and maps through an on disk index",
+                        dest="indexed", action="store_true")
+    parser.add_argument("--shardsize", help="maximum size in bytes of the language files",
+                        dest="shardsize", type=int, default=None)
 
     # Parse arguments
     args = parser.parse_args()
@@ -78,10 +135,57 @@ if __name__ == "__main__":
 
     segmentWithNLTK = "True" if not args.rawseg else "False"
 
+    strParameters = STRPARAMETERS % (regexFile, str(args.debug),
+                                     args.rmpunctuation, args.vbpunctuation,
+                                     segmentWithNLTK, args.filter, args.lm)
+    if args.dedup is not None:
+        strParameters += ";deduplicate=%s;nearDuplicates=%s;nearThreshold=%s" % \
+            (args.dedup, args.neardup, args.nearthreshold)
+    if args.compress is not None:
+        strParameters += ";outputCompression=%s" % args.compress
+    if args.shardsize is not None:
+        strParameters += ";outputShardSize=%d" % args.shardsize
+    if args.indexed:
+        strParameters += ";indexedLists=True"
+    if args.shard is not None:
+        strParameters += ";shard=%s" % args.shard
+    if args.wordcache != WordCache.DEFAULTSIZE:
+        strParameters += ";wordCacheSize=%d" % args.wordcache
+    if args.regexprofile:
+        strParameters += ";regexProfile=True"
+    if args.regexbackend != RegexEngine.DEFAULT:
+        strParameters += ";regexBackend=%s" % args.regexbackend
+    if args.sentencebudget is not None:
+        strParameters += ";sentenceBudget=%s" % args.sentencebudget
+    if args.documentbudget is not None:
+        strParameters += ";documentBudget=%s" % args.documentbudget
+    if len(args.abbreviations) > 0:
+        strParameters += ";abbreviationFiles=%s" % ",".join(
+            [os.path.abspath(f) for f in args.abbreviations])
+    if args.segmenter != TextDocument.SEGMENTERPUNKT:
+        strParameters += ";segmenter=%s" % args.segmenter
+    if args.segworkers > 1:
+        strParameters += ";segmentationWorkers=%d" % args.segworkers
+    if args.segchunksize is not None:
+        strParameters += ";segmentationChunkSize=%d" % args.segchunksize
+    if args.normworkers > 1:
+        strParameters += ";normalizationWorkers=%d" % args.normworkers
+    if args.normbatchsize is not None:
+        strParameters += ";normalizationBatchSize=%d" % args.normbatchsize
+    if args.threads > 1:
+        strParameters += ";stageThreads=%d" % args.threads
+    if args.earlystop:
+        strParameters += ";classifierEarlyStopping=True"
+    if args.maxwords is not None:
+        strParameters += ";classifierMaxWords=%d" % args.maxwords
+    if args.classification != TextDocument.CLASSIFYSENTENCES:
+        strParameters += ";classificationMode=%s" % args.classification
+    if args.ngrammodel is not None:
+        strParameters += ";classifierModel=%s" % args.ngrammodel
+    if args.wordmodel is not None:
+        strParameters += ";wordClassifierModel=%s" % args.wordmodel
+
     setupLogging(logging.INFO, outputDir + "/task_log.txt")
 
-    task = ImportDocumentTask(TaskInfo(STRPARAMETERS % (regexFile, str(args.debug),
-                                                        args.rmpunctuation, args.vbpunctuation,
-                                                        segmentWithNLTK, args.filter, args.lm),
-                                       outputDir, targetDir))
+    task = ImportDocumentTask(TaskInfo(strParameters, outputDir, targetDir))
     task.execute()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+usage = """
+    Train the words language classifier and export its
+    model as a flat file, mapped in memory with --wordmodel.
+"""
+
+import sys
+import os
+
+scriptsDir = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(scriptsDir + "/../../../")
+sys.path.append(scriptsDir + "/../../lib/num2words")
+
+import logging
+import argparse
+
+from asrt.common.LoggingSetup import setupLogging
+from asrt.common.ClassifierWord import WordClassifier
+
+
+####################
+# Main
+#
+if __name__ == "__main__":
+    # Setup parser
+    parser = argparse.ArgumentParser(description=usage)
+    parser.add_argument("-o", "--output", help="model file",
+                        nargs=1, dest="modelFile", required=True)
+    parser.add_argument("-i", "--input", help="labelled sentences files (label<tab>sentence), " +
+                        "default to europarl_raw", nargs='+', dest="inputFile", default=None)
+    parser.add_argument("-w", "--workers", help="training processes",
+                        dest="workers", type=int, default=4)
+
+    # Parse arguments
+    args = parser.parse_args()
+
+    setupLogging(logging.INFO)
+
+    classifier = WordClassifier()
+    if args.inputFile is None:
+        classifier.train(args.workers)
+    else:
+        classifier.trainFromSources(WordClassifier.readLabelledSources(args.inputFile),
+                                    args.workers)
+        # Uniform priors, as with europarl_raw
+        classifier.setUniformPriors()
+
+    classifier.exportModel(args.modelFile[0])
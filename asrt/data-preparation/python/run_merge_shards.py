@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+usage = """
+    Merge the language files of the shards of a
+    run_data_preparation_task.py --shard i/N import.
+"""
+
+import sys
+import os
+
+scriptsDir = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(scriptsDir + "/../../../")
+sys.path.append(scriptsDir + "/../../lib/num2words")
+
+import logging
+import argparse
+
+from asrt.common.tasks.AsrtTask import TaskInfo
+from asrt.common.tasks.TaskMergeSentences import MergeSentencesTask
+from asrt.common.LoggingSetup import setupLogging
+
+
+####################
+# Main
+#
+if __name__ == "__main__":
+    # Setup parser
+    parser = argparse.ArgumentParser(description=usage)
+    parser.add_argument("-s", "--shards", help="output directories of the shards",
+                        nargs='+', dest="shardDirs", required=True)
+    parser.add_argument("-o", "--output", help="output directory",
+                        nargs=1, dest="outputDir", required=True)
+
+    # Parse arguments
+    args = parser.parse_args()
+    outputDir = args.outputDir[0]
+    shardDirs = [os.path.abspath(d) for d in args.shardDirs]
+
+    strParameters = "%s=%s" % (MergeSentencesTask.SHARDDIRECTORIES,
+                               MergeSentencesTask.DIRECTORYSEPARATOR.join(shardDirs))
+
+    setupLogging(logging.INFO, outputDir + "/task_log.txt")
+
+    task = MergeSentencesTask(TaskInfo(strParameters, outputDir, outputDir))
+    task.execute()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+usage = """
+    Report the hottest, dead and backtracking suspect
+    regular expressions of merged profiles, written by
+    run_test_regex.py or run_data_preparation.py.
+"""
+
+import sys
+import os
+
+scriptsDir = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(scriptsDir + "/../../../")
+
+import argparse
+
+from asrt.common.RegularExpressionProfiler import RegexProfiler
+
+
+####################
+# Main
+#
+if __name__ == "__main__":
+    # Setup parser
+    parser = argparse.ArgumentParser(description=usage)
+    parser.add_argument("-p", "--profiles", help="profile files, merged",
+                        nargs='+', dest="profileFiles", required=True)
+    parser.add_argument("-n", "--count", help="rules per section",
+                        dest="count", type=int, default=20)
+    parser.add_argument("-o", "--output", help="also save the merged profile to this file",
+                        nargs=1, dest="outputFile", default=None)
+
+    # Parse arguments
+    args = parser.parse_args()
+
+    profiler = RegexProfiler.load(args.profileFiles)
+    if args.outputFile is not None:
+        profiler.save(args.outputFile[0])
+
+    print(profiler.getReport(args.count))
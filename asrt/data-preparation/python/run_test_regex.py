@@ -36,6 +36,9 @@ sys.path.append(scriptsDir + "/../../lib/num2words")
 
 from asrt.common.LoggingSetup import setupLogging
 from asrt.common.formula.FormulaRegularExpression import RegexList, RegularExpressionFormula
+from asrt.common.RegularExpressionBundle import RegexBundle
+from asrt.common.RegularExpressionProfiler import RegexProfiler
+from asrt.common.ioread import Ioread
 
 #######################################
 # main
@@ -47,10 +50,14 @@ if __name__ == "__main__":
                         nargs=1, dest="regexFile", required=True)
     parser.add_argument("-i", "--input", help="input text",
                         nargs=1, dest="inputText", default=[""])
+    parser.add_argument("-f", "--file", help="input text file, one sentence per line",
+                        nargs=1, dest="inputFile", default=None)
     parser.add_argument("-l", "--language", help="language (0=unk,1=fr,2=ge,3=en,4=it)",
                         nargs=1, dest="language", default=[0])
     parser.add_argument("-s", "--display", help="display regular expressions",
                         dest="display", action="store_true")
+    parser.add_argument("-p", "--profile", help="profile the regular expressions into this json file, see run_regex_report.py",
+                        nargs=1, dest="profileFile", default=None)
     parser.add_argument(
         "-d", "--debug", help="enable debug output", dest="debug", action="store_true")
 
@@ -66,16 +73,29 @@ if __name__ == "__main__":
 
     setupLogging(logging.INFO)
 
+    regexBundle = RegexBundle.load(regexFile)
     substitutionPatternList = []
-    for line in RegexList.loadFromFile(regexFile):
+    for line in regexBundle.getRegexList():
         if int(line[RegexList.TYPEINDICE]) != -1:
             substitutionPatternList.append(line)
 
     f = RegularExpressionFormula(None, substitutionPatternList)
+    f.setRules(regexBundle.getRules())
 
     if display:
         f.displayPatterns(languageId)
 
-    result = f.apply(inputText, languageId, debug)
+    if args.profileFile is not None:
+        f.setProfiler(RegexProfiler())
 
-    print(("Result --------------\n", result.encode('utf-8'), "\n---------------------"))
+    if args.inputFile is not None:
+        for strLine in Ioread().iterLines(args.inputFile[0]):
+            print(f.apply(strLine.strip(), languageId, debug))
+    else:
+        result = f.apply(inputText, languageId, debug)
+
+        print(("Result --------------\n", result.encode('utf-8'), "\n---------------------"))
+
+    if args.profileFile is not None:
+        f.getProfiler().save(args.profileFile[0])
+        print(f.getProfiler().getReport())
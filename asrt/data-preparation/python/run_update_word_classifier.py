@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# This file is part of asrt.
+
+# asrt is free software: you can redistribute it and/or modify
+# it under the terms of the BSD 3-Clause License as published by
+# the Open Source Initiative.
+
+# asrt is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# BSD 3-Clause License for more details.
+
+# You should have received a copy of the BSD 3-Clause License
+# along with asrt. If not, see <http://opensource.org/licenses/>.
+
+__author__ = "Alexandre Nanchen"
+__version__ = "Revision: 1.0"
+__date__ = "Date: 2026/10"
+__copyright__ = "Copyright (c) 2026 Idiap Research Institute"
+__license__ = "BSD 3-Clause"
+
+usage = """
+    Manage the words classifier model store used with
+    --wordmodel: create it, add labelled in-domain sentences
+    files to the current model, list or select versions.
+"""
+
+import sys
+import os
+
+scriptsDir = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(scriptsDir + "/../../../")
+sys.path.append(scriptsDir + "/../../lib/num2words")
+
+import logging
+import argparse
+
+from asrt.common.LoggingSetup import setupLogging
+from asrt.common.ClassifierWord import WordClassifier
+from asrt.common.ClassifierModelStore import ClassifierModelStore
+
+
+####################
+# Main
+#
+if __name__ == "__main__":
+    # Setup parser
+    parser = argparse.ArgumentParser(description=usage)
+    parser.add_argument("-s", "--store", help="model store directory",
+                        nargs=1, dest="storeDir", required=True)
+    parser.add_argument("-i", "--input", help="labelled sentences files (label<tab>sentence) to add",
+                        nargs='+', dest="inputFile", default=None)
+    parser.add_argument("--init", help="first train on europarl_raw, or on the input files",
+                        dest="init", action="store_true")
+    parser.add_argument("--current", help="use this version",
+                        dest="current", type=int, default=None)
+    parser.add_argument("-l", "--list", help="list the versions",
+                        dest="list", action="store_true")
+    parser.add_argument("-w", "--workers", help="counting processes",
+                        dest="workers", type=int, default=4)
+
+    # Parse arguments
+    args = parser.parse_args()
+
+    setupLogging(logging.INFO)
+
+    store = ClassifierModelStore(args.storeDir[0])
+
+    if args.init:
+        classifier = WordClassifier()
+        if args.inputFile is None:
+            classifier.train(args.workers)
+        else:
+            classifier.trainFromSources(WordClassifier.readLabelledSources(args.inputFile),
+                                        args.workers)
+            classifier.setUniformPriors()
+        store.addVersion(classifier, args.inputFile or [])
+    elif args.inputFile is not None:
+        store.update(args.inputFile, args.workers)
+
+    if args.current is not None:
+        store.setCurrentVersion(args.current)
+
+    if args.list:
+        currentVersion = store.getCurrentVersion()
+        for version in store.getVersions():
+            infoDict = store.getInfo(version)
+            print("%s%d\t%s\tparent %s\t%s" % ("*" if version == currentVersion else " ",
+                                                version, infoDict['created'],
+                                                infoDict['parent'], ",".join(infoDict['files'])))